@@ -0,0 +1,60 @@
+"""Add backfill checkpoints table
+
+Revision ID: 20251207_0900
+Revises: 20251206_2000
+Create Date: 2025-12-07 09:00:00.000000
+
+Stores per-chunk progress of historical backfill jobs
+(services/backfill_service.py) so interrupted runs can resume.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20251207_0900"
+down_revision = "20251206_2000"
+branch_labels = None
+depends_on = None
+
+SCHEMA = "tradeflix_tools"
+
+
+def upgrade() -> None:
+    op.create_table(
+        "backfill_checkpoints",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("job", sa.String(length=100), nullable=False),
+        sa.Column("chunk_start", sa.Date(), nullable=False),
+        sa.Column("chunk_end", sa.Date(), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("rows_written", sa.Integer(), nullable=True, server_default="0"),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "job", "chunk_start", "chunk_end", name="uq_backfill_chunk"
+        ),
+        schema=SCHEMA,
+    )
+    op.create_index(
+        "ix_backfill_checkpoints_job",
+        "backfill_checkpoints",
+        ["job"],
+        unique=False,
+        schema=SCHEMA,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_backfill_checkpoints_job",
+        table_name="backfill_checkpoints",
+        schema=SCHEMA,
+    )
+    op.drop_table("backfill_checkpoints", schema=SCHEMA)
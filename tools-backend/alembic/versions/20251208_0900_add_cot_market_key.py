@@ -0,0 +1,54 @@
+"""Add normalized market key and lookup indexes to COT disaggregated report
+
+Revision ID: 20251208_0900
+Revises: 20251207_0900
+Create Date: 2025-12-08 09:00:00.000000
+
+COT lookups filtered on upper("Commodity Name") / LIKE on the market name
+and sorted by report date, with no supporting index. market_key is a stored
+generated column holding the contract part of Market_and_Exchange_Names
+(e.g. "GOLD", "MICRO GOLD"), so commodity lookups become an index range
+scan on (market_key, report date DESC).
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20251208_0900"
+down_revision = "20251207_0900"
+branch_labels = None
+depends_on = None
+
+SCHEMA = "tradeflix_tools"
+TABLE = f'"{SCHEMA}"."cot_report_disagg_futures_only"'
+
+
+def upgrade() -> None:
+    op.execute(
+        f"""
+        ALTER TABLE {TABLE}
+        ADD COLUMN IF NOT EXISTS market_key TEXT
+        GENERATED ALWAYS AS (
+            upper(btrim(split_part("Market_and_Exchange_Names", ' - ', 1)))
+        ) STORED
+        """
+    )
+    op.execute(
+        f"""
+        CREATE INDEX IF NOT EXISTS ix_cot_disagg_market_key_report_date
+        ON {TABLE} (market_key, "Report_Date_as_YYYY_MM_DD" DESC)
+        """
+    )
+    # Cross-market scans partition by commodity name
+    op.execute(
+        f"""
+        CREATE INDEX IF NOT EXISTS ix_cot_disagg_commodity_report_date
+        ON {TABLE} ("Commodity Name", "Report_Date_as_YYYY_MM_DD" DESC)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute(f'DROP INDEX IF EXISTS "{SCHEMA}".ix_cot_disagg_commodity_report_date')
+    op.execute(f'DROP INDEX IF EXISTS "{SCHEMA}".ix_cot_disagg_market_key_report_date')
+    op.execute(f"ALTER TABLE {TABLE} DROP COLUMN IF EXISTS market_key")
@@ -0,0 +1,69 @@
+"""Add legacy COT reports table
+
+Revision ID: 20251209_0900
+Revises: 20251208_0900
+Create Date: 2025-12-09 09:00:00.000000
+
+Stores legacy-format (commercial / non-commercial) COT reports ingested
+incrementally from FMP (scripts/cron/cot_ingest_cron.py), so the legacy
+/cot endpoints read from the database instead of calling FMP per request.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20251209_0900"
+down_revision = "20251208_0900"
+branch_labels = None
+depends_on = None
+
+SCHEMA = "tradeflix_tools"
+
+
+def upgrade() -> None:
+    op.create_table(
+        "cot_report_legacy",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("symbol", sa.String(length=20), nullable=False),
+        sa.Column("report_date", sa.Date(), nullable=False),
+        sa.Column("name", sa.String(length=200), nullable=True),
+        sa.Column("sector", sa.String(length=100), nullable=True),
+        sa.Column("exchange", sa.String(length=200), nullable=True),
+        sa.Column("open_interest", sa.BigInteger(), nullable=False),
+        sa.Column("change_open_interest", sa.BigInteger(), nullable=True),
+        sa.Column("commercial_long", sa.BigInteger(), nullable=True),
+        sa.Column("commercial_short", sa.BigInteger(), nullable=True),
+        sa.Column("non_commercial_long", sa.BigInteger(), nullable=True),
+        sa.Column("non_commercial_short", sa.BigInteger(), nullable=True),
+        sa.Column("non_reportable_long", sa.BigInteger(), nullable=True),
+        sa.Column("non_reportable_short", sa.BigInteger(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        # Also serves (symbol, report_date) range scans
+        sa.UniqueConstraint(
+            "symbol", "report_date", name="uq_cot_legacy_symbol_date"
+        ),
+        schema=SCHEMA,
+    )
+    op.create_index(
+        "ix_cot_report_legacy_id",
+        "cot_report_legacy",
+        ["id"],
+        unique=False,
+        schema=SCHEMA,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_cot_report_legacy_id",
+        table_name="cot_report_legacy",
+        schema=SCHEMA,
+    )
+    op.drop_table("cot_report_legacy", schema=SCHEMA)
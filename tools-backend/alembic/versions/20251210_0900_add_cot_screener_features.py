@@ -0,0 +1,65 @@
+"""Add COT screener features table
+
+Revision ID: 20251210_0900
+Revises: 20251209_0900
+Create Date: 2025-12-10 09:00:00.000000
+
+Holds the latest precomputed COT features of every disaggregated market
+(percentiles, flows, concentration, squeeze scores, ML regime) so the
+/cot/screener endpoint filters and sorts in SQL instead of running the
+per-commodity analyses on request.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20251210_0900"
+down_revision = "20251209_0900"
+branch_labels = None
+depends_on = None
+
+SCHEMA = "tradeflix_tools"
+
+
+def upgrade() -> None:
+    op.create_table(
+        "cot_screener_features",
+        sa.Column("market_key", sa.Text(), nullable=False),
+        sa.Column("commodity_name", sa.Text(), nullable=True),
+        sa.Column("market_name", sa.Text(), nullable=True),
+        sa.Column("subgroup", sa.Text(), nullable=True),
+        sa.Column("report_date", sa.Date(), nullable=False),
+        sa.Column("weeks_analyzed", sa.Integer(), nullable=False),
+        sa.Column("open_interest", sa.BigInteger(), nullable=True),
+        sa.Column("mm_net", sa.BigInteger(), nullable=True),
+        sa.Column("mm_percentile", sa.Float(), nullable=True),
+        sa.Column("commercial_net", sa.BigInteger(), nullable=True),
+        sa.Column("commercial_percentile", sa.Float(), nullable=True),
+        sa.Column("swap_percentile", sa.Float(), nullable=True),
+        sa.Column("other_percentile", sa.Float(), nullable=True),
+        sa.Column("nonrept_percentile", sa.Float(), nullable=True),
+        sa.Column("mm_flow_4w", sa.BigInteger(), nullable=True),
+        sa.Column("mm_flow_4w_pct_oi", sa.Float(), nullable=True),
+        sa.Column("commercial_flow_4w", sa.BigInteger(), nullable=True),
+        sa.Column("crowding_score", sa.Float(), nullable=True),
+        sa.Column("crowding_level", sa.String(length=20), nullable=True),
+        sa.Column("long_squeeze_score", sa.Float(), nullable=True),
+        sa.Column("short_squeeze_score", sa.Float(), nullable=True),
+        sa.Column("squeeze_risk_score", sa.Float(), nullable=True),
+        sa.Column("dominant_squeeze", sa.String(length=20), nullable=True),
+        sa.Column("ml_regime", sa.String(length=30), nullable=True),
+        sa.Column("ml_regime_confidence", sa.Float(), nullable=True),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.PrimaryKeyConstraint("market_key"),
+        schema=SCHEMA,
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("cot_screener_features", schema=SCHEMA)
@@ -0,0 +1,79 @@
+"""Add COT ML regime history table
+
+Revision ID: 20251211_0900
+Revises: 20251210_0900
+Create Date: 2025-12-11 09:00:00.000000
+
+Stores the weekly rule-based ML regime classification (and its feature
+vector) of every disaggregated market, backfilled in one vectorized pass
+per market, for /cot/disagg/advanced/ml-regime/history.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20251211_0900"
+down_revision = "20251210_0900"
+branch_labels = None
+depends_on = None
+
+SCHEMA = "tradeflix_tools"
+
+FEATURE_COLUMNS = (
+    "mm_net_percentile",
+    "commercial_net_percentile",
+    "nonrept_net_percentile",
+    "mm_4wk_flow",
+    "commercial_4wk_flow",
+    "concentration_score",
+    "spread_ratio",
+    "herding_score",
+    "front_back_ratio",
+    "gross_positions_percentile",
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "cot_ml_regime_history",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("market_key", sa.Text(), nullable=False),
+        sa.Column("report_date", sa.Date(), nullable=False),
+        sa.Column("window", sa.Integer(), nullable=False),
+        sa.Column("regime", sa.String(length=30), nullable=False),
+        sa.Column("confidence", sa.Float(), nullable=False),
+        *(sa.Column(name, sa.Float(), nullable=True) for name in FEATURE_COLUMNS),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        # Backfills with different windows keep separate rows; also serves
+        # the (market_key, window) latest-weeks scans
+        sa.UniqueConstraint(
+            "market_key",
+            "window",
+            "report_date",
+            name="uq_cot_ml_regime_market_window_date",
+        ),
+        schema=SCHEMA,
+    )
+    op.create_index(
+        "ix_cot_ml_regime_history_id",
+        "cot_ml_regime_history",
+        ["id"],
+        unique=False,
+        schema=SCHEMA,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_cot_ml_regime_history_id",
+        table_name="cot_ml_regime_history",
+        schema=SCHEMA,
+    )
+    op.drop_table("cot_ml_regime_history", schema=SCHEMA)
@@ -0,0 +1,64 @@
+"""Add correlation regimes table
+
+Revision ID: 20251212_0900
+Revises: 20251211_0900
+Create Date: 2025-12-12 09:00:00.000000
+
+Stores the nightly multi-window (20/60/120/250 day) rolling correlations,
+regimes and structural break tests of the configured asset pairs, computed
+from metals_prices_spot, for /correlation/regimes.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20251212_0900"
+down_revision = "20251211_0900"
+branch_labels = None
+depends_on = None
+
+SCHEMA = "tradeflix_tools"
+
+
+def upgrade() -> None:
+    op.create_table(
+        "correlation_regimes",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("pair", sa.String(length=30), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("corr_20", sa.Float(), nullable=True),
+        sa.Column("corr_60", sa.Float(), nullable=True),
+        sa.Column("corr_120", sa.Float(), nullable=True),
+        sa.Column("corr_250", sa.Float(), nullable=True),
+        sa.Column("regime", sa.String(length=20), nullable=True),
+        sa.Column("corr_next_60", sa.Float(), nullable=True),
+        sa.Column("shift_stat", sa.Float(), nullable=True),
+        sa.Column("is_break", sa.Boolean(), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        # Also serves (pair, date) range scans
+        sa.UniqueConstraint("pair", "date", name="uq_correlation_regime_pair_date"),
+        schema=SCHEMA,
+    )
+    op.create_index(
+        "ix_correlation_regimes_id",
+        "correlation_regimes",
+        ["id"],
+        unique=False,
+        schema=SCHEMA,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_correlation_regimes_id",
+        table_name="correlation_regimes",
+        schema=SCHEMA,
+    )
+    op.drop_table("correlation_regimes", schema=SCHEMA)
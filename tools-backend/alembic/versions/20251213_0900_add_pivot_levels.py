@@ -0,0 +1,79 @@
+"""Add pivot levels table
+
+Revision ID: 20251213_0900
+Revises: 20251212_0900
+Create Date: 2025-12-13 09:00:00.000000
+
+Stores the daily, weekly and monthly pivot levels of each symbol, written
+after each COMEX/MCX session close, so pivot endpoints read levels instead
+of recomputing them from a live fetch.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20251213_0900"
+down_revision = "20251212_0900"
+branch_labels = None
+depends_on = None
+
+SCHEMA = "tradeflix_tools"
+
+LEVEL_COLUMNS = (
+    "high",
+    "low",
+    "close",
+    "pivot",
+    "bc",
+    "tc",
+    "width_percent",
+    "r1",
+    "r2",
+    "r3",
+    "s1",
+    "s2",
+    "s3",
+    "fib_618",
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "pivot_levels",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("symbol", sa.String(length=20), nullable=False),
+        sa.Column("exchange", sa.String(length=10), nullable=False),
+        sa.Column("timeframe", sa.String(length=10), nullable=False),
+        sa.Column("period_date", sa.Date(), nullable=False),
+        *(sa.Column(name, sa.Float(), nullable=False) for name in LEVEL_COLUMNS),
+        sa.Column("classification", sa.String(length=10), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        # Also serves latest-period lookups per symbol, exchange and timeframe
+        sa.UniqueConstraint(
+            "symbol",
+            "exchange",
+            "timeframe",
+            "period_date",
+            name="uq_pivot_level_period",
+        ),
+        schema=SCHEMA,
+    )
+    op.create_index(
+        "ix_pivot_levels_id",
+        "pivot_levels",
+        ["id"],
+        unique=False,
+        schema=SCHEMA,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_pivot_levels_id", table_name="pivot_levels", schema=SCHEMA)
+    op.drop_table("pivot_levels", schema=SCHEMA)
@@ -1,11 +1,8 @@
 from fastapi import APIRouter, HTTPException, Query, Depends
-from datetime import datetime, timedelta
+from datetime import datetime
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
-from typing import List
+from typing import Optional
 import logging
-import statistics
-import math
 
 from schemas.arbitrage import (
     ArbitrageCalculationRequest,
@@ -14,7 +11,18 @@ from schemas.arbitrage import (
     ArbitrageMetrics,
     ProfitAnalysis,
 )
+from services.arbitrage_history import (
+    AUTO_BUCKET,
+    BUCKET_SECONDS,
+    choose_bucket,
+    history_filters,
+    kept_times,
+    load_history_points,
+    load_history_statistics,
+    load_premium_series,
+)
 from services.arbitrage_service import ArbitrageService
+from services.downsampling import LTTB, METHODS, downsample_indices
 from services.data_providers import YahooFinanceProvider, DhanHQProvider
 from models.arbitrage import ArbitrageHistory
 from database import get_db
@@ -30,84 +38,6 @@ COMEX_GOLD_SYMBOL = "GC=F"
 COMEX_SILVER_SYMBOL = "SI=F"
 
 
-def _downsample_lttb(data: List, target_points: int) -> List:
-    """
-    Downsample data using Largest Triangle Three Buckets (LTTB) algorithm.
-    This preserves visual accuracy while reducing data points.
-
-    Args:
-        data: List of ArbitrageHistory objects (sorted by date descending)
-        target_points: Target number of points to return
-
-    Returns:
-        Downsampled list preserving chart shape
-    """
-    if len(data) <= target_points:
-        return data
-
-    # Reverse to chronological order for LTTB
-    data = list(reversed(data))
-
-    # Always keep first and last points
-    sampled = [data[0]]
-
-    # Calculate bucket size
-    bucket_size = (len(data) - 2) / (target_points - 2)
-
-    a = 0  # Index of previous selected point
-
-    for i in range(target_points - 2):
-        # Calculate bucket range
-        bucket_start = int(math.floor((i + 1) * bucket_size)) + 1
-        bucket_end = int(math.floor((i + 2) * bucket_size)) + 1
-        bucket_end = min(bucket_end, len(data) - 1)
-
-        # Calculate average point in next bucket for reference
-        avg_x = 0
-        avg_y = 0
-        next_bucket_start = int(math.floor((i + 2) * bucket_size)) + 1
-        next_bucket_end = int(math.floor((i + 3) * bucket_size)) + 1
-        next_bucket_end = min(next_bucket_end, len(data))
-
-        count = next_bucket_end - next_bucket_start
-        if count > 0:
-            for j in range(next_bucket_start, next_bucket_end):
-                avg_x += j
-                avg_y += float(data[j].premium_percent)
-            avg_x /= count
-            avg_y /= count
-
-        # Find point in current bucket with largest triangle area
-        max_area = -1
-        max_idx = bucket_start
-
-        point_a_x = a
-        point_a_y = float(data[a].premium_percent)
-
-        for j in range(bucket_start, bucket_end):
-            # Calculate triangle area
-            area = (
-                abs(
-                    (point_a_x - avg_x) * (float(data[j].premium_percent) - point_a_y)
-                    - (point_a_x - j) * (avg_y - point_a_y)
-                )
-                * 0.5
-            )
-
-            if area > max_area:
-                max_area = area
-                max_idx = j
-
-        sampled.append(data[max_idx])
-        a = max_idx
-
-    # Add last point
-    sampled.append(data[-1])
-
-    # Reverse back to descending order (newest first)
-    return list(reversed(sampled))
-
-
 @router.post("/calculate", response_model=ArbitrageCalculationResponse)
 async def calculate_arbitrage(request: ArbitrageCalculationRequest):
     """
@@ -368,6 +298,12 @@ async def get_arbitrage_history(
     exclude_estimated: bool = Query(
         default=True, description="Exclude estimated MCX prices (holidays)"
     ),
+    downsample: str = Query(
+        default=LTTB, description="Downsampling method: lttb, minmax or m4"
+    ),
+    bucket: Optional[str] = Query(
+        default=None, description="Time bucket: hour, day, week, month or auto"
+    ),
     db: Session = Depends(get_db),
 ):
     """
@@ -377,31 +313,31 @@ async def get_arbitrage_history(
     - **days**: Number of days of history (0 = all available data)
     - **max_points**: Maximum number of data points to return (for performance)
     - **exclude_estimated**: If true, excludes records where MCX price was estimated (holidays)
+    - **downsample**: lttb (chart shape), minmax or m4 (keep every spike)
+    - **bucket**: Average points per hour, day, week or month; auto picks
+      the finest bucket that fits max_points
 
     Returns historical premium/discount data with statistics.
-    Data is downsampled using LTTB algorithm when exceeding max_points.
+    Statistics cover every matching record and are computed in SQL.
+    Data is downsampled on the premium series when exceeding max_points.
     """
-    try:
-        symbol_upper = symbol.upper()
-
-        # Build query
-        query = db.query(ArbitrageHistory).filter(
-            ArbitrageHistory.symbol == symbol_upper
+    if downsample not in METHODS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown downsample method. Use {', '.join(METHODS)}",
+        )
+    if bucket is not None and bucket != AUTO_BUCKET and bucket not in BUCKET_SECONDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown bucket. Use {', '.join(BUCKET_SECONDS)} or auto",
         )
 
-        # Apply date filter only if days > 0
-        if days > 0:
-            cutoff_date = datetime.now() - timedelta(days=days)
-            query = query.filter(ArbitrageHistory.recorded_at >= cutoff_date)
-
-        # Exclude estimated MCX prices (holidays) if requested
-        if exclude_estimated:
-            query = query.filter(ArbitrageHistory.mcx_source != "estimated")
-
-        # Query historical data
-        history = query.order_by(desc(ArbitrageHistory.recorded_at)).all()
+    try:
+        symbol_upper = symbol.upper()
+        filters = history_filters(symbol_upper, days, exclude_estimated)
 
-        if not history:
+        stats = load_history_statistics(db, filters)
+        if stats is None:
             return {
                 "symbol": symbol_upper,
                 "days": days,
@@ -410,24 +346,14 @@ async def get_arbitrage_history(
                 "message": "No historical data available. Data collection starts when arbitrage calculations are performed.",
             }
 
-        # Calculate statistics on full dataset
-        premiums = [float(h.premium_percent) for h in history]
-        avg_premium = statistics.mean(premiums)
-        std_premium = statistics.stdev(premiums) if len(premiums) > 1 else 0
-        min_premium = min(premiums)
-        max_premium = max(premiums)
-
-        # Count signals
-        signal_counts = {}
-        for h in history:
-            signal_counts[h.signal] = signal_counts.get(h.signal, 0) + 1
-
-        # Downsample data if needed using LTTB-like algorithm
-        total_points = len(history)
-        if total_points > max_points:
-            history = _downsample_lttb(history, max_points)
+        # Downsample the streamed premium series, in chronological order,
+        # then fetch full rows of the kept points only
+        bucket = choose_bucket(bucket, stats, max_points)
+        micros, premiums = load_premium_series(db, filters, bucket)
+        keep = downsample_indices(premiums, max_points, downsample, x=micros / 1e6)
+        rows = load_history_points(db, filters, bucket, at=kept_times(micros, keep))
 
-        # Format data points
+        # Format data points, newest first
         data_points = [
             {
                 "recorded_at": h.recorded_at.isoformat(),
@@ -441,22 +367,27 @@ async def get_arbitrage_history(
                 "z_score": float(h.z_score) if h.z_score else None,
                 "percentile": float(h.percentile) if h.percentile else None,
             }
-            for h in history
+            for h in reversed(rows)
         ]
 
         return {
             "symbol": symbol_upper,
             "days": days,
             "data_count": len(data_points),
-            "total_points": total_points,
-            "downsampled": total_points > max_points,
+            "total_points": stats["count"],
+            "bucket": bucket,
+            "downsampled": len(data_points) < stats["count"],
             "data": data_points,
             "statistics": {
-                "average_premium_percent": round(avg_premium, 4),
-                "std_deviation": round(std_premium, 4),
-                "min_premium_percent": round(min_premium, 4),
-                "max_premium_percent": round(max_premium, 4),
-                "signal_distribution": signal_counts,
+                "average_premium_percent": round(stats["average"], 4),
+                "std_deviation": round(stats["std"], 4),
+                "min_premium_percent": round(stats["min"], 4),
+                "max_premium_percent": round(stats["max"], 4),
+                "percentiles": {
+                    name: round(value, 4)
+                    for name, value in stats["percentiles"].items()
+                },
+                "signal_distribution": stats["signal_distribution"],
             },
         }
 
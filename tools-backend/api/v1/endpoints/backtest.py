@@ -28,6 +28,7 @@ from schemas.visual_backtest import (
     BacktestListResponse,
 )
 from services.backtest_engine import run_backtest_with_lib
+from services.downsampling import aggregate_candles, downsample_points
 
 logger = logging.getLogger(__name__)
 
@@ -1462,9 +1463,24 @@ async def run_visual_backtest_endpoint(
             tradesCount=result["metrics"]["tradesCount"],
         )
 
+        # Chart series: equity thinned on its value, candles merged per
+        # bucket so wicks and trade entry/exit dates survive
+        equity_points = downsample_points(
+            result["equityCurve"], "equity", request.maxPoints, request.downsample
+        )
+        candles = aggregate_candles(
+            result["priceData"],
+            request.maxPoints,
+            anchors=[
+                day
+                for t in result["trades"]
+                for day in (t["entryDate"], t.get("exitDate"))
+                if day
+            ],
+        )
+
         equity_curve = [
-            EquityCurvePoint(date=p["date"], equity=p["equity"])
-            for p in result["equityCurve"]
+            EquityCurvePoint(date=p["date"], equity=p["equity"]) for p in equity_points
         ]
 
         price_data = [
@@ -1477,7 +1493,7 @@ async def run_visual_backtest_endpoint(
                 volume=c.get("volume", 0),
                 usdinr=c.get("usdinr"),
             )
-            for c in result["priceData"]
+            for c in candles
         ]
 
         return VisualBacktestResponse(
@@ -1487,6 +1503,10 @@ async def run_visual_backtest_endpoint(
             metrics=metrics,
             equityCurve=equity_curve,
             priceData=price_data,
+            downsampled=(
+                len(equity_points) < len(result["equityCurve"])
+                or len(candles) < len(result["priceData"])
+            ),
         )
 
     except ValueError as e:
@@ -1,8 +1,13 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
 from datetime import date, timedelta
-from typing import List
+from typing import List, Optional
+import asyncio
+import json
 import logging
 import numpy as np
+import pandas as pd
 
 from schemas.correlation import (
     CorrelationRequest,
@@ -15,15 +20,30 @@ from schemas.correlation import (
     BetaCalculationResponse,
     DiversificationAnalysisRequest,
     DiversificationScore,
+    CorrelationRegimeHistoryResponse,
+    CorrelationRegimesResponse,
     CorrelationBreakdownResponse,
     AssetPair,
     DivergenceRequest,
+    DivergencePoint,
     DivergenceResponse,
+    LeadLagMatrixRequest,
+    LeadLagMatrixResponse,
+    LeadLagPair,
     LeadLagResponse,
     TradingSignal,
     TradingSignalsResponse,
 )
-from services.correlation_service import CorrelationService
+from database import SessionLocal, get_db
+from services.correlation_regime_service import CorrelationRegimeService
+from services.correlation_service import ALIGN_INNER, CorrelationService
+from services.correlation_stream_service import (
+    USDINR,
+    get_live_correlation_service,
+    pair_key,
+    parse_pairs,
+)
+from services.price_stream_service import get_price_stream_hub
 from services.data_providers import YahooFinanceProvider, ProviderError
 
 logger = logging.getLogger(__name__)
@@ -45,9 +65,15 @@ YAHOO_SYMBOLS = {
     "USDINR": "USDINR=X",
 }
 
+# Largest basket accepted by /matrix
+MAX_MATRIX_ASSETS = 50
 
-async def fetch_returns(symbol: str, days: int) -> List[float]:
-    """Fetch real returns data from Yahoo Finance (optimized with numpy)"""
+# Seconds between /live keep-alive comments when no ticks arrive
+LIVE_KEEPALIVE_SECONDS = 15
+
+
+async def fetch_closes(symbol: str, days: int) -> pd.Series:
+    """Fetch daily closes from Yahoo Finance, indexed by date"""
     yahoo = YahooFinanceProvider()
     yahoo_symbol = YAHOO_SYMBOLS.get(symbol.upper(), symbol)
 
@@ -58,27 +84,48 @@ async def fetch_returns(symbol: str, days: int) -> List[float]:
         history = await yahoo.get_historical_data(
             yahoo_symbol, start_date, end_date, "1d", "USD"
         )
+    except ProviderError as e:
+        logger.warning(f"Could not fetch data for {symbol}: {e}")
+        raise ValueError(f"Could not fetch data for {symbol}: {e}")
 
-        if not history.data_points or len(history.data_points) < 2:
-            raise ValueError(f"Insufficient data for {symbol}")
+    if not history.data_points or len(history.data_points) < 2:
+        raise ValueError(f"Insufficient data for {symbol}")
 
-        # Calculate daily returns using numpy (optimized)
-        closes = np.array(
-            [float(dp.close) for dp in history.data_points], dtype=np.float64
-        )
+    closes = pd.Series(
+        [float(dp.close) for dp in history.data_points],
+        index=pd.DatetimeIndex([dp.date for dp in history.data_points]),
+        dtype=np.float64,
+    )
+    # Keep the last close of any duplicated date
+    return closes[~closes.index.duplicated(keep="last")].sort_index()
 
-        # Vectorized return calculation: (close[i] - close[i-1]) / close[i-1]
-        returns = np.diff(closes) / closes[:-1]
 
-        # Handle any inf/nan values
-        returns = np.nan_to_num(returns, nan=0.0, posinf=0.0, neginf=0.0)
+async def fetch_returns(symbol: str, days: int) -> List[float]:
+    """Fetch real returns data from Yahoo Finance (optimized with numpy)"""
+    closes = (await fetch_closes(symbol, days)).to_numpy()
 
-        # Trim to requested days and convert to list
-        return returns[-days:].tolist() if len(returns) > days else returns.tolist()
+    # Vectorized return calculation: (close[i] - close[i-1]) / close[i-1]
+    returns = np.diff(closes) / closes[:-1]
 
-    except ProviderError as e:
-        logger.warning(f"Could not fetch data for {symbol}: {e}")
-        raise ValueError(f"Could not fetch data for {symbol}: {e}")
+    # Handle any inf/nan values
+    returns = np.nan_to_num(returns, nan=0.0, posinf=0.0, neginf=0.0)
+
+    # Trim to requested days and convert to list
+    return returns[-days:].tolist() if len(returns) > days else returns.tolist()
+
+
+async def fetch_aligned_returns(
+    assets: List[str], days: int, how: str = ALIGN_INNER
+) -> pd.DataFrame:
+    """
+    Fetch closes of several assets concurrently and align their returns by date
+
+    Returns:
+        (T x n) returns with one column per asset, at most `days` rows
+    """
+    closes = await asyncio.gather(*(fetch_closes(asset, days) for asset in assets))
+    returns = correlation_service.align_returns(dict(zip(assets, closes)), how)
+    return returns.iloc[-days:]
 
 
 @router.post("/matrix", response_model=CorrelationMatrixResponse)
@@ -86,85 +133,78 @@ async def calculate_correlation_matrix(request: CorrelationRequest):
     """
     Calculate correlation matrix for multiple assets
 
-    - **assets**: List of asset symbols (2-10 assets)
+    - **assets**: List of asset symbols (2-50 assets)
     - **period_days**: Analysis period in days (7-365)
     - **timeframe**: Data timeframe (daily, weekly)
+    - **alignment**: "inner" (dates all assets traded) or "ffill" (carry
+      closes over holidays)
 
-    Returns correlation matrix with all pairwise correlations.
+    Returns are joined on a common date index and the full matrix, p-values
+    and confidence intervals are computed in one vectorized pass.
     """
     try:
         if len(request.assets) < 2:
             raise HTTPException(status_code=400, detail="At least 2 assets required")
 
-        if len(request.assets) > 10:
-            raise HTTPException(status_code=400, detail="Maximum 10 assets allowed")
-
-        # Fetch real price data from Yahoo Finance
-        asset_returns = {}
-        for asset in request.assets:
-            try:
-                asset_returns[asset] = await fetch_returns(asset, request.period_days)
-            except ValueError as e:
-                raise HTTPException(status_code=404, detail=str(e))
+        if len(request.assets) > MAX_MATRIX_ASSETS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Maximum {MAX_MATRIX_ASSETS} assets allowed",
+            )
 
-        # Align returns to same length (use minimum length)
-        min_length = min(len(returns) for returns in asset_returns.values())
-        aligned_returns = {
-            asset: returns[-min_length:] for asset, returns in asset_returns.items()
-        }
+        assets = list(dict.fromkeys(request.assets))
+        try:
+            returns = await fetch_aligned_returns(
+                assets, request.period_days, request.alignment
+            )
+            result = correlation_service.correlation_matrix(returns)
+        except ValueError as e:
+            raise HTTPException(status_code=404, detail=str(e))
 
+        sample_size = result["sample_size"]
         logger.info(
-            f"Aligned returns to {min_length} data points for correlation calculation"
+            f"Aligned {len(assets)} assets on {sample_size} common dates "
+            f"({request.alignment}) for correlation calculation"
         )
 
-        # Calculate all pairwise correlations
-        correlations = []
-        matrix = {asset: {} for asset in request.assets}
-
-        for i, asset1 in enumerate(request.assets):
-            for j, asset2 in enumerate(request.assets):
-                if i < j:  # Only calculate upper triangle
-                    corr = correlation_service.calculate_correlation(
-                        aligned_returns[asset1], aligned_returns[asset2]
-                    )
-
-                    strength = correlation_service.classify_correlation_strength(corr)
-                    direction = "positive" if corr >= 0 else "negative"
-
-                    p_value = correlation_service.calculate_p_value(
-                        corr, request.period_days
-                    )
-
-                    correlations.append(
-                        CorrelationPair(
-                            asset1=asset1,
-                            asset2=asset2,
-                            correlation=round(corr, 3),
-                            strength=strength,
-                            direction=direction,
-                            p_value=round(p_value, 3),
-                            sample_size=request.period_days,
-                        )
-                    )
-
-                    # Fill matrix (symmetric)
-                    matrix[asset1][asset2] = round(corr, 3)
-                    matrix[asset2][asset1] = round(corr, 3)
-                elif i == j:
-                    matrix[asset1][asset2] = 1.0
+        corr = np.round(result["correlation"], 3)
+        p_values = np.round(result["p_value"], 4)
+        ci_lower = np.round(result["ci_lower"], 3)
+        ci_upper = np.round(result["ci_upper"], 3)
+
+        # Upper triangle pairs
+        correlations = [
+            CorrelationPair(
+                asset1=assets[i],
+                asset2=assets[j],
+                correlation=corr[i, j],
+                strength=correlation_service.classify_correlation_strength(corr[i, j]),
+                direction="positive" if corr[i, j] >= 0 else "negative",
+                p_value=p_values[i, j],
+                ci_lower=ci_lower[i, j],
+                ci_upper=ci_upper[i, j],
+                sample_size=sample_size,
+            )
+            for i, j in zip(*np.triu_indices(len(assets), k=1))
+        ]
 
-        end_date = date.today()
-        start_date = end_date - timedelta(days=request.period_days)
+        matrix = {
+            asset: dict(zip(assets, row)) for asset, row in zip(assets, corr.tolist())
+        }
 
         return CorrelationMatrixResponse(
-            assets=request.assets,
+            assets=assets,
             period_days=request.period_days,
-            start_date=start_date,
-            end_date=end_date,
+            start_date=returns.index[0].date(),
+            end_date=returns.index[-1].date(),
             correlations=correlations,
             matrix=matrix,
+            sample_size=sample_size,
+            alignment=request.alignment,
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Error calculating correlation matrix: {str(e)}"
@@ -332,24 +372,17 @@ async def analyze_diversification(request: DiversificationAnalysisRequest):
         if len(request.assets) < 2:
             raise HTTPException(status_code=400, detail="At least 2 assets required")
 
-        # Fetch real price data
-        asset_returns = {}
-        for asset in request.assets:
-            try:
-                asset_returns[asset] = await fetch_returns(asset, request.period_days)
-            except ValueError as e:
-                raise HTTPException(status_code=404, detail=str(e))
-
-        # Calculate all pairwise correlations
-        all_correlations = []
-
-        for i, asset1 in enumerate(request.assets):
-            for j, asset2 in enumerate(request.assets):
-                if i < j:
-                    corr = correlation_service.calculate_correlation(
-                        asset_returns[asset1], asset_returns[asset2]
-                    )
-                    all_correlations.append(corr)
+        # Fetch real price data, aligned on common dates
+        try:
+            returns = await fetch_aligned_returns(
+                list(dict.fromkeys(request.assets)), request.period_days
+            )
+            corr = correlation_service.correlation_matrix(returns)["correlation"]
+        except ValueError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+
+        # All pairwise correlations (upper triangle)
+        all_correlations = corr[np.triu_indices(len(corr), k=1)].tolist()
 
         if not all_correlations:
             raise HTTPException(
@@ -380,6 +413,8 @@ async def analyze_diversification(request: DiversificationAnalysisRequest):
             recommendations=recommendations,
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Error analyzing diversification: {str(e)}"
@@ -462,6 +497,98 @@ async def get_correlation_breakdown(
         )
 
 
+@router.get("/regimes", response_model=CorrelationRegimesResponse)
+async def get_correlation_regimes(db: Session = Depends(get_db)):
+    """
+    Latest correlation regime of every configured pair
+
+    Returns 20/60/120/250-day correlations, the regime of the 120-day
+    correlation and the last structural break, precomputed nightly from
+    the stored price history.
+    """
+    try:
+        return CorrelationRegimeService.get_summary(db)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error loading correlation regimes: {str(e)}"
+        )
+
+
+@router.get("/regimes/history", response_model=CorrelationRegimeHistoryResponse)
+async def get_correlation_regime_history(
+    asset1: str = Query(description="First asset symbol (e.g., GOLD)"),
+    asset2: str = Query(description="Second asset symbol (e.g., SILVER)"),
+    days: int = Query(default=750, ge=20, le=5000, description="Trading days"),
+    db: Session = Depends(get_db),
+):
+    """
+    Stored multi-window correlation history and structural breaks of a pair
+
+    - **asset1** / **asset2**: Configured pair, in either order
+    - **days**: Latest trading days to return (20-5000)
+
+    A break is detected where the following 60-day correlation differs
+    significantly (Fisher z-test) from the 60 days up to it, and marks the
+    last day of the old regime.
+    """
+    try:
+        return CorrelationRegimeService.get_history(db, asset1, asset2, days)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error loading correlation regime history: {str(e)}",
+        )
+
+
+def _divergence_response(
+    request: DivergenceRequest,
+    beta: float,
+    correlation: float,
+    divergence: dict,
+    dates: pd.DatetimeIndex,
+) -> DivergenceResponse:
+    """Divergence response with its rolling series dated by window end"""
+    series = divergence["history"]
+    window_dates = dates[len(dates) - len(series["divergence"]) :]
+
+    history = [
+        DivergencePoint(
+            date=point_date.date(),
+            actual_move=actual,
+            expected_move=expected,
+            divergence_pct=divergence_pct,
+            z_score=None if np.isnan(z_score) else z_score,
+        )
+        for point_date, actual, expected, divergence_pct, z_score in zip(
+            window_dates,
+            np.round(series["actual_move"] * 100, 3).tolist(),
+            np.round(series["expected_move"] * 100, 3).tolist(),
+            np.round(series["divergence"] * 100, 3).tolist(),
+            np.round(series["z_score"], 3).tolist(),
+        )
+    ]
+
+    return DivergenceResponse(
+        asset1=request.asset1,
+        asset2=request.asset2,
+        period_days=request.period_days,
+        lookback_days=request.lookback_days,
+        beta=round(beta, 3),
+        correlation=round(correlation, 3),
+        has_divergence=divergence["has_divergence"],
+        divergence_score=divergence["divergence_score"],
+        z_score=divergence["z_score"],
+        expected_move=divergence["expected_move"],
+        actual_move=divergence["actual_move"],
+        divergence_pct=divergence["divergence_pct"],
+        signal=divergence["signal"],
+        interpretation=divergence["interpretation"],
+        history=history,
+    )
+
+
 @router.post("/divergence", response_model=DivergenceResponse)
 async def detect_divergence(request: DivergenceRequest):
     """
@@ -472,18 +599,22 @@ async def detect_divergence(request: DivergenceRequest):
     - **period_days**: Historical period for beta calculation (30-365)
     - **lookback_days**: Recent period to check for divergence (5-90)
 
-    Returns divergence analysis with z-score and trading signal.
+    Returns divergence analysis with z-score and trading signal, plus the
+    rolling divergence / z-score series for charting.
     """
     try:
         if request.asset1 == request.asset2:
             raise HTTPException(status_code=400, detail="Assets must be different")
 
-        # Fetch returns
+        # Fetch returns aligned on common dates
         try:
-            returns1 = await fetch_returns(request.asset1, request.period_days)
-            returns2 = await fetch_returns(request.asset2, request.period_days)
+            returns = await fetch_aligned_returns(
+                [request.asset1, request.asset2], request.period_days
+            )
         except ValueError as e:
             raise HTTPException(status_code=404, detail=str(e))
+        returns1 = returns[request.asset1].to_numpy()
+        returns2 = returns[request.asset2].to_numpy()
 
         # Calculate beta
         beta, _, _ = correlation_service.calculate_beta(returns1, returns2)
@@ -496,29 +627,84 @@ async def detect_divergence(request: DivergenceRequest):
             returns1, returns2, beta, request.lookback_days
         )
 
-        return DivergenceResponse(
-            asset1=request.asset1,
-            asset2=request.asset2,
-            period_days=request.period_days,
-            lookback_days=request.lookback_days,
-            beta=round(beta, 3),
-            correlation=round(correlation, 3),
-            has_divergence=divergence["has_divergence"],
-            divergence_score=divergence["divergence_score"],
-            z_score=divergence["z_score"],
-            expected_move=divergence["expected_move"],
-            actual_move=divergence["actual_move"],
-            divergence_pct=divergence["divergence_pct"],
-            signal=divergence["signal"],
-            interpretation=divergence["interpretation"],
+        return _divergence_response(
+            request, beta, correlation, divergence, returns.index
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Error detecting divergence: {str(e)}"
         )
 
 
+@router.post("/lead-lag/matrix", response_model=LeadLagMatrixResponse)
+async def calculate_lead_lag_matrix(request: LeadLagMatrixRequest):
+    """
+    Lead-lag relationships across a basket of assets
+
+    - **assets**: List of asset symbols (2-50), e.g. GOLD, DXY, USDINR, SPY, SILVER
+    - **period_days**: Analysis period in days (30-730)
+    - **max_lag**: Largest lag to test in periods (1-250)
+    - **alignment**: "inner" or "ffill" date alignment
+    - **include_profiles**: Include each pair's correlation at every lag
+
+    Every pair's cross-correlation over all lags is computed with one FFT,
+    and the lag with the strongest absolute correlation is reported.
+    """
+    try:
+        assets = list(dict.fromkeys(request.assets))
+        if len(assets) < 2:
+            raise HTTPException(status_code=400, detail="At least 2 assets required")
+
+        if len(assets) > MAX_MATRIX_ASSETS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Maximum {MAX_MATRIX_ASSETS} assets allowed",
+            )
+
+        try:
+            returns = await fetch_aligned_returns(
+                assets, request.period_days, request.alignment
+            )
+            result = correlation_service.lead_lag_matrix(returns, request.max_lag)
+        except ValueError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+
+        pairs = [
+            LeadLagPair(
+                **{
+                    **pair,
+                    "lag_correlations": pair["lag_correlations"]
+                    if request.include_profiles
+                    else None,
+                }
+            )
+            for pair in result["pairs"]
+        ]
+
+        return LeadLagMatrixResponse(
+            assets=assets,
+            period_days=request.period_days,
+            start_date=returns.index[0].date(),
+            end_date=returns.index[-1].date(),
+            sample_size=len(returns),
+            max_lag=result["lags"][-1],
+            lags=result["lags"] if request.include_profiles else None,
+            pairs=pairs,
+            lag_matrix=result["lag_matrix"],
+            correlation_matrix=result["correlation_matrix"],
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error calculating lead-lag matrix: {str(e)}"
+        )
+
+
 @router.post("/signals", response_model=TradingSignalsResponse)
 async def get_trading_signals(request: DivergenceRequest):
     """
@@ -536,12 +722,15 @@ async def get_trading_signals(request: DivergenceRequest):
         if request.asset1 == request.asset2:
             raise HTTPException(status_code=400, detail="Assets must be different")
 
-        # Fetch returns
+        # Fetch returns aligned on common dates
         try:
-            returns1 = await fetch_returns(request.asset1, request.period_days)
-            returns2 = await fetch_returns(request.asset2, request.period_days)
+            returns = await fetch_aligned_returns(
+                [request.asset1, request.asset2], request.period_days
+            )
         except ValueError as e:
             raise HTTPException(status_code=404, detail=str(e))
+        returns1 = returns[request.asset1].to_numpy()
+        returns2 = returns[request.asset2].to_numpy()
 
         # Calculate beta and correlation
         beta, _, _ = correlation_service.calculate_beta(returns1, returns2)
@@ -561,21 +750,8 @@ async def get_trading_signals(request: DivergenceRequest):
         )
 
         # Build divergence response
-        divergence_response = DivergenceResponse(
-            asset1=request.asset1,
-            asset2=request.asset2,
-            period_days=request.period_days,
-            lookback_days=request.lookback_days,
-            beta=round(beta, 3),
-            correlation=round(correlation, 3),
-            has_divergence=divergence["has_divergence"],
-            divergence_score=divergence["divergence_score"],
-            z_score=divergence["z_score"],
-            expected_move=divergence["expected_move"],
-            actual_move=divergence["actual_move"],
-            divergence_pct=divergence["divergence_pct"],
-            signal=divergence["signal"],
-            interpretation=divergence["interpretation"],
+        divergence_response = _divergence_response(
+            request, beta, correlation, divergence, returns.index
         )
 
         # Build lead-lag response
@@ -617,7 +793,92 @@ async def get_trading_signals(request: DivergenceRequest):
             summary=signals.get("summary", ""),
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Error generating trading signals: {str(e)}"
         )
+
+
+@router.get("/live")
+async def stream_live_correlation(
+    request: Request,
+    pairs: Optional[str] = Query(
+        default=None,
+        description="Comma-separated pairs, e.g. GOLD:SILVER,GOLD:USDINR "
+        "(default: all configured pairs)",
+    ),
+    db: Session = Depends(get_db),
+):
+    """
+    Live rolling correlation, covariance and beta over Server-Sent Events
+
+    - **pairs**: Configured pairs to stream (GOLD, SILVER, USDINR legs)
+
+    Windows of daily returns are rebuilt from stored history on first use
+    and updated in O(1) per price tick: each `correlation` event includes
+    the unfinished daily bar, with the closed-bar statistics under
+    `committed`. Ticks come from the shared live price stream.
+    """
+    service = get_live_correlation_service()
+    try:
+        requested = parse_pairs(pairs) if pairs else service.pairs
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    unknown = [pair_key(pair) for pair in requested if pair not in service.pairs]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Pairs not configured: {', '.join(unknown)}. "
+            f"Available: {', '.join(pair_key(pair) for pair in service.pairs)}",
+        )
+
+    service.ensure_loaded(db)
+    # USD/INR comes with every metal tick
+    symbols = sorted({asset for pair in requested for asset in pair} - {USDINR})
+    keys = {pair_key(pair) for pair in requested}
+    hub = get_price_stream_hub()
+
+    def event(update: dict) -> str:
+        return f"event: correlation\ndata: {json.dumps(update, default=str)}\n\n"
+
+    async def event_stream():
+        for pair in requested:
+            yield event(service.pair_update(pair))
+
+        queue = await hub.subscribe(symbols)
+        try:
+            while not await request.is_disconnected():
+                try:
+                    tick = await asyncio.wait_for(
+                        queue.get(), timeout=LIVE_KEEPALIVE_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if service.needs_rebuild():
+                    # Sessions were missed since the last tick. The request's
+                    # session is closed once streaming starts, so open one.
+                    with SessionLocal() as session:
+                        service.ensure_loaded(session)
+                for update in service.on_tick(tick):
+                    if update["pair"] in keys:
+                        yield event(update)
+        finally:
+            hub.unsubscribe(queue, symbols)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/live/status")
+async def get_live_correlation_status(db: Session = Depends(get_db)):
+    """Current live correlation of every configured pair"""
+    service = get_live_correlation_service()
+    service.ensure_loaded(db)
+    return service.status()
@@ -1,9 +1,14 @@
 from fastapi import APIRouter, HTTPException, Query, Depends
+from fastapi.encoders import jsonable_encoder
 from datetime import date, timedelta
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
+import functools
+import inspect
 import logging
+import math
+import numpy as np
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, func
+from sqlalchemy import func
 
 from schemas.cot import (
     COTRequest,
@@ -26,6 +31,8 @@ from schemas.cot import (
     SentimentGauge,
     SentimentLevel,
     COTChartDataResponse,
+    CategoryRankSeries,
+    COTPercentileChartResponse,
     NetPositionTimeSeries,
     LongShortTimeSeries,
     ExtremePositioningAlert,
@@ -37,6 +44,7 @@ from schemas.cot import (
     ConcentrationResponse,
     SqueezeRiskResponse,
     AdvancedCOTSummary,
+    ComprehensiveAdvancedAnalysis,
     # Priority 2 schemas
     CurveAnalysisResponse,
     SpreadAnalysisResponse,
@@ -45,92 +53,157 @@ from schemas.cot import (
     CrossMarketPressureResponse,
     VolatilityAnalysisResponse,
     MLRegimeAnalysisResponse,
+    MLRegimeHistoryResponse,
+    COTScreenerItem,
+    COTScreenerResponse,
 )
-from services.cot_service import COTService
+from services.cot_service import COTService, cot_symbol_for
 from services.cot_advanced_service import COTAdvancedService
-from services.data_providers import FMPCOTProvider, ProviderError
-from models.cot import COTReportDisaggFuturesOnly
+from services.cot_regime_history_service import (
+    REGIME_WINDOW,
+    COTRegimeHistoryService,
+)
+from services.cot_screener_service import COTScreenerService, RANGE_FIELDS, SORT_FIELDS
+from services.cot_cache_service import (
+    DISAGG,
+    LEGACY,
+    POPULAR_COMMODITIES,
+    get_cot_cache,
+)
+from services.downsampling import (
+    LTTB,
+    METHODS as DOWNSAMPLE_METHODS,
+    downsample_indices,
+)
+from services.cot_frame import (
+    COTFrame,
+    load_commodity_frame,
+    CHANGE_COLUMNS,
+    MARKET_COLUMNS,
+    NET_CATEGORIES,
+    NET_COLUMNS,
+    SPREAD_CATEGORIES,
+    SPREAD_COLUMNS,
+    PRODUCER_MERCHANT,
+    SWAP_DEALER,
+    MANAGED_MONEY,
+    OTHER_REPORTABLES,
+    NON_REPORTABLES,
+)
+from models.cot import COTReportDisaggFuturesOnly, COTReportLegacy
 from database import get_db
-from config import settings
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 cot_service = COTService()
+cot_cache = get_cot_cache()
+
+
+def _position_data(report: COTReportLegacy) -> COTPositionData:
+    """Legacy report row as position data with net positions"""
+    commercial_long = report.commercial_long or 0
+    commercial_short = report.commercial_short or 0
+    non_commercial_long = report.non_commercial_long or 0
+    non_commercial_short = report.non_commercial_short or 0
+    non_reportable_long = report.non_reportable_long or 0
+    non_reportable_short = report.non_reportable_short or 0
+    return COTPositionData(
+        report_date=report.report_date,
+        commercial_long=commercial_long,
+        commercial_short=commercial_short,
+        commercial_net=commercial_long - commercial_short,
+        non_commercial_long=non_commercial_long,
+        non_commercial_short=non_commercial_short,
+        non_commercial_net=non_commercial_long - non_commercial_short,
+        non_reportable_long=non_reportable_long,
+        non_reportable_short=non_reportable_short,
+        non_reportable_net=non_reportable_long - non_reportable_short,
+        open_interest=report.open_interest or 0,
+    )
 
-# COT symbol mappings
-COT_SYMBOLS = {
-    "GOLD": "GC",
-    "SILVER": "SI",
-    "CRUDE": "CL",
-    "COPPER": "HG",
-    "PLATINUM": "PL",
-    "PALLADIUM": "PA",
-    "NATURALGAS": "NG",
-}
 
+def fetch_cot_data_batch(
+    db: Session, commodities: Iterable[str], weeks: int
+) -> Dict[str, List[COTPositionData]]:
+    """
+    Load stored legacy COT reports of several commodities in one query.
 
-async def get_fmp_provider() -> FMPCOTProvider:
-    """Get FMP COT provider instance"""
-    if not settings.fmp_api_key:
-        raise HTTPException(
-            status_code=503, detail="FMP COT provider not configured. Set FMP_API_KEY."
+    Returns:
+        {commodity: reports oldest first}; commodities without stored
+        reports are left out
+    """
+    symbols = {
+        commodity: cot_symbol_for(commodity) or commodity.upper()
+        for commodity in commodities
+    }
+    start_date = date.today() - timedelta(weeks=weeks)
+
+    reports = (
+        db.query(COTReportLegacy)
+        .filter(
+            COTReportLegacy.symbol.in_(set(symbols.values())),
+            COTReportLegacy.report_date >= start_date,
         )
-    return FMPCOTProvider(settings.fmp_api_key)
+        .order_by(COTReportLegacy.symbol, COTReportLegacy.report_date)
+        .all()
+    )
 
+    by_symbol: Dict[str, List[COTPositionData]] = {}
+    for report in reports:
+        by_symbol.setdefault(report.symbol, []).append(_position_data(report))
 
-async def fetch_cot_data(commodity: str, weeks: int) -> List[COTPositionData]:
-    """Fetch real COT data from FMP"""
-    provider = await get_fmp_provider()
-    cot_symbol = COT_SYMBOLS.get(commodity.upper(), commodity.upper())
+    return {
+        commodity: by_symbol[symbol]
+        for commodity, symbol in symbols.items()
+        if symbol in by_symbol
+    }
 
-    end_date = date.today()
-    start_date = end_date - timedelta(weeks=weeks)
 
-    try:
-        reports = await provider.get_cot_report(
-            cot_symbol, from_date=start_date, to_date=end_date
-        )
+def fetch_cot_data(db: Session, commodity: str, weeks: int) -> List[COTPositionData]:
+    """Load stored legacy COT reports (ingested from FMP), oldest first"""
+    data = fetch_cot_data_batch(db, [commodity], weeks)
+    if commodity not in data:
+        raise HTTPException(status_code=404, detail=f"No COT data found for {commodity}")
+    return data[commodity]
 
-        if not reports:
-            raise HTTPException(
-                status_code=404, detail=f"No COT data found for {commodity}"
-            )
 
-        # Convert FMP reports to our schema
-        data = []
-        for report in reports:
-            data.append(
-                COTPositionData(
-                    report_date=report.report_date,
-                    commercial_long=report.commercial_long,
-                    commercial_short=report.commercial_short,
-                    commercial_net=report.commercial_long - report.commercial_short,
-                    non_commercial_long=report.non_commercial_long,
-                    non_commercial_short=report.non_commercial_short,
-                    non_commercial_net=report.non_commercial_long
-                    - report.non_commercial_short,
-                    non_reportable_long=report.non_reportable_long,
-                    non_reportable_short=report.non_reportable_short,
-                    non_reportable_net=report.non_reportable_long
-                    - report.non_reportable_short,
-                    open_interest=report.open_interest,
-                )
-            )
+def cot_cached(endpoint_func=None, *, source: str = DISAGG):
+    """
+    Serve a database-backed COT endpoint from the COT cache.
 
-        # Sort by date
-        data.sort(key=lambda x: x.report_date)
-        return data
+    Responses are keyed by endpoint name, query parameters and the latest
+    report date of `source`, so they stay valid until the next weekly
+    report. Errors (HTTPException) are not cached.
 
-    except ProviderError as e:
-        logger.error(f"FMP COT provider error: {e}")
-        raise HTTPException(
-            status_code=503, detail=f"COT data provider error: {str(e)}"
-        )
+    Usage: @cot_cached or @cot_cached(source=LEGACY)
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(**kwargs):
+            db = kwargs["db"]
+            params = {k: v for k, v in kwargs.items() if k != "db"}
+            endpoint = func.__name__
+
+            report_date = cot_cache.latest_report_date(db, source)
+            cached = cot_cache.get(endpoint, report_date, **params)
+            if cached is not None:
+                return cached
+
+            result = jsonable_encoder(await func(**kwargs))
+            cot_cache.set(endpoint, report_date, result, **params)
+            return result
+
+        return wrapper
+
+    if endpoint_func is not None:
+        return decorator(endpoint_func)
+    return decorator
 
 
 @router.post("/analysis", response_model=COTAnalysisResponse)
-async def get_cot_analysis(request: COTRequest):
+async def get_cot_analysis(request: COTRequest, db: Session = Depends(get_db)):
     """
     Get comprehensive COT analysis for a commodity
 
@@ -140,8 +213,8 @@ async def get_cot_analysis(request: COTRequest):
     Returns complete COT analysis with positioning, percentiles, and trading signals.
     """
     try:
-        # Fetch real COT data from FMP
-        historical_data = await fetch_cot_data(request.commodity, request.weeks)
+        # Stored COT data (ingested from FMP)
+        historical_data = fetch_cot_data(db, request.commodity, request.weeks)
 
         if not historical_data:
             raise HTTPException(
@@ -235,6 +308,8 @@ async def get_cot_analysis(request: COTRequest):
             avg_non_commercial_net=round(avg_non_commercial_net, 0),
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Error analyzing COT data: {str(e)}"
@@ -242,9 +317,11 @@ async def get_cot_analysis(request: COTRequest):
 
 
 @router.get("/historical", response_model=COTHistoricalResponse)
+@cot_cached(source=LEGACY)
 async def get_historical_cot(
     commodity: str = Query(description="Commodity symbol"),
     weeks: int = Query(default=52, ge=1, le=260),
+    db: Session = Depends(get_db),
 ):
     """
     Get historical COT data
@@ -255,8 +332,8 @@ async def get_historical_cot(
     Returns time series of COT positions.
     """
     try:
-        # Fetch real COT data from FMP
-        data = await fetch_cot_data(commodity, weeks)
+        # Stored COT data (ingested from FMP)
+        data = fetch_cot_data(db, commodity, weeks)
 
         return COTHistoricalResponse(
             commodity=commodity.upper(),
@@ -266,6 +343,8 @@ async def get_historical_cot(
             total_weeks=len(data),
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Error fetching historical COT data: {str(e)}"
@@ -273,7 +352,11 @@ async def get_historical_cot(
 
 
 @router.get("/changes", response_model=COTChangeAnalysis)
-async def get_cot_changes(commodity: str = Query(description="Commodity symbol")):
+@cot_cached(source=LEGACY)
+async def get_cot_changes(
+    commodity: str = Query(description="Commodity symbol"),
+    db: Session = Depends(get_db),
+):
     """
     Get week-over-week changes in COT positions
 
@@ -282,8 +365,8 @@ async def get_cot_changes(commodity: str = Query(description="Commodity symbol")
     Returns detailed change analysis with interpretation.
     """
     try:
-        # Fetch real COT data from FMP
-        data = await fetch_cot_data(commodity, 4)  # Need at least 2 weeks
+        # Stored COT data (ingested from FMP)
+        data = fetch_cot_data(db, commodity, 4)  # Need at least 2 weeks
         current = data[-1]
         previous = data[-2] if len(data) > 1 else current
 
@@ -322,6 +405,8 @@ async def get_cot_changes(commodity: str = Query(description="Commodity symbol")
             interpretation=interpretation,
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Error calculating COT changes: {str(e)}"
@@ -329,9 +414,11 @@ async def get_cot_changes(commodity: str = Query(description="Commodity symbol")
 
 
 @router.get("/extreme", response_model=List[COTExtremePositioning])
+@cot_cached(source=LEGACY)
 async def get_extreme_positioning(
     commodity: str = Query(description="Commodity symbol"),
     weeks: int = Query(default=52, ge=4, le=260),
+    db: Session = Depends(get_db),
 ):
     """
     Identify extreme positioning that may signal reversals
@@ -342,8 +429,8 @@ async def get_extreme_positioning(
     Returns list of extreme positioning alerts.
     """
     try:
-        # Fetch real COT data from FMP
-        data = await fetch_cot_data(commodity, weeks)
+        # Stored COT data (ingested from FMP)
+        data = fetch_cot_data(db, commodity, weeks)
         current = data[-1]
 
         commercial_nets = [d.commercial_net for d in data]
@@ -404,21 +491,71 @@ async def get_extreme_positioning(
 
         return extremes
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Error identifying extreme positioning: {str(e)}"
         )
 
 
+def _comparison_item(commodity: str, data: List[COTPositionData]) -> COTComparisonItem:
+    """Latest positioning of one commodity for /compare"""
+    current = data[-1]
+
+    commercial_nets = [d.commercial_net for d in data]
+    non_commercial_nets = [d.non_commercial_net for d in data]
+
+    comm_percentile = cot_service.calculate_percentile(
+        current.commercial_net, commercial_nets
+    )
+    spec_percentile = cot_service.calculate_percentile(
+        current.non_commercial_net, non_commercial_nets
+    )
+
+    # Generate signal
+    signal_data = cot_service.generate_cot_signal(
+        current.commercial_net,
+        comm_percentile,
+        current.non_commercial_net,
+        spec_percentile,
+        0,
+        0,
+    )
+
+    # Determine sentiment
+    if signal_data["signal"] in ["strong_buy", "buy"]:
+        sentiment = "bullish"
+    elif signal_data["signal"] in ["strong_sell", "sell"]:
+        sentiment = "bearish"
+    else:
+        sentiment = "neutral"
+
+    return COTComparisonItem(
+        commodity=commodity.upper(),
+        commercial_net=current.commercial_net,
+        commercial_percentile=comm_percentile,
+        non_commercial_net=current.non_commercial_net,
+        non_commercial_percentile=spec_percentile,
+        signal=signal_data["signal"],
+        sentiment=sentiment,
+    )
+
+
 @router.post("/compare", response_model=COTComparisonResponse)
-async def compare_commodities(request: COTComparisonRequest):
+async def compare_commodities(
+    request: COTComparisonRequest, db: Session = Depends(get_db)
+):
     """
     Compare COT positioning across multiple commodities
 
     - **commodities**: List of commodity symbols (2-5)
     - **weeks**: Historical period for analysis
 
-    Returns comparison with most bullish/bearish commodities.
+    Returns comparison with most bullish/bearish commodities. Each
+    commodity's result is cached until the next report; commodities that
+    are not cached are loaded in one query. Commodities that fail are
+    reported in `errors` instead of failing the comparison.
     """
     try:
         if len(request.commodities) < 2:
@@ -426,75 +563,70 @@ async def compare_commodities(request: COTComparisonRequest):
                 status_code=400, detail="At least 2 commodities required"
             )
 
-        comparison_data = []
-        commodity_scores = {}
-
-        for commodity in request.commodities:
-            # Fetch real COT data from FMP
-            data = await fetch_cot_data(commodity, request.weeks)
-            current = data[-1]
-
-            commercial_nets = [d.commercial_net for d in data]
-            non_commercial_nets = [d.non_commercial_net for d in data]
+        commodities = list(dict.fromkeys(c.upper() for c in request.commodities))
+        report_date = cot_cache.latest_report_date(db, LEGACY)
 
-            comm_percentile = cot_service.calculate_percentile(
-                current.commercial_net, commercial_nets
+        items: Dict[str, COTComparisonItem] = {}
+        for commodity in commodities:
+            cached = cot_cache.get(
+                "compare_item", report_date, commodity=commodity, weeks=request.weeks
             )
-            spec_percentile = cot_service.calculate_percentile(
-                current.non_commercial_net, non_commercial_nets
+            if cached is not None:
+                items[commodity] = COTComparisonItem(**cached)
+
+        missing = [c for c in commodities if c not in items]
+        data = fetch_cot_data_batch(db, missing, request.weeks) if missing else {}
+
+        errors = {}
+        for commodity in missing:
+            if commodity not in data:
+                errors[commodity] = f"No COT data found for {commodity}"
+                continue
+            try:
+                items[commodity] = _comparison_item(commodity, data[commodity])
+            except Exception as e:
+                logger.error(f"Error comparing COT data for {commodity}: {e}")
+                errors[commodity] = str(e)
+                continue
+            cot_cache.set(
+                "compare_item",
+                report_date,
+                items[commodity].model_dump(),
+                commodity=commodity,
+                weeks=request.weeks,
             )
 
-            # Generate signal
-            signal_data = cot_service.generate_cot_signal(
-                current.commercial_net,
-                comm_percentile,
-                current.non_commercial_net,
-                spec_percentile,
-                0,
-                0,
-            )
-
-            # Determine sentiment
-            if signal_data["signal"] in ["strong_buy", "buy"]:
-                sentiment = "bullish"
-            elif signal_data["signal"] in ["strong_sell", "sell"]:
-                sentiment = "bearish"
-            else:
-                sentiment = "neutral"
-
-            comparison_data.append(
-                COTComparisonItem(
-                    commodity=commodity.upper(),
-                    commercial_net=current.commercial_net,
-                    commercial_percentile=comm_percentile,
-                    non_commercial_net=current.non_commercial_net,
-                    non_commercial_percentile=spec_percentile,
-                    signal=signal_data["signal"],
-                    sentiment=sentiment,
-                )
+        if not items:
+            raise HTTPException(
+                status_code=404,
+                detail=f"No COT data found for {', '.join(commodities)}",
             )
 
-            commodity_scores[commodity] = {
-                "commercial_percentile": comm_percentile,
-                "non_commercial_percentile": spec_percentile,
+        compared = [c for c in commodities if c in items]
+        comparison_data = [items[c] for c in compared]
+        commodity_scores = {
+            c: {
+                "commercial_percentile": items[c].commercial_percentile,
+                "non_commercial_percentile": items[c].non_commercial_percentile,
             }
+            for c in compared
+        }
 
         # Find most bullish/bearish
         most_bullish, most_bearish = cot_service.compare_commodities(commodity_scores)
 
         return COTComparisonResponse(
-            commodities=[c.upper() for c in request.commodities],
+            commodities=compared,
             report_date=date.today(),
             weeks_analyzed=request.weeks,
             comparison_data=comparison_data,
-            most_bullish=most_bullish.upper()
-            if most_bullish
-            else request.commodities[0].upper(),
-            most_bearish=most_bearish.upper()
-            if most_bearish
-            else request.commodities[-1].upper(),
+            most_bullish=most_bullish or compared[0],
+            most_bearish=most_bearish or compared[-1],
+            errors=errors,
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Error comparing commodities: {str(e)}"
@@ -506,82 +638,76 @@ async def compare_commodities(request: COTComparisonRequest):
 # ============================================================================
 
 
-def get_commodity_market_filter(commodity: str) -> dict:
-    """
-    Get the exact market name pattern for a commodity.
-    This ensures we don't mix different contract sizes (e.g., GOLD vs MICRO GOLD).
-
-    Returns:
-        dict with 'commodity_name' (exact match) and 'market_pattern' (LIKE pattern for market name)
-    """
-    commodity_upper = commodity.upper().strip()
-
-    # Mapping of user-friendly names to exact database values
-    # Each entry has: commodity_name (exact), market_pattern (for Market_and_Exchange_Names LIKE)
-    commodity_mappings = {
-        # Main contracts
-        "GOLD": {"commodity_name": "GOLD", "market_pattern": "GOLD - %"},
-        "SILVER": {"commodity_name": "SILVER", "market_pattern": "SILVER - %"},
-        "CRUDE": {
-            "commodity_name": "CRUDE OIL, LIGHT SWEET",
-            "market_pattern": "CRUDE OIL%",
-        },
-        "COPPER": {"commodity_name": "COPPER", "market_pattern": "COPPER - %"},
-        "PLATINUM": {"commodity_name": "PLATINUM", "market_pattern": "PLATINUM - %"},
-        "PALLADIUM": {"commodity_name": "PALLADIUM", "market_pattern": "PALLADIUM - %"},
-        "NATURAL GAS": {
-            "commodity_name": "NATURAL GAS",
-            "market_pattern": "NATURAL GAS - %",
-        },
-        # Micro contracts - separate categories (only include those with data)
-        "MICRO GOLD": {"commodity_name": "GOLD", "market_pattern": "MICRO GOLD - %"},
-    }
-
-    return commodity_mappings.get(
-        commodity_upper,
-        {"commodity_name": commodity_upper, "market_pattern": f"{commodity_upper}%"},
+# Columns behind DisaggregatedPositionData and WeeklyChange
+POSITION_DATA_COLUMNS = (
+    MARKET_COLUMNS
+    + ("COMMODITY_NAME_UPPER",)
+    + NET_COLUMNS
+    + SPREAD_COLUMNS
+    + tuple(
+        f"Pct_of_OI_{category}_{side}_All"
+        for category in NET_CATEGORIES
+        for side in ("Long", "Short")
     )
+)
+WEEKLY_CHANGE_COLUMNS = CHANGE_COLUMNS + (
+    "Change_in_Open_Interest_All",
+    "Change_in_NonRept_Long_All",
+    "Change_in_NonRept_Short_All",
+)
+
+# Response field prefix for each trader category
+POSITION_FIELDS = {
+    PRODUCER_MERCHANT: "producer_merchant",
+    SWAP_DEALER: "swap_dealer",
+    MANAGED_MONEY: "managed_money",
+    OTHER_REPORTABLES: "other_reportables",
+    NON_REPORTABLES: "non_reportables",
+}
 
 
-def build_cot_query(db: Session, commodity: str, weeks: int):
+def build_cot_frame(
+    db: Session, commodity: str, weeks: int, columns: Iterable[str]
+) -> COTFrame:
     """
-    Build a query for COT data with exact market matching.
-    Uses market name pattern to distinguish between main and micro contracts.
+    Load COT history for one market, projecting only `columns`.
+    Commodities resolve to a market_key so main and micro contracts stay
+    separate and the lookup is an index range scan.
 
     Args:
         db: Database session
         commodity: Commodity name (e.g., GOLD, MICRO GOLD, SILVER)
         weeks: Number of weeks to fetch
+        columns: COTReportDisaggFuturesOnly attribute names to load
 
     Returns:
-        List of COTReportDisaggFuturesOnly records
+        COTFrame ordered newest first (no ORM rows are hydrated)
     """
-    filter_config = get_commodity_market_filter(commodity)
-
-    # Query with exact market pattern match
-    query = db.query(COTReportDisaggFuturesOnly).filter(
-        func.upper(COTReportDisaggFuturesOnly.Commodity_Name)
-        == filter_config["commodity_name"].upper(),
-        func.upper(COTReportDisaggFuturesOnly.Market_and_Exchange_Names).like(
-            filter_config["market_pattern"].upper()
-        ),
+    return load_commodity_frame(db, commodity, columns, weeks)
+
+
+def build_position_data(frame: COTFrame, i: int) -> DisaggregatedPositionData:
+    """Position snapshot for report `i` of a frame loaded with POSITION_DATA_COLUMNS"""
+    fields = {}
+    for category, field in POSITION_FIELDS.items():
+        fields[f"{field}_long"] = int(frame.long(category)[i])
+        fields[f"{field}_short"] = int(frame.short(category)[i])
+        fields[f"{field}_net"] = int(frame.net(category)[i])
+        fields[f"{field}_pct_long"] = frame.value(f"Pct_of_OI_{category}_Long_All", i)
+        fields[f"{field}_pct_short"] = frame.value(f"Pct_of_OI_{category}_Short_All", i)
+        if category in SPREAD_CATEGORIES:
+            fields[f"{field}_spread"] = int(frame.spread(category)[i])
+
+    return DisaggregatedPositionData(
+        report_date=frame.report_date(i),
+        market_name=frame.value("Market_and_Exchange_Names", i),
+        commodity_name=frame.value("Commodity_Name", i)
+        or frame.value("COMMODITY_NAME_UPPER", i),
+        commodity_group=frame.value("COMMODITY_GROUP_NAME", i),
+        open_interest=int(frame.open_interest[i]),
+        **fields,
     )
 
-    query = query.order_by(desc(COTReportDisaggFuturesOnly.Report_Date_as_YYYY_MM_DD))
-    reports = query.limit(weeks).all()
-
-    # Fallback: if no results with exact match, try broader commodity name search
-    if not reports:
-        query = db.query(COTReportDisaggFuturesOnly).filter(
-            COTReportDisaggFuturesOnly.Commodity_Name.ilike(f"%{commodity}%")
-        )
-        query = query.order_by(
-            desc(COTReportDisaggFuturesOnly.Report_Date_as_YYYY_MM_DD)
-        )
-        reports = query.limit(weeks).all()
-
-    return reports
-
 
 def calculate_cot_index(current: int, min_val: int, max_val: int) -> float:
     """Calculate COT Index: (current - min) / (max - min) * 100"""
@@ -621,6 +747,7 @@ def determine_sentiment(percentile: float, four_week_change: int) -> SentimentLe
 
 
 @router.get("/disagg/commodities", response_model=List[AvailableCommodity])
+@cot_cached
 async def get_available_commodities(
     db: Session = Depends(get_db),
     group: Optional[str] = Query(default=None, description="Filter by commodity group"),
@@ -681,6 +808,7 @@ async def get_available_commodities(
 
 
 @router.get("/disagg/analysis", response_model=DisaggCOTAnalysisResponse)
+@cot_cached
 async def get_disagg_cot_analysis(
     commodity: str = Query(description="Commodity name (e.g., GOLD, SILVER)"),
     weeks: int = Query(
@@ -696,25 +824,24 @@ async def get_disagg_cot_analysis(
     """
     try:
         # Query historical data using helper function (excludes micro/mini contracts)
-        reports = build_cot_query(db, commodity, weeks)
+        frame = build_cot_frame(
+            db, commodity, weeks, POSITION_DATA_COLUMNS + WEEKLY_CHANGE_COLUMNS
+        )
 
-        if not reports:
+        if not len(frame):
             raise HTTPException(
                 status_code=404, detail=f"No COT data found for {commodity}"
             )
 
-        # Reverse to chronological order
-        reports = list(reversed(reports))
+        # Net positions in chronological order
+        pm_nets = frame.net(PRODUCER_MERCHANT)[::-1].tolist()
+        sd_nets = frame.net(SWAP_DEALER)[::-1].tolist()
+        mm_nets = frame.net(MANAGED_MONEY)[::-1].tolist()
+        or_nets = frame.net(OTHER_REPORTABLES)[::-1].tolist()
+        nr_nets = frame.net(NON_REPORTABLES)[::-1].tolist()
 
-        current = reports[-1]
-        previous = reports[-2] if len(reports) > 1 else current
-
-        # Extract net positions for percentile calculation
-        pm_nets = [r.producer_merchant_net for r in reports]
-        sd_nets = [r.swap_dealer_net for r in reports]
-        mm_nets = [r.managed_money_net for r in reports]
-        or_nets = [r.other_reportables_net for r in reports]
-        nr_nets = [r.non_reportables_net for r in reports]
+        current = build_position_data(frame, 0)
+        previous = build_position_data(frame, 1) if len(frame) > 1 else current
 
         # Calculate percentiles
         pm_percentile = cot_service.calculate_percentile(
@@ -751,11 +878,8 @@ async def get_disagg_cot_analysis(
         )
 
         # Calculate 4-week changes
-        four_weeks_ago = reports[-5] if len(reports) >= 5 else reports[0]
-        mm_4wk_change = current.managed_money_net - four_weeks_ago.managed_money_net
-        pm_4wk_change = (
-            current.producer_merchant_net - four_weeks_ago.producer_merchant_net
-        )
+        mm_4wk_change = int(COTFrame.change_in(frame.net(MANAGED_MONEY), 4))
+        pm_4wk_change = int(COTFrame.change_in(frame.net(PRODUCER_MERCHANT), 4))
 
         # Calculate consecutive weeks in same direction
         def count_consecutive_direction(nets: List[int]) -> int:
@@ -795,94 +919,19 @@ async def get_disagg_cot_analysis(
             nr_percentile
         )
 
-        # Build current positions
-        current_positions = DisaggregatedPositionData(
-            report_date=to_date_str(current.Report_Date_as_YYYY_MM_DD),
-            market_name=current.Market_and_Exchange_Names,
-            commodity_name=current.Commodity_Name or current.COMMODITY_NAME_UPPER,
-            commodity_group=current.COMMODITY_GROUP_NAME,
-            open_interest=current.open_interest,
-            producer_merchant_long=current.get_int_value(
-                current.Prod_Merc_Positions_Long_All
-            ),
-            producer_merchant_short=current.get_int_value(
-                current.Prod_Merc_Positions_Short_All
-            ),
-            producer_merchant_net=current.producer_merchant_net,
-            producer_merchant_pct_long=current.Pct_of_OI_Prod_Merc_Long_All,
-            producer_merchant_pct_short=current.Pct_of_OI_Prod_Merc_Short_All,
-            swap_dealer_long=current.get_int_value(current.Swap_Positions_Long_All),
-            swap_dealer_short=current.get_int_value(current.Swap_Positions_Short_All),
-            swap_dealer_spread=current.get_int_value(current.Swap_Positions_Spread_All),
-            swap_dealer_net=current.swap_dealer_net,
-            swap_dealer_pct_long=current.Pct_of_OI_Swap_Long_All,
-            swap_dealer_pct_short=current.Pct_of_OI_Swap_Short_All,
-            managed_money_long=current.get_int_value(
-                current.M_Money_Positions_Long_All
-            ),
-            managed_money_short=current.get_int_value(
-                current.M_Money_Positions_Short_All
-            ),
-            managed_money_spread=current.get_int_value(
-                current.M_Money_Positions_Spread_All
-            ),
-            managed_money_net=current.managed_money_net,
-            managed_money_pct_long=current.Pct_of_OI_M_Money_Long_All,
-            managed_money_pct_short=current.Pct_of_OI_M_Money_Short_All,
-            other_reportables_long=current.get_int_value(
-                current.Other_Rept_Positions_Long_All
-            ),
-            other_reportables_short=current.get_int_value(
-                current.Other_Rept_Positions_Short_All
-            ),
-            other_reportables_spread=current.get_int_value(
-                current.Other_Rept_Positions_Spread_All
-            ),
-            other_reportables_net=current.other_reportables_net,
-            other_reportables_pct_long=current.Pct_of_OI_Other_Rept_Long_All,
-            other_reportables_pct_short=current.Pct_of_OI_Other_Rept_Short_All,
-            non_reportables_long=current.get_int_value(
-                current.NonRept_Positions_Long_All
-            ),
-            non_reportables_short=current.get_int_value(
-                current.NonRept_Positions_Short_All
-            ),
-            non_reportables_net=current.non_reportables_net,
-            non_reportables_pct_long=current.Pct_of_OI_NonRept_Long_All,
-            non_reportables_pct_short=current.Pct_of_OI_NonRept_Short_All,
-        )
-
         # Build weekly changes
         weekly_changes = WeeklyChange(
-            change_open_interest=current.get_int_value(
-                current.Change_in_Open_Interest_All
-            ),
-            change_prod_merc_long=current.get_int_value(
-                current.Change_in_Prod_Merc_Long_All
-            ),
-            change_prod_merc_short=current.get_int_value(
-                current.Change_in_Prod_Merc_Short_All
-            ),
-            change_swap_long=current.get_int_value(current.Change_in_Swap_Long_All),
-            change_swap_short=current.get_int_value(current.Change_in_Swap_Short_All),
-            change_m_money_long=current.get_int_value(
-                current.Change_in_M_Money_Long_All
-            ),
-            change_m_money_short=current.get_int_value(
-                current.Change_in_M_Money_Short_All
-            ),
-            change_other_rept_long=current.get_int_value(
-                current.Change_in_Other_Rept_Long_All
-            ),
-            change_other_rept_short=current.get_int_value(
-                current.Change_in_Other_Rept_Short_All
-            ),
-            change_nonrept_long=current.get_int_value(
-                current.Change_in_NonRept_Long_All
-            ),
-            change_nonrept_short=current.get_int_value(
-                current.Change_in_NonRept_Short_All
-            ),
+            change_open_interest=frame.value("Change_in_Open_Interest_All"),
+            change_prod_merc_long=frame.value("Change_in_Prod_Merc_Long_All"),
+            change_prod_merc_short=frame.value("Change_in_Prod_Merc_Short_All"),
+            change_swap_long=frame.value("Change_in_Swap_Long_All"),
+            change_swap_short=frame.value("Change_in_Swap_Short_All"),
+            change_m_money_long=frame.value("Change_in_M_Money_Long_All"),
+            change_m_money_short=frame.value("Change_in_M_Money_Short_All"),
+            change_other_rept_long=frame.value("Change_in_Other_Rept_Long_All"),
+            change_other_rept_short=frame.value("Change_in_Other_Rept_Short_All"),
+            change_nonrept_long=frame.value("Change_in_NonRept_Long_All"),
+            change_nonrept_short=frame.value("Change_in_NonRept_Short_All"),
             change_prod_merc_net=current.producer_merchant_net
             - previous.producer_merchant_net,
             change_swap_net=current.swap_dealer_net - previous.swap_dealer_net,
@@ -984,11 +1033,11 @@ async def get_disagg_cot_analysis(
 
         return DisaggCOTAnalysisResponse(
             commodity=commodity.upper(),
-            market_name=current.Market_and_Exchange_Names,
-            latest_report_date=to_date_str(current.Report_Date_as_YYYY_MM_DD),
-            data_as_of_date=to_date_str(current.Report_Date_as_YYYY_MM_DD),
-            weeks_analyzed=len(reports),
-            current_positions=current_positions,
+            market_name=current.market_name,
+            latest_report_date=current.report_date,
+            data_as_of_date=current.report_date,
+            weeks_analyzed=len(frame),
+            current_positions=current,
             weekly_changes=weekly_changes,
             producer_merchant_percentile=build_category_percentile(
                 "Producer/Merchant",
@@ -1047,6 +1096,7 @@ async def get_disagg_cot_analysis(
 
 
 @router.get("/disagg/historical", response_model=DisaggCOTHistoricalResponse)
+@cot_cached
 async def get_disagg_historical(
     commodity: str = Query(description="Commodity name"),
     weeks: int = Query(default=52, ge=1, le=260),
@@ -1059,75 +1109,23 @@ async def get_disagg_historical(
     """
     try:
         # Query historical data using helper function (excludes micro/mini contracts)
-        reports = build_cot_query(db, commodity, weeks)
+        frame = build_cot_frame(db, commodity, weeks, POSITION_DATA_COLUMNS)
 
-        if not reports:
+        if not len(frame):
             raise HTTPException(
                 status_code=404, detail=f"No COT data found for {commodity}"
             )
 
-        # Reverse to chronological order
-        reports = list(reversed(reports))
-
-        data_points = []
-        for r in reports:
-            data_points.append(
-                DisaggregatedPositionData(
-                    report_date=to_date_str(r.Report_Date_as_YYYY_MM_DD),
-                    market_name=r.Market_and_Exchange_Names,
-                    commodity_name=r.Commodity_Name or r.COMMODITY_NAME_UPPER,
-                    commodity_group=r.COMMODITY_GROUP_NAME,
-                    open_interest=r.open_interest,
-                    producer_merchant_long=r.get_int_value(
-                        r.Prod_Merc_Positions_Long_All
-                    ),
-                    producer_merchant_short=r.get_int_value(
-                        r.Prod_Merc_Positions_Short_All
-                    ),
-                    producer_merchant_net=r.producer_merchant_net,
-                    producer_merchant_pct_long=r.Pct_of_OI_Prod_Merc_Long_All,
-                    producer_merchant_pct_short=r.Pct_of_OI_Prod_Merc_Short_All,
-                    swap_dealer_long=r.get_int_value(r.Swap_Positions_Long_All),
-                    swap_dealer_short=r.get_int_value(r.Swap_Positions_Short_All),
-                    swap_dealer_spread=r.get_int_value(r.Swap_Positions_Spread_All),
-                    swap_dealer_net=r.swap_dealer_net,
-                    swap_dealer_pct_long=r.Pct_of_OI_Swap_Long_All,
-                    swap_dealer_pct_short=r.Pct_of_OI_Swap_Short_All,
-                    managed_money_long=r.get_int_value(r.M_Money_Positions_Long_All),
-                    managed_money_short=r.get_int_value(r.M_Money_Positions_Short_All),
-                    managed_money_spread=r.get_int_value(
-                        r.M_Money_Positions_Spread_All
-                    ),
-                    managed_money_net=r.managed_money_net,
-                    managed_money_pct_long=r.Pct_of_OI_M_Money_Long_All,
-                    managed_money_pct_short=r.Pct_of_OI_M_Money_Short_All,
-                    other_reportables_long=r.get_int_value(
-                        r.Other_Rept_Positions_Long_All
-                    ),
-                    other_reportables_short=r.get_int_value(
-                        r.Other_Rept_Positions_Short_All
-                    ),
-                    other_reportables_spread=r.get_int_value(
-                        r.Other_Rept_Positions_Spread_All
-                    ),
-                    other_reportables_net=r.other_reportables_net,
-                    other_reportables_pct_long=r.Pct_of_OI_Other_Rept_Long_All,
-                    other_reportables_pct_short=r.Pct_of_OI_Other_Rept_Short_All,
-                    non_reportables_long=r.get_int_value(r.NonRept_Positions_Long_All),
-                    non_reportables_short=r.get_int_value(
-                        r.NonRept_Positions_Short_All
-                    ),
-                    non_reportables_net=r.non_reportables_net,
-                    non_reportables_pct_long=r.Pct_of_OI_NonRept_Long_All,
-                    non_reportables_pct_short=r.Pct_of_OI_NonRept_Short_All,
-                )
-            )
+        # Chronological order
+        data_points = [
+            build_position_data(frame, i) for i in reversed(range(len(frame)))
+        ]
 
         return DisaggCOTHistoricalResponse(
             commodity=commodity.upper(),
-            market_name=reports[0].Market_and_Exchange_Names if reports else None,
-            start_date=data_points[0].report_date if data_points else "",
-            end_date=data_points[-1].report_date if data_points else "",
+            market_name=data_points[0].market_name,
+            start_date=data_points[0].report_date,
+            end_date=data_points[-1].report_date,
             data_points=data_points,
             total_weeks=len(data_points),
         )
@@ -1142,78 +1140,79 @@ async def get_disagg_historical(
 
 
 @router.get("/disagg/chart-data", response_model=COTChartDataResponse)
+@cot_cached
 async def get_chart_data(
     commodity: str = Query(description="Commodity name"),
     weeks: int = Query(default=52, ge=1, le=260),
+    max_points: Optional[int] = Query(
+        default=None, ge=20, le=520, description="Maximum weeks to return"
+    ),
+    downsample: str = Query(
+        default=LTTB, description="Downsampling method: lttb, minmax or m4"
+    ),
     db: Session = Depends(get_db),
 ):
     """
     Get chart-ready COT data for visualization
 
     Returns time series data formatted for charts (net positions and long/short).
+    With max_points, every series keeps the same weeks, chosen on the
+    managed money net position.
     """
     try:
+        if downsample not in DOWNSAMPLE_METHODS:
+            methods = ", ".join(DOWNSAMPLE_METHODS)
+            raise HTTPException(
+                status_code=400, detail=f"Unknown downsample method. Use {methods}"
+            )
+
         # Query historical data using helper function (excludes micro/mini contracts)
-        reports = build_cot_query(db, commodity, weeks)
+        frame = build_cot_frame(
+            db, commodity, weeks, NET_COLUMNS + ("Market_and_Exchange_Names",)
+        )
 
-        if not reports:
+        if not len(frame):
             raise HTTPException(
                 status_code=404, detail=f"No COT data found for {commodity}"
             )
 
-        # Reverse to chronological order
-        reports = list(reversed(reports))
+        # Chronological order, reduced to the downsampled weeks
+        keep = downsample_indices(
+            frame.net(MANAGED_MONEY)[::-1], max_points, downsample
+        )
+
+        def series(values) -> List[int]:
+            return values[::-1][keep].tolist()
 
-        # Build time series
-        dates = [to_date_str(r.Report_Date_as_YYYY_MM_DD) for r in reports]
+        dates = series(frame.dates)
 
         net_positions = NetPositionTimeSeries(
             dates=dates,
-            producer_merchant_net=[r.producer_merchant_net for r in reports],
-            swap_dealer_net=[r.swap_dealer_net for r in reports],
-            managed_money_net=[r.managed_money_net for r in reports],
-            other_reportables_net=[r.other_reportables_net for r in reports],
-            non_reportables_net=[r.non_reportables_net for r in reports],
-            open_interest=[r.open_interest for r in reports],
+            producer_merchant_net=series(frame.net(PRODUCER_MERCHANT)),
+            swap_dealer_net=series(frame.net(SWAP_DEALER)),
+            managed_money_net=series(frame.net(MANAGED_MONEY)),
+            other_reportables_net=series(frame.net(OTHER_REPORTABLES)),
+            non_reportables_net=series(frame.net(NON_REPORTABLES)),
+            open_interest=series(frame.open_interest),
         )
 
         long_short_positions = LongShortTimeSeries(
             dates=dates,
-            producer_merchant_long=[
-                r.get_int_value(r.Prod_Merc_Positions_Long_All) for r in reports
-            ],
-            producer_merchant_short=[
-                r.get_int_value(r.Prod_Merc_Positions_Short_All) for r in reports
-            ],
-            swap_dealer_long=[
-                r.get_int_value(r.Swap_Positions_Long_All) for r in reports
-            ],
-            swap_dealer_short=[
-                r.get_int_value(r.Swap_Positions_Short_All) for r in reports
-            ],
-            managed_money_long=[
-                r.get_int_value(r.M_Money_Positions_Long_All) for r in reports
-            ],
-            managed_money_short=[
-                r.get_int_value(r.M_Money_Positions_Short_All) for r in reports
-            ],
-            other_reportables_long=[
-                r.get_int_value(r.Other_Rept_Positions_Long_All) for r in reports
-            ],
-            other_reportables_short=[
-                r.get_int_value(r.Other_Rept_Positions_Short_All) for r in reports
-            ],
-            non_reportables_long=[
-                r.get_int_value(r.NonRept_Positions_Long_All) for r in reports
-            ],
-            non_reportables_short=[
-                r.get_int_value(r.NonRept_Positions_Short_All) for r in reports
-            ],
+            producer_merchant_long=series(frame.long(PRODUCER_MERCHANT)),
+            producer_merchant_short=series(frame.short(PRODUCER_MERCHANT)),
+            swap_dealer_long=series(frame.long(SWAP_DEALER)),
+            swap_dealer_short=series(frame.short(SWAP_DEALER)),
+            managed_money_long=series(frame.long(MANAGED_MONEY)),
+            managed_money_short=series(frame.short(MANAGED_MONEY)),
+            other_reportables_long=series(frame.long(OTHER_REPORTABLES)),
+            other_reportables_short=series(frame.short(OTHER_REPORTABLES)),
+            non_reportables_long=series(frame.long(NON_REPORTABLES)),
+            non_reportables_short=series(frame.short(NON_REPORTABLES)),
         )
 
         return COTChartDataResponse(
             commodity=commodity.upper(),
-            market_name=reports[0].Market_and_Exchange_Names if reports else None,
+            market_name=frame.value("Market_and_Exchange_Names", -1),
             net_positions=net_positions,
             long_short_positions=long_short_positions,
         )
@@ -1227,7 +1226,94 @@ async def get_chart_data(
         )
 
 
+@router.get("/disagg/percentile-chart", response_model=COTPercentileChartResponse)
+@cot_cached
+async def get_percentile_chart(
+    commodity: str = Query(description="Commodity name"),
+    weeks: int = Query(default=156, ge=1, le=520, description="Weeks to chart"),
+    window: int = Query(
+        default=52, ge=4, le=260, description="Lookback window for each point"
+    ),
+    max_points: Optional[int] = Query(
+        default=None, ge=20, le=520, description="Maximum weeks to return"
+    ),
+    downsample: str = Query(
+        default=LTTB, description="Downsampling method: lttb, minmax or m4"
+    ),
+    db: Session = Depends(get_db),
+):
+    """
+    Get rolling percentile and COT index series for every trader category
+
+    Each week's net position is ranked against the `window` reports up to
+    and including it, so the series show how extreme positioning was at
+    every point in time, not just the latest week. With max_points, every
+    series keeps the same weeks, chosen on the managed money COT index.
+    """
+    try:
+        if downsample not in DOWNSAMPLE_METHODS:
+            methods = ", ".join(DOWNSAMPLE_METHODS)
+            raise HTTPException(
+                status_code=400, detail=f"Unknown downsample method. Use {methods}"
+            )
+
+        # Extra history so the first charted week has a full window
+        frame = build_cot_frame(
+            db,
+            commodity,
+            weeks + window - 1,
+            NET_COLUMNS + ("Market_and_Exchange_Names",),
+        )
+
+        if not len(frame):
+            raise HTTPException(
+                status_code=404, detail=f"No COT data found for {commodity}"
+            )
+
+        points = min(weeks, len(frame))
+
+        ranks = {
+            category: frame.rolling_net_ranks(category, window)
+            for category in NET_CATEGORIES
+        }
+        keep = downsample_indices(
+            ranks[MANAGED_MONEY][1][:points][::-1], max_points, downsample
+        )
+
+        # Latest `points` weeks, chronological, rounded like calculate_cot_index
+        def series(values) -> List[float]:
+            return np.round(values[:points][::-1][keep], 2).tolist()
+
+        return COTPercentileChartResponse(
+            commodity=commodity.upper(),
+            market_name=frame.value("Market_and_Exchange_Names"),
+            window=window,
+            dates=frame.dates[:points][::-1][keep].tolist(),
+            net_percentile=CategoryRankSeries(
+                **{
+                    POSITION_FIELDS[category]: series(percentile)
+                    for category, (percentile, _) in ranks.items()
+                }
+            ),
+            cot_index=CategoryRankSeries(
+                **{
+                    POSITION_FIELDS[category]: series(cot_index)
+                    for category, (_, cot_index) in ranks.items()
+                }
+            ),
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching percentile chart: {e}")
+        raise HTTPException(
+            status_code=500, detail=f"Error fetching percentile chart: {str(e)}"
+        )
+
+
 @router.get("/disagg/extreme-alerts", response_model=List[ExtremePositioningAlert])
+@cot_cached
 async def get_extreme_alerts(
     commodity: str = Query(description="Commodity name"),
     weeks: int = Query(default=52, ge=4, le=260),
@@ -1240,46 +1326,27 @@ async def get_extreme_alerts(
     """
     try:
         # Query historical data using helper function (excludes micro/mini contracts)
-        reports = build_cot_query(db, commodity, weeks)
+        frame = build_cot_frame(db, commodity, weeks, NET_COLUMNS)
 
-        if not reports:
+        if not len(frame):
             raise HTTPException(
                 status_code=404, detail=f"No COT data found for {commodity}"
             )
 
-        reports = list(reversed(reports))
-        current = reports[-1]
-
         # Calculate nets and percentiles
         import statistics
 
-        categories = [
-            (
-                "Producer/Merchant",
-                [r.producer_merchant_net for r in reports],
-                current.producer_merchant_net,
-            ),
-            (
-                "Swap Dealer",
-                [r.swap_dealer_net for r in reports],
-                current.swap_dealer_net,
-            ),
-            (
-                "Managed Money",
-                [r.managed_money_net for r in reports],
-                current.managed_money_net,
-            ),
-            (
-                "Other Reportables",
-                [r.other_reportables_net for r in reports],
-                current.other_reportables_net,
-            ),
-            (
-                "Non-Reportables",
-                [r.non_reportables_net for r in reports],
-                current.non_reportables_net,
-            ),
-        ]
+        category_names = {
+            PRODUCER_MERCHANT: "Producer/Merchant",
+            SWAP_DEALER: "Swap Dealer",
+            MANAGED_MONEY: "Managed Money",
+            OTHER_REPORTABLES: "Other Reportables",
+            NON_REPORTABLES: "Non-Reportables",
+        }
+        categories = []
+        for category in NET_CATEGORIES:
+            nets = frame.net(category).tolist()
+            categories.append((category_names[category], nets, nets[0]))
 
         alerts = []
         for category_name, nets, current_net in categories:
@@ -1316,7 +1383,7 @@ async def get_extreme_alerts(
                 alerts.append(
                     ExtremePositioningAlert(
                         commodity=commodity.upper(),
-                        report_date=to_date_str(current.Report_Date_as_YYYY_MM_DD),
+                        report_date=frame.report_date(),
                         category=category_name,
                         net_position=current_net,
                         percentile=percentile,
@@ -1341,6 +1408,7 @@ async def get_extreme_alerts(
 
 
 @router.get("/disagg/trading-signal", response_model=COTTradingSignal)
+@cot_cached
 async def get_trading_signal(
     commodity: str = Query(description="Commodity name"),
     weeks: int = Query(default=52, ge=4, le=260),
@@ -1353,30 +1421,26 @@ async def get_trading_signal(
     """
     try:
         # Query historical data using helper function (excludes micro/mini contracts)
-        reports = build_cot_query(db, commodity, weeks)
+        frame = build_cot_frame(db, commodity, weeks, NET_COLUMNS)
 
-        if not reports:
+        if not len(frame):
             raise HTTPException(
                 status_code=404, detail=f"No COT data found for {commodity}"
             )
 
-        reports = list(reversed(reports))
-        current = reports[-1]
-
         # Calculate percentiles
-        mm_nets = [r.managed_money_net for r in reports]
-        pm_nets = [r.producer_merchant_net for r in reports]
+        mm_nets = frame.net(MANAGED_MONEY)
+        pm_nets = frame.net(PRODUCER_MERCHANT)
 
         mm_percentile = cot_service.calculate_percentile(
-            current.managed_money_net, mm_nets
+            int(mm_nets[0]), mm_nets.tolist()
         )
         pm_percentile = cot_service.calculate_percentile(
-            current.producer_merchant_net, pm_nets
+            int(pm_nets[0]), pm_nets.tolist()
         )
 
         # Calculate 4-week change
-        four_weeks_ago = reports[-5] if len(reports) >= 5 else reports[0]
-        mm_4wk_change = current.managed_money_net - four_weeks_ago.managed_money_net
+        mm_4wk_change = int(COTFrame.change_in(mm_nets, 4))
 
         # Determine signal type and generate signal
         signal_type = "neutral"
@@ -1491,6 +1555,7 @@ async def get_trading_signal(
 @router.get(
     "/disagg/advanced/flow-decomposition", response_model=FlowDecompositionResponse
 )
+@cot_cached
 async def get_flow_decomposition(
     commodity: str = Query(description="Commodity name (e.g., GOLD, SILVER)"),
     weeks: int = Query(
@@ -1522,6 +1587,7 @@ async def get_flow_decomposition(
 
 
 @router.get("/disagg/advanced/participation", response_model=ParticipationResponse)
+@cot_cached
 async def get_participation_metrics(
     commodity: str = Query(description="Commodity name (e.g., GOLD, SILVER)"),
     weeks: int = Query(
@@ -1551,6 +1617,7 @@ async def get_participation_metrics(
 
 
 @router.get("/disagg/advanced/concentration", response_model=ConcentrationResponse)
+@cot_cached
 async def get_concentration_metrics(
     commodity: str = Query(description="Commodity name (e.g., GOLD, SILVER)"),
     weeks: int = Query(
@@ -1580,6 +1647,7 @@ async def get_concentration_metrics(
 
 
 @router.get("/disagg/advanced/squeeze-risk", response_model=SqueezeRiskResponse)
+@cot_cached
 async def get_squeeze_risk(
     commodity: str = Query(description="Commodity name (e.g., GOLD, SILVER)"),
     weeks: int = Query(
@@ -1613,6 +1681,7 @@ async def get_squeeze_risk(
 
 
 @router.get("/disagg/advanced/summary", response_model=AdvancedCOTSummary)
+@cot_cached
 async def get_advanced_summary(
     commodity: str = Query(description="Commodity name (e.g., GOLD, SILVER)"),
     weeks: int = Query(
@@ -1641,12 +1710,42 @@ async def get_advanced_summary(
         )
 
 
+@router.get("/disagg/advanced/all", response_model=ComprehensiveAdvancedAnalysis)
+@cot_cached
+async def get_all_advanced_analytics(
+    commodity: str = Query(description="Commodity name (e.g., GOLD, SILVER)"),
+    weeks: int = Query(
+        default=52, ge=4, le=260, description="Historical weeks for comparison"
+    ),
+    db: Session = Depends(get_db),
+):
+    """
+    Get every advanced COT module for a commodity in one response.
+
+    Loads the commodity history once and shares it (and derived nets,
+    percentiles and flows) across summary, squeeze risk, concentration,
+    flow decomposition, participation, curve, spread, herding, volatility
+    and ML regime analyses. Modules lacking history are listed in
+    `unavailable`.
+    """
+    try:
+        return COTAdvancedService.analyze_all(db, commodity, weeks)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error generating advanced analytics: {e}")
+        raise HTTPException(
+            status_code=500, detail=f"Error generating advanced analytics: {str(e)}"
+        )
+
+
 # ============================================================================
 # Priority 2: Curve, Spread, and Herding Endpoints
 # ============================================================================
 
 
 @router.get("/disagg/advanced/curve-analysis", response_model=CurveAnalysisResponse)
+@cot_cached
 async def get_curve_analysis(
     commodity: str = Query(description="Commodity name (e.g., GOLD, SILVER)"),
     weeks: int = Query(
@@ -1681,6 +1780,7 @@ async def get_curve_analysis(
 
 
 @router.get("/disagg/advanced/spread-analysis", response_model=SpreadAnalysisResponse)
+@cot_cached
 async def get_spread_analysis(
     commodity: str = Query(description="Commodity name (e.g., GOLD, SILVER)"),
     weeks: int = Query(
@@ -1714,6 +1814,7 @@ async def get_spread_analysis(
 
 
 @router.get("/disagg/advanced/herding-analysis", response_model=HerdingAnalysisResponse)
+@cot_cached
 async def get_herding_analysis(
     commodity: str = Query(description="Commodity name (e.g., GOLD, SILVER)"),
     weeks: int = Query(
@@ -1755,6 +1856,7 @@ async def get_herding_analysis(
 @router.get(
     "/disagg/advanced/cross-market-pressure", response_model=CrossMarketPressureResponse
 )
+@cot_cached
 async def get_cross_market_pressure(
     weeks: int = Query(
         default=52, ge=4, le=260, description="Historical weeks for comparison"
@@ -1793,6 +1895,7 @@ async def get_cross_market_pressure(
 @router.get(
     "/disagg/advanced/volatility-regime", response_model=VolatilityAnalysisResponse
 )
+@cot_cached
 async def get_volatility_regime(
     commodity: str = Query(description="Commodity name (e.g., GOLD, SILVER)"),
     weeks: int = Query(
@@ -1824,6 +1927,7 @@ async def get_volatility_regime(
 
 
 @router.get("/disagg/advanced/ml-regime", response_model=MLRegimeAnalysisResponse)
+@cot_cached
 async def get_ml_regime_classification(
     commodity: str = Query(description="Commodity name (e.g., GOLD, SILVER)"),
     weeks: int = Query(
@@ -1859,3 +1963,232 @@ async def get_ml_regime_classification(
         raise HTTPException(
             status_code=500, detail=f"Error classifying regime: {str(e)}"
         )
+
+
+@router.get(
+    "/disagg/advanced/ml-regime/history", response_model=MLRegimeHistoryResponse
+)
+@cot_cached
+async def get_ml_regime_history(
+    commodity: str = Query(description="Commodity name (e.g., GOLD, SILVER)"),
+    weeks: int = Query(default=156, ge=8, le=520, description="Weeks to classify"),
+    window: int = Query(
+        default=REGIME_WINDOW,
+        ge=8,
+        le=260,
+        description="Lookback window for each week's percentiles",
+    ),
+    db: Session = Depends(get_db),
+):
+    """
+    Get the weekly ML regime classification history.
+
+    Every week is classified with the same rules as /disagg/advanced/ml-regime,
+    using only the reports up to that week. Returns the history oldest first
+    with regime transitions and the regime distribution, for regime charts
+    and backtests. Backfilled markets are read from storage.
+    """
+    try:
+        return COTRegimeHistoryService.get_history(db, commodity, weeks, window)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error in ML regime history: {e}")
+        raise HTTPException(
+            status_code=500, detail=f"Error fetching regime history: {str(e)}"
+        )
+
+
+# ============================================================================
+# COT Screener
+# ============================================================================
+
+
+def _parse_range_filters(filters: Iterable[str]) -> dict:
+    """Parse "field:min:max" filters (either bound may be empty)"""
+    ranges = {}
+    for spec in filters:
+        parts = spec.split(":")
+        if len(parts) != 3 or parts[0] not in RANGE_FIELDS:
+            raise ValueError(
+                f"Invalid filter '{spec}', expected field:min:max with field in "
+                f"{', '.join(RANGE_FIELDS)}"
+            )
+        field, low, high = parts
+        ranges[field] = (float(low) if low else None, float(high) if high else None)
+    return ranges
+
+
+@router.get("/screener", response_model=COTScreenerResponse)
+async def get_cot_screener(
+    min_mm_percentile: Optional[float] = Query(default=None, ge=0, le=100),
+    max_mm_percentile: Optional[float] = Query(default=None, ge=0, le=100),
+    min_commercial_percentile: Optional[float] = Query(default=None, ge=0, le=100),
+    max_commercial_percentile: Optional[float] = Query(default=None, ge=0, le=100),
+    min_mm_flow: Optional[float] = Query(
+        default=None, description="Minimum 4-week managed money flow (% of OI)"
+    ),
+    max_mm_flow: Optional[float] = Query(
+        default=None, description="Maximum 4-week managed money flow (% of OI)"
+    ),
+    min_squeeze_score: Optional[float] = Query(default=None, ge=0, le=100),
+    min_crowding_score: Optional[float] = Query(default=None, ge=0, le=100),
+    crowding_level: Optional[str] = Query(
+        default=None, description="low, moderate, high or extreme"
+    ),
+    ml_regime: Optional[str] = Query(default=None, description="e.g. mean_reversion"),
+    dominant_squeeze: Optional[str] = Query(
+        default=None, description="long_squeeze, short_squeeze or balanced"
+    ),
+    subgroup: Optional[str] = Query(default=None, description="e.g. PRECIOUS METALS"),
+    search: Optional[str] = Query(default=None, description="Search market names"),
+    filters: Optional[List[str]] = Query(
+        default=None,
+        description="Extra range filters as field:min:max, e.g. swap_percentile:80:",
+    ),
+    current_only: bool = Query(
+        default=True, description="Only markets reported on the latest report date"
+    ),
+    sort_by: str = Query(
+        default="mm_percentile", description=f"One of: {', '.join(SORT_FIELDS)}"
+    ),
+    order: str = Query(default="desc", pattern="^(asc|desc)$"),
+    page: int = Query(default=1, ge=1, description="Page number"),
+    page_size: int = Query(default=50, ge=1, le=500, description="Items per page"),
+    db: Session = Depends(get_db),
+):
+    """
+    Screen all markets on precomputed COT features.
+
+    Features of each market's latest report (52-week percentiles, 4-week
+    flows, concentration, squeeze scores, ML regime) are refreshed after each
+    report, so any screen is one query on a small table. Example: managed
+    money above the 90th percentile with negative 4-week flow:
+    `?min_mm_percentile=90&max_mm_flow=-0.01`
+    """
+    try:
+        ranges = _parse_range_filters(filters or [])
+        for field, low, high in (
+            ("mm_percentile", min_mm_percentile, max_mm_percentile),
+            (
+                "commercial_percentile",
+                min_commercial_percentile,
+                max_commercial_percentile,
+            ),
+            ("mm_flow_4w_pct_oi", min_mm_flow, max_mm_flow),
+            ("squeeze_risk_score", min_squeeze_score, None),
+            ("crowding_score", min_crowding_score, None),
+        ):
+            if low is not None or high is not None:
+                ranges[field] = (low, high)
+
+        query = COTScreenerService.screen(
+            db,
+            ranges=ranges,
+            crowding_level=crowding_level,
+            ml_regime=ml_regime,
+            dominant_squeeze=dominant_squeeze,
+            subgroup=subgroup,
+            search=search,
+            current_only=current_only,
+            sort_by=sort_by,
+            descending=order == "desc",
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        total = query.count()
+        total_pages = math.ceil(total / page_size) if total > 0 else 1
+        features = query.offset((page - 1) * page_size).limit(page_size).all()
+
+        return COTScreenerResponse(
+            report_date=COTScreenerService.latest_report_date(db),
+            items=[COTScreenerItem.model_validate(f) for f in features],
+            total=total,
+            page=page,
+            page_size=page_size,
+            total_pages=total_pages,
+        )
+    except Exception as e:
+        logger.error(f"Error running COT screener: {e}")
+        raise HTTPException(
+            status_code=500, detail=f"Error running COT screener: {str(e)}"
+        )
+
+
+# ============================================================================
+# COT Cache Warm-up
+# ============================================================================
+
+# Per-commodity endpoints precomputed after each report, with default parameters
+WARM_ENDPOINTS = [
+    get_disagg_cot_analysis,
+    get_chart_data,
+    get_percentile_chart,
+    get_trading_signal,
+    get_extreme_alerts,
+    get_all_advanced_analytics,
+    get_advanced_summary,
+    get_squeeze_risk,
+    get_concentration_metrics,
+    get_flow_decomposition,
+    get_participation_metrics,
+    get_curve_analysis,
+    get_spread_analysis,
+    get_herding_analysis,
+    get_volatility_regime,
+    get_ml_regime_classification,
+    get_ml_regime_history,
+]
+
+# Legacy (FMP) endpoints, warmed for commodities with an FMP symbol
+LEGACY_WARM_ENDPOINTS = [get_historical_cot, get_cot_changes, get_extreme_positioning]
+
+
+def _query_defaults(endpoint_func) -> dict:
+    """Default values of an endpoint's Query parameters"""
+    defaults = {}
+    for name, parameter in inspect.signature(endpoint_func).parameters.items():
+        default = getattr(parameter.default, "default", parameter.default)
+        if default is not inspect.Parameter.empty:
+            defaults[name] = default
+    return defaults
+
+
+async def warm_cot_cache(db: Session, commodities: Optional[List[str]] = None) -> dict:
+    """
+    Precompute cached COT responses for popular commodities.
+
+    Run after a new report is ingested so the first requests of the week
+    are cache reads.
+
+    Returns:
+        {"warmed": count, "failed": {"endpoint:commodity": error}}
+    """
+    commodities = commodities or POPULAR_COMMODITIES
+    warmed = 0
+    failed = {}
+
+    global_endpoints = [(get_available_commodities, {}), (get_cross_market_pressure, {})]
+    per_commodity = [
+        (endpoint, {"commodity": commodity})
+        for commodity in commodities
+        for endpoint in WARM_ENDPOINTS
+    ] + [
+        (endpoint, {"commodity": commodity})
+        for commodity in commodities
+        if cot_symbol_for(commodity)
+        for endpoint in LEGACY_WARM_ENDPOINTS
+    ]
+
+    for endpoint, params in global_endpoints + per_commodity:
+        kwargs = {**_query_defaults(endpoint), **params, "db": db}
+        try:
+            await endpoint(**kwargs)
+            warmed += 1
+        except HTTPException as e:
+            failed[f"{endpoint.__name__}:{params.get('commodity', '*')}"] = e.detail
+
+    logger.info(f"COT cache warm-up: {warmed} responses cached, {len(failed)} failed")
+    return {"warmed": warmed, "failed": failed}
@@ -72,6 +72,262 @@ async def trigger_arbitrage_cron(
         raise HTTPException(status_code=500, detail=f"Cron job failed: {str(e)}")
 
 
+@router.post("/cot")
+async def trigger_cot_cron(
+    x_cron_secret: str = Header(..., alias="X-Cron-Secret"),
+    symbols: str = "",
+    dry_run: bool = False,
+):
+    """
+    Trigger incremental COT report ingestion from FMP
+
+    - **X-Cron-Secret**: Required header for authentication (use SECRET_KEY or CRON_SECRET)
+    - **symbols**: Comma-separated FMP COT symbols (default: all tracked symbols)
+    - **dry_run**: If true, don't save to database
+
+    Fetches only reports newer than the latest stored date for each symbol,
+    stores them, and warms the COT cache when new reports arrived.
+    """
+    verify_cron_secret(x_cron_secret)
+
+    logger.info(f"Cron triggered: cot - symbols={symbols or 'all'}, dry_run={dry_run}")
+
+    # Import here to avoid circular imports
+    from database import get_db
+    from api.v1.endpoints.cot import cot_cache, warm_cot_cache
+    from scripts.cron.cot_ingest_cron import COTIngestion
+    from services.cot_cache_service import LEGACY
+    from services.cot_service import COT_SYMBOLS
+
+    symbol_list = [s.strip().upper() for s in symbols.split(",") if s.strip()]
+    symbol_list = symbol_list or list(COT_SYMBOLS.values())
+
+    try:
+        ingestion = COTIngestion(dry_run=dry_run)
+        success = await ingestion.run(symbol_list)
+
+        warmup = None
+        if ingestion.latest_report_date and not dry_run:
+            cot_cache.mark_new_report(ingestion.latest_report_date.isoformat(), LEGACY)
+            db = next(get_db())
+            try:
+                warmup = await warm_cot_cache(db)
+            finally:
+                db.close()
+
+        return {
+            "status": "success" if success else "partial_failure",
+            "timestamp": datetime.now().isoformat(),
+            "symbols": symbol_list,
+            "dry_run": dry_run,
+            "rows_written": ingestion.rows_written,
+            "latest_report_date": ingestion.latest_report_date,
+            "cache_warmup": warmup,
+            "message": "COT data ingestion completed",
+        }
+    except Exception as e:
+        logger.error(f"Cron job failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Cron job failed: {str(e)}")
+
+
+@router.post("/cot-cache")
+async def trigger_cot_cache_warmup(
+    x_cron_secret: str = Header(..., alias="X-Cron-Secret"),
+    commodities: str = "",
+    refresh_screener: bool = False,
+):
+    """
+    Refresh COT screener features and warm the COT response cache for the latest report
+
+    - **X-Cron-Secret**: Required header for authentication (use SECRET_KEY or CRON_SECRET)
+    - **commodities**: Comma-separated commodities (default: popular commodities)
+    - **refresh_screener**: Recompute screener features even if they are current
+
+    Run after a new COT report has been loaded so COT endpoints are served from cache.
+    Screener features and the latest weeks of the ML regime history are recomputed
+    when the report table has a newer report.
+    """
+    verify_cron_secret(x_cron_secret)
+
+    logger.info(f"Cron triggered: cot-cache - commodities={commodities or 'default'}")
+
+    # Import here to avoid circular imports
+    from database import get_db
+    from api.v1.endpoints.cot import warm_cot_cache
+    from services.cot_regime_history_service import (
+        REFRESH_WEEKS,
+        COTRegimeHistoryService,
+    )
+    from services.cot_screener_service import COTScreenerService
+
+    commodity_list = [c.strip().upper() for c in commodities.split(",") if c.strip()]
+    db = next(get_db())
+
+    try:
+        screener_markets = None
+        regime_weeks = None
+        if refresh_screener or COTScreenerService.is_stale(db):
+            screener_markets = COTScreenerService.refresh_features(db)
+            regime_weeks = COTRegimeHistoryService.backfill(db, REFRESH_WEEKS)
+            db.commit()
+
+        result = await warm_cot_cache(db, commodity_list or None)
+        return {
+            "status": "success" if not result["failed"] else "partial_failure",
+            "timestamp": datetime.now().isoformat(),
+            "screener_markets_refreshed": screener_markets,
+            "regime_weeks_classified": regime_weeks,
+            **result,
+            "message": "COT cache warm-up completed",
+        }
+    except Exception as e:
+        logger.error(f"Cron job failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Cron job failed: {str(e)}")
+    finally:
+        db.close()
+
+
+@router.post("/cot-regime-history")
+async def trigger_cot_regime_backfill(
+    x_cron_secret: str = Header(..., alias="X-Cron-Secret"),
+    weeks: int = 260,
+):
+    """
+    Backfill the weekly COT ML regime history of every market
+
+    - **X-Cron-Secret**: Required header for authentication (use SECRET_KEY or CRON_SECRET)
+    - **weeks**: Latest weeks to classify per market
+
+    Run once to load history; weekly updates are done by /cot-cache.
+    """
+    verify_cron_secret(x_cron_secret)
+
+    logger.info(f"Cron triggered: cot-regime-history - weeks={weeks}")
+
+    # Import here to avoid circular imports
+    from database import get_db
+    from services.cot_regime_history_service import COTRegimeHistoryService
+
+    db = next(get_db())
+
+    try:
+        written = COTRegimeHistoryService.backfill(db, weeks)
+        db.commit()
+        return {
+            "status": "success",
+            "timestamp": datetime.now().isoformat(),
+            "weeks": weeks,
+            "rows_written": written,
+            "message": "COT regime history backfill completed",
+        }
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Cron job failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Cron job failed: {str(e)}")
+    finally:
+        db.close()
+
+
+@router.post("/correlation-regimes")
+async def trigger_correlation_regimes(
+    x_cron_secret: str = Header(..., alias="X-Cron-Secret"),
+    full: bool = False,
+):
+    """
+    Recompute multi-window correlation regimes and structural breaks
+
+    - **X-Cron-Secret**: Required header for authentication (use SECRET_KEY or CRON_SECRET)
+    - **full**: Rewrite the full history (first run) instead of the latest days
+
+    Run nightly after the metals price ingestion.
+    """
+    verify_cron_secret(x_cron_secret)
+
+    logger.info(f"Cron triggered: correlation-regimes - full={full}")
+
+    # Import here to avoid circular imports
+    from database import get_db
+    from services.correlation_regime_service import CorrelationRegimeService
+
+    db = next(get_db())
+
+    try:
+        if full:
+            written = CorrelationRegimeService.refresh(db, days=None)
+        else:
+            written = CorrelationRegimeService.refresh(db)
+        db.commit()
+        return {
+            "status": "success",
+            "timestamp": datetime.now().isoformat(),
+            "full": full,
+            "rows_written": written,
+            "message": "Correlation regimes refreshed",
+        }
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Cron job failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Cron job failed: {str(e)}")
+    finally:
+        db.close()
+
+
+@router.post("/pivot-levels")
+async def trigger_pivot_levels(
+    x_cron_secret: str = Header(..., alias="X-Cron-Secret"),
+    exchange: str = "ALL",
+):
+    """
+    Store the daily/weekly/monthly pivot levels of the configured symbols
+
+    - **X-Cron-Secret**: Required header for authentication (use SECRET_KEY or CRON_SECRET)
+    - **exchange**: COMEX, MCX or ALL
+
+    Run right after each session close (COMEX and MCX).
+    """
+    verify_cron_secret(x_cron_secret)
+
+    logger.info(f"Cron triggered: pivot-levels - exchange={exchange}")
+
+    # Import here to avoid circular imports
+    from database import get_db
+    from services.pivot_level_service import (
+        EXCHANGES,
+        PivotLevelService,
+        get_pivot_level_store,
+    )
+
+    exchange = exchange.upper()
+    if exchange != "ALL" and exchange not in EXCHANGES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown exchange: {exchange}. Use COMEX, MCX or ALL",
+        )
+    exchanges = EXCHANGES if exchange == "ALL" else (exchange,)
+
+    db = next(get_db())
+
+    try:
+        written, errors = await PivotLevelService.refresh(db, exchanges)
+        db.commit()
+        # Serve the new session's levels from this process right away
+        get_pivot_level_store().load(db)
+        return {
+            "status": "partial_failure" if errors else "success",
+            "timestamp": datetime.now().isoformat(),
+            "exchanges": list(exchanges),
+            "rows_written": written,
+            "errors": errors,
+            "message": "Pivot levels refreshed",
+        }
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Cron job failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Cron job failed: {str(e)}")
+    finally:
+        db.close()
+
+
 @router.get("/health")
 async def cron_health_check():
     """
@@ -99,6 +355,7 @@ async def get_cron_status(
     # Import database utilities
     from database import get_db
     from sqlalchemy import text
+    from services.data_providers import get_scheduler_metrics
 
     db = next(get_db())
 
@@ -118,6 +375,20 @@ async def get_cron_status(
             for row in result
         }
 
+        result = db.execute(
+            text("""
+            SELECT symbol, MAX(report_date) as last_report
+            FROM tradeflix_tools.cot_report_legacy
+            GROUP BY symbol
+            ORDER BY symbol
+        """)
+        )
+
+        cot_status = {
+            row.symbol: row.last_report.isoformat() if row.last_report else None
+            for row in result
+        }
+
         return {
             "timestamp": datetime.now().isoformat(),
             "jobs": {
@@ -126,8 +397,26 @@ async def get_cron_status(
                     "endpoint": "/api/v1/cron/arbitrage",
                     "last_run": arbitrage_status,
                     "schedule": "6:00 PM IST (12:30 PM UTC) weekdays",
-                }
+                },
+                "cot": {
+                    "description": "Incremental COT Report Ingestion (FMP)",
+                    "endpoint": "/api/v1/cron/cot",
+                    "last_run": cot_status,
+                    "schedule": "Saturday 2:00 AM IST (Friday 8:30 PM UTC)",
+                },
+                "correlation_regimes": {
+                    "description": "Nightly Correlation Regime Precompute",
+                    "endpoint": "/api/v1/cron/correlation-regimes",
+                    "schedule": "Nightly, after the metals price ingestion",
+                },
+                "pivot_levels": {
+                    "description": "Session-Close Pivot Level Precompute",
+                    "endpoint": "/api/v1/cron/pivot-levels",
+                    "schedule": "After COMEX close (5:15 PM ET) and MCX close "
+                    "(11:55 PM IST) weekdays",
+                },
             },
+            "rate_limiters": get_scheduler_metrics(),
         }
     finally:
         db.close()
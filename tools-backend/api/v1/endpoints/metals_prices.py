@@ -5,9 +5,13 @@ API endpoints for metals spot prices and seasonal analysis
 from fastapi import APIRouter, Depends, Query, HTTPException
 from sqlalchemy.orm import Session
 from datetime import date
+from typing import Optional
 import logging
 
+import numpy as np
+
 from database import get_db
+from services.downsampling import LTTB, METHODS, downsample_indices
 from services.metals_price_service_vectorized import (
     MetalsPriceServiceVectorized as MetalsPriceService,
 )
@@ -39,6 +43,12 @@ async def get_prices(
     end_date: date = Query(..., description="End date (YYYY-MM-DD)"),
     metal: str = Query(default="GOLD", description="GOLD, SILVER, PLATINUM, PALLADIUM"),
     currency: str = Query(default="INR", description="USD or INR"),
+    max_points: Optional[int] = Query(
+        default=None, ge=50, le=5000, description="Maximum points to return"
+    ),
+    downsample: str = Query(
+        default=LTTB, description="Downsampling method: lttb, minmax or m4"
+    ),
     db: Session = Depends(get_db),
 ):
     """
@@ -48,6 +58,8 @@ async def get_prices(
     - **end_date**: End date
     - **metal**: Metal symbol (GOLD, SILVER, PLATINUM, PALLADIUM)
     - **currency**: Currency (USD or INR)
+    - **max_points**: Downsample the price series to this many points
+    - **downsample**: lttb (chart shape), minmax or m4 (keep every spike)
     """
     if end_date < start_date:
         raise HTTPException(status_code=400, detail="end_date must be after start_date")
@@ -55,10 +67,25 @@ async def get_prices(
     if (end_date - start_date).days > 365:
         raise HTTPException(status_code=400, detail="Date range cannot exceed 365 days")
 
+    if downsample not in METHODS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown downsample method. Use {', '.join(METHODS)}",
+        )
+
     prices = MetalsPriceService.get_price_range(
         db, start_date, end_date, metal, currency
     )
 
+    total_points = len(prices)
+    keep = downsample_indices(
+        np.array([row["price"] for row in prices], dtype=np.float64),
+        max_points,
+        downsample,
+    )
+    if len(keep) < total_points:
+        prices = [prices[i] for i in keep]
+
     return {
         "metal": metal,
         "currency": currency,
@@ -66,6 +93,8 @@ async def get_prices(
         "end_date": end_date.isoformat(),
         "prices": prices,
         "count": len(prices),
+        "total_points": total_points,
+        "downsampled": len(prices) < total_points,
     }
 
 
@@ -1,8 +1,12 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from datetime import date, timedelta
-from typing import Optional
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
 import logging
 
+import numpy as np
+from sqlalchemy.orm import Session
+
 from schemas.pivot import (
     PivotCalculationRequest,
     PivotCalculationResponse,
@@ -11,119 +15,47 @@ from schemas.pivot import (
     FibonacciLevels,
 )
 from services.pivot_service import PivotService
+from services.pivot_level_service import (
+    YAHOO_SYMBOLS,
+    fetch_daily_bars,
+    get_pivot_level_store,
+    period_ohlc,
+)
 from services.data_providers import (
     YahooFinanceProvider,
     DhanHQProvider,
     ProviderError,
-    DataNotAvailableError,
 )
 from config import settings
+from database import get_db
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 pivot_service = PivotService()
 
-# Symbol mappings
-YAHOO_SYMBOLS = {
-    "GOLD": "GC=F",
-    "SILVER": "SI=F",
-    "CRUDE": "CL=F",
-    "COPPER": "HG=F",
-    "NATURALGAS": "NG=F",
-}
+# Longest accuracy backtest (about 20 years of trading days)
+MAX_HISTORY_DAYS = 7300
 
+# Most symbols per multi-timeframe batch request
+MAX_BATCH_SYMBOLS = 20
 
-async def fetch_previous_ohlc(symbol: str, timeframe: str, exchange: str = "COMEX"):
-    """Fetch previous period OHLC data for pivot calculation"""
-    if exchange.upper() == "COMEX":
-        yahoo = YahooFinanceProvider()
-        yahoo_symbol = YAHOO_SYMBOLS.get(symbol.upper(), f"{symbol}=F")
-
-        # Determine date range based on timeframe
-        today = date.today()
-        if timeframe == "daily":
-            # Get recent data (include today in case market is open)
-            start_date = today - timedelta(days=10)  # Buffer for weekends/holidays
-            end_date = today
-        elif timeframe == "weekly":
-            # Get last 2 weeks of data
-            start_date = today - timedelta(days=20)
-            end_date = today
-        else:  # monthly
-            start_date = today - timedelta(days=60)
-            end_date = today
-
-        try:
-            logger.info(
-                f"Fetching OHLC for {yahoo_symbol} from {start_date} to {end_date}"
-            )
-            history = await yahoo.get_historical_data(
-                yahoo_symbol, start_date, end_date, "1d", "USD"
-            )
-
-            if not history.data_points:
-                logger.error(f"No data points returned for {yahoo_symbol}")
-                raise ValueError(f"No data available for {symbol}")
-
-            if timeframe == "daily":
-                # Use last trading day
-                dp = history.data_points[-1]
-                return {
-                    "high": float(dp.high),
-                    "low": float(dp.low),
-                    "close": float(dp.close),
-                    "date": dp.date,
-                }
-            elif timeframe == "weekly":
-                # Aggregate last 5 trading days
-                recent = history.data_points[-5:]
-                return {
-                    "high": max(float(dp.high) for dp in recent),
-                    "low": min(float(dp.low) for dp in recent),
-                    "close": float(recent[-1].close),
-                    "date": recent[-1].date,
-                }
-            else:  # monthly
-                # Aggregate last ~22 trading days
-                recent = history.data_points[-22:]
-                return {
-                    "high": max(float(dp.high) for dp in recent),
-                    "low": min(float(dp.low) for dp in recent),
-                    "close": float(recent[-1].close),
-                    "date": recent[-1].date,
-                }
 
-        except DataNotAvailableError as e:
-            logger.error(f"DataNotAvailableError for {symbol}: {e}")
-            raise ValueError(f"No data available for {symbol}: {e}")
-        except ProviderError as e:
-            logger.error(f"ProviderError fetching data for {symbol}: {e}")
-            raise ValueError(f"Could not fetch data for {symbol}: {e}")
-        except Exception as e:
-            logger.error(f"Unexpected error fetching data for {symbol}: {e}")
-            raise ValueError(f"Could not fetch data for {symbol}: {e}")
-
-    elif exchange.upper() == "MCX":
-        if not settings.dhan_client_id or not settings.dhan_access_token:
-            raise ValueError("MCX data provider not configured")
-
-        dhan = DhanHQProvider(settings.dhan_client_id, settings.dhan_access_token)
-
-        try:
-            ohlc = await dhan.get_ohlc(
-                symbol.upper(), date.today() - timedelta(days=1), "INR"
-            )
-            return {
-                "high": float(ohlc.high),
-                "low": float(ohlc.low),
-                "close": float(ohlc.close),
-                "date": ohlc.date,
-            }
-        except ProviderError as e:
-            raise ValueError(f"Could not fetch MCX data for {symbol}: {e}")
+async def previous_periods(
+    symbol: str, exchange: str, db: Session
+) -> Tuple[Dict[str, Dict[str, Any]], str]:
+    """
+    Previous-period OHLC of every timeframe
 
-    raise ValueError(f"Unknown exchange: {exchange}")
+    Returns:
+        (periods, source): stored session-close pivots when available
+        ("stored"), otherwise a live fetch ("live")
+    """
+    store = get_pivot_level_store()
+    periods = store.periods(symbol, exchange) if store.ensure_loaded(db) else None
+    if periods is not None:
+        return periods, "stored"
+    return period_ohlc(await fetch_daily_bars(symbol, exchange)), "live"
 
 
 @router.post("/calculate", response_model=PivotCalculationResponse)
@@ -195,6 +127,7 @@ async def get_auto_pivots(
     symbol: str = Query(description="Symbol (GOLD, SILVER, CRUDE, etc.)"),
     timeframe: str = Query(default="daily", description="daily, weekly, or monthly"),
     exchange: str = Query(default="COMEX", description="COMEX or MCX"),
+    db: Session = Depends(get_db),
 ):
     """
     Automatically fetch previous period OHLC and calculate pivot levels.
@@ -203,11 +136,13 @@ async def get_auto_pivots(
     - **timeframe**: daily, weekly, or monthly
     - **exchange**: COMEX or MCX
 
-    Returns pivot levels calculated from real market data.
+    Returns pivot levels calculated from real market data, read from the
+    session-close store when available (source "stored" or "live").
     """
     try:
-        # Fetch previous period OHLC
-        ohlc_data = await fetch_previous_ohlc(symbol, timeframe.lower(), exchange)
+        # Previous period OHLC (unknown timeframes use the monthly period)
+        periods, source = await previous_periods(symbol, exchange, db)
+        ohlc_data = periods.get(timeframe.lower(), periods["monthly"])
 
         high = ohlc_data["high"]
         low = ohlc_data["low"]
@@ -243,9 +178,17 @@ async def get_auto_pivots(
             "S2": floor_data["s2"],
             "S3": floor_data["s3"],
         }
-        nearest_name, nearest_value, distance = pivot_service.find_nearest_level(
-            current_price, all_levels
-        )
+        if "level_values" in ohlc_data:
+            # Stored levels are already sorted: binary search only
+            nearest_name, nearest_value, distance = (
+                pivot_service.nearest_sorted_level(
+                    ohlc_data["level_names"], ohlc_data["level_values"], current_price
+                )
+            )
+        else:
+            nearest_name, nearest_value, distance = pivot_service.find_nearest_level(
+                current_price, all_levels
+            )
 
         return {
             "symbol": symbol.upper(),
@@ -265,6 +208,7 @@ async def get_auto_pivots(
             },
             "market_bias": pivot_service.get_level_bias(current_price, cpr_data),
             "data_source": "YahooFinance" if exchange.upper() == "COMEX" else "DhanHQ",
+            "source": source,
         }
 
     except ValueError as e:
@@ -276,10 +220,97 @@ async def get_auto_pivots(
         )
 
 
+async def multi_timeframe_pivots(
+    symbol: str, exchange: str, db: Session
+) -> Dict[str, Any]:
+    """
+    Pivots of every timeframe and their confluence zones.
+
+    Uses the stored session-close periods, or one daily fetch for symbols
+    not stored yet.
+
+    Raises:
+        ValueError: Data could not be fetched
+    """
+    store = get_pivot_level_store()
+    periods = store.periods(symbol, exchange) if store.ensure_loaded(db) else None
+    price = YahooFinanceProvider().get_price(
+        YAHOO_SYMBOLS.get(symbol.upper(), f"{symbol}=F"), "USD"
+    )
+
+    if periods is None:
+        bars, current_price_data = await asyncio.gather(
+            fetch_daily_bars(symbol, exchange), price
+        )
+        periods, source = period_ohlc(bars), "live"
+    else:
+        current_price_data, source = await price, "stored"
+    current_price = float(current_price_data.price)
+
+    results = {}
+    for timeframe, period in periods.items():
+        high, low, close = period["high"], period["low"], period["close"]
+        results[timeframe] = {
+            "ohlc": {"high": high, "low": low, "close": close},
+            "ohlc_date": period["date"].isoformat(),
+            "cpr": pivot_service.calculate_cpr(high, low, close),
+            "floor_pivots": pivot_service.calculate_floor_pivots(high, low, close),
+            "fibonacci": pivot_service.calculate_fibonacci(high, low, direction="up"),
+        }
+
+    # Confluence zones: levels of different timeframes within 0.3% of each other
+    confluence_zones = PivotService.find_confluence_zones(
+        PivotService.timeframe_levels(periods)
+    )
+
+    # Find nearest confluence zone
+    nearest_confluence = None
+    if confluence_zones:
+        nearest_confluence = dict(
+            min(confluence_zones, key=lambda z: abs(z["value"] - current_price))
+        )
+        nearest_confluence["distance"] = round(
+            abs(nearest_confluence["value"] - current_price), 2
+        )
+        nearest_confluence["distance_percent"] = round(
+            (abs(nearest_confluence["value"] - current_price) / current_price) * 100,
+            3,
+        )
+
+    return {
+        "symbol": symbol.upper(),
+        "exchange": exchange.upper(),
+        "current_price": current_price,
+        "timeframes": results,
+        "confluence_zones": [
+            {
+                "value": z["value"],
+                "strength": z["strength"],
+                "levels": [
+                    {
+                        "name": lvl["name"],
+                        "value": lvl["value"],
+                        "timeframe": lvl["timeframe"],
+                    }
+                    for lvl in z["levels"]
+                ],
+                "description": z["description"],
+            }
+            for z in confluence_zones[:10]  # Top 10 confluence zones
+        ],
+        "nearest_confluence": nearest_confluence,
+        "market_bias": pivot_service.get_level_bias(
+            current_price, results["daily"]["cpr"]
+        ),
+        "source": source,
+    }
+
+
 @router.get("/multi-timeframe")
 async def get_multi_timeframe_pivots(
     symbol: str = Query(description="Symbol (GOLD, SILVER, CRUDE, etc.)"),
     exchange: str = Query(default="COMEX", description="COMEX or MCX"),
+    db: Session = Depends(get_db),
 ):
     """
     Get pivot levels for all timeframes (daily, weekly, monthly) with confluence detection.
@@ -288,190 +319,7 @@ async def get_multi_timeframe_pivots(
     multiple timeframe levels align.
     """
     try:
-        results = {}
-        all_levels = []
-
-        # Fetch pivots for each timeframe
-        for timeframe in ["daily", "weekly", "monthly"]:
-            ohlc_data = await fetch_previous_ohlc(symbol, timeframe, exchange)
-
-            high = ohlc_data["high"]
-            low = ohlc_data["low"]
-            close = ohlc_data["close"]
-
-            cpr_data = pivot_service.calculate_cpr(high, low, close)
-            floor_data = pivot_service.calculate_floor_pivots(high, low, close)
-            fib_data = pivot_service.calculate_fibonacci(high, low, direction="up")
-
-            results[timeframe] = {
-                "ohlc": {"high": high, "low": low, "close": close},
-                "ohlc_date": ohlc_data["date"].isoformat(),
-                "cpr": cpr_data,
-                "floor_pivots": floor_data,
-                "fibonacci": fib_data,
-            }
-
-            # Collect all levels for confluence detection
-            tf_prefix = timeframe[0].upper()  # D, W, M
-            all_levels.extend(
-                [
-                    {
-                        "name": f"{tf_prefix}_CPR_TC",
-                        "value": cpr_data["tc"],
-                        "timeframe": timeframe,
-                        "type": "cpr",
-                    },
-                    {
-                        "name": f"{tf_prefix}_CPR_Pivot",
-                        "value": cpr_data["pivot"],
-                        "timeframe": timeframe,
-                        "type": "cpr",
-                    },
-                    {
-                        "name": f"{tf_prefix}_CPR_BC",
-                        "value": cpr_data["bc"],
-                        "timeframe": timeframe,
-                        "type": "cpr",
-                    },
-                    {
-                        "name": f"{tf_prefix}_R3",
-                        "value": floor_data["r3"],
-                        "timeframe": timeframe,
-                        "type": "resistance",
-                    },
-                    {
-                        "name": f"{tf_prefix}_R2",
-                        "value": floor_data["r2"],
-                        "timeframe": timeframe,
-                        "type": "resistance",
-                    },
-                    {
-                        "name": f"{tf_prefix}_R1",
-                        "value": floor_data["r1"],
-                        "timeframe": timeframe,
-                        "type": "resistance",
-                    },
-                    {
-                        "name": f"{tf_prefix}_S1",
-                        "value": floor_data["s1"],
-                        "timeframe": timeframe,
-                        "type": "support",
-                    },
-                    {
-                        "name": f"{tf_prefix}_S2",
-                        "value": floor_data["s2"],
-                        "timeframe": timeframe,
-                        "type": "support",
-                    },
-                    {
-                        "name": f"{tf_prefix}_S3",
-                        "value": floor_data["s3"],
-                        "timeframe": timeframe,
-                        "type": "support",
-                    },
-                    {
-                        "name": f"{tf_prefix}_Fib_618",
-                        "value": fib_data["level_618"],
-                        "timeframe": timeframe,
-                        "type": "fibonacci",
-                    },
-                ]
-            )
-
-        # Detect confluence zones (levels within 0.3% of each other from different timeframes)
-        confluence_zones = []
-        confluence_threshold = 0.003  # 0.3%
-
-        for i, level1 in enumerate(all_levels):
-            for level2 in all_levels[i + 1 :]:
-                if level1["timeframe"] != level2["timeframe"]:
-                    avg_value = (level1["value"] + level2["value"]) / 2
-                    diff_pct = abs(level1["value"] - level2["value"]) / avg_value
-
-                    if diff_pct <= confluence_threshold:
-                        # Check if this confluence zone already exists
-                        zone_exists = False
-                        for zone in confluence_zones:
-                            if (
-                                abs(zone["value"] - avg_value) / avg_value
-                                <= confluence_threshold
-                            ):
-                                # Add to existing zone
-                                if level1["name"] not in [
-                                    lvl["name"] for lvl in zone["levels"]
-                                ]:
-                                    zone["levels"].append(level1)
-                                if level2["name"] not in [
-                                    lvl["name"] for lvl in zone["levels"]
-                                ]:
-                                    zone["levels"].append(level2)
-                                zone["value"] = sum(
-                                    lvl["value"] for lvl in zone["levels"]
-                                ) / len(zone["levels"])
-                                zone["strength"] = len(zone["levels"])
-                                zone_exists = True
-                                break
-
-                        if not zone_exists:
-                            confluence_zones.append(
-                                {
-                                    "value": round(avg_value, 2),
-                                    "levels": [level1, level2],
-                                    "strength": 2,
-                                    "description": f"{level1['name']} ≈ {level2['name']}",
-                                }
-                            )
-
-        # Sort confluence zones by strength (number of aligned levels)
-        confluence_zones.sort(key=lambda x: x["strength"], reverse=True)
-
-        # Get current price
-        yahoo = YahooFinanceProvider()
-        yahoo_symbol = YAHOO_SYMBOLS.get(symbol.upper(), f"{symbol}=F")
-        current_price_data = await yahoo.get_price(yahoo_symbol, "USD")
-        current_price = float(current_price_data.price)
-
-        # Find nearest confluence zone
-        nearest_confluence = None
-        if confluence_zones:
-            nearest_confluence = min(
-                confluence_zones, key=lambda z: abs(z["value"] - current_price)
-            )
-            nearest_confluence["distance"] = round(
-                abs(nearest_confluence["value"] - current_price), 2
-            )
-            nearest_confluence["distance_percent"] = round(
-                (abs(nearest_confluence["value"] - current_price) / current_price)
-                * 100,
-                3,
-            )
-
-        return {
-            "symbol": symbol.upper(),
-            "exchange": exchange.upper(),
-            "current_price": current_price,
-            "timeframes": results,
-            "confluence_zones": [
-                {
-                    "value": round(z["value"], 2),
-                    "strength": z["strength"],
-                    "levels": [
-                        {
-                            "name": lvl["name"],
-                            "value": lvl["value"],
-                            "timeframe": lvl["timeframe"],
-                        }
-                        for lvl in z["levels"]
-                    ],
-                    "description": " + ".join([lvl["name"] for lvl in z["levels"]]),
-                }
-                for z in confluence_zones[:10]  # Top 10 confluence zones
-            ],
-            "nearest_confluence": nearest_confluence,
-            "market_bias": pivot_service.get_level_bias(
-                current_price, results["daily"]["cpr"]
-            ),
-        }
+        return await multi_timeframe_pivots(symbol, exchange, db)
 
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -482,6 +330,49 @@ async def get_multi_timeframe_pivots(
         )
 
 
+@router.get("/multi-timeframe/batch")
+async def get_multi_timeframe_pivots_batch(
+    symbols: str = Query(description="Comma-separated symbols (GOLD,SILVER,...)"),
+    exchange: str = Query(default="COMEX", description="COMEX or MCX"),
+    db: Session = Depends(get_db),
+):
+    """
+    Multi-timeframe pivots and confluence zones of several symbols at once.
+
+    Symbols are fetched concurrently. A symbol that fails is reported under
+    errors instead of failing the whole batch.
+    """
+    names = list(
+        dict.fromkeys(
+            item.strip().upper() for item in symbols.split(",") if item.strip()
+        )
+    )
+    if not names:
+        raise HTTPException(status_code=400, detail="At least one symbol required")
+    if len(names) > MAX_BATCH_SYMBOLS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {MAX_BATCH_SYMBOLS} symbols per batch",
+        )
+
+    outcomes = await asyncio.gather(
+        *(multi_timeframe_pivots(name, exchange, db) for name in names),
+        return_exceptions=True,
+    )
+
+    results, errors = {}, {}
+    for name, outcome in zip(names, outcomes):
+        if isinstance(outcome, Exception):
+            logger.error(
+                f"Error calculating multi-timeframe pivots for {name}: {outcome}"
+            )
+            errors[name] = str(outcome)
+        else:
+            results[name] = outcome
+
+    return {"exchange": exchange.upper(), "results": results, "errors": errors}
+
+
 @router.get("/history")
 async def get_pivot_history(
     symbol: str,
@@ -489,6 +380,9 @@ async def get_pivot_history(
     days: int = 30,
     exchange: str = Query("MCX", description="Exchange: MCX or COMEX"),
     tolerance: float = Query(0.3, description="Tolerance percentage for level testing"),
+    tolerances: Optional[List[float]] = Query(
+        None, description="Additional tolerance percentages backtested in the same pass"
+    ),
 ):
     """
     Get historical pivot levels and their accuracy statistics
@@ -498,15 +392,16 @@ async def get_pivot_history(
 
     - **symbol**: Trading symbol (GOLD, SILVER, CRUDE, COPPER, etc.)
     - **timeframe**: daily, weekly, or monthly
-    - **days**: Number of days of history to analyze (max 365)
+    - **days**: Number of days of history to analyze (max 20 years)
     - **exchange**: MCX (India) or COMEX (International)
     - **tolerance**: Percentage tolerance for level testing (default 0.3%)
+    - **tolerances**: Extra tolerances, reported under tolerance_results
 
     Returns historical pivot data with real accuracy metrics.
     """
     symbol = symbol.upper()
     timeframe = timeframe.lower()
-    days = min(days, 365)  # Cap at 1 year
+    days = min(days, MAX_HISTORY_DAYS)
 
     try:
         # Fetch historical data
@@ -515,8 +410,6 @@ async def get_pivot_history(
         start_date = today - timedelta(days=int(days * 1.5))
         end_date = today
 
-        historical_data = []
-
         if exchange.upper() == "MCX":
             # Use DhanHQ for MCX data
             if not settings.dhan_client_id or not settings.dhan_access_token:
@@ -530,21 +423,12 @@ async def get_pivot_history(
                 access_token=settings.dhan_access_token,
             )
 
-            result = await dhan.get_historical_data(
+            # Columnar bars, no per-day objects
+            frame = await dhan.get_historical_frame(
                 symbol=symbol, start_date=start_date, end_date=end_date, interval="1d"
             )
-
-            # Convert to list of dicts for accuracy calculation
-            for dp in result.data_points:
-                historical_data.append(
-                    {
-                        "date": dp.date,
-                        "open": float(dp.open),
-                        "high": float(dp.high),
-                        "low": float(dp.low),
-                        "close": float(dp.close),
-                    }
-                )
+            order = np.argsort(frame.timestamps, kind="stable")
+            high, low, close = frame.high[order], frame.low[order], frame.close[order]
         else:
             # Use Yahoo Finance for COMEX data
             yahoo = YahooFinanceProvider()
@@ -557,35 +441,28 @@ async def get_pivot_history(
                 interval="1d",
             )
 
-            # Convert to list of dicts
-            for dp in result.data_points:
-                historical_data.append(
-                    {
-                        "date": dp.date,
-                        "open": float(dp.open),
-                        "high": float(dp.high),
-                        "low": float(dp.low),
-                        "close": float(dp.close),
-                    }
-                )
-
-        # Ensure data is sorted by date ascending
-        historical_data.sort(key=lambda x: x["date"])
+            # Ensure data is sorted by date ascending
+            points = sorted(result.data_points, key=lambda dp: dp.date)
+            ohlc = np.array(
+                [[dp.high, dp.low, dp.close] for dp in points], dtype=np.float64
+            ).reshape(-1, 3)
+            high, low, close = ohlc[:, 0], ohlc[:, 1], ohlc[:, 2]
 
         # Limit to requested number of days
-        if len(historical_data) > days + 1:
-            historical_data = historical_data[-(days + 1) :]
+        high, low, close = high[-(days + 1) :], low[-(days + 1) :], close[-(days + 1) :]
 
-        if len(historical_data) < 2:
+        if len(close) < 2:
             raise HTTPException(
                 status_code=404,
                 detail=f"Insufficient historical data for {symbol}. Need at least 2 days.",
             )
 
-        # Calculate real accuracy statistics
-        accuracy_result = PivotService.calculate_pivot_accuracy(
-            historical_data=historical_data, tolerance_percent=tolerance
+        # Calculate real accuracy statistics for every tolerance in one pass
+        all_tolerances = list(dict.fromkeys([tolerance, *(tolerances or [])]))
+        results = PivotService.backtest_pivot_accuracy(
+            high, low, close, all_tolerances
         )
+        accuracy_result = results[tolerance]
 
         if "error" in accuracy_result:
             raise HTTPException(status_code=400, detail=accuracy_result["error"])
@@ -595,11 +472,19 @@ async def get_pivot_history(
             "symbol": symbol,
             "timeframe": timeframe,
             "exchange": exchange.upper(),
-            "period_analyzed": f"Last {len(historical_data) - 1} trading days",
+            "period_analyzed": f"Last {len(close) - 1} trading days",
             "total_sessions": accuracy_result["total_sessions_analyzed"],
             "level_accuracy": accuracy_result["level_accuracy"],
             "cpr_statistics": accuracy_result["cpr_statistics"],
             "best_performing_levels": accuracy_result["best_performing_levels"],
+            "tolerance_results": [
+                {
+                    "tolerance": value,
+                    "level_accuracy": results[value]["level_accuracy"],
+                    "best_performing_levels": results[value]["best_performing_levels"],
+                }
+                for value in all_tolerances
+            ],
             "notes": f"Accuracy calculated with {tolerance}% tolerance. A level is 'respected' if price reverses after testing it.",
             "data_source": "DhanHQ" if exchange.upper() == "MCX" else "Yahoo Finance",
         }
@@ -631,6 +516,8 @@ async def find_nearest_level(
     high: Optional[float] = None,
     low: Optional[float] = None,
     close: Optional[float] = None,
+    exchange: str = "COMEX",
+    db: Session = Depends(get_db),
 ):
     """
     Find the nearest pivot level to current price
@@ -638,12 +525,33 @@ async def find_nearest_level(
     - **symbol**: Trading symbol
     - **current_price**: Current market price
     - **timeframe**: daily, weekly, or monthly
-    - **high, low, close**: Previous period OHLC (required for calculation)
+    - **high, low, close**: Previous period OHLC; omit all three to use the
+      session-close levels of the symbol (stored, or fetched live)
+    - **exchange**: COMEX or MCX (when high, low and close are omitted)
 
     Returns the nearest level and distance from current price.
     """
     try:
-        if not all([high, low, close]):
+        timeframe = timeframe.lower()
+        store = get_pivot_level_store()
+        source = "request"
+
+        if high is None and low is None and close is None:
+            try:
+                periods, source = await previous_periods(symbol, exchange, db)
+            except ValueError as e:
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"No pivot levels for {exchange.upper()}:"
+                    f"{symbol.upper()} ({e}); pass high, low and close",
+                )
+            if timeframe not in periods:
+                raise HTTPException(
+                    status_code=400, detail=f"Unknown timeframe: {timeframe}"
+                )
+            period = periods[timeframe]
+            high, low, close = period["high"], period["low"], period["close"]
+        elif not all([high, low, close]):
             raise HTTPException(
                 status_code=400, detail="high, low, and close parameters are required"
             )
@@ -666,17 +574,20 @@ async def find_nearest_level(
             "S3": floor_data["s3"],
         }
 
-        # Find nearest level
-        nearest_name, nearest_value, distance = pivot_service.find_nearest_level(
-            current_price, all_levels
-        )
+        # Find nearest level: binary search over the stored sorted levels
+        nearest = None
+        if source == "stored":
+            nearest = store.nearest_level(symbol, exchange, timeframe, current_price)
+        if nearest is None:
+            nearest = pivot_service.find_nearest_level(current_price, all_levels)
+        nearest_name, nearest_value, distance = nearest
 
         # Determine market bias
         bias = pivot_service.get_level_bias(current_price, cpr_data)
 
         return {
             "symbol": symbol.upper(),
-            "timeframe": timeframe.lower(),
+            "timeframe": timeframe,
             "current_price": current_price,
             "nearest_level": {
                 "name": nearest_name,
@@ -686,6 +597,7 @@ async def find_nearest_level(
             },
             "market_bias": bias,
             "all_levels": all_levels,
+            "source": source,
         }
 
     except HTTPException:
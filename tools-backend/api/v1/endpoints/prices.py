@@ -1,5 +1,8 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
 from datetime import date, timedelta
+import asyncio
+import json
 import logging
 
 from services.data_providers import (
@@ -8,6 +11,7 @@ from services.data_providers import (
     MetalPriceAPIProvider,
     ProviderError,
 )
+from services.price_stream_service import PriceStreamHub, get_price_stream_hub
 from config import settings
 
 logger = logging.getLogger(__name__)
@@ -27,6 +31,21 @@ YAHOO_SYMBOLS = {
 
 MCX_SYMBOLS = ["GOLD", "SILVER", "CRUDEOIL", "NATURALGAS", "COPPER"]
 
+# Seconds between SSE keep-alive comments when no ticks arrive
+SSE_KEEPALIVE_SECONDS = 15
+
+
+def _parse_stream_symbols(symbols: str) -> list[str]:
+    """Parse and validate symbols for the live price stream"""
+    symbol_list = [s.strip().upper() for s in symbols.split(",") if s.strip()]
+    unsupported = [s for s in symbol_list if s not in PriceStreamHub.SUPPORTED_SYMBOLS]
+    if not symbol_list or unsupported:
+        raise ValueError(
+            f"Unsupported symbols: {unsupported or symbols}. "
+            f"Use {', '.join(PriceStreamHub.SUPPORTED_SYMBOLS)}."
+        )
+    return symbol_list
+
 
 @router.get("/current")
 async def get_current_prices(
@@ -274,3 +293,106 @@ async def get_forex_rate(
         raise HTTPException(
             status_code=500, detail=f"Error fetching forex rate: {str(e)}"
         )
+
+
+@router.websocket("/stream")
+async def stream_prices_websocket(
+    websocket: WebSocket,
+    symbols: str = Query(default="GOLD,SILVER", description="Comma-separated symbols"),
+):
+    """
+    Live price stream over WebSocket
+
+    - **symbols**: GOLD and/or SILVER (comma-separated)
+
+    Sends a JSON tick whenever COMEX, MCX or USD/INR quotes change, with fair
+    value, premium and signal computed once server-side. All clients share
+    one upstream poller per feed.
+    """
+    await websocket.accept()
+
+    try:
+        symbol_list = _parse_stream_symbols(symbols)
+    except ValueError as e:
+        await websocket.send_json({"type": "error", "detail": str(e)})
+        await websocket.close(code=1008)
+        return
+
+    hub = get_price_stream_hub()
+    queue = await hub.subscribe(symbol_list)
+
+    async def forward_ticks():
+        while True:
+            await websocket.send_json(await queue.get())
+
+    async def wait_for_disconnect():
+        # Reading the socket is the only way to notice a client that leaves
+        # while no ticks arrive (market closed, upstream down)
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+
+    tasks = [
+        asyncio.create_task(forward_ticks()),
+        asyncio.create_task(wait_for_disconnect()),
+    ]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            error = task.exception()
+            if error is not None and not isinstance(error, WebSocketDisconnect):
+                logger.warning(f"Price stream websocket closed: {error}")
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        hub.unsubscribe(queue, symbol_list)
+
+
+@router.get("/stream/sse")
+async def stream_prices_sse(
+    request: Request,
+    symbols: str = Query(default="GOLD,SILVER", description="Comma-separated symbols"),
+):
+    """
+    Live price stream over Server-Sent Events
+
+    - **symbols**: GOLD and/or SILVER (comma-separated)
+
+    Same ticks as the WebSocket stream, delivered as `tick` events for
+    clients that prefer EventSource.
+    """
+    try:
+        symbol_list = _parse_stream_symbols(symbols)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    hub = get_price_stream_hub()
+
+    async def event_stream():
+        queue = await hub.subscribe(symbol_list)
+        try:
+            while not await request.is_disconnected():
+                try:
+                    tick = await asyncio.wait_for(
+                        queue.get(), timeout=SSE_KEEPALIVE_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: tick\ndata: {json.dumps(tick, default=str)}\n\n"
+        finally:
+            hub.unsubscribe(queue, symbol_list)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/stream/status")
+async def get_stream_status():
+    """Active live price feeds, subscriber counts and last quotes"""
+    return get_price_stream_hub().status()
@@ -84,6 +84,28 @@ class Settings(BaseSettings):
     rate_limit_per_minute: int = 60
     rate_limit_per_hour: int = 1000
 
+    # Upstream provider rate limits (requests/second, shared process-wide)
+    dhan_rate_limit_per_second: float = 1.0
+    metal_price_api_rate_limit_per_second: float = 2.0
+    fmp_rate_limit_per_second: float = 5.0
+
+    # Live price stream (/prices/stream) upstream poll interval
+    price_stream_poll_seconds: float = 5.0
+
+    # Live rolling correlation (/correlation/live): pairs and window in days
+    correlation_live_pairs: str = "GOLD:SILVER,GOLD:USDINR,SILVER:USDINR"
+    correlation_live_window: int = 60
+
+    # Precomputed correlation regimes (/correlation/regimes) of these pairs
+    correlation_regime_pairs: str = (
+        "GOLD:SILVER,GOLD:USDINR,SILVER:USDINR,GOLD:PLATINUM,"
+        "GOLD:PALLADIUM,PLATINUM:PALLADIUM"
+    )
+
+    # Precomputed pivot levels (/pivots/auto, /multi-timeframe, /nearest-level)
+    pivot_comex_symbols: str = "GOLD,SILVER,CRUDE,COPPER,NATURALGAS"
+    pivot_mcx_symbols: str = "GOLD,SILVER,CRUDE,NATURALGAS"
+
     class Config:
         env_file = ".env"
         case_sensitive = False
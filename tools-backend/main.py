@@ -9,6 +9,8 @@ import logging
 from config import settings
 from database import engine, Base
 from api.v1.router import api_router
+from services.data_providers import configure_schedulers_from_settings
+from services.price_stream_service import get_price_stream_hub
 
 # Configure logging
 logging.basicConfig(
@@ -24,6 +26,9 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info(f"Starting {settings.app_name} API")
     logger.info(f"Environment: {settings.app_env}")
+
+    # Process-wide upstream rate limits (DhanHQ, MetalPriceAPI, FMP)
+    configure_schedulers_from_settings(settings)
     
     # Create database tables
     # Base.metadata.create_all(bind=engine)  # Uncomment when models are ready
@@ -32,6 +37,7 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down API")
+    await get_price_stream_hub().shutdown()
 
 
 # Initialize FastAPI app
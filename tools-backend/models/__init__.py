@@ -5,8 +5,16 @@ from .strategy import Strategy, Backtest
 from .alert import Alert, AlertRule
 from .seasonal import SeasonalEvent, SeasonalAnalysis, EventType, RecurrenceType
 from .metals import MetalsPriceSpot
-from .cot import COTReportDisaggFuturesOnly
+from .cot import (
+    COTReportDisaggFuturesOnly,
+    COTReportLegacy,
+    COTScreenerFeature,
+    COTMLRegimeHistory,
+)
 from .arbitrage import ArbitrageHistory, ArbitrageAlert
+from .correlation import CorrelationRegime
+from .pivot import PivotLevel
+from .backfill import BackfillCheckpoint
 
 __all__ = [
     "User",
@@ -21,6 +29,12 @@ __all__ = [
     "RecurrenceType",
     "MetalsPriceSpot",
     "COTReportDisaggFuturesOnly",
+    "COTReportLegacy",
+    "COTScreenerFeature",
+    "COTMLRegimeHistory",
     "ArbitrageHistory",
     "ArbitrageAlert",
+    "CorrelationRegime",
+    "PivotLevel",
+    "BackfillCheckpoint",
 ]
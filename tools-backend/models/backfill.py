@@ -0,0 +1,39 @@
+"""
+Backfill checkpoint model for resumable historical ingestion
+"""
+
+from sqlalchemy import Column, Integer, String, Date, DateTime, Text, UniqueConstraint
+from sqlalchemy.sql import func
+from database import Base
+
+
+class BackfillCheckpoint(Base):
+    """
+    Progress of one date-range chunk of a backfill job.
+
+    The backfill engine writes a row per chunk so an interrupted run can
+    resume by skipping chunks already marked "done".
+    """
+
+    __tablename__ = "backfill_checkpoints"
+
+    id = Column(Integer, primary_key=True, index=True)
+    job = Column(String(100), nullable=False, index=True)  # e.g. "arbitrage:GOLD"
+    chunk_start = Column(Date, nullable=False)
+    chunk_end = Column(Date, nullable=False)
+
+    status = Column(String(20), nullable=False)  # done, failed
+    rows_written = Column(Integer, default=0)
+    error = Column(Text, nullable=True)
+
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+    __table_args__ = (
+        UniqueConstraint("job", "chunk_start", "chunk_end", name="uq_backfill_chunk"),
+        {"schema": "tradeflix_tools"},
+    )
+
+    def __repr__(self):
+        return f"<BackfillCheckpoint({self.job} {self.chunk_start}..{self.chunk_end} {self.status})>"
@@ -0,0 +1,55 @@
+"""
+Correlation regime models for precomputed pair history
+"""
+
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Date,
+    DateTime,
+    Float,
+    Integer,
+    String,
+    UniqueConstraint,
+)
+from sqlalchemy.sql import func
+from database import Base
+
+
+class CorrelationRegime(Base):
+    """
+    Multi-window rolling correlation and regime of one asset pair on one day.
+
+    Written nightly by CorrelationRegimeService.refresh() from the stored
+    metals_prices_spot history; read by /correlation/regimes.
+    """
+
+    __tablename__ = "correlation_regimes"
+
+    id = Column(Integer, primary_key=True, index=True)
+    pair = Column(String(30), nullable=False)  # e.g. "GOLD:SILVER"
+    date = Column(Date, nullable=False)
+
+    # Rolling correlation of daily returns over the last N trading days
+    corr_20 = Column(Float, nullable=True)
+    corr_60 = Column(Float, nullable=True)
+    corr_120 = Column(Float, nullable=True)
+    corr_250 = Column(Float, nullable=True)
+
+    # Regime of the 120-day correlation (strong_positive ... strong_negative)
+    regime = Column(String(20), nullable=True)
+
+    # Structural break test: 60-day correlation after this day vs corr_60
+    corr_next_60 = Column(Float, nullable=True)
+    shift_stat = Column(Float, nullable=True)  # Fisher z-test statistic
+    is_break = Column(Boolean, nullable=False, default=False)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("pair", "date", name="uq_correlation_regime_pair_date"),
+        {"schema": "tradeflix_tools"},
+    )
+
+    def __repr__(self):
+        return f"<CorrelationRegime({self.pair} {self.date} {self.regime})>"
@@ -9,7 +9,21 @@ reportable open interest positions into four classifications:
 - Other Reportables: Remaining large traders (proprietary trading, family offices)
 """
 
-from sqlalchemy import Column, BigInteger, Float, Text
+from sqlalchemy import (
+    Column,
+    BigInteger,
+    Computed,
+    Date,
+    DateTime,
+    Float,
+    Index,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+    text,
+)
+from sqlalchemy.sql import func
 from database import Base
 
 
@@ -22,7 +36,19 @@ class COTReportDisaggFuturesOnly(Base):
     """
 
     __tablename__ = "cot_report_disagg_futures_only"
-    __table_args__ = {"schema": "tradeflix_tools"}
+    __table_args__ = (
+        Index(
+            "ix_cot_disagg_market_key_report_date",
+            "market_key",
+            text('"Report_Date_as_YYYY_MM_DD" DESC'),
+        ),
+        Index(
+            "ix_cot_disagg_commodity_report_date",
+            "Commodity Name",
+            text('"Report_Date_as_YYYY_MM_DD" DESC'),
+        ),
+        {"schema": "tradeflix_tools"},
+    )
 
     # Primary key
     ID = Column("ID", Text, primary_key=True)
@@ -591,6 +617,17 @@ class COTReportDisaggFuturesOnly(Base):
     COMMODITY_SUBGROUP_NAME = Column("COMMODITY_SUBGROUP_NAME", Text, nullable=True)
     COMMODITY_GROUP_NAME = Column("COMMODITY_GROUP_NAME", Text, nullable=True)
 
+    # Normalized contract name, e.g. "GOLD" or "MICRO GOLD" (generated by the database)
+    market_key = Column(
+        "market_key",
+        Text,
+        Computed(
+            """upper(btrim(split_part("Market_and_Exchange_Names", ' - ', 1)))""",
+            persisted=True,
+        ),
+        nullable=True,
+    )
+
     def __repr__(self):
         return f"<COTReportDisaggFuturesOnly(ID={self.ID}, Market={self.Market_and_Exchange_Names}, Date={self.Report_Date_as_YYYY_MM_DD})>"
 
@@ -756,3 +793,141 @@ class COTReportDisaggFuturesOnly(Base):
             "traders_m_money_long": self.Traders_M_Money_Long_All,
             "traders_m_money_short": self.Traders_M_Money_Short_All,
         }
+
+
+class COTReportLegacy(Base):
+    """
+    Legacy-format (commercial / non-commercial) COT report from FMP.
+
+    One row per FMP symbol and report date, written by the incremental
+    ingestion job (scripts/cron/cot_ingest_cron.py) and read by the legacy
+    /cot endpoints.
+    """
+
+    __tablename__ = "cot_report_legacy"
+
+    id = Column(Integer, primary_key=True, index=True)
+    symbol = Column(String(20), nullable=False)  # FMP symbol, e.g. "GC"
+    report_date = Column(Date, nullable=False)
+    name = Column(String(200), nullable=True)
+    sector = Column(String(100), nullable=True)
+    exchange = Column(String(200), nullable=True)
+
+    open_interest = Column(BigInteger, nullable=False, default=0)
+    change_open_interest = Column(BigInteger, nullable=True)
+    commercial_long = Column(BigInteger, nullable=True)
+    commercial_short = Column(BigInteger, nullable=True)
+    non_commercial_long = Column(BigInteger, nullable=True)
+    non_commercial_short = Column(BigInteger, nullable=True)
+    non_reportable_long = Column(BigInteger, nullable=True)
+    non_reportable_short = Column(BigInteger, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("symbol", "report_date", name="uq_cot_legacy_symbol_date"),
+        {"schema": "tradeflix_tools"},
+    )
+
+    def __repr__(self):
+        return f"<COTReportLegacy({self.symbol} {self.report_date} OI:{self.open_interest})>"
+
+
+class COTScreenerFeature(Base):
+    """
+    Precomputed latest COT features of one disaggregated market.
+
+    One row per market_key, rebuilt after each report by
+    COTScreenerService.refresh_features() and filtered/sorted in SQL by the
+    /cot/screener endpoint. Percentiles and scores are those of the
+    per-commodity /cot/disagg/* endpoints over the same window.
+    """
+
+    __tablename__ = "cot_screener_features"
+
+    market_key = Column(Text, primary_key=True)  # e.g. "GOLD"
+    commodity_name = Column(Text, nullable=True)
+    market_name = Column(Text, nullable=True)
+    subgroup = Column(Text, nullable=True)
+    report_date = Column(Date, nullable=False)
+    weeks_analyzed = Column(Integer, nullable=False)
+    open_interest = Column(BigInteger, nullable=True)
+
+    # Net positions and percentiles within the analysis window
+    mm_net = Column(BigInteger, nullable=True)
+    mm_percentile = Column(Float, nullable=True)
+    commercial_net = Column(BigInteger, nullable=True)
+    commercial_percentile = Column(Float, nullable=True)
+    swap_percentile = Column(Float, nullable=True)
+    other_percentile = Column(Float, nullable=True)
+    nonrept_percentile = Column(Float, nullable=True)
+
+    # 4-week net flows (contracts, and managed money as % of open interest)
+    mm_flow_4w = Column(BigInteger, nullable=True)
+    mm_flow_4w_pct_oi = Column(Float, nullable=True)
+    commercial_flow_4w = Column(BigInteger, nullable=True)
+
+    # Concentration, squeeze and regime
+    crowding_score = Column(Float, nullable=True)
+    crowding_level = Column(String(20), nullable=True)
+    long_squeeze_score = Column(Float, nullable=True)
+    short_squeeze_score = Column(Float, nullable=True)
+    squeeze_risk_score = Column(Float, nullable=True)
+    dominant_squeeze = Column(String(20), nullable=True)
+    ml_regime = Column(String(30), nullable=True)
+    ml_regime_confidence = Column(Float, nullable=True)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = {"schema": "tradeflix_tools"}
+
+    def __repr__(self):
+        return f"<COTScreenerFeature({self.market_key} {self.report_date})>"
+
+
+class COTMLRegimeHistory(Base):
+    """
+    Weekly rule-based ML regime classification of one disaggregated market.
+
+    Written by COTRegimeHistoryService.backfill() from vectorized feature
+    matrices; each week's percentiles use only the reports up to that week.
+    Read by /cot/disagg/advanced/ml-regime/history.
+    """
+
+    __tablename__ = "cot_ml_regime_history"
+
+    id = Column(Integer, primary_key=True, index=True)
+    market_key = Column(Text, nullable=False)  # e.g. "GOLD"
+    report_date = Column(Date, nullable=False)
+    window = Column(Integer, nullable=False)  # Percentile lookback (reports)
+
+    regime = Column(String(30), nullable=False)
+    confidence = Column(Float, nullable=False)
+
+    # MLRegimeFeatures of the week
+    mm_net_percentile = Column(Float, nullable=True)
+    commercial_net_percentile = Column(Float, nullable=True)
+    nonrept_net_percentile = Column(Float, nullable=True)
+    mm_4wk_flow = Column(Float, nullable=True)
+    commercial_4wk_flow = Column(Float, nullable=True)
+    concentration_score = Column(Float, nullable=True)
+    spread_ratio = Column(Float, nullable=True)
+    herding_score = Column(Float, nullable=True)
+    front_back_ratio = Column(Float, nullable=True)
+    gross_positions_percentile = Column(Float, nullable=True)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        # One classification per market, percentile window and week
+        UniqueConstraint(
+            "market_key",
+            "window",
+            "report_date",
+            name="uq_cot_ml_regime_market_window_date",
+        ),
+        {"schema": "tradeflix_tools"},
+    )
+
+    def __repr__(self):
+        return f"<COTMLRegimeHistory({self.market_key} {self.report_date} {self.regime})>"
@@ -0,0 +1,76 @@
+"""
+Pivot level models for precomputed session pivots
+"""
+
+from sqlalchemy import (
+    Column,
+    Date,
+    DateTime,
+    Float,
+    Integer,
+    String,
+    UniqueConstraint,
+)
+from sqlalchemy.sql import func
+from database import Base
+
+
+class PivotLevel(Base):
+    """
+    CPR, floor and Fibonacci pivots of one symbol, exchange and timeframe.
+
+    period_date is the last session of the period the levels come from;
+    they apply to the sessions after it. Written after each COMEX/MCX close
+    by PivotLevelService.refresh(); read by /pivots/auto, /multi-timeframe
+    and /nearest-level.
+    """
+
+    __tablename__ = "pivot_levels"
+
+    id = Column(Integer, primary_key=True, index=True)
+    symbol = Column(String(20), nullable=False)  # GOLD, SILVER, ...
+    exchange = Column(String(10), nullable=False)  # COMEX or MCX
+    timeframe = Column(String(10), nullable=False)  # daily, weekly, monthly
+    period_date = Column(Date, nullable=False)
+
+    # Previous period OHLC
+    high = Column(Float, nullable=False)
+    low = Column(Float, nullable=False)
+    close = Column(Float, nullable=False)
+
+    # Central Pivot Range
+    pivot = Column(Float, nullable=False)
+    bc = Column(Float, nullable=False)
+    tc = Column(Float, nullable=False)
+    width_percent = Column(Float, nullable=False)
+    classification = Column(String(10), nullable=False)  # narrow, normal, wide
+
+    # Floor pivots
+    r1 = Column(Float, nullable=False)
+    r2 = Column(Float, nullable=False)
+    r3 = Column(Float, nullable=False)
+    s1 = Column(Float, nullable=False)
+    s2 = Column(Float, nullable=False)
+    s3 = Column(Float, nullable=False)
+
+    # Fibonacci 61.8% retracement of the period range
+    fib_618 = Column(Float, nullable=False)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        UniqueConstraint(
+            "symbol",
+            "exchange",
+            "timeframe",
+            "period_date",
+            name="uq_pivot_level_period",
+        ),
+        {"schema": "tradeflix_tools"},
+    )
+
+    def __repr__(self):
+        return (
+            f"<PivotLevel({self.exchange}:{self.symbol} {self.timeframe} "
+            f"{self.period_date})>"
+        )
@@ -20,6 +20,12 @@ class CorrelationRequest(BaseModel):
     timeframe: str = Field(
         default="daily", description="Data timeframe (daily, weekly)"
     )
+    alignment: str = Field(
+        default="inner",
+        pattern="^(inner|ffill)$",
+        description="Date alignment: inner (dates all assets traded) or ffill "
+        "(carry the last close over holidays)",
+    )
 
 
 class CorrelationPair(BaseModel):
@@ -35,6 +41,12 @@ class CorrelationPair(BaseModel):
     p_value: Optional[float] = Field(
         default=None, description="Statistical significance"
     )
+    ci_lower: Optional[float] = Field(
+        default=None, description="95% confidence interval lower bound"
+    )
+    ci_upper: Optional[float] = Field(
+        default=None, description="95% confidence interval upper bound"
+    )
     sample_size: int
 
 
@@ -47,6 +59,8 @@ class CorrelationMatrixResponse(BaseModel):
     end_date: date
     correlations: List[CorrelationPair]
     matrix: Dict[str, Dict[str, float]]  # 2D matrix for heatmap
+    sample_size: Optional[int] = None  # Aligned observations
+    alignment: Optional[str] = None
 
 
 class RollingCorrelationRequest(BaseModel):
@@ -155,6 +169,67 @@ class CorrelationBreakdownResponse(BaseModel):
     interpretation: str
 
 
+class CorrelationRegimeSummary(BaseModel):
+    """Latest stored correlation regime of one pair"""
+
+    pair: str
+    asset1: str
+    asset2: str
+    date: date
+    corr_20: Optional[float] = None
+    corr_60: Optional[float] = None
+    corr_120: Optional[float] = None
+    corr_250: Optional[float] = None
+    regime: Optional[str] = None
+    last_break: Optional[date] = None
+
+
+class CorrelationRegimesResponse(BaseModel):
+    """Latest correlation regimes of every stored pair"""
+
+    windows: List[int]
+    regime_window: int
+    as_of: Optional[date] = None
+    pairs: List[CorrelationRegimeSummary]
+
+
+class CorrelationRegimePoint(BaseModel):
+    """Multi-window correlation of one pair on one day"""
+
+    date: date
+    corr_20: Optional[float] = None
+    corr_60: Optional[float] = None
+    corr_120: Optional[float] = None
+    corr_250: Optional[float] = None
+    regime: Optional[str] = None
+    shift_stat: Optional[float] = None  # Break test z-statistic
+    is_break: bool = False
+
+
+class CorrelationBreak(BaseModel):
+    """Structural break in a pair's correlation"""
+
+    date: date
+    correlation_before: Optional[float] = None
+    correlation_after: Optional[float] = None
+    shift_stat: Optional[float] = None
+
+
+class CorrelationRegimeHistoryResponse(BaseModel):
+    """Stored correlation regime history of one pair"""
+
+    pair: str
+    asset1: str
+    asset2: str
+    windows: List[int]
+    regime_window: int
+    break_window: int
+    current_regime: Optional[str] = None
+    history: List[CorrelationRegimePoint]
+    breaks: List[CorrelationBreak]
+    regime_distribution: Dict[str, int]
+
+
 class DivergenceRequest(BaseModel):
     """Request for divergence detection"""
 
@@ -168,6 +243,16 @@ class DivergenceRequest(BaseModel):
     )
 
 
+class DivergencePoint(BaseModel):
+    """Divergence of one lookback window, dated by its last day"""
+
+    date: date
+    actual_move: float
+    expected_move: float
+    divergence_pct: float
+    z_score: Optional[float] = None  # None until two earlier windows exist
+
+
 class DivergenceResponse(BaseModel):
     """Divergence detection response"""
 
@@ -190,6 +275,9 @@ class DivergenceResponse(BaseModel):
     signal: str
     interpretation: str
 
+    # Rolling divergence series, oldest first
+    history: List[DivergencePoint] = []
+
 
 class LeadLagResponse(BaseModel):
     """Lead-lag analysis response"""
@@ -205,6 +293,55 @@ class LeadLagResponse(BaseModel):
     interpretation: str
 
 
+class LeadLagMatrixRequest(BaseModel):
+    """Request for basket lead-lag analysis"""
+
+    assets: List[str] = Field(min_length=2, description="List of asset symbols")
+    period_days: int = Field(
+        default=365, ge=30, le=730, description="Analysis period in days"
+    )
+    max_lag: int = Field(
+        default=20, ge=1, le=250, description="Largest lag to test (in periods)"
+    )
+    alignment: str = Field(
+        default="inner",
+        pattern="^(inner|ffill)$",
+        description="Date alignment: inner (dates all assets traded) or ffill "
+        "(carry the last close over holidays)",
+    )
+    include_profiles: bool = Field(
+        default=False, description="Include the correlation at every lag per pair"
+    )
+
+
+class LeadLagPair(BaseModel):
+    """Strongest lead-lag relationship of one asset pair"""
+
+    asset1: str
+    asset2: str
+    leading_asset: str  # asset symbol or "simultaneous"
+    lag_periods: int
+    lag_direction: int  # Positive when asset1 leads
+    correlation_at_lag: float
+    correlation_at_zero: float
+    lag_correlations: Optional[List[float]] = None  # One value per lag
+
+
+class LeadLagMatrixResponse(BaseModel):
+    """Basket lead-lag response"""
+
+    assets: List[str]
+    period_days: int
+    start_date: date
+    end_date: date
+    sample_size: int
+    max_lag: int  # Effective largest lag (capped by the sample size)
+    lags: Optional[List[int]] = None  # Lags of lag_correlations
+    pairs: List[LeadLagPair]
+    lag_matrix: Dict[str, Dict[str, int]]  # Positive when the row asset leads
+    correlation_matrix: Dict[str, Dict[str, float]]  # Correlation at best lag
+
+
 class TradingSignal(BaseModel):
     """Individual trading signal"""
 
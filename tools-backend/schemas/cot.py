@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Dict, List, Optional
 from datetime import date
 from enum import Enum
 
@@ -245,6 +245,8 @@ class COTComparisonResponse(BaseModel):
     comparison_data: List[COTComparisonItem]
     most_bullish: str
     most_bearish: str
+    # {commodity: reason} for commodities that failed
+    errors: Dict[str, str] = Field(default_factory=dict)
 
 
 # ============================================================================
@@ -373,6 +375,27 @@ class COTChartDataResponse(BaseModel):
     long_short_positions: LongShortTimeSeries
 
 
+class CategoryRankSeries(BaseModel):
+    """Rolling rank series per trader category (0-100, chronological)"""
+
+    producer_merchant: List[float]
+    swap_dealer: List[float]
+    managed_money: List[float]
+    other_reportables: List[float]
+    non_reportables: List[float]
+
+
+class COTPercentileChartResponse(BaseModel):
+    """Rolling net-position percentile and COT index series as columnar arrays"""
+
+    commodity: str
+    market_name: Optional[str] = None
+    window: int  # Weeks each point is ranked against
+    dates: List[str]
+    net_percentile: CategoryRankSeries
+    cot_index: CategoryRankSeries
+
+
 class MomentumAnalysis(BaseModel):
     """Momentum analysis for position changes"""
 
@@ -831,24 +854,6 @@ class HerdingAnalysisResponse(BaseModel):
     interpretation: str
 
 
-class ComprehensiveAdvancedAnalysis(BaseModel):
-    """All advanced analytics in one response"""
-
-    commodity: str
-    report_date: str
-
-    # Priority 1 metrics
-    summary: AdvancedCOTSummary
-    squeeze_risk: SqueezeRiskResponse
-    concentration: ConcentrationResponse
-    flow_decomposition: FlowDecompositionResponse
-
-    # Priority 2 metrics
-    curve_analysis: Optional[CurveAnalysisResponse] = None
-    spread_analysis: Optional[SpreadAnalysisResponse] = None
-    herding_analysis: Optional[HerdingAnalysisResponse] = None
-
-
 # ============================================================================
 # Priority 3: Cross-Market, Volatility, and ML Regime Analytics
 # ============================================================================
@@ -906,6 +911,56 @@ class CrossMarketPressureResponse(BaseModel):
     interpretation: str
 
 
+class COTScreenerItem(BaseModel):
+    """Precomputed latest COT features of one market"""
+
+    market_key: str
+    commodity_name: Optional[str] = None
+    market_name: Optional[str] = None
+    subgroup: Optional[str] = None
+    report_date: date
+    weeks_analyzed: int
+    open_interest: Optional[int] = None
+
+    # Positioning
+    mm_net: Optional[int] = None
+    mm_percentile: Optional[float] = None
+    commercial_net: Optional[int] = None
+    commercial_percentile: Optional[float] = None
+    swap_percentile: Optional[float] = None
+    other_percentile: Optional[float] = None
+    nonrept_percentile: Optional[float] = None
+
+    # 4-week flows
+    mm_flow_4w: Optional[int] = None
+    mm_flow_4w_pct_oi: Optional[float] = None
+    commercial_flow_4w: Optional[int] = None
+
+    # Concentration, squeeze and regime
+    crowding_score: Optional[float] = None
+    crowding_level: Optional[str] = None
+    long_squeeze_score: Optional[float] = None
+    short_squeeze_score: Optional[float] = None
+    squeeze_risk_score: Optional[float] = None
+    dominant_squeeze: Optional[str] = None
+    ml_regime: Optional[str] = None
+    ml_regime_confidence: Optional[float] = None
+
+    class Config:
+        from_attributes = True
+
+
+class COTScreenerResponse(BaseModel):
+    """Paginated COT screener results"""
+
+    report_date: Optional[date] = None  # Latest report in the feature table
+    items: List[COTScreenerItem]
+    total: int  # Markets matching the filters
+    page: int
+    page_size: int
+    total_pages: int
+
+
 class VolatilityRegimeMetrics(BaseModel):
     """COT-implied volatility regime metrics"""
 
@@ -1052,3 +1107,58 @@ class MLRegimeAnalysisResponse(BaseModel):
     regime_distribution: dict  # {regime: count} over history
 
     interpretation: str
+
+
+class MLRegimeHistoryPoint(BaseModel):
+    """Regime classification of one week with its feature vector"""
+
+    report_date: str
+    regime: MLRegimeType
+    confidence: float
+    features: MLRegimeFeatures
+
+
+class MLRegimeTransition(BaseModel):
+    """Week in which the classified regime changed"""
+
+    report_date: str
+    from_regime: MLRegimeType
+    to_regime: MLRegimeType
+
+
+class MLRegimeHistoryResponse(BaseModel):
+    """Weekly ML regime history, oldest week first"""
+
+    commodity: str
+    report_date: str  # Latest classified week
+    window: int  # Reports each week's percentiles are ranked against
+    source: str  # "stored" (backfilled table) or "computed"
+    history: List[MLRegimeHistoryPoint]
+    transitions: List[MLRegimeTransition]
+    regime_distribution: dict  # {regime: weeks}
+
+
+class ComprehensiveAdvancedAnalysis(BaseModel):
+    """All advanced analytics in one response, computed from one history load"""
+
+    commodity: str
+    report_date: str
+    weeks_analyzed: int
+
+    # Priority 1 metrics
+    summary: AdvancedCOTSummary
+    squeeze_risk: SqueezeRiskResponse
+    concentration: ConcentrationResponse
+    flow_decomposition: FlowDecompositionResponse
+    participation: Optional[ParticipationResponse] = None
+
+    # Priority 2 metrics
+    curve_analysis: Optional[CurveAnalysisResponse] = None
+    spread_analysis: Optional[SpreadAnalysisResponse] = None
+    herding_analysis: Optional[HerdingAnalysisResponse] = None
+
+    # Priority 3 metrics
+    volatility_regime: Optional[VolatilityAnalysisResponse] = None
+    ml_regime: Optional[MLRegimeAnalysisResponse] = None
+
+    unavailable: dict = {}  # {module: reason} for modules lacking history
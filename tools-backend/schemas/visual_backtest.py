@@ -131,6 +131,10 @@ class VisualBacktestRequest(BaseModel):
     startDate: Optional[str] = Field(None, alias="startDate")
     endDate: Optional[str] = Field(None, alias="endDate")
     initialCapital: float = Field(10000, alias="initialCapital")
+    # Reduce equityCurve and priceData to about this many points (None = all):
+    # equity is downsampled with `downsample`, candles are merged per bucket
+    maxPoints: Optional[int] = Field(None, alias="maxPoints", ge=50, le=20000)
+    downsample: Literal["lttb", "minmax", "m4"] = "lttb"
 
     class Config:
         populate_by_name = True
@@ -193,6 +197,7 @@ class VisualBacktestResponse(BaseModel):
     metrics: VisualBacktestMetrics
     equityCurve: List[EquityCurvePoint] = Field(..., alias="equityCurve")
     priceData: List[CandleData] = Field(..., alias="priceData")
+    downsampled: bool = False
 
     class Config:
         populate_by_name = True
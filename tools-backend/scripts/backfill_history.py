@@ -0,0 +1,122 @@
+"""
+Backfill historical spot and arbitrage data.
+
+Runs the chunked, resumable backfill engine (services/backfill_service.py).
+Chunks already completed by an earlier run are skipped unless --no-resume
+is given.
+
+Datasets:
+- spot: metals_prices_spot (gold/silver/platinum/palladium + USD/INR) from MetalPriceAPI
+- arbitrage: arbitrage_history from COMEX (Yahoo Finance), MCX (DhanHQ) and
+  USD/INR from metals_prices_spot (backfill spot first)
+
+Usage:
+    python scripts/backfill_history.py spot --start-date 2017-01-01
+    python scripts/backfill_history.py arbitrage --symbol GOLD SILVER --start-date 2024-01-01
+    python scripts/backfill_history.py arbitrage --symbol GOLD --dry-run
+"""
+
+import asyncio
+import argparse
+import json
+import sys
+import os
+from datetime import date, datetime
+import logging
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.backfill_service import (
+    ArbitrageHistoryBackfill,
+    BackfillEngine,
+    SpotPriceBackfill,
+)
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Backfill historical price data")
+    parser.add_argument(
+        "dataset", choices=["spot", "arbitrage"], help="Dataset to backfill"
+    )
+    parser.add_argument(
+        "--symbol",
+        nargs="+",
+        default=["GOLD"],
+        choices=["GOLD", "SILVER"],
+        help="Commodity symbols (arbitrage only)",
+    )
+    parser.add_argument(
+        "--start-date", type=str, default="2024-01-01", help="Start date (YYYY-MM-DD)"
+    )
+    parser.add_argument(
+        "--end-date",
+        type=str,
+        default=None,
+        help="End date (YYYY-MM-DD), defaults to today",
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=4, help="Chunks fetched in parallel"
+    )
+    parser.add_argument(
+        "--no-dhan",
+        action="store_true",
+        help="Skip DhanHQ and use estimated MCX prices (arbitrage only)",
+    )
+    parser.add_argument(
+        "--no-resume",
+        action="store_true",
+        help="Refetch chunks that were already checkpointed",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Fetch and transform data without writing to the database",
+    )
+    return parser
+
+
+async def run_backfill(args: argparse.Namespace) -> int:
+    """Run the requested backfill, returning a process exit code"""
+    start_date = datetime.strptime(args.start_date, "%Y-%m-%d").date()
+    end_date = (
+        datetime.strptime(args.end_date, "%Y-%m-%d").date()
+        if args.end_date
+        else date.today()
+    )
+
+    engine = BackfillEngine(
+        concurrency=args.concurrency,
+        dry_run=args.dry_run,
+        resume=not args.no_resume,
+    )
+
+    if args.dataset == "spot":
+        jobs = [SpotPriceBackfill()]
+    else:
+        jobs = [
+            ArbitrageHistoryBackfill(symbol, use_dhan=not args.no_dhan)
+            for symbol in args.symbol
+        ]
+
+    failed = 0
+    for job in jobs:
+        result = await engine.run(job, start_date, end_date)
+        logger.info(json.dumps(result.to_dict(), indent=2))
+        failed += result.chunks_failed
+
+    return 1 if failed else 0
+
+
+def main():
+    args = build_parser().parse_args()
+    sys.exit(asyncio.run(run_backfill(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""
+Incremental COT Ingestion Script
+
+This script fetches legacy-format COT reports from FMP for every tracked symbol
+and stores them in the database. Only report dates newer than the latest stored
+one are requested, and all symbols are fetched concurrently.
+Designed to be run as a weekly cron job after the CFTC release (Friday 3:30 PM ET).
+
+Usage:
+    # Run directly
+    python scripts/cron/cot_ingest_cron.py
+
+    # Run with specific symbols
+    python scripts/cron/cot_ingest_cron.py --symbols GC SI
+
+    # Dry run (don't save to DB)
+    python scripts/cron/cot_ingest_cron.py --dry-run
+
+Cron Setup (Linux/Mac):
+    # Add to crontab (crontab -e) - runs Saturday 2:00 AM IST (Friday 8:30 PM UTC)
+    30 20 * * 5 cd /path/to/tools-backend && /path/to/.venv/bin/python scripts/cron/cot_ingest_cron.py >> /var/log/cot_cron.log 2>&1
+
+Environment Variables Required:
+    - DATABASE_URL: PostgreSQL connection string
+    - FMP_API_KEY: Financial Modeling Prep API key
+"""
+
+import asyncio
+import argparse
+import sys
+import os
+from datetime import date, datetime, timedelta
+import logging
+
+# Add tools-backend directory to path for imports
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, BACKEND_DIR)
+
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import sessionmaker
+
+from config import settings
+from models.cot import COTReportLegacy
+from services.bulk_writer import COT_LEGACY, bulk_upsert
+from services.cot_service import COT_SYMBOLS
+from services.data_providers import DataNotAvailableError, FMPCOTProvider, Priority
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+    handlers=[
+        logging.StreamHandler(),
+    ],
+)
+logger = logging.getLogger(__name__)
+
+# History loaded for a symbol with no stored reports (5 years, the endpoints' maximum)
+INITIAL_HISTORY_WEEKS = 260
+
+
+class COTIngestion:
+    """Handles incremental COT report ingestion from FMP."""
+
+    def __init__(self, dry_run: bool = False):
+        self.dry_run = dry_run
+        self.rows_written = 0
+        self.latest_report_date: date | None = None
+
+        if not settings.fmp_api_key:
+            raise ValueError("FMP_API_KEY is not configured")
+        self.provider = FMPCOTProvider(settings.fmp_api_key, priority=Priority.BACKGROUND)
+
+        # Database connection (read-only in dry run)
+        self.engine = create_engine(settings.database_url)
+        self.Session = sessionmaker(bind=self.engine)
+
+    def get_latest_stored_dates(self, symbols: list[str]) -> dict[str, date]:
+        """Latest stored report date per symbol, in one grouped query."""
+        session = self.Session()
+        try:
+            rows = (
+                session.query(
+                    COTReportLegacy.symbol, func.max(COTReportLegacy.report_date)
+                )
+                .filter(COTReportLegacy.symbol.in_(symbols))
+                .group_by(COTReportLegacy.symbol)
+                .all()
+            )
+            return {symbol: latest for symbol, latest in rows}
+        finally:
+            session.close()
+
+    async def fetch_new_reports(self, symbol: str, since: date | None) -> list[dict]:
+        """Fetch reports for a symbol newer than `since` as table rows."""
+        today = date.today()
+        from_date = since + timedelta(days=1) if since else today - timedelta(
+            weeks=INITIAL_HISTORY_WEEKS
+        )
+        if from_date > today:
+            return []
+
+        try:
+            reports = await self.provider.get_cot_report(
+                symbol, from_date=from_date, to_date=today
+            )
+        except DataNotAvailableError:
+            logger.info(f"{symbol}: no new reports since {since}")
+            return []
+
+        rows = []
+        for report in reports:
+            report_date = (
+                report.date.date() if isinstance(report.date, datetime) else report.date
+            )
+            if since and report_date <= since:
+                continue
+            rows.append(
+                {
+                    "symbol": symbol,
+                    "report_date": report_date,
+                    "name": report.name,
+                    "sector": report.sector,
+                    "exchange": report.exchange,
+                    "open_interest": report.open_interest,
+                    "change_open_interest": report.change_open_interest,
+                    "commercial_long": report.commercial_long,
+                    "commercial_short": report.commercial_short,
+                    "non_commercial_long": report.non_commercial_long,
+                    "non_commercial_short": report.non_commercial_short,
+                    "non_reportable_long": report.non_reportable_long,
+                    "non_reportable_short": report.non_reportable_short,
+                }
+            )
+
+        logger.info(f"{symbol}: {len(rows)} new reports since {since or from_date}")
+        return rows
+
+    def save_to_database(self, rows: list[dict]):
+        """Save COT rows to database in a single bulk upsert."""
+        if self.dry_run:
+            for row in rows:
+                logger.info(
+                    f"[DRY RUN] Would save: {row['symbol']} {row['report_date']} OI={row['open_interest']}"
+                )
+            return
+
+        if not rows:
+            return
+
+        session = self.Session()
+        try:
+            self.rows_written = bulk_upsert(session, COT_LEGACY, rows)
+            session.commit()
+            logger.info(f"✓ Saved {self.rows_written} COT reports")
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error saving COT reports to database: {e}")
+            raise
+        finally:
+            session.close()
+
+    async def run(self, symbols: list[str]):
+        """Run incremental ingestion for specified symbols."""
+        logger.info(f"Starting COT Ingestion at {datetime.now()}")
+        logger.info(f"Symbols: {symbols}")
+        logger.info(f"Dry run: {self.dry_run}")
+
+        latest = self.get_latest_stored_dates(symbols)
+
+        # All symbols concurrently; the FMP rate limiter paces the requests
+        results = await asyncio.gather(
+            *(self.fetch_new_reports(symbol, latest.get(symbol)) for symbol in symbols),
+            return_exceptions=True,
+        )
+
+        rows = []
+        failed = []
+        for symbol, result in zip(symbols, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error fetching COT reports for {symbol}: {result}")
+                failed.append(symbol)
+            else:
+                rows.extend(result)
+
+        try:
+            self.save_to_database(rows)
+        except Exception:
+            return False
+        finally:
+            await self.provider.close()
+
+        if rows:
+            self.latest_report_date = max(row["report_date"] for row in rows)
+
+        logger.info(f"\n{'=' * 50}")
+        logger.info(
+            f"Completed: {len(symbols) - len(failed)}/{len(symbols)} symbols, {len(rows)} new reports"
+        )
+        logger.info(f"{'=' * 50}")
+
+        return not failed
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Incremental COT Ingestion")
+    parser.add_argument(
+        "--symbols",
+        nargs="+",
+        default=list(COT_SYMBOLS.values()),
+        help="FMP COT symbols to process (default: all tracked symbols)",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Don't save to database, just show what would be saved",
+    )
+
+    args = parser.parse_args()
+
+    ingestion = COTIngestion(dry_run=args.dry_run)
+    success = await ingestion.run(args.symbols)
+
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
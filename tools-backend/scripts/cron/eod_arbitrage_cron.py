@@ -41,11 +41,16 @@ import logging
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from config import settings
-from services.arbitrage_service import ArbitrageService
+from services.arbitrage_service import (
+    COMEX_SYMBOLS,
+    MCX_CONTRACT_SIZES,
+    ArbitrageService,
+)
+from services.bulk_writer import ARBITRAGE_HISTORY, bulk_upsert
 from services.data_providers import YahooFinanceProvider, DhanHQProvider
 
 # Configure logging
@@ -58,19 +63,6 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Constants
-COMEX_SYMBOLS = {
-    "GOLD": "GC=F",
-    "SILVER": "SI=F",
-}
-
-MCX_CONTRACT_SIZES = {
-    "GOLD": 10,  # 10 grams
-    "SILVER": 1000,  # 1 kg (1000 grams)
-}
-
-IMPORT_DUTY_PERCENT = 2.5
-
 
 class EODArbitrageIngestion:
     """Handles end-of-day arbitrage data ingestion."""
@@ -148,7 +140,7 @@ class EODArbitrageIngestion:
         fair_value = self.arbitrage_service.calculate_fair_value(
             comex_price_usd_per_oz=comex_price,
             usdinr_rate=usdinr_rate,
-            import_duty_percent=IMPORT_DUTY_PERCENT,
+            import_duty_percent=ArbitrageService.DEFAULT_IMPORT_DUTY_PERCENT,
             contract_size_grams=contract_size,
         )
 
@@ -175,73 +167,35 @@ class EODArbitrageIngestion:
             "signal": signal,
         }
 
-    def save_to_database(
-        self,
-        symbol: str,
-        comex_price: float,
-        mcx_price: float,
-        usdinr_rate: float,
-        fair_value: float,
-        premium: float,
-        premium_percent: float,
-        signal: str,
-    ):
-        """Save arbitrage record to database."""
+    def save_to_database(self, records: list[dict]):
+        """Save arbitrage records to database in a single bulk upsert."""
         if self.dry_run:
-            logger.info(
-                f"[DRY RUN] Would save: {symbol} premium={premium_percent:.3f}%"
-            )
+            for record in records:
+                logger.info(
+                    f"[DRY RUN] Would save: {record['symbol']} premium={record['premium_percent']:.3f}%"
+                )
+            return
+
+        if not records:
             return
 
         session = self.Session()
         try:
-            session.execute(
-                text("""
-                    INSERT INTO tradeflix_tools.arbitrage_history 
-                    (symbol, recorded_at, comex_price_usd, mcx_price_inr, usdinr_rate, 
-                     fair_value_inr, premium, premium_percent, signal, comex_source, mcx_source)
-                    VALUES (:symbol, :recorded_at, :comex_price_usd, :mcx_price_inr, :usdinr_rate,
-                            :fair_value_inr, :premium, :premium_percent, :signal, :comex_source, :mcx_source)
-                    ON CONFLICT (symbol, recorded_at) DO UPDATE SET
-                        comex_price_usd = EXCLUDED.comex_price_usd,
-                        mcx_price_inr = EXCLUDED.mcx_price_inr,
-                        usdinr_rate = EXCLUDED.usdinr_rate,
-                        fair_value_inr = EXCLUDED.fair_value_inr,
-                        premium = EXCLUDED.premium,
-                        premium_percent = EXCLUDED.premium_percent,
-                        signal = EXCLUDED.signal,
-                        comex_source = EXCLUDED.comex_source,
-                        mcx_source = EXCLUDED.mcx_source
-                """),
-                {
-                    "symbol": symbol,
-                    "recorded_at": datetime.now().replace(
-                        hour=0, minute=0, second=0, microsecond=0
-                    ),
-                    "comex_price_usd": comex_price,
-                    "mcx_price_inr": mcx_price,
-                    "usdinr_rate": usdinr_rate,
-                    "fair_value_inr": fair_value,
-                    "premium": premium,
-                    "premium_percent": premium_percent,
-                    "signal": signal,
-                    "comex_source": "YahooFinance",
-                    "mcx_source": "DhanHQ",
-                },
-            )
+            bulk_upsert(session, ARBITRAGE_HISTORY, records)
             session.commit()
-            logger.info(
-                f"✓ Saved {symbol}: premium={premium_percent:.3f}%, signal={signal}"
-            )
+            for record in records:
+                logger.info(
+                    f"✓ Saved {record['symbol']}: premium={record['premium_percent']:.3f}%, signal={record['signal']}"
+                )
         except Exception as e:
             session.rollback()
-            logger.error(f"Error saving {symbol} to database: {e}")
+            logger.error(f"Error saving arbitrage records to database: {e}")
             raise
         finally:
             session.close()
 
-    async def process_symbol(self, symbol: str) -> bool:
-        """Process a single symbol - fetch data and save to DB."""
+    async def process_symbol(self, symbol: str) -> dict | None:
+        """Process a single symbol - fetch data and build its arbitrage record."""
         logger.info(f"\n{'=' * 50}")
         logger.info(f"Processing {symbol}")
         logger.info(f"{'=' * 50}")
@@ -250,17 +204,17 @@ class EODArbitrageIngestion:
         comex_price = await self.fetch_comex_price(symbol)
         if not comex_price:
             logger.error(f"Failed to fetch COMEX price for {symbol}")
-            return False
+            return None
 
         usdinr_rate = await self.fetch_usdinr_rate()
         if not usdinr_rate:
             logger.error("Failed to fetch USD/INR rate")
-            return False
+            return None
 
         mcx_price = await self.fetch_mcx_price(symbol)
         if not mcx_price:
             logger.error(f"Failed to fetch MCX price for {symbol}")
-            return False
+            return None
 
         # Calculate arbitrage
         metrics = self.calculate_arbitrage(symbol, comex_price, mcx_price, usdinr_rate)
@@ -271,19 +225,21 @@ class EODArbitrageIngestion:
         )
         logger.info(f"Signal: {metrics['signal']}")
 
-        # Save to database
-        self.save_to_database(
-            symbol=symbol,
-            comex_price=comex_price,
-            mcx_price=mcx_price,
-            usdinr_rate=usdinr_rate,
-            fair_value=metrics["fair_value"],
-            premium=metrics["premium"],
-            premium_percent=metrics["premium_percent"],
-            signal=metrics["signal"],
-        )
-
-        return True
+        return {
+            "symbol": symbol,
+            "recorded_at": datetime.now().replace(
+                hour=0, minute=0, second=0, microsecond=0
+            ),
+            "comex_price_usd": comex_price,
+            "mcx_price_inr": mcx_price,
+            "usdinr_rate": usdinr_rate,
+            "fair_value_inr": metrics["fair_value"],
+            "premium": metrics["premium"],
+            "premium_percent": metrics["premium_percent"],
+            "signal": metrics["signal"],
+            "comex_source": "YahooFinance",
+            "mcx_source": "DhanHQ",
+        }
 
     async def run(self, symbols: list[str]):
         """Run EOD ingestion for specified symbols."""
@@ -291,14 +247,22 @@ class EODArbitrageIngestion:
         logger.info(f"Symbols: {symbols}")
         logger.info(f"Dry run: {self.dry_run}")
 
-        success_count = 0
+        records = []
         for symbol in symbols:
             try:
-                if await self.process_symbol(symbol):
-                    success_count += 1
+                record = await self.process_symbol(symbol)
+                if record:
+                    records.append(record)
             except Exception as e:
                 logger.error(f"Error processing {symbol}: {e}")
 
+        # One bulk write for all symbols
+        try:
+            self.save_to_database(records)
+            success_count = len(records)
+        except Exception:
+            success_count = 0
+
         logger.info(f"\n{'=' * 50}")
         logger.info(
             f"Completed: {success_count}/{len(symbols)} symbols processed successfully"
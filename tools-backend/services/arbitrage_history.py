@@ -0,0 +1,266 @@
+"""
+SQL-side arbitrage history queries.
+
+/arbitrage/history used to hydrate every matching ArbitrageHistory ORM row
+(up to 10000 days) to compute statistics in Python. Here the statistics,
+percentiles and signal distribution come from one aggregate query. Chart
+points, optionally averaged into date_trunc buckets, are read in two
+passes: the (recorded_at, premium_percent) series is streamed batch by
+batch into arrays for downsampling, then full rows are fetched for the
+kept points only. Memory stays proportional to two float columns plus the
+returned points, whatever the range.
+
+Usage:
+    filters = history_filters("GOLD", days=365, exclude_estimated=True)
+    stats = load_history_statistics(db, filters)
+    bucket = choose_bucket(AUTO_BUCKET, stats, max_points=500)
+    micros, premiums = load_premium_series(db, filters, bucket)
+    keep = downsample_indices(premiums, 500, LTTB, x=micros / 1e6)
+    rows = load_history_points(db, filters, bucket, at=kept_times(micros, keep))
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import func, literal_column, select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from models.arbitrage import ArbitrageHistory
+
+# Premium percentiles reported with the statistics
+HISTORY_PERCENTILES = (5, 25, 50, 75, 95)
+
+# date_trunc fields, finest first, with their approximate length in seconds
+BUCKET_SECONDS = {
+    "hour": 3600,
+    "day": 86400,
+    "week": 7 * 86400,
+    "month": 2629746,
+}
+AUTO_BUCKET = "auto"
+
+# Rows per fetch while streaming the premium series
+STREAM_BATCH_ROWS = 5000
+
+POINT_COLUMNS = (
+    "recorded_at",
+    "comex_price_usd",
+    "mcx_price_inr",
+    "usdinr_rate",
+    "fair_value_inr",
+    "premium",
+    "premium_percent",
+    "signal",
+    "z_score",
+    "percentile",
+)
+SERIES_COLUMNS = ("recorded_at", "premium_percent")
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+MICROSECOND = timedelta(microseconds=1)
+
+
+def history_filters(symbol: str, days: int, exclude_estimated: bool) -> List[Any]:
+    """
+    Filter expressions of a history request
+
+    Args:
+        symbol: Trading symbol
+        days: Days of history (0 = all available data)
+        exclude_estimated: Drop records with estimated MCX prices (holidays)
+    """
+    model = ArbitrageHistory
+    filters = [model.symbol == symbol.upper()]
+    if days > 0:
+        filters.append(model.recorded_at >= datetime.now() - timedelta(days=days))
+    if exclude_estimated:
+        filters.append(model.mcx_source != "estimated")
+    return filters
+
+
+def statistics_query(filters: Sequence[Any]) -> Select:
+    """
+    One row of count, time span, premium statistics and signal distribution
+
+    The signal distribution is a scalar subquery over a GROUP BY, aggregated
+    into a JSON object, so everything comes back in a single round trip.
+    """
+    model = ArbitrageHistory
+    premium = model.premium_percent
+
+    signals = (
+        select(model.signal, func.count().label("n"))
+        .where(*filters)
+        .group_by(model.signal)
+        .subquery()
+    )
+    distribution = select(
+        func.json_object_agg(signals.c.signal, signals.c.n)
+    ).scalar_subquery()
+
+    return select(
+        func.count().label("count"),
+        func.min(model.recorded_at).label("first_at"),
+        func.max(model.recorded_at).label("last_at"),
+        func.avg(premium).label("average"),
+        func.stddev_samp(premium).label("std"),
+        func.min(premium).label("min"),
+        func.max(premium).label("max"),
+        *(
+            func.percentile_cont(q / 100).within_group(premium).label(f"p{q}")
+            for q in HISTORY_PERCENTILES
+        ),
+        distribution.label("signals"),
+    ).where(*filters)
+
+
+def points_query(
+    filters: Sequence[Any],
+    bucket: Optional[str] = None,
+    columns: Sequence[str] = POINT_COLUMNS,
+    at: Optional[Sequence[datetime]] = None,
+) -> Select:
+    """
+    Chart points oldest first, as tuples of `columns`
+
+    Args:
+        filters: history_filters() output
+        bucket: date_trunc field (see BUCKET_SECONDS); None returns every
+            recording. A bucket averages its prices, premiums and
+            statistics, takes its most frequent signal and is stamped with
+            its start.
+        columns: POINT_COLUMNS names, recorded_at first
+        at: Only the points stamped at these times (recorded_at, or the
+            bucket start)
+
+    Raises:
+        ValueError: Unknown bucket
+    """
+    model = ArbitrageHistory
+    if bucket is None:
+        stmt = select(*(getattr(model, name) for name in columns)).where(*filters)
+        if at is not None:
+            stmt = stmt.where(model.recorded_at.in_(at))
+        return stmt.order_by(model.recorded_at)
+    if bucket not in BUCKET_SECONDS:
+        raise ValueError(
+            f"Unknown bucket: {bucket}. Use {', '.join(BUCKET_SECONDS)}"
+        )
+
+    # Whitelisted above; inlined so SELECT and GROUP BY render identically
+    start = func.date_trunc(literal_column(f"'{bucket}'"), model.recorded_at)
+    aggregates = [start.label("recorded_at")]
+    for name in columns[1:]:
+        column = getattr(model, name)
+        if name == "signal":
+            aggregates.append(func.mode().within_group(column).label(name))
+        else:
+            aggregates.append(func.avg(column).label(name))
+    stmt = select(*aggregates).where(*filters)
+    if at is not None:
+        stmt = stmt.where(start.in_(at))
+    return stmt.group_by(start).order_by(start)
+
+
+def load_history_statistics(
+    db: Session, filters: Sequence[Any]
+) -> Optional[Dict[str, Any]]:
+    """
+    Premium statistics of the matching records, None when there are none
+
+    Returns:
+        {"count", "first_at", "last_at", "average", "std", "min", "max",
+        "percentiles": {"p5", ...}, "signal_distribution"} with floats
+    """
+    row = db.execute(statistics_query(filters)).one()
+    if not row.count:
+        return None
+
+    return {
+        "count": row.count,
+        "first_at": row.first_at,
+        "last_at": row.last_at,
+        "average": float(row.average),
+        # stddev_samp is NULL for a single record
+        "std": float(row.std) if row.std is not None else 0.0,
+        "min": float(row.min),
+        "max": float(row.max),
+        "percentiles": {
+            f"p{q}": float(getattr(row, f"p{q}")) for q in HISTORY_PERCENTILES
+        },
+        "signal_distribution": dict(row.signals or {}),
+    }
+
+
+def choose_bucket(
+    requested: Optional[str], stats: Dict[str, Any], max_points: int
+) -> Optional[str]:
+    """
+    Resolve the requested bucket
+
+    AUTO_BUCKET keeps every recording when they fit in max_points, else
+    picks the finest bucket whose count over the data's time span fits
+    (months when none does).
+    """
+    if requested != AUTO_BUCKET:
+        return requested
+    if stats["count"] <= max_points:
+        return None
+
+    span = (stats["last_at"] - stats["first_at"]).total_seconds()
+    for bucket, seconds in BUCKET_SECONDS.items():
+        if span / seconds <= max_points:
+            return bucket
+    return "month"
+
+
+def load_premium_series(
+    db: Session, filters: Sequence[Any], bucket: Optional[str] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Stream the premium series in STREAM_BATCH_ROWS batches, oldest first
+
+    Returns:
+        (recorded_at as int64 epoch microseconds, premium_percent floats)
+    """
+    stmt = points_query(filters, bucket, SERIES_COLUMNS).execution_options(
+        yield_per=STREAM_BATCH_ROWS
+    )
+    micros, premiums = [], []
+    for batch in db.execute(stmt).partitions():
+        micros.append(
+            np.fromiter(
+                ((at - EPOCH) // MICROSECOND for at, _ in batch),
+                dtype=np.int64,
+                count=len(batch),
+            )
+        )
+        premiums.append(
+            np.fromiter(
+                (float(premium) for _, premium in batch),
+                dtype=np.float64,
+                count=len(batch),
+            )
+        )
+    if not micros:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+    return np.concatenate(micros), np.concatenate(premiums)
+
+
+def kept_times(micros: np.ndarray, keep: np.ndarray) -> Optional[List[datetime]]:
+    """Times of the kept points, None when every point is kept"""
+    if len(keep) == len(micros):
+        return None
+    return [EPOCH + int(us) * MICROSECOND for us in micros[keep]]
+
+
+def load_history_points(
+    db: Session,
+    filters: Sequence[Any],
+    bucket: Optional[str] = None,
+    at: Optional[Sequence[datetime]] = None,
+) -> List[Any]:
+    """POINT_COLUMNS rows oldest first, only those stamped `at` if given"""
+    return db.execute(points_query(filters, bucket, at=at)).all()
@@ -4,6 +4,18 @@ Arbitrage calculation service for COMEX-MCX price comparison
 from typing import Dict, List, Optional
 import statistics
 
+# COMEX futures tickers on Yahoo Finance
+COMEX_SYMBOLS = {
+    "GOLD": "GC=F",
+    "SILVER": "SI=F",
+}
+
+# MCX quote units in grams (GOLD per 10g, SILVER per kg)
+MCX_CONTRACT_SIZES = {
+    "GOLD": 10,
+    "SILVER": 1000,
+}
+
 
 class ArbitrageService:
     """Service for calculating arbitrage opportunities between COMEX and MCX"""
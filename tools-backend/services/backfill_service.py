@@ -0,0 +1,506 @@
+"""
+Chunked, parallel historical backfill engine.
+
+Splits a date range into provider-sized chunks and fetches them concurrently.
+Every upstream call goes through the shared rate limiter in the backfill lane
+(services/data_providers/rate_limiter.py). Each chunk is bulk upserted
+(services/bulk_writer.py) and checkpointed in the same transaction, so an
+interrupted run resumes from the first unfinished chunk.
+
+Jobs:
+- SpotPriceBackfill: metals_prices_spot from MetalPriceAPI. One request per
+  chunk covers all metals plus USD/INR.
+- ArbitrageHistoryBackfill: arbitrage_history built from COMEX (Yahoo
+  Finance), MCX (DhanHQ) and USD/INR (metals_prices_spot).
+
+Usage:
+    engine = BackfillEngine(concurrency=4)
+    result = await engine.run(SpotPriceBackfill(), date(2017, 1, 1), date.today())
+
+CLI:
+    python scripts/backfill_history.py spot --start-date 2017-01-01
+    python scripts/backfill_history.py arbitrage --symbol GOLD --dry-run
+"""
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import asyncio
+import logging
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from config import settings
+from database import SessionLocal
+from models.backfill import BackfillCheckpoint
+from models.metals import MetalsPriceSpot
+from services.arbitrage_service import (
+    COMEX_SYMBOLS,
+    MCX_CONTRACT_SIZES,
+    ArbitrageService,
+)
+from services.bulk_writer import ARBITRAGE_HISTORY, METALS_PRICES_SPOT, bulk_upsert
+from services.data_providers import (
+    DataNotAvailableError,
+    DhanHQProvider,
+    MetalPriceAPIProvider,
+    Priority,
+    YahooFinanceProvider,
+)
+
+logger = logging.getLogger(__name__)
+
+# Typical MCX premium over fair value, used when DhanHQ data is unavailable
+TYPICAL_MCX_PREMIUM = {
+    "GOLD": 0.005,
+    "SILVER": 0.008,
+}
+
+
+@dataclass(frozen=True)
+class DateChunk:
+    """Inclusive date range fetched by a single upstream request"""
+
+    start: date
+    end: date
+
+    def __str__(self) -> str:
+        return f"{self.start}..{self.end}"
+
+
+def split_date_range(start_date: date, end_date: date, chunk_days: int) -> List[DateChunk]:
+    """
+    Split an inclusive date range into consecutive chunks.
+
+    Args:
+        start_date: First date
+        end_date: Last date
+        chunk_days: Maximum days per chunk
+
+    Returns:
+        List of DateChunk in chronological order
+    """
+    if chunk_days < 1:
+        raise ValueError("chunk_days must be at least 1")
+
+    chunks = []
+    current = start_date
+    while current <= end_date:
+        chunk_end = min(current + timedelta(days=chunk_days - 1), end_date)
+        chunks.append(DateChunk(current, chunk_end))
+        current = chunk_end + timedelta(days=1)
+    return chunks
+
+
+@dataclass
+class BackfillResult:
+    """Outcome of a backfill run"""
+
+    job: str
+    start_date: date
+    end_date: date
+    dry_run: bool
+    chunks_total: int = 0
+    chunks_skipped: int = 0
+    chunks_completed: int = 0
+    chunks_failed: int = 0
+    rows_fetched: int = 0
+    rows_written: int = 0
+    errors: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job": self.job,
+            "start_date": self.start_date.isoformat(),
+            "end_date": self.end_date.isoformat(),
+            "dry_run": self.dry_run,
+            "chunks_total": self.chunks_total,
+            "chunks_skipped": self.chunks_skipped,
+            "chunks_completed": self.chunks_completed,
+            "chunks_failed": self.chunks_failed,
+            "rows_fetched": self.rows_fetched,
+            "rows_written": self.rows_written,
+            "errors": self.errors,
+        }
+
+
+class BackfillJob(ABC):
+    """A dataset that can be backfilled chunk by chunk"""
+
+    # Days per upstream request
+    chunk_days: int = 365
+
+    @property
+    @abstractmethod
+    def name(self) -> str:
+        """Checkpoint key, unique per dataset (e.g. "arbitrage:GOLD")"""
+        pass
+
+    @abstractmethod
+    async def fetch_chunk(self, chunk: DateChunk, db: Session) -> List[Dict[str, Any]]:
+        """Fetch and transform one chunk into rows for the target table"""
+        pass
+
+    @abstractmethod
+    def upsert(self, db: Session, rows: List[Dict[str, Any]]) -> int:
+        """Write rows to the target table, returning the count written"""
+        pass
+
+    async def close(self):
+        """Release provider resources after a run"""
+        pass
+
+
+class SpotPriceBackfill(BackfillJob):
+    """Backfill metals_prices_spot from MetalPriceAPI timeframe queries"""
+
+    # Column prefix -> MetalPriceAPI code
+    METALS = {
+        "gold": "XAU",
+        "silver": "XAG",
+        "platinum": "XPT",
+        "palladium": "XPD",
+    }
+
+    def __init__(self, provider: Optional[MetalPriceAPIProvider] = None):
+        self.provider = provider or MetalPriceAPIProvider(
+            api_key=settings.metal_price_api_key, priority=Priority.BACKFILL
+        )
+        self.chunk_days = self.provider.max_history_days
+
+    @property
+    def name(self) -> str:
+        return "spot"
+
+    @staticmethod
+    def _usd_price(rates: Dict[str, float], code: str) -> Optional[float]:
+        """USD per ounce from a USD-based rates dict"""
+        if f"USD{code}" in rates:
+            return rates[f"USD{code}"]
+        if rates.get(code):
+            return 1 / rates[code]
+        return None
+
+    async def fetch_chunk(self, chunk: DateChunk, db: Session) -> List[Dict[str, Any]]:
+        rates_by_date = await self.provider.get_timeframe_rates(
+            [*self.METALS.values(), "INR"], chunk.start, chunk.end, base="USD"
+        )
+
+        rows = []
+        for day, rates in sorted(rates_by_date.items()):
+            usd_inr = rates.get("INR")
+            row: Dict[str, Any] = {"date": day, "usd_inr_rate": usd_inr}
+            for metal, code in self.METALS.items():
+                usd = self._usd_price(rates, code)
+                row[f"{metal}_usd"] = usd
+                row[f"{metal}_inr"] = usd * usd_inr if usd and usd_inr else None
+            rows.append(row)
+        return rows
+
+    def upsert(self, db: Session, rows: List[Dict[str, Any]]) -> int:
+        return bulk_upsert(db, METALS_PRICES_SPOT, rows)
+
+    async def close(self):
+        await self.provider.close()
+
+
+class ArbitrageHistoryBackfill(BackfillJob):
+    """
+    Backfill arbitrage_history for one symbol.
+
+    COMEX and MCX chunks are fetched concurrently; USD/INR comes from
+    metals_prices_spot, so run the spot backfill first. Dates without an
+    MCX print use an estimated MCX price (fair value plus typical premium).
+    """
+
+    def __init__(
+        self,
+        symbol: str,
+        use_dhan: bool = True,
+        yahoo: Optional[YahooFinanceProvider] = None,
+        dhan: Optional[DhanHQProvider] = None,
+    ):
+        self.symbol = symbol.upper()
+        if self.symbol not in COMEX_SYMBOLS:
+            raise ValueError(f"Unknown symbol: {symbol}")
+
+        self.yahoo = yahoo or YahooFinanceProvider()
+        self.dhan = dhan
+        if (
+            self.dhan is None
+            and use_dhan
+            and settings.dhan_client_id
+            and settings.dhan_access_token
+        ):
+            self.dhan = DhanHQProvider(
+                client_id=settings.dhan_client_id,
+                access_token=settings.dhan_access_token,
+                priority=Priority.BACKFILL,
+            )
+        if self.dhan is None:
+            logger.warning("DhanHQ not configured, MCX prices will be estimated")
+        else:
+            self.chunk_days = self.dhan.max_history_days
+
+    @property
+    def name(self) -> str:
+        return f"arbitrage:{self.symbol}"
+
+    @staticmethod
+    def _usdinr_rates(db: Session, chunk: DateChunk) -> Dict[date, float]:
+        rows = (
+            db.query(MetalsPriceSpot.date, MetalsPriceSpot.usd_inr_rate)
+            .filter(
+                MetalsPriceSpot.date >= chunk.start,
+                MetalsPriceSpot.date <= chunk.end,
+                MetalsPriceSpot.usd_inr_rate.isnot(None),
+            )
+            .all()
+        )
+        return {row.date: float(row.usd_inr_rate) for row in rows}
+
+    async def _comex_prices(self, chunk: DateChunk) -> Dict[date, float]:
+        try:
+            history = await self.yahoo.get_historical_data(
+                COMEX_SYMBOLS[self.symbol], chunk.start, chunk.end
+            )
+        except DataNotAvailableError:
+            # Holidays/weekends-only chunk
+            return {}
+        return {p.date: float(p.close) for p in history.data_points}
+
+    async def _mcx_prices(self, chunk: DateChunk) -> Dict[date, float]:
+        if self.dhan is None:
+            return {}
+        try:
+            frame = await self.dhan.get_historical_frame(
+                self.symbol, chunk.start, chunk.end
+            )
+        except DataNotAvailableError:
+            return {}
+        return dict(zip(frame.dates.tolist(), frame.close.tolist()))
+
+    async def fetch_chunk(self, chunk: DateChunk, db: Session) -> List[Dict[str, Any]]:
+        usdinr_rates = self._usdinr_rates(db, chunk)
+        if not usdinr_rates:
+            raise DataNotAvailableError(
+                "metals_prices_spot", f"No USD/INR rates for {chunk}"
+            )
+
+        comex_prices, mcx_prices = await asyncio.gather(
+            self._comex_prices(chunk), self._mcx_prices(chunk)
+        )
+
+        contract_size = MCX_CONTRACT_SIZES[self.symbol]
+        comex_source = f"Yahoo Finance ({COMEX_SYMBOLS[self.symbol]})"
+        rows = []
+
+        for day in sorted(comex_prices):
+            usdinr_rate = usdinr_rates.get(day)
+            if usdinr_rate is None:
+                continue
+
+            comex_price = comex_prices[day]
+            fair_value = ArbitrageService.calculate_fair_value(
+                comex_price_usd_per_oz=comex_price,
+                usdinr_rate=usdinr_rate,
+                import_duty_percent=ArbitrageService.DEFAULT_IMPORT_DUTY_PERCENT,
+                contract_size_grams=contract_size,
+            )
+            if fair_value <= 0:
+                continue
+
+            if day in mcx_prices:
+                mcx_price = mcx_prices[day]
+                mcx_source = "DhanHQ"
+            else:
+                mcx_price = fair_value * (1 + TYPICAL_MCX_PREMIUM[self.symbol])
+                mcx_source = "estimated"
+
+            metrics = ArbitrageService.calculate_arbitrage_metrics(
+                mcx_price=mcx_price, fair_value=fair_value
+            )
+
+            rows.append(
+                {
+                    "symbol": self.symbol,
+                    "recorded_at": datetime.combine(day, datetime.min.time()),
+                    "comex_price_usd": comex_price,
+                    "mcx_price_inr": mcx_price,
+                    "usdinr_rate": usdinr_rate,
+                    "fair_value_inr": fair_value,
+                    "premium": metrics["premium"],
+                    "premium_percent": metrics["premium_percent"],
+                    "signal": metrics["signal"],
+                    "comex_source": comex_source,
+                    "mcx_source": mcx_source,
+                }
+            )
+
+        return rows
+
+    def upsert(self, db: Session, rows: List[Dict[str, Any]]) -> int:
+        return bulk_upsert(db, ARBITRAGE_HISTORY, rows)
+
+
+class BackfillEngine:
+    """
+    Runs a BackfillJob over a date range with bounded concurrency.
+
+    Concurrency bounds in-flight chunks; the per-upstream request rate is
+    still enforced by the shared rate limiter, so extra concurrency only
+    overlaps latency and DB writes.
+
+    Chunks ending today or later are written but not checkpointed: today's
+    data is still incomplete, so the next run fetches them again.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 4,
+        dry_run: bool = False,
+        resume: bool = True,
+        session_factory: Callable[[], Session] = SessionLocal,
+        clock: Callable[[], date] = date.today,
+    ):
+        self.concurrency = max(1, concurrency)
+        self.dry_run = dry_run
+        self.resume = resume
+        self.session_factory = session_factory
+        self.clock = clock
+
+    def _completed_ranges(self, job_name: str) -> List[Tuple[date, date]]:
+        """Date ranges already checkpointed as done for a job"""
+        with self.session_factory() as db:
+            rows = (
+                db.query(BackfillCheckpoint.chunk_start, BackfillCheckpoint.chunk_end)
+                .filter(
+                    BackfillCheckpoint.job == job_name,
+                    BackfillCheckpoint.status == "done",
+                )
+                .all()
+            )
+        return [(row.chunk_start, row.chunk_end) for row in rows]
+
+    @staticmethod
+    def _checkpoint(
+        db: Session,
+        job_name: str,
+        chunk: DateChunk,
+        status: str,
+        rows_written: int = 0,
+        error: Optional[str] = None,
+    ):
+        stmt = pg_insert(BackfillCheckpoint.__table__).values(
+            job=job_name,
+            chunk_start=chunk.start,
+            chunk_end=chunk.end,
+            status=status,
+            rows_written=rows_written,
+            error=error,
+        )
+        db.execute(
+            stmt.on_conflict_do_update(
+                constraint="uq_backfill_chunk",
+                set_={
+                    "status": stmt.excluded.status,
+                    "rows_written": stmt.excluded.rows_written,
+                    "error": stmt.excluded.error,
+                    "updated_at": func.now(),
+                },
+            )
+        )
+
+    async def _process_chunk(
+        self, job: BackfillJob, chunk: DateChunk, result: BackfillResult
+    ):
+        db = self.session_factory()
+        try:
+            rows = await job.fetch_chunk(chunk, db)
+            result.rows_fetched += len(rows)
+
+            if self.dry_run:
+                logger.info(f"[dry-run] {job.name} {chunk}: {len(rows)} rows")
+            else:
+                written = job.upsert(db, rows) if rows else 0
+                if chunk.end < self.clock():
+                    self._checkpoint(db, job.name, chunk, "done", written)
+                db.commit()
+                result.rows_written += written
+                logger.info(f"{job.name} {chunk}: {written} rows written")
+
+            result.chunks_completed += 1
+
+        except Exception as e:
+            db.rollback()
+            result.chunks_failed += 1
+            result.errors.append(f"{chunk}: {e}")
+            logger.error(f"Backfill {job.name} {chunk} failed: {e}")
+
+            if not self.dry_run:
+                try:
+                    self._checkpoint(db, job.name, chunk, "failed", error=str(e))
+                    db.commit()
+                except Exception as checkpoint_error:
+                    db.rollback()
+                    logger.error(f"Failed to checkpoint {chunk}: {checkpoint_error}")
+        finally:
+            db.close()
+
+    async def run(
+        self, job: BackfillJob, start_date: date, end_date: date
+    ) -> BackfillResult:
+        """
+        Backfill a job's dataset for an inclusive date range.
+
+        Args:
+            job: Dataset to backfill
+            start_date: First date
+            end_date: Last date
+
+        Returns:
+            BackfillResult with chunk and row counts
+        """
+        chunks = split_date_range(start_date, end_date, job.chunk_days)
+        result = BackfillResult(
+            job=job.name,
+            start_date=start_date,
+            end_date=end_date,
+            dry_run=self.dry_run,
+            chunks_total=len(chunks),
+        )
+
+        # A chunk is done if an earlier run covered its whole range
+        completed = self._completed_ranges(job.name) if self.resume else []
+        pending = [
+            chunk
+            for chunk in chunks
+            if not any(s <= chunk.start and chunk.end <= e for s, e in completed)
+        ]
+        result.chunks_skipped = len(chunks) - len(pending)
+
+        logger.info(
+            f"Backfill {job.name} {start_date}..{end_date}: {len(pending)} chunks "
+            f"pending, {result.chunks_skipped} already done"
+            + (" (dry run)" if self.dry_run else "")
+        )
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def process(chunk: DateChunk):
+            async with semaphore:
+                await self._process_chunk(job, chunk, result)
+
+        try:
+            await asyncio.gather(*(process(chunk) for chunk in pending))
+        finally:
+            await job.close()
+
+        logger.info(
+            f"Backfill {job.name} finished: {result.chunks_completed} completed, "
+            f"{result.chunks_failed} failed, {result.rows_written} rows written"
+        )
+        return result
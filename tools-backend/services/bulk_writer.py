@@ -0,0 +1,276 @@
+"""
+Bulk upsert writer for price, arbitrage and COT ingestion.
+
+Row-at-a-time INSERT ... ON CONFLICT costs one round trip per row. This
+writer stages rows in a temporary table with COPY (psycopg2 copy_expert),
+or with execute_values pages as a fallback, and then merges them in a
+single INSERT ... SELECT ... ON CONFLICT statement.
+
+Usage:
+    with SessionLocal() as db:
+        bulk_upsert(db, ARBITRAGE_HISTORY, rows)
+        db.commit()
+"""
+
+from dataclasses import dataclass, replace
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Tuple
+import csv
+import io
+import logging
+import math
+import uuid
+
+from sqlalchemy import Table
+from sqlalchemy.orm import Session
+
+from models.arbitrage import ArbitrageHistory
+from models.cot import (
+    COTMLRegimeHistory,
+    COTReportDisaggFuturesOnly,
+    COTReportLegacy,
+    COTScreenerFeature,
+)
+from models.correlation import CorrelationRegime
+from models.metals import MetalsPriceSpot
+from models.pivot import PivotLevel
+
+logger = logging.getLogger(__name__)
+
+# NULL marker in the staged CSV, so empty strings survive as empty strings
+COPY_NULL = "\\N"
+
+# Rows per execute_values page
+VALUES_PAGE_SIZE = 1000
+
+
+def _quote(identifier: str) -> str:
+    """Quote a SQL identifier (COT columns contain spaces)"""
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+@dataclass(frozen=True)
+class UpsertTarget:
+    """
+    Destination table for bulk upserts.
+
+    Attributes:
+        schema: Table schema
+        table: Table name
+        columns: Columns written by the upsert
+        conflict_columns: Columns of the unique constraint to merge on
+        keep_existing_on_null: Don't overwrite stored values with incoming NULLs
+    """
+
+    schema: str
+    table: str
+    columns: Tuple[str, ...]
+    conflict_columns: Tuple[str, ...]
+    keep_existing_on_null: bool = False
+
+    @classmethod
+    def from_table(
+        cls,
+        table: Table,
+        conflict_columns: Iterable[str],
+        exclude: Iterable[str] = (),
+        keep_existing_on_null: bool = False,
+    ) -> "UpsertTarget":
+        """Build a target from a SQLAlchemy table definition"""
+        excluded = set(exclude)
+        return cls(
+            schema=table.schema,
+            table=table.name,
+            columns=tuple(c.name for c in table.columns if c.name not in excluded),
+            conflict_columns=tuple(conflict_columns),
+            keep_existing_on_null=keep_existing_on_null,
+        )
+
+    @property
+    def qualified_name(self) -> str:
+        return f"{_quote(self.schema)}.{_quote(self.table)}"
+
+
+# Ingestion targets
+ARBITRAGE_HISTORY = UpsertTarget.from_table(
+    ArbitrageHistory.__table__,
+    conflict_columns=("symbol", "recorded_at"),
+    exclude=("id", "created_at"),
+)
+
+# Partial sources (e.g. a missing metal) must not erase data loaded earlier
+METALS_PRICES_SPOT = UpsertTarget.from_table(
+    MetalsPriceSpot.__table__,
+    conflict_columns=("date",),
+    keep_existing_on_null=True,
+)
+
+# market_key is generated by the database
+COT_DISAGG_FUTURES_ONLY = UpsertTarget.from_table(
+    COTReportDisaggFuturesOnly.__table__,
+    conflict_columns=("ID",),
+    exclude=("market_key",),
+)
+
+COT_LEGACY = UpsertTarget.from_table(
+    COTReportLegacy.__table__,
+    conflict_columns=("symbol", "report_date"),
+    exclude=("id", "created_at"),
+)
+
+COT_SCREENER_FEATURES = UpsertTarget.from_table(
+    COTScreenerFeature.__table__,
+    conflict_columns=("market_key",),
+)
+
+COT_ML_REGIME_HISTORY = UpsertTarget.from_table(
+    COTMLRegimeHistory.__table__,
+    conflict_columns=("market_key", "window", "report_date"),
+    exclude=("id",),
+)
+
+CORRELATION_REGIMES = UpsertTarget.from_table(
+    CorrelationRegime.__table__,
+    conflict_columns=("pair", "date"),
+    exclude=("id",),
+)
+
+PIVOT_LEVELS = UpsertTarget.from_table(
+    PivotLevel.__table__,
+    conflict_columns=("symbol", "exchange", "timeframe", "period_date"),
+    exclude=("id",),
+)
+
+
+def _copy_value(value: Any) -> Any:
+    """Format a Python value for the staged CSV"""
+    if value is None:
+        return COPY_NULL
+    if isinstance(value, float) and math.isnan(value):
+        return COPY_NULL
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _dedupe(
+    rows: List[Dict[str, Any]], conflict_columns: Tuple[str, ...]
+) -> List[Dict[str, Any]]:
+    """
+    Keep the last row per conflict key.
+
+    ON CONFLICT DO UPDATE rejects a statement that touches the same row
+    twice, so duplicates have to be dropped before merging.
+    """
+    latest: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+    for row in rows:
+        latest[tuple(row.get(c) for c in conflict_columns)] = row
+    return list(latest.values())
+
+
+def _copy_buffer(rows: List[Dict[str, Any]], columns: Tuple[str, ...]) -> io.StringIO:
+    """Serialize rows as CSV for COPY FROM STDIN"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([_copy_value(row.get(c)) for c in columns])
+    buffer.seek(0)
+    return buffer
+
+
+def _merge_sql(target: UpsertTarget, staging: str) -> str:
+    """INSERT ... SELECT ... ON CONFLICT statement merging the staging table"""
+    columns = ", ".join(_quote(c) for c in target.columns)
+    conflict = ", ".join(_quote(c) for c in target.conflict_columns)
+    updates = [c for c in target.columns if c not in target.conflict_columns]
+
+    if target.keep_existing_on_null:
+        assignments = ", ".join(
+            f"{_quote(c)} = COALESCE(EXCLUDED.{_quote(c)}, {target.qualified_name}.{_quote(c)})"
+            for c in updates
+        )
+    else:
+        assignments = ", ".join(f"{_quote(c)} = EXCLUDED.{_quote(c)}" for c in updates)
+
+    action = f"DO UPDATE SET {assignments}" if updates else "DO NOTHING"
+    return (
+        f"INSERT INTO {target.qualified_name} ({columns}) "
+        f"SELECT {columns} FROM {staging} "
+        f"ON CONFLICT ({conflict}) {action}"
+    )
+
+
+def bulk_upsert(
+    db: Session,
+    target: UpsertTarget,
+    rows: List[Dict[str, Any]],
+    method: str = "copy",
+) -> int:
+    """
+    Upsert rows through a temporary staging table.
+
+    Runs inside the session's current transaction; the caller commits.
+
+    Args:
+        db: Database session
+        target: Destination table
+        rows: Row dictionaries keyed by column name. Only columns present
+            in at least one row are written; others keep their stored values
+        method: "copy" (COPY FROM STDIN) or "values" (execute_values pages)
+
+    Returns:
+        Number of rows inserted or updated
+    """
+    if not rows:
+        return 0
+    if method not in ("copy", "values"):
+        raise ValueError(f"Unknown bulk upsert method: {method}")
+
+    present = set().union(*(row.keys() for row in rows))
+    missing = [c for c in target.conflict_columns if c not in present]
+    if missing:
+        raise ValueError(f"Rows are missing conflict columns: {missing}")
+    target = replace(target, columns=tuple(c for c in target.columns if c in present))
+
+    rows = _dedupe(rows, target.conflict_columns)
+    columns = ", ".join(_quote(c) for c in target.columns)
+    staging = _quote(f"_bulk_{target.table}_{uuid.uuid4().hex[:8]}")
+
+    # Raw psycopg2 connection sharing the session's transaction
+    dbapi_connection = db.connection().connection
+    cursor = dbapi_connection.cursor()
+    try:
+        # CREATE TABLE AS copies column types without NOT NULL/serial constraints
+        cursor.execute(
+            f"CREATE TEMP TABLE {staging} ON COMMIT DROP AS "
+            f"SELECT {columns} FROM {target.qualified_name} WITH NO DATA"
+        )
+
+        if method == "copy":
+            cursor.copy_expert(
+                f"COPY {staging} ({columns}) FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')",
+                _copy_buffer(rows, target.columns),
+            )
+        else:
+            from psycopg2.extras import execute_values
+
+            execute_values(
+                cursor,
+                f"INSERT INTO {staging} ({columns}) VALUES %s",
+                [tuple(row.get(c) for c in target.columns) for row in rows],
+                page_size=VALUES_PAGE_SIZE,
+            )
+
+        cursor.execute(_merge_sql(target, staging))
+        written = cursor.rowcount
+        cursor.execute(f"DROP TABLE {staging}")
+    finally:
+        cursor.close()
+
+    logger.debug(f"Bulk upserted {written} rows into {target.qualified_name}")
+    return written
@@ -0,0 +1,387 @@
+"""
+Correlation Regime Service
+
+/correlation/breakdown fetches and computes one period on demand. This
+service computes the rolling correlations of every configured pair
+(settings.correlation_regime_pairs) over 20/60/120/250 trading days across
+the full metals_prices_spot history in one vectorized pass
+(CorrelationService.rolling_pair_correlations), labels each day's regime,
+tests for structural breaks and stores the result in correlation_regimes,
+so regime views are a single indexed read.
+
+A structural break is detected where the correlation of the BREAK_WINDOW
+days after a day differs from the BREAK_WINDOW days up to it (Fisher
+z-test, |z| >= BREAK_Z) and |z| is the largest within half a window either
+side. The fixed-window statistic peaks early (a strongly correlated window
+loses little by dropping its last days), so the break is then placed on the
+day within half a window that best splits the surrounding returns into two
+correlation regimes (locate_break). The last BREAK_WINDOW days cannot be
+tested yet.
+"""
+
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+import logging
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from config import settings
+from models.correlation import CorrelationRegime
+from models.metals import MetalsPriceSpot
+from schemas.correlation import (
+    CorrelationBreak,
+    CorrelationRegimeHistoryResponse,
+    CorrelationRegimePoint,
+    CorrelationRegimeSummary,
+    CorrelationRegimesResponse,
+)
+from services.bulk_writer import CORRELATION_REGIMES, bulk_upsert
+from services.correlation_service import CorrelationService
+from services.correlation_stream_service import Pair, pair_key, parse_pairs
+
+logger = logging.getLogger(__name__)
+
+# Rolling windows in trading days (stored as corr_<window>)
+REGIME_WINDOWS = (20, 60, 120, 250)
+
+# Window whose correlation defines the regime
+REGIME_WINDOW = 120
+
+# Structural break test window and threshold
+BREAK_WINDOW = 60
+BREAK_Z = 3.0
+
+# Fewest observations on either side of a located break
+MIN_SEGMENT = 10
+
+# Days rewritten nightly; break tests of older days no longer change
+REFRESH_DAYS = 2 * BREAK_WINDOW
+
+# Price columns of the stored history
+REGIME_ASSETS = {
+    "GOLD": MetalsPriceSpot.gold_usd,
+    "SILVER": MetalsPriceSpot.silver_usd,
+    "PLATINUM": MetalsPriceSpot.platinum_usd,
+    "PALLADIUM": MetalsPriceSpot.palladium_usd,
+    "USDINR": MetalsPriceSpot.usd_inr_rate,
+}
+
+# (lower bound, regime) from the strongest positive band down
+REGIME_BANDS = (
+    (0.6, "strong_positive"),
+    (0.2, "positive"),
+    (-0.2, "uncorrelated"),
+    (-0.6, "negative"),
+)
+
+WINDOW_COLUMNS = tuple(f"corr_{window}" for window in REGIME_WINDOWS)
+
+
+def correlation_regimes(correlations: np.ndarray) -> np.ndarray:
+    """Regime label of each correlation (None where missing)"""
+    correlations = np.asarray(correlations, dtype=np.float64)
+    labels = np.select(
+        [correlations >= bound for bound, _ in REGIME_BANDS],
+        [regime for _, regime in REGIME_BANDS],
+        default="strong_negative",
+    ).astype(object)
+    labels[np.isnan(correlations)] = None
+    return labels
+
+
+def locate_break(x: np.ndarray, y: np.ndarray, first: int, last: int) -> int:
+    """
+    Most likely last day of the old correlation regime
+
+    Splits the returns after each day in [first, last] and scores each split
+    by the Gaussian log-likelihood of a separate correlation on either side,
+    -n/2 * log(1 - r^2) summed over both segments.
+
+    Args:
+        x, y: Returns of the search span, NaN where missing
+        first, last: Candidate split days (indices into x and y)
+
+    Returns:
+        Index of the best split's last day
+    """
+    valid = ~(np.isnan(x) | np.isnan(y))
+    x, y = np.where(valid, x, 0.0), np.where(valid, y, 0.0)
+    sums = np.cumsum(
+        np.vstack([valid.astype(np.float64), x, y, x * x, y * y, x * y]), axis=1
+    )
+
+    def log_likelihood(n, sx, sy, sxx, syy, sxy):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            r = (sxy - sx * sy / n) / np.sqrt((sxx - sx * sx / n) * (syy - sy * sy / n))
+            score = -n / 2 * np.log1p(-np.minimum(r * r, 0.999999))
+        return np.where(n >= MIN_SEGMENT, np.nan_to_num(score, nan=0.0), -np.inf)
+
+    before = sums[:, first : last + 1]
+    after = sums[:, -1:] - before
+    scores = log_likelihood(*before) + log_likelihood(*after)
+    return first + int(np.argmax(scores))
+
+
+class CorrelationRegimeService:
+    """Precomputed multi-window correlation regimes and structural breaks"""
+
+    @staticmethod
+    def pairs() -> List[Pair]:
+        """Configured pairs"""
+        return parse_pairs(settings.correlation_regime_pairs, tuple(REGIME_ASSETS))
+
+    @staticmethod
+    def load_returns(db: Session) -> pd.DataFrame:
+        """Daily returns of every asset over the full stored history"""
+        rows = (
+            db.query(MetalsPriceSpot.date, *REGIME_ASSETS.values())
+            .order_by(MetalsPriceSpot.date)
+            .all()
+        )
+        prices = pd.DataFrame(rows, columns=["date", *REGIME_ASSETS])
+        prices = prices.set_index(pd.to_datetime(prices["date"])).drop(columns="date")
+        prices = prices.apply(pd.to_numeric, errors="coerce")
+        # Missing prices stay missing instead of becoming zero returns
+        returns = prices.pct_change(fill_method=None)
+        return returns.replace([np.inf, -np.inf], np.nan).iloc[1:]
+
+    @staticmethod
+    def regime_rows(returns: pd.DataFrame, pairs: List[Pair]) -> List[Dict[str, Any]]:
+        """
+        correlation_regimes rows of every pair and day, in one vectorized pass
+
+        Args:
+            returns: Daily returns, one column per asset (NaN where missing)
+            pairs: Asset pairs
+
+        Returns:
+            Rows of the days with at least one window's correlation
+        """
+        columns = {asset: i for i, asset in enumerate(returns.columns)}
+        rolling = CorrelationService.rolling_pair_correlations(
+            returns.to_numpy(),
+            [(columns[a], columns[b]) for a, b in pairs],
+            REGIME_WINDOWS,
+        )
+
+        # Break test: window ending today vs the following window
+        before, n_before = rolling[BREAK_WINDOW]
+        after = np.full_like(before, np.nan)
+        n_after = np.zeros_like(n_before)
+        after[:-BREAK_WINDOW] = before[BREAK_WINDOW:]
+        n_after[:-BREAK_WINDOW] = n_before[BREAK_WINDOW:]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            shift = (
+                np.arctanh(np.clip(after, -0.999999, 0.999999))
+                - np.arctanh(np.clip(before, -0.999999, 0.999999))
+            ) / np.sqrt(1 / (n_before - 3) + 1 / (n_after - 3))
+        strength = np.nan_to_num(np.abs(shift), nan=0.0)
+        local_max = (
+            pd.DataFrame(strength)
+            .rolling(BREAK_WINDOW + 1, center=True, min_periods=1)
+            .max()
+            .to_numpy()
+        )
+        detected = (strength >= BREAK_Z) & (strength == local_max)
+
+        # Move each detected break to the best split within half a window
+        data = returns.to_numpy()
+        half = BREAK_WINDOW // 2
+        tested = len(data) - BREAK_WINDOW - 1
+        is_break = np.zeros_like(detected)
+        for day, p in zip(*np.nonzero(detected)):
+            a, b = (columns[asset] for asset in pairs[p])
+            start = max(0, day - half - BREAK_WINDOW + 1)
+            end = min(len(data), day + half + BREAK_WINDOW + 1)
+            split = locate_break(
+                data[start:end, a],
+                data[start:end, b],
+                max(day - half, start) - start,
+                min(day + half, tested) - start,
+            )
+            is_break[start + split, p] = True
+
+        regimes = correlation_regimes(rolling[REGIME_WINDOW][0])
+        updated_at = datetime.now(timezone.utc)
+        dates = returns.index.date
+
+        rows = []
+        for p, pair in enumerate(pairs):
+            frame = pd.DataFrame(
+                {
+                    **{
+                        column: rolling[window][0][:, p]
+                        for column, window in zip(WINDOW_COLUMNS, REGIME_WINDOWS)
+                    },
+                    "corr_next_60": after[:, p],
+                    "shift_stat": shift[:, p],
+                },
+                index=dates,
+            ).round(4)
+            frame["regime"] = regimes[:, p]
+            frame["is_break"] = is_break[:, p]
+            frame = frame[frame[list(WINDOW_COLUMNS)].notna().any(axis=1)]
+
+            frame = frame.astype(object).where(frame.notna(), None)
+            rows.extend(
+                {
+                    "pair": pair_key(pair),
+                    "date": day,
+                    **record,
+                    "is_break": bool(record["is_break"]),
+                    "updated_at": updated_at,
+                }
+                for day, record in zip(frame.index, frame.to_dict("records"))
+            )
+        return rows
+
+    @staticmethod
+    def refresh(db: Session, days: Optional[int] = REFRESH_DAYS) -> int:
+        """
+        Recompute the configured pairs and store their latest days.
+
+        Args:
+            db: Database session
+            days: Latest trading days to write; None writes the full history
+
+        Runs inside the session's transaction; the caller commits.
+
+        Returns:
+            Number of rows written
+        """
+        returns = CorrelationRegimeService.load_returns(db)
+        if days is not None:
+            # History the written days' longest window and break test need
+            keep = days + max(REGIME_WINDOWS) + BREAK_WINDOW
+            returns = returns.iloc[-keep:]
+        rows = CorrelationRegimeService.regime_rows(
+            returns, CorrelationRegimeService.pairs()
+        )
+
+        if days is not None:
+            cutoff = returns.index[-days].date() if len(returns) >= days else None
+            rows = [row for row in rows if cutoff is None or row["date"] >= cutoff]
+
+        written = bulk_upsert(db, CORRELATION_REGIMES, rows)
+        logger.info(f"Correlation regimes: {written} pair-days refreshed")
+        return written
+
+    @staticmethod
+    def _stored_key(db: Session, asset1: str, asset2: str) -> str:
+        """Stored pair key of two assets in either order"""
+        pair = (asset1.upper(), asset2.upper())
+        for key in (pair_key(pair), pair_key(pair[::-1])):
+            stored = (
+                db.query(CorrelationRegime.id)
+                .filter(CorrelationRegime.pair == key)
+                .first()
+            )
+            if stored:
+                return key
+        raise ValueError(f"No stored correlation regimes for {pair_key(pair)}")
+
+    @staticmethod
+    def get_summary(db: Session) -> CorrelationRegimesResponse:
+        """Latest regime and last break of every stored pair"""
+        model = CorrelationRegime
+        latest_dates = (
+            db.query(model.pair, func.max(model.date).label("date"))
+            .group_by(model.pair)
+            .subquery()
+        )
+        latest = (
+            db.query(model)
+            .join(
+                latest_dates,
+                (model.pair == latest_dates.c.pair)
+                & (model.date == latest_dates.c.date),
+            )
+            .order_by(model.pair)
+            .all()
+        )
+        last_breaks = dict(
+            db.query(model.pair, func.max(model.date))
+            .filter(model.is_break.is_(True))
+            .group_by(model.pair)
+            .all()
+        )
+
+        pairs = [
+            CorrelationRegimeSummary(
+                pair=record.pair,
+                asset1=record.pair.split(":")[0],
+                asset2=record.pair.split(":")[1],
+                date=record.date,
+                **{column: getattr(record, column) for column in WINDOW_COLUMNS},
+                regime=record.regime,
+                last_break=last_breaks.get(record.pair),
+            )
+            for record in latest
+        ]
+        return CorrelationRegimesResponse(
+            windows=list(REGIME_WINDOWS),
+            regime_window=REGIME_WINDOW,
+            as_of=max((item.date for item in pairs), default=None),
+            pairs=pairs,
+        )
+
+    @staticmethod
+    def get_history(
+        db: Session, asset1: str, asset2: str, days: int = 750
+    ) -> CorrelationRegimeHistoryResponse:
+        """
+        Stored regime history of a pair, oldest day first
+
+        Raises:
+            ValueError: Pair has no stored history
+        """
+        key = CorrelationRegimeService._stored_key(db, asset1, asset2)
+        model = CorrelationRegime
+        records = (
+            db.query(model)
+            .filter(model.pair == key)
+            .order_by(model.date.desc())
+            .limit(days)
+            .all()
+        )[::-1]
+
+        history = [
+            CorrelationRegimePoint(
+                date=record.date,
+                **{column: getattr(record, column) for column in WINDOW_COLUMNS},
+                regime=record.regime,
+                shift_stat=record.shift_stat,
+                is_break=record.is_break,
+            )
+            for record in records
+        ]
+        breaks = [
+            CorrelationBreak(
+                date=record.date,
+                correlation_before=record.corr_60,
+                correlation_after=record.corr_next_60,
+                shift_stat=record.shift_stat,
+            )
+            for record in records
+            if record.is_break
+        ]
+
+        return CorrelationRegimeHistoryResponse(
+            pair=key,
+            asset1=key.split(":")[0],
+            asset2=key.split(":")[1],
+            windows=list(REGIME_WINDOWS),
+            regime_window=REGIME_WINDOW,
+            break_window=BREAK_WINDOW,
+            current_regime=history[-1].regime if history else None,
+            history=history,
+            breaks=breaks,
+            regime_distribution=dict(
+                Counter(point.regime for point in history if point.regime)
+            ),
+        )
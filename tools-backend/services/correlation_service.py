@@ -3,10 +3,23 @@ Correlation analysis service for multi-asset analysis
 Optimized with numpy and pandas for high-performance calculations
 """
 
-from typing import List, Dict, Tuple, Union
+from collections import deque
+from typing import Any, List, Dict, Optional, Tuple, Union
 import numpy as np
 import pandas as pd
 import math
+from scipy import stats
+
+# Date alignment modes for multi-asset return series
+ALIGN_INNER = "inner"  # Only dates every asset traded
+ALIGN_FFILL = "ffill"  # All dates, carrying the last close over holidays
+ALIGNMENTS = (ALIGN_INNER, ALIGN_FFILL)
+
+# Fewest overlapping observations a lag correlation is computed from
+MIN_LAG_OVERLAP = 10
+
+# Updates between exact recomputations of RollingCorrelation's running sums
+RESYNC_EVERY = 1000
 
 
 class CorrelationService:
@@ -52,6 +65,100 @@ class CorrelationService:
         # Clamp to [-1, 1] to handle floating point errors
         return float(np.clip(correlation, -1.0, 1.0))
 
+    @staticmethod
+    def align_returns(
+        closes: Dict[str, pd.Series], how: str = ALIGN_INNER
+    ) -> pd.DataFrame:
+        """
+        Join close series on their dates and compute aligned returns
+
+        Args:
+            closes: Close prices per asset, indexed by date
+            how: "inner" keeps dates every asset traded; "ffill" keeps all
+                dates, carrying each asset's last close over its holidays
+                (zero return on those dates)
+
+        Returns:
+            (T x n) DataFrame of simple returns, one column per asset
+        """
+        if how not in ALIGNMENTS:
+            raise ValueError(f"Unknown alignment: {how}")
+
+        prices = pd.concat(closes, axis=1, join="outer").sort_index()
+        if how == ALIGN_FFILL:
+            prices = prices.ffill()
+        # Also drops dates before every asset has a price
+        prices = prices.dropna()
+
+        returns = prices.pct_change().iloc[1:]
+        return returns.replace([np.inf, -np.inf], np.nan).dropna()
+
+    @staticmethod
+    def correlation_matrix(
+        returns: Union[np.ndarray, pd.DataFrame], confidence: float = 0.95
+    ) -> Dict[str, np.ndarray]:
+        """
+        Full correlation matrix with p-values and confidence intervals
+
+        Computed for all pairs at once from one (T x n) array: correlations
+        from the centered cross-product matrix, two-sided p-values from the
+        t-distribution and intervals from Fisher's Z transformation.
+
+        Args:
+            returns: Aligned returns, one column per asset
+            confidence: Confidence level of the intervals
+
+        Returns:
+            Dict of (n x n) arrays "correlation", "p_value", "ci_lower",
+            "ci_upper" and the scalar "sample_size"
+        """
+        x = np.asarray(returns, dtype=np.float64)
+        sample_size = x.shape[0]
+        if sample_size < 2:
+            raise ValueError("At least 2 aligned observations required")
+
+        centered = x - x.mean(axis=0)
+        norms = np.sqrt(np.einsum("ij,ij->j", centered, centered))
+        scale = np.outer(norms, norms)
+
+        # Zero-variance assets get 0 correlation, as calculate_correlation
+        correlation = np.zeros_like(scale)
+        np.divide(centered.T @ centered, scale, out=correlation, where=scale > 0)
+        correlation = np.clip(correlation, -1.0, 1.0)
+        np.fill_diagonal(correlation, 1.0)
+
+        p_value = CorrelationService.correlation_p_values(correlation, sample_size)
+
+        if sample_size < 4:
+            ci_lower, ci_upper = correlation.copy(), correlation.copy()
+        else:
+            z = np.arctanh(np.clip(correlation, -1 + 1e-12, 1 - 1e-12))
+            margin = stats.norm.ppf(0.5 + confidence / 2) / math.sqrt(sample_size - 3)
+            ci_lower, ci_upper = np.tanh(z - margin), np.tanh(z + margin)
+
+        return {
+            "correlation": correlation,
+            "p_value": p_value,
+            "ci_lower": ci_lower,
+            "ci_upper": ci_upper,
+            "sample_size": sample_size,
+        }
+
+    @staticmethod
+    def correlation_p_values(
+        correlation: Union[float, np.ndarray], sample_size: int
+    ) -> np.ndarray:
+        """Two-sided p-values of correlations (t-test with n - 2 df)"""
+        r = np.asarray(correlation, dtype=np.float64)
+        if sample_size < 3:
+            return np.ones_like(r)
+
+        df = sample_size - 2
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = r * np.sqrt(df / (1 - r**2))
+        # |r| = 1 gives an infinite t statistic and p = 0
+        return 2 * stats.t.sf(np.abs(np.nan_to_num(t, nan=0.0)), df)
+
     @staticmethod
     def classify_correlation_strength(correlation: float) -> str:
         """
@@ -204,34 +311,16 @@ class CorrelationService:
     @staticmethod
     def calculate_p_value(correlation: float, sample_size: int) -> float:
         """
-        Calculate approximate p-value for correlation
+        Calculate the two-sided p-value for a correlation
 
         Args:
             correlation: Correlation coefficient
             sample_size: Number of observations
 
         Returns:
-            P-value (approximate)
+            P-value
         """
-        if sample_size < 3:
-            return 1.0
-
-        # t-statistic
-        t = correlation * math.sqrt((sample_size - 2) / (1 - correlation**2))
-
-        # Approximate p-value using t-distribution
-        # This is a simplified approximation
-        # degrees of freedom = sample_size - 2
-
-        # Very rough approximation
-        if abs(t) > 2.576:  # 99% confidence
-            return 0.01
-        elif abs(t) > 1.96:  # 95% confidence
-            return 0.05
-        elif abs(t) > 1.645:  # 90% confidence
-            return 0.10
-        else:
-            return 0.20
+        return float(CorrelationService.correlation_p_values(correlation, sample_size))
 
     @staticmethod
     def calculate_confidence_interval(
@@ -384,6 +473,9 @@ class CorrelationService:
                 "divergence_pct": 0,
                 "signal": "neutral",
                 "interpretation": "Insufficient data",
+                "history": CorrelationService.divergence_series(
+                    returns1, returns2, beta, lookback_days
+                ),
             }
 
         # Get recent returns
@@ -405,24 +497,16 @@ class CorrelationService:
         divergence = cumulative_return1 - expected_move1
         divergence_pct = divergence * 100
 
-        # Calculate historical divergences for z-score using numpy
-        arr1 = CorrelationService._to_numpy(returns1)
-        arr2 = CorrelationService._to_numpy(returns2)
-        min_len = min(len(arr1), len(arr2))
-
-        historical_divergences = []
-        for i in range(lookback_days, min_len):
-            hist_ret1 = float(np.sum(arr1[i - lookback_days : i]))
-            hist_ret2 = float(np.sum(arr2[i - lookback_days : i]))
-            hist_expected = beta * hist_ret2
-            hist_divergence = hist_ret1 - hist_expected
-            historical_divergences.append(hist_divergence)
+        # Rolling divergence series; the latest window is the current one
+        series = CorrelationService.divergence_series(
+            returns1, returns2, beta, lookback_days
+        )
+        historical_divergences = series["divergence"][:-1]
 
-        # Calculate z-score using numpy
+        # Z-score of the current divergence against all earlier windows
         if len(historical_divergences) >= 2:
-            hist_arr = np.array(historical_divergences)
-            mean_div = float(np.mean(hist_arr))
-            std_div = float(np.std(hist_arr, ddof=1)) if len(hist_arr) > 1 else 1.0
+            mean_div = float(np.mean(historical_divergences))
+            std_div = float(np.std(historical_divergences, ddof=1))
             z_score = (divergence - mean_div) / std_div if std_div > 0 else 0
         else:
             z_score = 0
@@ -455,6 +539,67 @@ class CorrelationService:
             "divergence_pct": round(divergence_pct, 3),
             "signal": signal,
             "interpretation": interpretation,
+            "history": series,
+        }
+
+    @staticmethod
+    def divergence_series(
+        returns1: Union[List[float], np.ndarray],
+        returns2: Union[List[float], np.ndarray],
+        beta: float,
+        lookback_days: int = 30,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Divergence of every rolling lookback window, in O(N)
+
+        Window sums come from one cumulative sum of the daily residuals
+        (returns1 - beta * returns2). Each window's z-score is taken against
+        all earlier windows, so the last point matches detect_divergence.
+
+        Args:
+            returns1: Returns for asset 1, aligned with returns2
+            returns2: Returns for asset 2
+            beta: Historical beta between assets
+            lookback_days: Window length
+
+        Returns:
+            Dict of arrays "actual_move", "expected_move", "divergence" and
+            "z_score" (NaN until two earlier windows exist), one entry per
+            window ending at index lookback_days - 1 .. N - 1
+        """
+        arr1 = CorrelationService._to_numpy(returns1)
+        arr2 = CorrelationService._to_numpy(returns2)
+        n = min(len(arr1), len(arr2))
+        if n < lookback_days:
+            empty = np.array([], dtype=np.float64)
+            return {
+                "actual_move": empty,
+                "expected_move": empty,
+                "divergence": empty,
+                "z_score": empty,
+            }
+
+        def window_sums(values: np.ndarray) -> np.ndarray:
+            sums = np.concatenate(([0.0], np.cumsum(values[-n:])))
+            return sums[lookback_days:] - sums[:-lookback_days]
+
+        actual = window_sums(arr1)
+        expected = beta * window_sums(arr2)
+        divergence = actual - expected
+
+        # Mean and std of the windows before each point
+        history = pd.Series(divergence).expanding(min_periods=2)
+        mean = history.mean().shift(1).to_numpy()
+        std = history.std(ddof=1).shift(1).to_numpy()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            z_score = np.where(std > 0, (divergence - mean) / std, 0.0)
+        z_score[np.isnan(std)] = np.nan
+
+        return {
+            "actual_move": actual,
+            "expected_move": expected,
+            "divergence": divergence,
+            "z_score": z_score,
         }
 
     @staticmethod
@@ -482,28 +627,11 @@ class CorrelationService:
                 "interpretation": "Insufficient data for lead-lag analysis",
             }
 
-        correlations = {}
-
-        # Test different lags
-        for lag in range(-max_lag, max_lag + 1):
-            if lag < 0:
-                # Asset 2 leads (shift asset 1 forward)
-                r1 = returns1[-lag:]
-                r2 = returns2[:lag]
-            elif lag > 0:
-                # Asset 1 leads (shift asset 2 forward)
-                r1 = returns1[:-lag]
-                r2 = returns2[lag:]
-            else:
-                r1 = returns1
-                r2 = returns2
-
-            min_len = min(len(r1), len(r2))
-            if min_len >= 10:
-                corr = CorrelationService.calculate_correlation(
-                    r1[:min_len], r2[:min_len]
-                )
-                correlations[lag] = corr
+        # All lags in one FFT pass
+        lags, lag_correlations = CorrelationService.cross_correlation(
+            returns1, returns2, max_lag
+        )
+        correlations = dict(zip(lags.tolist(), lag_correlations.tolist()))
 
         if not correlations:
             return {
@@ -538,6 +666,232 @@ class CorrelationService:
             "interpretation": interpretation,
         }
 
+    @staticmethod
+    def cross_correlation(
+        returns1: Union[List[float], np.ndarray],
+        returns2: Union[List[float], np.ndarray],
+        max_lag: int = 5,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Pearson correlation of returns1[t] with returns2[t + lag] for every lag
+
+        Computed for all lags at once with an FFT, so max_lag in the
+        hundreds over long (e.g. intraday) series stays cheap. Each lag is
+        the exact correlation of its overlapping observations.
+
+        Args:
+            returns1: Returns for asset 1
+            returns2: Returns for asset 2 (series are aligned on their tails)
+            max_lag: Largest lag in periods, capped so every lag keeps
+                MIN_LAG_OVERLAP observations
+
+        Returns:
+            (lags, correlations) from -max_lag to max_lag; a positive lag
+            means asset 1 leads
+        """
+        arr1 = CorrelationService._to_numpy(returns1)
+        arr2 = CorrelationService._to_numpy(returns2)
+        n = min(len(arr1), len(arr2))
+
+        lags, correlations = CorrelationService.lagged_correlations(
+            np.column_stack([arr1[len(arr1) - n :], arr2[len(arr2) - n :]]),
+            [(0, 1)],
+            max_lag,
+        )
+        return lags, correlations[(0, 1)]
+
+    @staticmethod
+    def lagged_correlations(
+        data: np.ndarray, pairs: List[Tuple[int, int]], max_lag: int
+    ) -> Tuple[np.ndarray, Dict[Tuple[int, int], np.ndarray]]:
+        """
+        FFT cross-correlations of column pairs of a (T x n) returns array
+
+        Each column is transformed once. Per pair the lagged cross products
+        come from one inverse FFT, and the per-lag sums and sums of squares
+        of the overlapping segments from prefix sums.
+
+        Returns:
+            (lags, {(i, j): correlation of column i at t with column j at
+            t + lag, one value per lag})
+        """
+        data = np.asarray(data, dtype=np.float64)
+        t = data.shape[0]
+        max_lag = max(0, min(max_lag, t - MIN_LAG_OVERLAP))
+        lags = np.arange(-max_lag, max_lag + 1)
+        if t < MIN_LAG_OVERLAP:
+            return lags[:0], {pair: np.array([]) for pair in pairs}
+
+        centered = data - data.mean(axis=0)
+        # Zero padding to >= 2T - 1 makes the circular correlation linear
+        nfft = 1 << (2 * t - 2).bit_length()
+        spectra = np.fft.rfft(centered, nfft, axis=0)
+
+        zeros = np.zeros((1, data.shape[1]))
+        prefix = np.vstack([zeros, np.cumsum(centered, axis=0)])
+        prefix_sq = np.vstack([zeros, np.cumsum(centered**2, axis=0)])
+        sum_sq = prefix_sq[-1]
+
+        overlap = t - np.abs(lags)
+        start1 = np.maximum(-lags, 0)
+        start2 = np.maximum(lags, 0)
+
+        def segment(sums: np.ndarray, column: int, start: np.ndarray) -> np.ndarray:
+            return sums[start + overlap, column] - sums[start, column]
+
+        correlations = {}
+        for i, j in pairs:
+            products = np.fft.irfft(np.conj(spectra[:, i]) * spectra[:, j], nfft)
+            cross = products[lags % nfft]
+
+            sum1, sum2 = segment(prefix, i, start1), segment(prefix, j, start2)
+            var1 = segment(prefix_sq, i, start1) - sum1**2 / overlap
+            var2 = segment(prefix_sq, j, start2) - sum2**2 / overlap
+            cov = cross - sum1 * sum2 / overlap
+            scale = np.sqrt(np.clip(var1 * var2, 0.0, None))
+
+            # Constant segments get 0 correlation, as calculate_correlation
+            correlation = np.zeros_like(cov)
+            tolerance = 1e-12 * np.sqrt(sum_sq[i] * sum_sq[j])
+            np.divide(cov, scale, out=correlation, where=scale > tolerance)
+            correlations[(i, j)] = np.clip(correlation, -1.0, 1.0)
+
+        return lags, correlations
+
+    @staticmethod
+    def lead_lag_matrix(returns: pd.DataFrame, max_lag: int = 20) -> Dict:
+        """
+        Lead-lag relationships of every pair in a basket
+
+        Args:
+            returns: Aligned returns, one column per asset
+            max_lag: Largest lag in periods
+
+        Returns:
+            Dict with "lags", "pairs" (one dict per asset pair with the best
+            lag, its correlation and the full lag profile), "lag_matrix"
+            (best lag of the row asset over the column asset, positive when
+            the row asset leads) and "correlation_matrix" (correlation at
+            that lag)
+        """
+        assets = [str(asset) for asset in returns.columns]
+        pairs = [
+            (i, j) for i in range(len(assets)) for j in range(i + 1, len(assets))
+        ]
+        lags, correlations = CorrelationService.lagged_correlations(
+            returns.to_numpy(), pairs, max_lag
+        )
+        if len(lags) == 0:
+            raise ValueError("Insufficient data for lead-lag analysis")
+
+        zero = int(np.flatnonzero(lags == 0)[0])
+        lag_matrix = {asset: {asset: 0} for asset in assets}
+        correlation_matrix = {asset: {asset: 1.0} for asset in assets}
+        pair_results = []
+
+        for (i, j), profile in correlations.items():
+            strength = np.abs(profile)
+            # Ties (e.g. a constant asset) resolve to no lag
+            best = int(np.argmax(strength))
+            if strength[zero] >= strength[best]:
+                best = zero
+            best_lag = int(lags[best])
+            best_corr = round(float(profile[best]), 3)
+            asset1, asset2 = assets[i], assets[j]
+
+            if best_lag > 0:
+                leading_asset = asset1
+            elif best_lag < 0:
+                leading_asset = asset2
+            else:
+                leading_asset = "simultaneous"
+
+            lag_matrix[asset1][asset2], lag_matrix[asset2][asset1] = best_lag, -best_lag
+            correlation_matrix[asset1][asset2] = best_corr
+            correlation_matrix[asset2][asset1] = best_corr
+            pair_results.append(
+                {
+                    "asset1": asset1,
+                    "asset2": asset2,
+                    "leading_asset": leading_asset,
+                    "lag_periods": abs(best_lag),
+                    "lag_direction": best_lag,
+                    "correlation_at_lag": best_corr,
+                    "correlation_at_zero": round(float(profile[zero]), 3),
+                    "lag_correlations": np.round(profile, 3).tolist(),
+                }
+            )
+
+        return {
+            "lags": lags.tolist(),
+            "pairs": pair_results,
+            "lag_matrix": lag_matrix,
+            "correlation_matrix": correlation_matrix,
+        }
+
+    @staticmethod
+    def rolling_pair_correlations(
+        returns: np.ndarray,
+        pairs: List[Tuple[int, int]],
+        windows: Tuple[int, ...],
+        min_fill: float = 0.8,
+    ) -> Dict[int, Tuple[np.ndarray, np.ndarray]]:
+        """
+        Rolling correlations of many column pairs over several windows
+
+        Cumulative sums of each pair's counts, sums, squares and cross
+        products are built once; every window is then a difference of two
+        rows, so all pairs and windows cost O(T x pairs) each. Missing
+        returns (NaN) of either asset drop that day from the pair's window.
+
+        Args:
+            returns: (T x n) returns, NaN where an asset has no data
+            pairs: Column index pairs
+            windows: Window lengths in rows
+            min_fill: Fewest observations a window needs, as a fraction
+
+        Returns:
+            {window: (correlations, observations)}, each (T x pairs) with
+            NaN correlations where the window is incomplete
+        """
+        data = np.asarray(returns, dtype=np.float64)
+        data = data - np.nanmean(data, axis=0)
+        first = np.array([i for i, _ in pairs], dtype=int)
+        second = np.array([j for _, j in pairs], dtype=int)
+        x, y = data[:, first], data[:, second]
+
+        valid = ~(np.isnan(x) | np.isnan(y))
+        x, y = np.where(valid, x, 0.0), np.where(valid, y, 0.0)
+
+        zeros = np.zeros((1, len(pairs)))
+        sums = [
+            np.vstack([zeros, np.cumsum(values, axis=0)])
+            for values in (valid.astype(np.float64), x, y, x * x, y * y, x * y)
+        ]
+
+        results = {}
+        for window in windows:
+            if window > data.shape[0]:
+                empty = np.full(x.shape, np.nan)
+                results[window] = (empty, np.zeros(x.shape, dtype=int))
+                continue
+            n, sx, sy, sxx, syy, sxy = (
+                total[window:] - total[:-window] for total in sums
+            )
+            with np.errstate(divide="ignore", invalid="ignore"):
+                cov = sxy - sx * sy / n
+                scale = np.sqrt((sxx - sx**2 / n) * (syy - sy**2 / n))
+                correlation = np.clip(cov / scale, -1.0, 1.0)
+            correlation[(n < max(3, min_fill * window)) | ~(scale > 0)] = np.nan
+
+            # Rows before the first full window have no value
+            padding = np.full((window - 1, len(pairs)), np.nan)
+            results[window] = (
+                np.vstack([padding, correlation]),
+                np.vstack([np.zeros_like(padding), n]).astype(int),
+            )
+        return results
+
     @staticmethod
     def generate_trading_signals(
         correlation: float,
@@ -630,3 +984,143 @@ class CorrelationService:
             "signal_count": len(signals),
             "summary": f"Generated {len(signals)} signal(s). Overall: {overall_signal} ({confidence} confidence)",
         }
+
+
+# Running sums of a RollingCorrelation window:
+# (count, mean_x, mean_y, m2_x, m2_y, co-moment)
+Moments = Tuple[int, float, float, float, float, float]
+
+EMPTY_MOMENTS: Moments = (0, 0.0, 0.0, 0.0, 0.0, 0.0)
+
+
+class RollingCorrelation:
+    """
+    Sliding-window correlation, covariance and beta of paired returns
+
+    Keeps Welford running means and co-moments of the last `window` (x, y)
+    pairs, so each new bar or tick costs O(1) instead of recomputing from
+    the full return lists. Beta is of x (the asset) on y (the benchmark),
+    as calculate_beta.
+
+    Usage:
+        state = RollingCorrelation(60)
+        state.update(gold_return, usdinr_return)
+        state.stats()["correlation"]
+
+        saved = state.snapshot()
+        state = RollingCorrelation.restore(saved)
+    """
+
+    def __init__(self, window: int):
+        if window < 2:
+            raise ValueError("Window must hold at least 2 observations")
+        self.window = window
+        self._pairs: deque = deque(maxlen=window)
+        self._moments: Moments = EMPTY_MOMENTS
+        self._updates = 0
+
+    def __len__(self) -> int:
+        return len(self._pairs)
+
+    @staticmethod
+    def _added(moments: Moments, x: float, y: float) -> Moments:
+        n, mean_x, mean_y, m2_x, m2_y, c_xy = moments
+        n += 1
+        dx = x - mean_x
+        mean_x += dx / n
+        mean_y_new = mean_y + (y - mean_y) / n
+        return (
+            n,
+            mean_x,
+            mean_y_new,
+            m2_x + dx * (x - mean_x),
+            m2_y + (y - mean_y) * (y - mean_y_new),
+            c_xy + dx * (y - mean_y_new),
+        )
+
+    @staticmethod
+    def _removed(moments: Moments, x: float, y: float) -> Moments:
+        n, mean_x, mean_y, m2_x, m2_y, c_xy = moments
+        if n <= 1:
+            return EMPTY_MOMENTS
+        n -= 1
+        mean_x_old = mean_x - (x - mean_x) / n
+        mean_y_old = mean_y - (y - mean_y) / n
+        return (
+            n,
+            mean_x_old,
+            mean_y_old,
+            m2_x - (x - mean_x_old) * (x - mean_x),
+            m2_y - (y - mean_y_old) * (y - mean_y),
+            c_xy - (x - mean_x_old) * (y - mean_y),
+        )
+
+    def _next_moments(self, x: float, y: float) -> Moments:
+        """Moments after appending (x, y) and evicting the oldest pair"""
+        moments = self._moments
+        if len(self._pairs) == self.window:
+            moments = self._removed(moments, *self._pairs[0])
+        return self._added(moments, x, y)
+
+    def update(self, x: float, y: float):
+        """Append one (x, y) return pair, evicting the oldest when full"""
+        self._moments = self._next_moments(float(x), float(y))
+        self._pairs.append((float(x), float(y)))
+
+        # Bound floating point drift of the running sums
+        self._updates += 1
+        if self._updates % RESYNC_EVERY == 0:
+            self._resync()
+
+    def _resync(self):
+        moments = EMPTY_MOMENTS
+        for x, y in self._pairs:
+            moments = self._added(moments, x, y)
+        self._moments = moments
+
+    def stats(self, pending: Optional[Tuple[float, float]] = None) -> Dict[str, Any]:
+        """
+        Current window statistics
+
+        Args:
+            pending: Optional (x, y) of an unfinished bar; statistics are
+                computed as if it were appended, without changing the state
+
+        Returns:
+            Dict with observations, correlation, covariance (sample), beta
+            and the volatilities (sample std) of x and y
+        """
+        moments = self._moments
+        if pending is not None:
+            moments = self._next_moments(float(pending[0]), float(pending[1]))
+
+        n, _, _, m2_x, m2_y, c_xy = moments
+        m2_x, m2_y = max(m2_x, 0.0), max(m2_y, 0.0)
+        scale = math.sqrt(m2_x * m2_y)
+        correlation = min(max(c_xy / scale, -1.0), 1.0) if scale > 0 else 0.0
+
+        return {
+            "observations": n,
+            "correlation": correlation,
+            "covariance": c_xy / (n - 1) if n > 1 else 0.0,
+            "beta": c_xy / m2_y if m2_y > 0 else 0.0,
+            "volatility_x": math.sqrt(m2_x / (n - 1)) if n > 1 else 0.0,
+            "volatility_y": math.sqrt(m2_y / (n - 1)) if n > 1 else 0.0,
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-serializable state, restorable with restore()"""
+        return {
+            "window": self.window,
+            "x": [x for x, _ in self._pairs],
+            "y": [y for _, y in self._pairs],
+        }
+
+    @classmethod
+    def restore(cls, snapshot: Dict[str, Any]) -> "RollingCorrelation":
+        """Rebuild a state from snapshot() output or stored return history"""
+        state = cls(int(snapshot["window"]))
+        for x, y in zip(snapshot["x"], snapshot["y"]):
+            state._pairs.append((float(x), float(y)))
+        state._resync()
+        return state
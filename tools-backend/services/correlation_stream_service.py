@@ -0,0 +1,316 @@
+"""
+Live rolling correlation of configured asset pairs.
+
+/correlation/rolling and /correlation/beta recompute from full return lists
+on every request. For live dashboards this service keeps one
+RollingCorrelation state per configured pair (settings.correlation_live_pairs)
+over daily returns:
+
+- On startup the windows are rebuilt from the daily COMEX and USD/INR
+  closes stored in arbitrage_history.
+- Ticks from the live price stream hub reprice the unfinished daily bar in
+  O(1) (RollingCorrelation.stats with a pending pair).
+- When the date rolls over the finished bar is committed to every window.
+  If the unfinished bar is older than the previous session (days without
+  subscribers), it would span several sessions: it is dropped instead and
+  the windows are rebuilt from storage, which holds the missed sessions.
+
+Usage:
+    service = get_live_correlation_service()
+    service.ensure_loaded(db)
+    queue = await get_price_stream_hub().subscribe(service.symbols)
+    updates = service.on_tick(await queue.get())
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+
+import pandas as pd
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from config import settings
+from models.arbitrage import ArbitrageHistory
+from services.correlation_service import (
+    ALIGN_INNER,
+    CorrelationService,
+    RollingCorrelation,
+)
+from services.pivot_level_service import last_completed_session
+
+logger = logging.getLogger(__name__)
+
+# Assets priced by the live price stream: COMEX metals and USD/INR
+USDINR = "USDINR"
+LIVE_ASSETS = ("GOLD", "SILVER", USDINR)
+
+Pair = Tuple[str, str]
+
+
+def parse_pairs(spec: str, assets: Tuple[str, ...] = LIVE_ASSETS) -> List[Pair]:
+    """
+    Parse "GOLD:SILVER,GOLD:USDINR" into asset pairs
+
+    Raises:
+        ValueError: Malformed pair or asset not in `assets`
+    """
+    pairs = []
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        pair = tuple(asset.strip().upper() for asset in item.split(":"))
+        if len(pair) != 2 or pair[0] == pair[1] or not set(pair) <= set(assets):
+            raise ValueError(
+                f"Invalid pair: {item.strip()}. "
+                f"Use ASSET1:ASSET2 with assets from {', '.join(assets)}."
+            )
+        if pair not in pairs:
+            pairs.append(pair)
+    if not pairs:
+        raise ValueError("At least one pair required")
+    return pairs
+
+
+def pair_key(pair: Pair) -> str:
+    return f"{pair[0]}:{pair[1]}"
+
+
+class LiveCorrelationService:
+    """Per-pair rolling correlation states fed by live price ticks"""
+
+    def __init__(self, pairs: List[Pair], window: int = 60):
+        self.pairs = pairs
+        self.window = window
+        self._states: Dict[Pair, RollingCorrelation] = {
+            pair: RollingCorrelation(window) for pair in pairs
+        }
+        # Closes of the last committed bar and prices of the unfinished one
+        self._closes: Dict[str, float] = {}
+        self._quotes: Dict[str, float] = {}
+        self._bar_date: Optional[date] = None
+        self._loaded = False
+
+    @property
+    def symbols(self) -> List[str]:
+        """Price stream symbols needed by the pairs (USD/INR comes with any)"""
+        return sorted({asset for pair in self.pairs for asset in pair} - {USDINR})
+
+    # ------------------------------------------------------------------
+    # Startup rebuild and snapshots
+    # ------------------------------------------------------------------
+
+    def load_daily_closes(self, db: Session, today: date) -> Dict[str, pd.Series]:
+        """Last stored COMEX and USD/INR price of each day before today"""
+        model = ArbitrageHistory
+        day = func.date(model.recorded_at)
+        since = today - timedelta(days=self.window * 2 + 10)
+
+        rows = (
+            db.query(model.symbol, day, model.comex_price_usd, model.usdinr_rate)
+            .filter(
+                model.symbol.in_(self.symbols),
+                model.recorded_at >= since,
+                model.recorded_at < today,
+            )
+            .distinct(model.symbol, day)
+            .order_by(model.symbol, day, model.recorded_at.desc())
+            .all()
+        )
+        frame = pd.DataFrame(rows, columns=["symbol", "day", "comex", USDINR])
+        if frame.empty:
+            return {}
+        frame["day"] = pd.to_datetime(frame["day"])
+
+        closes = {
+            symbol: history.set_index("day")["comex"].astype(float)
+            for symbol, history in frame.groupby("symbol")
+        }
+        closes[USDINR] = frame.groupby("day")[USDINR].last().astype(float)
+        return closes
+
+    def rebuild(self, db: Session, today: Optional[date] = None):
+        """Rebuild every window from the stored daily closes"""
+        today = today or date.today()
+        closes = self.load_daily_closes(db, today)
+
+        snapshot = {"bar_date": today.isoformat(), "closes": {}, "states": {}}
+        if closes:
+            returns = CorrelationService.align_returns(closes, ALIGN_INNER)
+            returns = returns.iloc[-self.window :]
+            snapshot["closes"] = {
+                asset: float(series.iloc[-1]) for asset, series in closes.items()
+            }
+            # Pairs without stored history for both assets start empty
+            snapshot["states"] = {
+                pair_key(pair): {
+                    "window": self.window,
+                    "x": returns[pair[0]].tolist(),
+                    "y": returns[pair[1]].tolist(),
+                }
+                for pair in self.pairs
+                if set(pair) <= set(returns.columns)
+            }
+
+        self.restore(snapshot)
+        logger.info(
+            f"Live correlation rebuilt: {len(self.pairs)} pairs, "
+            f"{max((len(s) for s in self._states.values()), default=0)} daily bars"
+        )
+
+    def needs_rebuild(self, today: Optional[date] = None) -> bool:
+        """True before the first load and once the windows miss a session"""
+        if not self._loaded:
+            return True
+        previous_session = last_completed_session(today or date.today())
+        return self._bar_date is not None and self._bar_date < previous_session
+
+    def ensure_loaded(self, db: Session, today: Optional[date] = None):
+        if self.needs_rebuild(today):
+            self.rebuild(db, today)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-serializable state of every pair, restorable with restore()"""
+        return {
+            "bar_date": self._bar_date.isoformat() if self._bar_date else None,
+            "closes": dict(self._closes),
+            "quotes": dict(self._quotes),
+            "states": {
+                pair_key(pair): state.snapshot() for pair, state in self._states.items()
+            },
+        }
+
+    def restore(self, snapshot: Dict[str, Any]):
+        """Restore snapshot() output; pairs missing from it start empty"""
+        bar_date = snapshot.get("bar_date")
+        self._bar_date = date.fromisoformat(bar_date) if bar_date else None
+        self._closes = dict(snapshot.get("closes") or {})
+        self._quotes = dict(snapshot.get("quotes") or {})
+
+        states = snapshot.get("states") or {}
+        self._states = {
+            pair: RollingCorrelation.restore(states[pair_key(pair)])
+            if pair_key(pair) in states
+            else RollingCorrelation(self.window)
+            for pair in self.pairs
+        }
+        self._loaded = True
+
+    # ------------------------------------------------------------------
+    # Live updates
+    # ------------------------------------------------------------------
+
+    def on_tick(
+        self, tick: Dict[str, Any], now: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Apply a price stream tick.
+
+        Commits the previous daily bar on date rollover. A bar older than
+        the previous session is dropped instead of committed as one return
+        spanning several sessions, and the service is marked for a rebuild
+        (callers check needs_rebuild() before applying ticks). Every
+        subscriber applies the same tick, so applying it again changes
+        nothing.
+
+        Returns:
+            Updates of the pairs priced by the tick
+        """
+        today = (now or datetime.now()).date()
+        if self._bar_date is None:
+            self._bar_date = today
+        elif self._bar_date < last_completed_session(today):
+            logger.warning(
+                f"Live correlation bar of {self._bar_date} is stale; "
+                "dropping it until the windows are rebuilt"
+            )
+            self._quotes = {}
+            self._bar_date = today
+            self._loaded = False
+        elif today > self._bar_date:
+            self._commit_bar()
+            self._bar_date = today
+
+        prices = {USDINR: tick.get("usdinr_rate")}
+        if tick.get("symbol") in LIVE_ASSETS:
+            prices[tick["symbol"]] = tick.get("comex_price_usd")
+
+        priced = {asset for asset, price in prices.items() if price is not None}
+        for asset in priced:
+            self._quotes[asset] = float(prices[asset])
+
+        return [
+            self.pair_update(pair) for pair in self.pairs if priced.intersection(pair)
+        ]
+
+    def _bar_returns(self) -> Dict[str, float]:
+        """Returns of the unfinished bar so far"""
+        return {
+            asset: price / self._closes[asset] - 1
+            for asset, price in self._quotes.items()
+            if self._closes.get(asset)
+        }
+
+    def _commit_bar(self):
+        """Append the finished bar to every window it completes"""
+        returns = self._bar_returns()
+        for pair, state in self._states.items():
+            if pair[0] in returns and pair[1] in returns:
+                state.update(returns[pair[0]], returns[pair[1]])
+        self._closes.update(self._quotes)
+        self._quotes = {}
+
+    def pair_update(self, pair: Pair) -> Dict[str, Any]:
+        """Live statistics of a pair, including the unfinished bar if priced"""
+        state = self._states[pair]
+        returns = self._bar_returns()
+        pending = (
+            (returns[pair[0]], returns[pair[1]])
+            if pair[0] in returns and pair[1] in returns
+            else None
+        )
+
+        def rounded(stats: Dict[str, Any]) -> Dict[str, Any]:
+            return {
+                name: value if name == "observations" else round(value, 6)
+                for name, value in stats.items()
+            }
+
+        return {
+            "type": "correlation",
+            "pair": pair_key(pair),
+            "asset1": pair[0],
+            "asset2": pair[1],
+            "window": self.window,
+            "bar_date": self._bar_date.isoformat() if self._bar_date else None,
+            "includes_live_bar": pending is not None,
+            **rounded(state.stats(pending)),
+            "committed": rounded(state.stats()),
+            "timestamp": datetime.now().isoformat(),
+        }
+
+    def status(self) -> Dict[str, Any]:
+        """Current statistics of every pair"""
+        return {
+            "window": self.window,
+            "loaded": self._loaded,
+            "bar_date": self._bar_date.isoformat() if self._bar_date else None,
+            "closes": self._closes,
+            "quotes": self._quotes,
+            "pairs": [self.pair_update(pair) for pair in self.pairs],
+        }
+
+
+# Global service instance (one per process)
+_live_correlation_service: Optional[LiveCorrelationService] = None
+
+
+def get_live_correlation_service() -> LiveCorrelationService:
+    """Get the global live correlation service"""
+    global _live_correlation_service
+    if _live_correlation_service is None:
+        _live_correlation_service = LiveCorrelationService(
+            parse_pairs(settings.correlation_live_pairs),
+            settings.correlation_live_window,
+        )
+    return _live_correlation_service
@@ -9,12 +9,36 @@ Provides advanced analysis including:
 - Regime classification
 """
 
-from typing import List
+from typing import Dict, Iterable, Optional, Tuple
+import numpy as np
+import pandas as pd
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
 import logging
 
-from models.cot import COTReportDisaggFuturesOnly
+from services.cot_frame import (
+    COTContext,
+    COTFrame,
+    load_commodity_frame,
+    load_cot_panel,
+    rolling_rank,
+    change_column,
+    position_column,
+    trader_column,
+    NET_COLUMNS,
+    SPREAD_CATEGORIES,
+    SPREAD_COLUMNS,
+    CHANGE_COLUMNS,
+    TRADER_COLUMNS,
+    CONCENTRATION_COLUMNS,
+    CURVE_COLUMNS,
+    PRODUCER_MERCHANT,
+    SWAP_DEALER,
+    MANAGED_MONEY,
+    OTHER_REPORTABLES,
+    NON_REPORTABLES,
+    REPORT_DATE,
+    WEEK_RANK,
+)
 from schemas.cot import (
     FlowComponent,
     FlowDecompositionData,
@@ -26,6 +50,7 @@ from schemas.cot import (
     SqueezeRiskMetrics,
     SqueezeRiskResponse,
     AdvancedCOTSummary,
+    ComprehensiveAdvancedAnalysis,
     # Priority 2 schemas
     CurveBucketPositioning,
     CurveAnalysisResponse,
@@ -48,23 +73,52 @@ from schemas.cot import (
 
 logger = logging.getLogger(__name__)
 
+# Every column used by the single-commodity analyses (see load_context)
+ANALYSIS_COLUMNS = (
+    NET_COLUMNS
+    + SPREAD_COLUMNS
+    + CHANGE_COLUMNS
+    + TRADER_COLUMNS
+    + CONCENTRATION_COLUMNS
+    + CURVE_COLUMNS
+)
+
+# Columns of the ML regime feature vector (see ml_regime_features)
+ML_REGIME_COLUMNS = (
+    NET_COLUMNS
+    + SPREAD_COLUMNS
+    + TRADER_COLUMNS
+    + CONCENTRATION_COLUMNS
+    + ("Open_Interest_Old", "Open_Interest_Other")
+)
+
+# Decimal places of MLRegimeFeatures values (others use 1)
+ML_FEATURE_DIGITS = {"mm_4wk_flow": 2, "commercial_4wk_flow": 2, "front_back_ratio": 2}
+
 
 class COTAdvancedService:
     """Service for advanced COT analytics"""
 
+    @staticmethod
+    def load_context(db: Session, commodity: str, weeks: int = 52) -> COTContext:
+        """Load a commodity's history once, with every column the analyses use"""
+        return COTContext.load(db, commodity, ANALYSIS_COLUMNS, weeks)
+
     @staticmethod
     def get_historical_data(
-        db: Session, commodity: str, weeks: int = 52
-    ) -> List[COTReportDisaggFuturesOnly]:
-        """Fetch historical COT data for a commodity"""
-        query = db.query(COTReportDisaggFuturesOnly).filter(
-            COTReportDisaggFuturesOnly.Commodity_Name.ilike(f"%{commodity}%")
-        )
-        return (
-            query.order_by(desc(COTReportDisaggFuturesOnly.Report_Date_as_YYYY_MM_DD))
-            .limit(weeks)
-            .all()
-        )
+        db: Session,
+        commodity: str,
+        weeks: int,
+        columns: Iterable[str],
+        context: Optional[COTContext] = None,
+    ) -> COTFrame:
+        """
+        Fetch historical COT data for a commodity, projecting only `columns`.
+        With a context, the latest `weeks` of its shared history are used instead.
+        """
+        if context is not None:
+            return context.window(weeks)
+        return load_commodity_frame(db, commodity, columns, weeks)
 
     @staticmethod
     def calculate_flow_component(change_long: int, change_short: int) -> FlowComponent:
@@ -112,43 +166,46 @@ class COTAdvancedService:
 
     @staticmethod
     def analyze_flow_decomposition(
-        db: Session, commodity: str, weeks: int = 12
+        db: Session,
+        commodity: str,
+        weeks: int = 12,
+        context: Optional[COTContext] = None,
     ) -> FlowDecompositionResponse:
         """Analyze flow decomposition for all trader categories"""
-        data = COTAdvancedService.get_historical_data(db, commodity, weeks)
+        data = COTAdvancedService.get_historical_data(
+            db, commodity, weeks, CHANGE_COLUMNS, context
+        )
 
-        if not data:
+        if not len(data):
             raise ValueError(f"No data found for commodity: {commodity}")
 
-        historical_flows = []
-
-        for record in data:
-            # Get change values
-            pm_long = record.get_int_value(record.Change_in_Prod_Merc_Long_All)
-            pm_short = record.get_int_value(record.Change_in_Prod_Merc_Short_All)
-            swap_long = record.get_int_value(record.Change_in_Swap_Long_All)
-            swap_short = record.get_int_value(record.Change_in_Swap_Short_All)
-            mm_long = record.get_int_value(record.Change_in_M_Money_Long_All)
-            mm_short = record.get_int_value(record.Change_in_M_Money_Short_All)
-            other_long = record.get_int_value(record.Change_in_Other_Rept_Long_All)
-            other_short = record.get_int_value(record.Change_in_Other_Rept_Short_All)
-
-            flow_data = FlowDecompositionData(
-                report_date=str(record.Report_Date_as_YYYY_MM_DD or ""),
-                producer_merchant=COTAdvancedService.calculate_flow_component(
-                    pm_long, pm_short
-                ),
-                swap_dealer=COTAdvancedService.calculate_flow_component(
-                    swap_long, swap_short
-                ),
-                managed_money=COTAdvancedService.calculate_flow_component(
-                    mm_long, mm_short
-                ),
-                other_reportables=COTAdvancedService.calculate_flow_component(
-                    other_long, other_short
-                ),
+        # Change columns as Python ints, one list per category and side
+        changes = {
+            (category, side): data.column(change_column(category, side)).tolist()
+            for category in (
+                PRODUCER_MERCHANT,
+                SWAP_DEALER,
+                MANAGED_MONEY,
+                OTHER_REPORTABLES,
+            )
+            for side in ("Long", "Short")
+        }
+
+        def flow(category: str, i: int) -> FlowComponent:
+            return COTAdvancedService.calculate_flow_component(
+                changes[(category, "Long")][i], changes[(category, "Short")][i]
+            )
+
+        historical_flows = [
+            FlowDecompositionData(
+                report_date=report_date,
+                producer_merchant=flow(PRODUCER_MERCHANT, i),
+                swap_dealer=flow(SWAP_DEALER, i),
+                managed_money=flow(MANAGED_MONEY, i),
+                other_reportables=flow(OTHER_REPORTABLES, i),
             )
-            historical_flows.append(flow_data)
+            for i, report_date in enumerate(data.dates.tolist())
+        ]
 
         current = historical_flows[0] if historical_flows else None
 
@@ -185,37 +242,28 @@ class COTAdvancedService:
 
     @staticmethod
     def analyze_participation(
-        db: Session, commodity: str, weeks: int = 52
+        db: Session,
+        commodity: str,
+        weeks: int = 52,
+        context: Optional[COTContext] = None,
     ) -> ParticipationResponse:
         """Analyze participation and detect whale-driven moves"""
-        data = COTAdvancedService.get_historical_data(db, commodity, weeks)
+        data = COTAdvancedService.get_historical_data(
+            db, commodity, weeks, NET_COLUMNS + TRADER_COLUMNS, context
+        )
 
         if len(data) < 2:
             raise ValueError(f"Insufficient data for commodity: {commodity}")
 
-        current = data[0]
-        previous = data[1]
-
-        # Calculate historical averages for comparison
-        avg_mm_contracts_long = []
-        avg_mm_contracts_short = []
-
-        for record in data:
-            mm_long = record.get_int_value(record.M_Money_Positions_Long_All)
-            mm_short = record.get_int_value(record.M_Money_Positions_Short_All)
-            traders_long = record.Traders_M_Money_Long_All or 1
-            traders_short = record.Traders_M_Money_Short_All or 1
-
-            avg_mm_contracts_long.append(mm_long / traders_long if traders_long else 0)
-            avg_mm_contracts_short.append(
-                mm_short / traders_short if traders_short else 0
-            )
+        # Historical contracts per trader (missing trader counts treated as 1)
+        avg_mm_contracts_long = data.avg_position(MANAGED_MONEY, "Long")
+        avg_mm_contracts_short = data.avg_position(MANAGED_MONEY, "Short")
 
         # Calculate percentiles
         def percentile(values, pct):
-            sorted_vals = sorted(values)
+            sorted_vals = np.sort(values)
             idx = int(len(sorted_vals) * pct / 100)
-            return sorted_vals[min(idx, len(sorted_vals) - 1)]
+            return float(sorted_vals[min(idx, len(sorted_vals) - 1)])
 
         p90_long = percentile(avg_mm_contracts_long, 90)
         p90_short = percentile(avg_mm_contracts_short, 90)
@@ -223,19 +271,18 @@ class COTAdvancedService:
         metrics = []
 
         # Managed Money
-        mm_long = current.get_int_value(current.M_Money_Positions_Long_All)
-        mm_short = current.get_int_value(current.M_Money_Positions_Short_All)
-        mm_traders_long = current.Traders_M_Money_Long_All or 1
-        mm_traders_short = current.Traders_M_Money_Short_All or 1
-        prev_mm_traders_long = previous.Traders_M_Money_Long_All or 1
-        prev_mm_traders_short = previous.Traders_M_Money_Short_All or 1
+        mm_long = int(data.long(MANAGED_MONEY)[0])
+        mm_short = int(data.short(MANAGED_MONEY)[0])
+        mm_traders = data.traders(MANAGED_MONEY, "Long", default=1) + data.traders(
+            MANAGED_MONEY, "Short", default=1
+        )
+        mm_traders_long = data.value(trader_column(MANAGED_MONEY, "Long")) or 1
+        mm_traders_short = data.value(trader_column(MANAGED_MONEY, "Short")) or 1
 
-        mm_avg_long = mm_long / mm_traders_long if mm_traders_long else 0
-        mm_avg_short = mm_short / mm_traders_short if mm_traders_short else 0
+        mm_avg_long = float(avg_mm_contracts_long[0])
+        mm_avg_short = float(avg_mm_contracts_short[0])
 
-        trader_change = (mm_traders_long + mm_traders_short) - (
-            prev_mm_traders_long + prev_mm_traders_short
-        )
+        trader_change = int(mm_traders[0] - mm_traders[1])
 
         is_whale = (
             mm_avg_long > p90_long or mm_avg_short > p90_short
@@ -265,16 +312,15 @@ class COTAdvancedService:
         )
 
         # Producer/Merchant
-        pm_long = current.get_int_value(current.Prod_Merc_Positions_Long_All)
-        pm_short = current.get_int_value(current.Prod_Merc_Positions_Short_All)
-        pm_traders_long = current.Traders_Prod_Merc_Long_All or 1
-        pm_traders_short = current.Traders_Prod_Merc_Short_All or 1
-        prev_pm_traders_long = previous.Traders_Prod_Merc_Long_All or 1
-        prev_pm_traders_short = previous.Traders_Prod_Merc_Short_All or 1
-
-        pm_trader_change = (pm_traders_long + pm_traders_short) - (
-            prev_pm_traders_long + prev_pm_traders_short
+        pm_long = int(data.long(PRODUCER_MERCHANT)[0])
+        pm_short = int(data.short(PRODUCER_MERCHANT)[0])
+        pm_traders = data.traders(PRODUCER_MERCHANT, "Long", default=1) + data.traders(
+            PRODUCER_MERCHANT, "Short", default=1
         )
+        pm_traders_long = data.value(trader_column(PRODUCER_MERCHANT, "Long")) or 1
+        pm_traders_short = data.value(trader_column(PRODUCER_MERCHANT, "Short")) or 1
+
+        pm_trader_change = int(pm_traders[0] - pm_traders[1])
 
         metrics.append(
             ParticipationMetrics(
@@ -311,7 +357,7 @@ class COTAdvancedService:
 
         return ParticipationResponse(
             commodity=commodity,
-            report_date=str(current.Report_Date_as_YYYY_MM_DD or ""),
+            report_date=data.report_date(),
             metrics=metrics,
             overall_participation=overall,
             whale_alert=whale_alert,
@@ -319,51 +365,44 @@ class COTAdvancedService:
 
     @staticmethod
     def analyze_concentration(
-        db: Session, commodity: str, weeks: int = 52
+        db: Session,
+        commodity: str,
+        weeks: int = 52,
+        context: Optional[COTContext] = None,
     ) -> ConcentrationResponse:
         """Analyze concentration and crowding metrics"""
-        data = COTAdvancedService.get_historical_data(db, commodity, weeks)
+        data = COTAdvancedService.get_historical_data(
+            db, commodity, weeks, CONCENTRATION_COLUMNS, context
+        )
 
-        if not data:
+        if not len(data):
             raise ValueError(f"No data found for commodity: {commodity}")
 
-        current = data[0]
-
         # Get concentration ratios
-        top_4_long = current.Conc_Gross_LE_4_TDR_Long_All or 0
-        top_8_long = current.Conc_Gross_LE_8_TDR_Long_All or 0
-        top_4_short = current.Conc_Gross_LE_4_TDR_Short_All or 0
-        top_8_short = current.Conc_Gross_LE_8_TDR_Short_All or 0
+        top_4_long = data.value("Conc_Gross_LE_4_TDR_Long_All")
+        top_8_long = data.value("Conc_Gross_LE_8_TDR_Long_All")
+        top_4_short = data.value("Conc_Gross_LE_4_TDR_Short_All")
+        top_8_short = data.value("Conc_Gross_LE_8_TDR_Short_All")
 
-        top_4_net_long = current.Conc_Net_LE_4_TDR_Long_All or 0
-        top_8_net_long = current.Conc_Net_LE_8_TDR_Long_All or 0
-        top_4_net_short = current.Conc_Net_LE_4_TDR_Short_All or 0
-        top_8_net_short = current.Conc_Net_LE_8_TDR_Short_All or 0
+        top_4_net_long = data.value("Conc_Net_LE_4_TDR_Long_All")
+        top_8_net_long = data.value("Conc_Net_LE_8_TDR_Long_All")
+        top_4_net_short = data.value("Conc_Net_LE_4_TDR_Short_All")
+        top_8_net_short = data.value("Conc_Net_LE_8_TDR_Short_All")
 
         # Calculate concentration ratios
         long_ratio = top_4_long / top_8_long if top_8_long > 0 else 0.5
         short_ratio = top_4_short / top_8_short if top_8_short > 0 else 0.5
 
-        # Historical percentiles
-        hist_long_ratios = []
-        hist_short_ratios = []
-        for record in data:
-            t4l = record.Conc_Gross_LE_4_TDR_Long_All or 0
-            t8l = record.Conc_Gross_LE_8_TDR_Long_All or 1
-            t4s = record.Conc_Gross_LE_4_TDR_Short_All or 0
-            t8s = record.Conc_Gross_LE_8_TDR_Short_All or 1
-            hist_long_ratios.append(t4l / t8l if t8l > 0 else 0.5)
-            hist_short_ratios.append(t4s / t8s if t8s > 0 else 0.5)
-
-        def calc_percentile(value, values):
-            return (
-                sum(1 for v in values if v <= value) / len(values) * 100
-                if values
-                else 50
+        # Historical ratios (missing top-8 values count as 1)
+        def top_4_ratios(side: str) -> np.ndarray:
+            top_8 = data.column(f"Conc_Gross_LE_8_TDR_{side}_All")
+            top_8 = np.where(top_8 == 0, 1.0, top_8)
+            return COTFrame.safe_divide(
+                data.column(f"Conc_Gross_LE_4_TDR_{side}_All"), top_8, default=0.5
             )
 
-        long_pct = calc_percentile(long_ratio, hist_long_ratios)
-        short_pct = calc_percentile(short_ratio, hist_short_ratios)
+        long_pct = COTFrame.percentile_rank(top_4_ratios("Long"), long_ratio)
+        short_pct = COTFrame.percentile_rank(top_4_ratios("Short"), short_ratio)
 
         long_concentration = ConcentrationMetrics(
             side="long",
@@ -421,7 +460,7 @@ class COTAdvancedService:
 
         return ConcentrationResponse(
             commodity=commodity,
-            report_date=str(current.Report_Date_as_YYYY_MM_DD or ""),
+            report_date=data.report_date(),
             long_concentration=long_concentration,
             short_concentration=short_concentration,
             crowding_score=round(crowding_score, 1),
@@ -432,35 +471,28 @@ class COTAdvancedService:
 
     @staticmethod
     def analyze_squeeze_risk(
-        db: Session, commodity: str, weeks: int = 52
+        db: Session,
+        commodity: str,
+        weeks: int = 52,
+        context: Optional[COTContext] = None,
     ) -> SqueezeRiskResponse:
         """Analyze squeeze vulnerability for both longs and shorts"""
-        data = COTAdvancedService.get_historical_data(db, commodity, weeks)
+        data = COTAdvancedService.get_historical_data(
+            db, commodity, weeks, NET_COLUMNS + CONCENTRATION_COLUMNS, context
+        )
 
-        if not data:
+        if not len(data):
             raise ValueError(f"No data found for commodity: {commodity}")
 
-        current = data[0]
-
         # Calculate percentiles for managed money
-        mm_nets = [record.managed_money_net for record in data]
-        current_mm_net = current.managed_money_net
-
-        def calc_percentile(value, values):
-            return (
-                sum(1 for v in values if v <= value) / len(values) * 100
-                if values
-                else 50
-            )
-
-        mm_percentile = calc_percentile(current_mm_net, mm_nets)
+        mm_percentile = float(data.net_percentiles(MANAGED_MONEY)[0])
 
         # Get concentration
-        conc_long = current.Conc_Gross_LE_4_TDR_Long_All or 0
-        conc_short = current.Conc_Gross_LE_4_TDR_Short_All or 0
+        conc_long = data.value("Conc_Gross_LE_4_TDR_Long_All")
+        conc_short = data.value("Conc_Gross_LE_4_TDR_Short_All")
 
         # Get commercial positioning
-        commercial_net = current.producer_merchant_net
+        commercial_net = int(data.net(PRODUCER_MERCHANT)[0])
         commercial_direction = (
             "long"
             if commercial_net > 0
@@ -470,7 +502,7 @@ class COTAdvancedService:
         )
 
         # Get non-reportable positioning
-        nonrept_net = current.non_reportables_net
+        nonrept_net = int(data.net(NON_REPORTABLES)[0])
         nonrept_bias = (
             "long" if nonrept_net > 0 else "short" if nonrept_net < 0 else "neutral"
         )
@@ -578,7 +610,7 @@ class COTAdvancedService:
 
         return SqueezeRiskResponse(
             commodity=commodity,
-            report_date=str(current.Report_Date_as_YYYY_MM_DD or ""),
+            report_date=data.report_date(),
             long_squeeze_risk=long_squeeze,
             short_squeeze_risk=short_squeeze,
             dominant_risk=dominant,
@@ -588,105 +620,182 @@ class COTAdvancedService:
 
     @staticmethod
     def get_advanced_summary(
-        db: Session, commodity: str, weeks: int = 52
+        db: Session,
+        commodity: str,
+        weeks: int = 52,
+        context: Optional[COTContext] = None,
     ) -> AdvancedCOTSummary:
-        """Get a summary of all advanced metrics"""
+        """Get a summary of all advanced metrics (one history load)"""
         try:
-            flow = COTAdvancedService.analyze_flow_decomposition(db, commodity, 12)
+            if context is None:
+                context = COTAdvancedService.load_context(db, commodity, max(weeks, 12))
+            flow = COTAdvancedService.analyze_flow_decomposition(
+                db, commodity, 12, context
+            )
             concentration = COTAdvancedService.analyze_concentration(
-                db, commodity, weeks
+                db, commodity, weeks, context
             )
-            squeeze = COTAdvancedService.analyze_squeeze_risk(db, commodity, weeks)
-
-            # Calculate flow momentum score
-            if flow.current_week:
-                mm_flow = flow.current_week.managed_money
-                if mm_flow.dominant_flow in ["new_longs", "short_covering"]:
-                    flow_momentum = min(100, abs(mm_flow.net_flow) / 1000 * 100)
-                else:
-                    flow_momentum = -min(100, abs(mm_flow.net_flow) / 1000 * 100)
-            else:
-                flow_momentum = 0
-
-            # Determine regime
-            mm_pct = squeeze.long_squeeze_risk.managed_money_percentile
-            if mm_pct > 85:
-                regime = "speculative_mania"
-                regime_conf = min(100, (mm_pct - 85) * 6 + 50)
-            elif mm_pct < 15:
-                regime = "accumulation"
-                regime_conf = min(100, (15 - mm_pct) * 6 + 50)
-            elif flow_momentum < -30:
-                regime = "distribution"
-                regime_conf = min(100, abs(flow_momentum))
-            else:
-                regime = "neutral"
-                regime_conf = 50
-
-            # Generate alerts
-            alerts = []
-            if squeeze.long_squeeze_risk.risk_level in ["high", "extreme"]:
-                alerts.append(
-                    f"⚠️ Long squeeze risk: {squeeze.long_squeeze_risk.risk_level}"
-                )
-            if squeeze.short_squeeze_risk.risk_level in ["high", "extreme"]:
-                alerts.append(
-                    f"⚠️ Short squeeze risk: {squeeze.short_squeeze_risk.risk_level}"
-                )
-            if concentration.crowding_level in ["high", "extreme"]:
-                alerts.append(f"⚠️ High concentration: {concentration.crowding_level}")
-
-            # Primary insight
-            if regime == "speculative_mania":
-                insight = "Extreme bullish positioning - contrarian sell signal"
-                action = "Consider reducing longs, adding hedges"
-            elif regime == "accumulation":
-                insight = "Extreme bearish positioning - contrarian buy signal"
-                action = "Consider accumulating long positions"
-            elif (
-                squeeze.dominant_risk == "long_squeeze"
-                and squeeze.overall_vulnerability in ["high", "extreme"]
-            ):
-                insight = "Elevated long squeeze risk - vulnerable to selloff"
-                action = "Tighten stops, reduce position size"
-            elif (
-                squeeze.dominant_risk == "short_squeeze"
-                and squeeze.overall_vulnerability in ["high", "extreme"]
-            ):
-                insight = "Elevated short squeeze risk - potential for sharp rally"
-                action = "Avoid new shorts, consider tactical longs"
-            else:
-                insight = "Positioning within normal ranges"
-                action = "Continue monitoring, no urgent action"
-
-            return AdvancedCOTSummary(
-                commodity=commodity,
-                report_date=concentration.report_date,
-                crowding_score=concentration.crowding_score,
-                squeeze_risk_score=max(
-                    squeeze.long_squeeze_risk.risk_score,
-                    squeeze.short_squeeze_risk.risk_score,
-                ),
-                flow_momentum_score=abs(flow_momentum),
-                concentration_score=concentration.crowding_score,
-                alerts=alerts,
-                current_regime=regime,
-                regime_confidence=regime_conf,
-                primary_insight=insight,
-                suggested_action=action,
+            squeeze = COTAdvancedService.analyze_squeeze_risk(
+                db, commodity, weeks, context
+            )
+            return COTAdvancedService.build_summary(
+                commodity, flow, concentration, squeeze
             )
 
         except Exception as e:
             logger.error(f"Error generating advanced summary: {e}")
             raise
 
+    @staticmethod
+    def build_summary(
+        commodity: str,
+        flow: FlowDecompositionResponse,
+        concentration: ConcentrationResponse,
+        squeeze: SqueezeRiskResponse,
+    ) -> AdvancedCOTSummary:
+        """Combine flow, concentration and squeeze analyses into a summary"""
+        # Calculate flow momentum score
+        if flow.current_week:
+            mm_flow = flow.current_week.managed_money
+            if mm_flow.dominant_flow in ["new_longs", "short_covering"]:
+                flow_momentum = min(100, abs(mm_flow.net_flow) / 1000 * 100)
+            else:
+                flow_momentum = -min(100, abs(mm_flow.net_flow) / 1000 * 100)
+        else:
+            flow_momentum = 0
+
+        # Determine regime
+        mm_pct = squeeze.long_squeeze_risk.managed_money_percentile
+        if mm_pct > 85:
+            regime = "speculative_mania"
+            regime_conf = min(100, (mm_pct - 85) * 6 + 50)
+        elif mm_pct < 15:
+            regime = "accumulation"
+            regime_conf = min(100, (15 - mm_pct) * 6 + 50)
+        elif flow_momentum < -30:
+            regime = "distribution"
+            regime_conf = min(100, abs(flow_momentum))
+        else:
+            regime = "neutral"
+            regime_conf = 50
+
+        # Generate alerts
+        alerts = []
+        if squeeze.long_squeeze_risk.risk_level in ["high", "extreme"]:
+            alerts.append(
+                f"⚠️ Long squeeze risk: {squeeze.long_squeeze_risk.risk_level}"
+            )
+        if squeeze.short_squeeze_risk.risk_level in ["high", "extreme"]:
+            alerts.append(
+                f"⚠️ Short squeeze risk: {squeeze.short_squeeze_risk.risk_level}"
+            )
+        if concentration.crowding_level in ["high", "extreme"]:
+            alerts.append(f"⚠️ High concentration: {concentration.crowding_level}")
+
+        # Primary insight
+        if regime == "speculative_mania":
+            insight = "Extreme bullish positioning - contrarian sell signal"
+            action = "Consider reducing longs, adding hedges"
+        elif regime == "accumulation":
+            insight = "Extreme bearish positioning - contrarian buy signal"
+            action = "Consider accumulating long positions"
+        elif (
+            squeeze.dominant_risk == "long_squeeze"
+            and squeeze.overall_vulnerability in ["high", "extreme"]
+        ):
+            insight = "Elevated long squeeze risk - vulnerable to selloff"
+            action = "Tighten stops, reduce position size"
+        elif (
+            squeeze.dominant_risk == "short_squeeze"
+            and squeeze.overall_vulnerability in ["high", "extreme"]
+        ):
+            insight = "Elevated short squeeze risk - potential for sharp rally"
+            action = "Avoid new shorts, consider tactical longs"
+        else:
+            insight = "Positioning within normal ranges"
+            action = "Continue monitoring, no urgent action"
+
+        return AdvancedCOTSummary(
+            commodity=commodity,
+            report_date=concentration.report_date,
+            crowding_score=concentration.crowding_score,
+            squeeze_risk_score=max(
+                squeeze.long_squeeze_risk.risk_score,
+                squeeze.short_squeeze_risk.risk_score,
+            ),
+            flow_momentum_score=abs(flow_momentum),
+            concentration_score=concentration.crowding_score,
+            alerts=alerts,
+            current_regime=regime,
+            regime_confidence=regime_conf,
+            primary_insight=insight,
+            suggested_action=action,
+        )
+
+    @staticmethod
+    def analyze_all(
+        db: Session, commodity: str, weeks: int = 52
+    ) -> ComprehensiveAdvancedAnalysis:
+        """
+        Run every single-commodity analysis from one history load.
+
+        Modules needing more history than is available are reported in
+        `unavailable` instead of failing the whole response.
+        """
+        context = COTAdvancedService.load_context(db, commodity, max(weeks, 12))
+        if not len(context):
+            raise ValueError(f"No data found for commodity: {commodity}")
+
+        flow = COTAdvancedService.analyze_flow_decomposition(
+            db, commodity, 12, context
+        )
+        concentration = COTAdvancedService.analyze_concentration(
+            db, commodity, weeks, context
+        )
+        squeeze = COTAdvancedService.analyze_squeeze_risk(
+            db, commodity, weeks, context
+        )
+
+        optional_modules = {
+            "participation": COTAdvancedService.analyze_participation,
+            "curve_analysis": COTAdvancedService.analyze_curve_structure,
+            "spread_analysis": COTAdvancedService.analyze_spread_vs_directional,
+            "herding_analysis": COTAdvancedService.analyze_herding,
+            "volatility_regime": COTAdvancedService.analyze_volatility_regime,
+            "ml_regime": COTAdvancedService.classify_ml_regime,
+        }
+        results = {}
+        unavailable = {}
+        for name, analyze in optional_modules.items():
+            try:
+                results[name] = analyze(db, commodity, weeks, context)
+            except ValueError as e:
+                unavailable[name] = str(e)
+
+        return ComprehensiveAdvancedAnalysis(
+            commodity=commodity,
+            report_date=context.frame.report_date(),
+            weeks_analyzed=len(context.window(weeks)),
+            summary=COTAdvancedService.build_summary(
+                commodity, flow, concentration, squeeze
+            ),
+            squeeze_risk=squeeze,
+            concentration=concentration,
+            flow_decomposition=flow,
+            unavailable=unavailable,
+            **results,
+        )
+
     # =========================================================================
     # Priority 2: Curve, Spread, and Herding Analysis
     # =========================================================================
 
     @staticmethod
     def analyze_curve_structure(
-        db: Session, commodity: str, weeks: int = 52
+        db: Session,
+        commodity: str,
+        weeks: int = 52,
+        context: Optional[COTContext] = None,
     ) -> CurveAnalysisResponse:
         """
         Analyze curve structure positioning (front vs back month).
@@ -694,26 +803,26 @@ class COTAdvancedService:
         Uses Old (front/near) vs Other (back/deferred) buckets to understand
         where different trader types are positioned along the curve.
         """
-        data = COTAdvancedService.get_historical_data(db, commodity, weeks)
+        data = COTAdvancedService.get_historical_data(
+            db, commodity, weeks, ("Open_Interest_All",) + CURVE_COLUMNS, context
+        )
 
-        if not data:
+        if not len(data):
             raise ValueError(f"No data found for commodity: {commodity}")
 
-        current = data[0]
-
         # Get OI breakdown
-        total_oi = current.get_int_value(current.Open_Interest_All)
-        front_oi = current.get_int_value(current.Open_Interest_Old)
-        back_oi = current.get_int_value(current.Open_Interest_Other)
+        total_oi = data.value("Open_Interest_All")
+        front_oi = data.value("Open_Interest_Old")
+        back_oi = data.value("Open_Interest_Other")
         front_oi_pct = (front_oi / total_oi * 100) if total_oi > 0 else 0
 
         positioning = []
 
         # Producer/Merchant curve positioning
-        pm_front_long = current.get_int_value(current.Prod_Merc_Positions_Long_Old)
-        pm_front_short = current.get_int_value(current.Prod_Merc_Positions_Short_Old)
-        pm_back_long = current.get_int_value(current.Prod_Merc_Positions_Long_Other)
-        pm_back_short = current.get_int_value(current.Prod_Merc_Positions_Short_Other)
+        pm_front_long = data.value("Prod_Merc_Positions_Long_Old")
+        pm_front_short = data.value("Prod_Merc_Positions_Short_Old")
+        pm_back_long = data.value("Prod_Merc_Positions_Long_Other")
+        pm_back_short = data.value("Prod_Merc_Positions_Short_Other")
         pm_total = pm_front_long + pm_front_short + pm_back_long + pm_back_short
         pm_front_pct = (
             ((pm_front_long + pm_front_short) / pm_total * 100) if pm_total > 0 else 50
@@ -745,12 +854,12 @@ class COTAdvancedService:
         )
 
         # Managed Money curve positioning
-        mm_front_long = current.get_int_value(current.M_Money_Positions_Long_Old)
-        mm_front_short = current.get_int_value(current.M_Money_Positions_Short_Old)
-        mm_back_long = current.get_int_value(current.M_Money_Positions_Long_Other)
-        mm_back_short = current.get_int_value(current.M_Money_Positions_Short_Other)
-        mm_front_spread = current.get_int_value(current.M_Money_Positions_Spread_Old)
-        mm_back_spread = current.get_int_value(current.M_Money_Positions_Spread_Other)
+        mm_front_long = data.value("M_Money_Positions_Long_Old")
+        mm_front_short = data.value("M_Money_Positions_Short_Old")
+        mm_back_long = data.value("M_Money_Positions_Long_Other")
+        mm_back_short = data.value("M_Money_Positions_Short_Other")
+        mm_front_spread = data.value("M_Money_Positions_Spread_Old")
+        mm_back_spread = data.value("M_Money_Positions_Spread_Other")
         mm_total = mm_front_long + mm_front_short + mm_back_long + mm_back_short
         mm_front_pct = (
             ((mm_front_long + mm_front_short) / mm_total * 100) if mm_total > 0 else 50
@@ -784,12 +893,12 @@ class COTAdvancedService:
         )
 
         # Swap Dealer curve positioning
-        swap_front_long = current.get_int_value(current.Swap_Positions_Long_Old)
-        swap_front_short = current.get_int_value(current.Swap_Positions_Short_Old)
-        swap_back_long = current.get_int_value(current.Swap_Positions_Long_Other)
-        swap_back_short = current.get_int_value(current.Swap_Positions_Short_Other)
-        swap_front_spread = current.get_int_value(current.Swap_Positions_Spread_Old)
-        swap_back_spread = current.get_int_value(current.Swap_Positions_Spread_Other)
+        swap_front_long = data.value("Swap_Positions_Long_Old")
+        swap_front_short = data.value("Swap_Positions_Short_Old")
+        swap_back_long = data.value("Swap_Positions_Long_Other")
+        swap_back_short = data.value("Swap_Positions_Short_Other")
+        swap_front_spread = data.value("Swap_Positions_Spread_Old")
+        swap_back_spread = data.value("Swap_Positions_Spread_Other")
         swap_total = (
             swap_front_long + swap_front_short + swap_back_long + swap_back_short
         )
@@ -828,7 +937,7 @@ class COTAdvancedService:
 
         # Calculate roll stress
         # High stress when: high front OI %, high concentration, approaching typical roll
-        conc_front = current.Conc_Gross_LE_4_TDR_Long_Old or 0
+        conc_front = data.value("Conc_Gross_LE_4_TDR_Long_Old")
         roll_stress = (front_oi_pct / 100) * 0.5 + (conc_front / 100) * 0.5
         roll_stress_score = min(100, roll_stress * 100)
 
@@ -857,7 +966,7 @@ class COTAdvancedService:
 
         return CurveAnalysisResponse(
             commodity=commodity,
-            report_date=str(current.Report_Date_as_YYYY_MM_DD or ""),
+            report_date=data.report_date(),
             total_oi=total_oi,
             front_oi=front_oi,
             back_oi=back_oi,
@@ -871,7 +980,10 @@ class COTAdvancedService:
 
     @staticmethod
     def analyze_spread_vs_directional(
-        db: Session, commodity: str, weeks: int = 52
+        db: Session,
+        commodity: str,
+        weeks: int = 52,
+        context: Optional[COTContext] = None,
     ) -> SpreadAnalysisResponse:
         """
         Analyze spread vs directional exposure.
@@ -880,22 +992,21 @@ class COTAdvancedService:
         High spread ratio = more relative-value trading
         Low spread ratio = more macro/directional flows
         """
-        data = COTAdvancedService.get_historical_data(db, commodity, weeks)
+        data = COTAdvancedService.get_historical_data(
+            db, commodity, weeks, NET_COLUMNS + SPREAD_COLUMNS, context
+        )
 
         if len(data) < 2:
             raise ValueError(f"Insufficient data for commodity: {commodity}")
 
-        current = data[0]
-        previous = data[1]
-
         breakdown = []
         total_spread = 0
         total_directional = 0
 
         # Swap Dealers
-        swap_long = current.get_int_value(current.Swap_Positions_Long_All)
-        swap_short = current.get_int_value(current.Swap_Positions_Short_All)
-        swap_spread = current.get_int_value(current.Swap_Positions_Spread_All)
+        swap_long = data.value("Swap_Positions_Long_All")
+        swap_short = data.value("Swap_Positions_Short_All")
+        swap_spread = data.value("Swap_Positions_Spread_All")
         swap_directional = swap_long + swap_short
         swap_total = swap_directional + swap_spread
         swap_spread_pct = (swap_spread / swap_total * 100) if swap_total > 0 else 0
@@ -927,9 +1038,9 @@ class COTAdvancedService:
         total_directional += swap_directional
 
         # Managed Money
-        mm_long = current.get_int_value(current.M_Money_Positions_Long_All)
-        mm_short = current.get_int_value(current.M_Money_Positions_Short_All)
-        mm_spread = current.get_int_value(current.M_Money_Positions_Spread_All)
+        mm_long = data.value("M_Money_Positions_Long_All")
+        mm_short = data.value("M_Money_Positions_Short_All")
+        mm_spread = data.value("M_Money_Positions_Spread_All")
         mm_directional = mm_long + mm_short
         mm_total = mm_directional + mm_spread
         mm_spread_pct = (mm_spread / mm_total * 100) if mm_total > 0 else 0
@@ -961,9 +1072,9 @@ class COTAdvancedService:
         total_directional += mm_directional
 
         # Other Reportables
-        other_long = current.get_int_value(current.Other_Rept_Positions_Long_All)
-        other_short = current.get_int_value(current.Other_Rept_Positions_Short_All)
-        other_spread = current.get_int_value(current.Other_Rept_Positions_Spread_All)
+        other_long = data.value("Other_Rept_Positions_Long_All")
+        other_short = data.value("Other_Rept_Positions_Short_All")
+        other_spread = data.value("Other_Rept_Positions_Spread_All")
         other_directional = other_long + other_short
         other_total = other_directional + other_spread
         other_spread_pct = (other_spread / other_total * 100) if other_total > 0 else 0
@@ -1008,23 +1119,12 @@ class COTAdvancedService:
             mode_strength = "moderate"
 
         # Week-over-week changes
-        prev_swap_spread = previous.get_int_value(previous.Swap_Positions_Spread_All)
-        prev_mm_spread = previous.get_int_value(previous.M_Money_Positions_Spread_All)
-        prev_other_spread = previous.get_int_value(
-            previous.Other_Rept_Positions_Spread_All
-        )
-        prev_total_spread = prev_swap_spread + prev_mm_spread + prev_other_spread
-
-        prev_swap_dir = previous.get_int_value(
-            previous.Swap_Positions_Long_All
-        ) + previous.get_int_value(previous.Swap_Positions_Short_All)
-        prev_mm_dir = previous.get_int_value(
-            previous.M_Money_Positions_Long_All
-        ) + previous.get_int_value(previous.M_Money_Positions_Short_All)
-        prev_other_dir = previous.get_int_value(
-            previous.Other_Rept_Positions_Long_All
-        ) + previous.get_int_value(previous.Other_Rept_Positions_Short_All)
-        prev_total_dir = prev_swap_dir + prev_mm_dir + prev_other_dir
+        prev_total_spread = int(
+            sum(data.spread(category)[1] for category in SPREAD_CATEGORIES)
+        )
+        prev_total_dir = int(
+            sum(data.gross(category)[1] for category in SPREAD_CATEGORIES)
+        )
 
         spread_change = total_spread - prev_total_spread
         dir_change = total_directional - prev_total_dir
@@ -1041,7 +1141,7 @@ class COTAdvancedService:
 
         return SpreadAnalysisResponse(
             commodity=commodity,
-            report_date=str(current.Report_Date_as_YYYY_MM_DD or ""),
+            report_date=data.report_date(),
             breakdown=breakdown,
             total_spread_positions=total_spread,
             total_directional_positions=total_directional,
@@ -1055,7 +1155,10 @@ class COTAdvancedService:
 
     @staticmethod
     def analyze_herding(
-        db: Session, commodity: str, weeks: int = 52
+        db: Session,
+        commodity: str,
+        weeks: int = 52,
+        context: Optional[COTContext] = None,
     ) -> HerdingAnalysisResponse:
         """
         Analyze herding behavior and market structure.
@@ -1066,50 +1169,34 @@ class COTAdvancedService:
         - Dispersed: High activity, no consensus
         - Capitulation: Extreme one-sided with falling counts
         """
-        data = COTAdvancedService.get_historical_data(db, commodity, weeks)
+        data = COTAdvancedService.get_historical_data(
+            db, commodity, weeks, NET_COLUMNS + TRADER_COLUMNS, context
+        )
 
         if len(data) < 2:
             raise ValueError(f"Insufficient data for commodity: {commodity}")
 
-        current = data[0]
-        previous = data[1]
-
         categories = []
 
         # Calculate historical medians for comparison
-        mm_trader_counts = []
-        mm_avg_sizes = []
-        for record in data:
-            mm_long_traders = record.Traders_M_Money_Long_All or 0
-            mm_short_traders = record.Traders_M_Money_Short_All or 0
-            mm_long_pos = record.get_int_value(record.M_Money_Positions_Long_All)
-            mm_short_pos = record.get_int_value(record.M_Money_Positions_Short_All)
-            total_traders = mm_long_traders + mm_short_traders
-            total_pos = mm_long_pos + mm_short_pos
-            mm_trader_counts.append(total_traders)
-            if total_traders > 0:
-                mm_avg_sizes.append(total_pos / total_traders)
-
-        median_traders = (
-            sorted(mm_trader_counts)[len(mm_trader_counts) // 2]
-            if mm_trader_counts
-            else 0
+        mm_trader_counts = data.traders(MANAGED_MONEY, "Long") + data.traders(
+            MANAGED_MONEY, "Short"
         )
-        p90_avg_size = (
-            sorted(mm_avg_sizes)[int(len(mm_avg_sizes) * 0.9)] if mm_avg_sizes else 0
+        has_traders = mm_trader_counts > 0
+        mm_avg_sizes = (
+            data.gross(MANAGED_MONEY)[has_traders] / mm_trader_counts[has_traders]
         )
 
+        median_traders = int(np.sort(mm_trader_counts)[len(mm_trader_counts) // 2])
+
         # Managed Money herding
-        mm_long_traders = current.Traders_M_Money_Long_All or 0
-        mm_short_traders = current.Traders_M_Money_Short_All or 0
+        mm_long_traders = data.value("Traders_M_Money_Long_All")
+        mm_short_traders = data.value("Traders_M_Money_Short_All")
         mm_total_traders = mm_long_traders + mm_short_traders
-        prev_mm_total = (previous.Traders_M_Money_Long_All or 0) + (
-            previous.Traders_M_Money_Short_All or 0
-        )
-        mm_trader_change = mm_total_traders - prev_mm_total
+        mm_trader_change = int(mm_trader_counts[0] - mm_trader_counts[1])
 
-        mm_long_pos = current.get_int_value(current.M_Money_Positions_Long_All)
-        mm_short_pos = current.get_int_value(current.M_Money_Positions_Short_All)
+        mm_long_pos = data.value("M_Money_Positions_Long_All")
+        mm_short_pos = data.value("M_Money_Positions_Short_All")
         mm_net = mm_long_pos - mm_short_pos
         mm_avg_size = (
             (mm_long_pos + mm_short_pos) / mm_total_traders
@@ -1118,11 +1205,7 @@ class COTAdvancedService:
         )
 
         mm_ls_ratio = mm_long_traders / mm_short_traders if mm_short_traders > 0 else 10
-        mm_size_percentile = (
-            sum(1 for s in mm_avg_sizes if s <= mm_avg_size) / len(mm_avg_sizes) * 100
-            if mm_avg_sizes
-            else 50
-        )
+        mm_size_percentile = COTFrame.percentile_rank(mm_avg_sizes, mm_avg_size)
 
         # Classify herding type
         if mm_total_traders > median_traders and abs(mm_ls_ratio - 1) > 0.5:
@@ -1164,16 +1247,16 @@ class COTAdvancedService:
         )
 
         # Producer/Merchant herding
-        pm_long_traders = current.Traders_Prod_Merc_Long_All or 0
-        pm_short_traders = current.Traders_Prod_Merc_Short_All or 0
+        pm_long_traders = data.value("Traders_Prod_Merc_Long_All")
+        pm_short_traders = data.value("Traders_Prod_Merc_Short_All")
         pm_total_traders = pm_long_traders + pm_short_traders
-        prev_pm_total = (previous.Traders_Prod_Merc_Long_All or 0) + (
-            previous.Traders_Prod_Merc_Short_All or 0
+        pm_trader_counts = data.traders(PRODUCER_MERCHANT, "Long") + data.traders(
+            PRODUCER_MERCHANT, "Short"
         )
-        pm_trader_change = pm_total_traders - prev_pm_total
+        pm_trader_change = int(pm_trader_counts[0] - pm_trader_counts[1])
 
-        pm_long_pos = current.get_int_value(current.Prod_Merc_Positions_Long_All)
-        pm_short_pos = current.get_int_value(current.Prod_Merc_Positions_Short_All)
+        pm_long_pos = data.value("Prod_Merc_Positions_Long_All")
+        pm_short_pos = data.value("Prod_Merc_Positions_Short_All")
         pm_net = pm_long_pos - pm_short_pos
         pm_avg_size = (
             (pm_long_pos + pm_short_pos) / pm_total_traders
@@ -1260,7 +1343,7 @@ class COTAdvancedService:
 
         return HerdingAnalysisResponse(
             commodity=commodity,
-            report_date=str(current.Report_Date_as_YYYY_MM_DD or ""),
+            report_date=data.report_date(),
             categories=categories,
             overall_herding_score=round(overall_score, 1),
             overall_herding_type=overall_type,
@@ -1275,19 +1358,6 @@ class COTAdvancedService:
     # Priority 3: Cross-Market, Volatility, and ML Regime Analysis
     # =========================================================================
 
-    @staticmethod
-    def get_all_commodities_data(db: Session, weeks: int = 52) -> List[str]:
-        """Get latest data for all commodities for cross-market analysis."""
-        from sqlalchemy import distinct
-
-        # Use Commodity_Name since get_historical_data filters by that field
-        commodities_query = (
-            db.query(distinct(COTReportDisaggFuturesOnly.Commodity_Name))
-            .order_by(COTReportDisaggFuturesOnly.Commodity_Name)
-            .all()
-        )
-        return [c[0] for c in commodities_query if c[0]]
-
     @staticmethod
     def analyze_cross_market_pressure(
         db: Session, weeks: int = 52, top_n: int = 5
@@ -1295,113 +1365,101 @@ class COTAdvancedService:
         """
         Analyze speculative pressure across all commodities.
         Ranks commodities by crowding level and identifies rotation patterns.
+
+        History for every market is loaded in one windowed query and
+        percentiles are computed per market with grouped operations. Markets
+        are keyed by market_key, since contracts such as GOLD and MICRO GOLD
+        share a Commodity_Name.
         """
-        all_commodities = COTAdvancedService.get_all_commodities_data(db, weeks)
+        panel = load_cot_panel(
+            db,
+            NET_COLUMNS + ("COMMODITY_SUBGROUP_NAME",),
+            weeks,
+            partition="market_key",
+        )
+        if panel.empty:
+            raise ValueError("No commodities with sufficient data found")
 
-        pressure_items = []
-        latest_date = None
+        def net(category: str) -> pd.Series:
+            return panel[position_column(category, "Long")] - panel[
+                position_column(category, "Short")
+            ]
 
-        for commodity_name in all_commodities[:50]:
-            try:
-                data = COTAdvancedService.get_historical_data(db, commodity_name, weeks)
-                if len(data) < 2:
-                    continue
-
-                current = data[0]
-                previous = data[1]
-
-                if latest_date is None:
-                    latest_date = str(current.Report_Date_as_YYYY_MM_DD or "")
-
-                mm_net = current.managed_money_net
-                commercial_net = current.producer_merchant_net
-                oi = current.get_int_value(current.Open_Interest_All)
-
-                if oi == 0:
-                    continue
-
-                spec_pressure = (mm_net - commercial_net) / oi * 100
-
-                # Calculate percentiles
-                mm_nets = [r.managed_money_net for r in data]
-                pressures = []
-                for r in data:
-                    r_oi = r.get_int_value(r.Open_Interest_All)
-                    if r_oi > 0:
-                        pressures.append(
-                            (r.managed_money_net - r.producer_merchant_net) / r_oi * 100
-                        )
-
-                mm_percentile = (
-                    sum(1 for x in mm_nets if x <= mm_net) / len(mm_nets) * 100
-                    if mm_nets
-                    else 50
-                )
-                commercial_nets = [r.producer_merchant_net for r in data]
-                commercial_percentile = (
-                    sum(1 for x in commercial_nets if x <= commercial_net)
-                    / len(commercial_nets)
-                    * 100
-                    if commercial_nets
-                    else 50
-                )
-                pressure_percentile = (
-                    sum(1 for x in pressures if x <= spec_pressure)
-                    / len(pressures)
-                    * 100
-                    if pressures
-                    else 50
-                )
+        open_interest = panel["Open_Interest_All"]
+        frame = pd.DataFrame(
+            {
+                "commodity": panel["market_key"],
+                "report_date": panel[REPORT_DATE],
+                "group": panel["COMMODITY_SUBGROUP_NAME"],
+                "week_rank": panel[WEEK_RANK],
+                "mm_net": net(MANAGED_MONEY),
+                "commercial_net": net(PRODUCER_MERCHANT),
+                "open_interest": open_interest,
+            }
+        )
+        # Pressure over weeks with open interest, NaN otherwise
+        frame["pressure"] = (
+            (frame["mm_net"] - frame["commercial_net"])
+            * 100.0
+            / open_interest.where(open_interest > 0)
+        )
+
+        current = frame[frame["week_rank"] == 1].set_index("commodity")
+        previous = frame[frame["week_rank"] == 2].set_index("commodity")
+        commodities = frame["commodity"]
+
+        def percentiles(column: str) -> pd.Series:
+            """Share of each commodity's weeks at or below its latest value"""
+            values = frame[column]
+            at_or_below = values.le(commodities.map(current[column]))
+            counts = at_or_below.groupby(commodities).sum()
+            totals = values.notna().groupby(commodities).sum()
+            return (counts / totals.where(totals > 0) * 100).fillna(50.0)
+
+        current = current.assign(
+            mm_percentile=percentiles("mm_net"),
+            commercial_percentile=percentiles("commercial_net"),
+            pressure_percentile=percentiles("pressure"),
+            prev_pressure=previous["pressure"].reindex(current.index).fillna(0),
+        )
+        # Need two weeks of history and open interest in the latest week
+        current = current[
+            current.index.isin(previous.index) & (current["open_interest"] != 0)
+        ]
+        if current.empty:
+            raise ValueError("No commodities with sufficient data found")
 
-                prev_oi = previous.get_int_value(previous.Open_Interest_All)
-                prev_pressure = (
-                    (previous.managed_money_net - previous.producer_merchant_net)
-                    / prev_oi
-                    * 100
-                    if prev_oi > 0
-                    else 0
-                )
-                pressure_change = spec_pressure - prev_pressure
-
-                if pressure_percentile >= 90:
-                    crowding = "extreme_long"
-                elif pressure_percentile >= 70:
-                    crowding = "long"
-                elif pressure_percentile <= 10:
-                    crowding = "extreme_short"
-                elif pressure_percentile <= 30:
-                    crowding = "short"
-                else:
-                    crowding = "neutral"
-
-                direction = (
-                    "increasing"
-                    if pressure_change > 2
-                    else "decreasing"
-                    if pressure_change < -2
-                    else "stable"
-                )
+        current["pressure_change"] = current["pressure"] - current["prev_pressure"]
+        percentile = current["pressure_percentile"].to_numpy()
+        current["crowding"] = np.select(
+            [percentile >= 90, percentile >= 70, percentile <= 10, percentile <= 30],
+            ["extreme_long", "long", "extreme_short", "short"],
+            default="neutral",
+        )
+        change = current["pressure_change"].to_numpy()
+        current["direction"] = np.select(
+            [change > 2, change < -2], ["increasing", "decreasing"], default="stable"
+        )
 
-                pressure_items.append(
-                    SpeculativePressureItem(
-                        commodity=commodity_name,
-                        commodity_group=current.COMMODITY_SUBGROUP_NAME,
-                        report_date=str(current.Report_Date_as_YYYY_MM_DD or ""),
-                        managed_money_net=mm_net,
-                        commercial_net=commercial_net,
-                        open_interest=oi,
-                        spec_pressure=round(spec_pressure, 2),
-                        spec_pressure_percentile=round(pressure_percentile, 1),
-                        mm_percentile=round(mm_percentile, 1),
-                        commercial_percentile=round(commercial_percentile, 1),
-                        crowding_level=crowding,
-                        pressure_change=round(pressure_change, 2),
-                        pressure_direction=direction,
-                    )
-                )
-            except Exception as e:
-                logger.debug(f"Skipping {commodity_name}: {e}")
-                continue
+        latest_date = current["report_date"].max()
+        pressure_items = [
+            SpeculativePressureItem(
+                commodity=commodity,
+                commodity_group=row.group,
+                report_date=row.report_date,
+                managed_money_net=int(row.mm_net),
+                commercial_net=int(row.commercial_net),
+                open_interest=int(row.open_interest),
+                spec_pressure=round(float(row.pressure), 2),
+                spec_pressure_percentile=round(float(row.pressure_percentile), 1),
+                mm_percentile=round(float(row.mm_percentile), 1),
+                commercial_percentile=round(float(row.commercial_percentile), 1),
+                crowding_level=row.crowding,
+                pressure_change=round(float(row.pressure_change), 2),
+                pressure_direction=row.direction,
+            )
+            for commodity, row in current.iterrows()
+        ]
 
         if not pressure_items:
             raise ValueError("No commodities with sufficient data found")
@@ -1482,57 +1540,43 @@ class COTAdvancedService:
 
     @staticmethod
     def analyze_volatility_regime(
-        db: Session, commodity: str, weeks: int = 52
+        db: Session,
+        commodity: str,
+        weeks: int = 52,
+        context: Optional[COTContext] = None,
     ) -> VolatilityAnalysisResponse:
         """
         Analyze COT-implied volatility regime.
         Uses position activity and concentration as proxies for volatility expectations.
         """
-        data = COTAdvancedService.get_historical_data(db, commodity, weeks)
+        data = COTAdvancedService.get_historical_data(
+            db,
+            commodity,
+            weeks,
+            NET_COLUMNS + SPREAD_COLUMNS + CONCENTRATION_COLUMNS,
+            context,
+        )
 
         if len(data) < 4:
             raise ValueError(f"Insufficient data for commodity: {commodity}")
 
-        current = data[0]
-
-        # Calculate gross positions and spread ratios for history
-        gross_list = []
-        spread_ratios = []
-
-        for record in data:
-            mm_long = record.get_int_value(record.M_Money_Positions_Long_All)
-            mm_short = record.get_int_value(record.M_Money_Positions_Short_All)
-            mm_spread = record.get_int_value(record.M_Money_Positions_Spread_All)
-            swap_long = record.get_int_value(record.Swap_Positions_Long_All)
-            swap_short = record.get_int_value(record.Swap_Positions_Short_All)
-            swap_spread = record.get_int_value(record.Swap_Positions_Spread_All)
+        # Gross positions and spread ratios for history (managed money + swaps)
+        gross_list = data.gross(MANAGED_MONEY) + data.gross(SWAP_DEALER)
+        spread_ratios = data.spread_ratio((MANAGED_MONEY, SWAP_DEALER))
 
-            gross = mm_long + mm_short + swap_long + swap_short
-            total = gross + mm_spread + swap_spread
-            spread_ratio = (mm_spread + swap_spread) / total * 100 if total > 0 else 0
+        current_gross = int(gross_list[0])
+        current_spread_ratio = float(spread_ratios[0])
 
-            gross_list.append(gross)
-            spread_ratios.append(spread_ratio)
-
-        current_gross = gross_list[0]
-        current_spread_ratio = spread_ratios[0]
-
-        gross_percentile = (
-            sum(1 for x in gross_list if x <= current_gross) / len(gross_list) * 100
-        )
-        spread_percentile = (
-            sum(1 for x in spread_ratios if x <= current_spread_ratio)
-            / len(spread_ratios)
-            * 100
-        )
+        gross_percentiles = COTFrame.percentile_ranks(gross_list)
+        gross_percentile = float(gross_percentiles[0])
+        spread_percentile = COTFrame.percentile_rank(spread_ratios, current_spread_ratio)
 
         # 4-week change
-        gross_4wk_ago = gross_list[min(4, len(gross_list) - 1)]
-        gross_change_4wk = current_gross - gross_4wk_ago
+        gross_change_4wk = int(COTFrame.change_in(gross_list, 4))
 
         # Concentration score
-        conc_long = current.Conc_Gross_LE_4_TDR_Long_All or 0
-        conc_short = current.Conc_Gross_LE_4_TDR_Short_All or 0
+        conc_long = data.value("Conc_Gross_LE_4_TDR_Long_All")
+        conc_short = data.value("Conc_Gross_LE_4_TDR_Short_All")
         concentration_score = (conc_long + conc_short) / 2
 
         # Derive volatility regime
@@ -1552,7 +1596,7 @@ class COTAdvancedService:
             vol_regime = "low"
 
         # Directional skew
-        mm_net = current.managed_money_net
+        mm_net = int(data.net(MANAGED_MONEY)[0])
         if mm_net > 0 and gross_percentile > 70:
             vol_skew = "call_skew"
         elif mm_net < 0 and gross_percentile > 70:
@@ -1560,36 +1604,35 @@ class COTAdvancedService:
         else:
             vol_skew = "neutral"
 
-        # Historical regime
-        vol_history = []
-        for i, record in enumerate(data[:12]):
-            hist_gross_pct = (
-                sum(1 for x in gross_list if x <= gross_list[i]) / len(gross_list) * 100
-            )
-            hist_conc = (
-                (record.Conc_Gross_LE_4_TDR_Long_All or 0)
-                + (record.Conc_Gross_LE_4_TDR_Short_All or 0)
-            ) / 2
-            hist_score = (
-                hist_gross_pct * 0.4 + hist_conc * 0.4 + (100 - spread_ratios[i]) * 0.2
-            )
+        # Historical regime (latest 12 weeks)
+        recent = slice(0, 12)
+        hist_conc = (
+            data.column("Conc_Gross_LE_4_TDR_Long_All")[recent]
+            + data.column("Conc_Gross_LE_4_TDR_Short_All")[recent]
+        ) / 2
+        hist_scores = (
+            gross_percentiles[recent] * 0.4
+            + hist_conc * 0.4
+            + (100 - spread_ratios[recent]) * 0.2
+        )
+        hist_regimes = np.select(
+            [hist_scores >= 75, hist_scores >= 55, hist_scores >= 35],
+            ["high", "elevated", "normal"],
+            default="low",
+        )
 
-            if hist_score >= 75:
-                hist_regime = "high"
-            elif hist_score >= 55:
-                hist_regime = "elevated"
-            elif hist_score >= 35:
-                hist_regime = "normal"
-            else:
-                hist_regime = "low"
-
-            vol_history.append(
-                {
-                    "date": str(record.Report_Date_as_YYYY_MM_DD or ""),
-                    "regime": hist_regime,
-                    "score": round(hist_score, 1),
-                }
+        vol_history = [
+            {
+                "date": report_date,
+                "regime": regime,
+                "score": round(score, 1),
+            }
+            for report_date, regime, score in zip(
+                data.dates[recent].tolist(),
+                hist_regimes.tolist(),
+                hist_scores.tolist(),
             )
+        ]
 
         # Alert
         vol_alert = None
@@ -1610,7 +1653,7 @@ class COTAdvancedService:
 
         current_metrics = VolatilityRegimeMetrics(
             commodity=commodity,
-            report_date=str(current.Report_Date_as_YYYY_MM_DD or ""),
+            report_date=data.report_date(),
             gross_positions=current_gross,
             gross_positions_percentile=round(gross_percentile, 1),
             gross_positions_change_4wk=gross_change_4wk,
@@ -1625,7 +1668,7 @@ class COTAdvancedService:
 
         return VolatilityAnalysisResponse(
             commodity=commodity,
-            report_date=str(current.Report_Date_as_YYYY_MM_DD or ""),
+            report_date=data.report_date(),
             current_metrics=current_metrics,
             vol_regime_history=vol_history,
             vol_alert=vol_alert,
@@ -1633,144 +1676,181 @@ class COTAdvancedService:
         )
 
     @staticmethod
-    def classify_ml_regime(
-        db: Session, commodity: str, weeks: int = 52
-    ) -> MLRegimeAnalysisResponse:
+    def ml_regime_features(data: COTFrame, window: int = 52) -> Dict[str, np.ndarray]:
         """
-        ML-based regime classification using rule-based heuristics.
-        Classifies market into actionable regimes based on positioning patterns.
+        ML regime feature vectors of every report, as newest-first arrays.
+
+        Percentiles rank each week against the `window` reports ending at
+        that week (fewer for the oldest weeks), so historical weeks only use
+        data available at the time. Keys are MLRegimeFeatures fields.
         """
-        data = COTAdvancedService.get_historical_data(db, commodity, weeks)
 
-        if len(data) < 8:
-            raise ValueError(f"Insufficient data for commodity: {commodity}")
+        def net_percentile(category: str) -> np.ndarray:
+            return data.rolling_net_ranks(category, window)[0]
+
+        def rolling_percentile(values: np.ndarray) -> np.ndarray:
+            return rolling_rank(values[::-1], window)[0][::-1]
+
+        oi = data.open_interest
+        return {
+            "mm_net_percentile": net_percentile(MANAGED_MONEY),
+            "commercial_net_percentile": net_percentile(PRODUCER_MERCHANT),
+            "nonrept_net_percentile": net_percentile(NON_REPORTABLES),
+            # 4-week flows as % of open interest
+            "mm_4wk_flow": COTFrame.safe_divide(
+                data.net_flows(MANAGED_MONEY, 4) * 100.0, oi
+            ),
+            "commercial_4wk_flow": COTFrame.safe_divide(
+                data.net_flows(PRODUCER_MERCHANT, 4) * 100.0, oi
+            ),
+            # Structure features
+            "concentration_score": (
+                data.column("Conc_Gross_LE_4_TDR_Long_All")
+                + data.column("Conc_Gross_LE_4_TDR_Short_All")
+            )
+            / 2,
+            "spread_ratio": data.spread_ratio((MANAGED_MONEY,)),
+            # Herding score (simplified): long/short trader count imbalance
+            "herding_score": np.minimum(
+                100,
+                np.abs(
+                    COTFrame.safe_divide(
+                        data.column("Traders_M_Money_Long_All"),
+                        data.column("Traders_M_Money_Short_All"),
+                        default=1.0,
+                    )
+                    - 1
+                )
+                * 50,
+            ),
+            # Curve features
+            "front_back_ratio": COTFrame.safe_divide(
+                data.column("Open_Interest_Old"),
+                data.column("Open_Interest_Other"),
+                default=1.0,
+            ),
+            "gross_positions_percentile": rolling_percentile(
+                data.gross(MANAGED_MONEY)
+            ),
+        }
 
-        current = data[0]
+    @staticmethod
+    def classify_ml_regimes(
+        features: Dict[str, np.ndarray],
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Classify every week of a feature matrix in one vectorized pass.
 
-        # Build feature vector
-        mm_nets = [r.managed_money_net for r in data]
-        commercial_nets = [r.producer_merchant_net for r in data]
-        nonrept_nets = [r.non_reportables_net for r in data]
+        Rules are checked in order and the first match wins:
+        mean reversion, capitulation, accumulation, distribution, trend
+        following, breakout setup, otherwise consolidation.
 
-        mm_net = current.managed_money_net
-        commercial_net = current.producer_merchant_net
-        nonrept_net = current.non_reportables_net
+        Returns:
+            (regimes, confidences): MLRegimeType values and confidence (max 95)
+        """
+        mm = features["mm_net_percentile"]
+        commercial = features["commercial_net_percentile"]
+        mm_flow = features["mm_4wk_flow"]
+        commercial_flow = features["commercial_4wk_flow"]
+        concentration = features["concentration_score"]
+        gross = features["gross_positions_percentile"]
+
+        rules = [
+            # Mean reversion: extreme positioning (+10 when flows diverge)
+            (
+                (mm >= 90) | (mm <= 10),
+                MLRegimeType.MEAN_REVERSION,
+                np.minimum(95, 50 + np.abs(mm - 50))
+                + np.where(commercial_flow * mm_flow < 0, 10, 0),
+            ),
+            # Capitulation: extreme + falling positions
+            (
+                (mm >= 85) & (mm_flow < -2),
+                MLRegimeType.CAPITULATION,
+                70 + np.abs(mm_flow) * 3,
+            ),
+            # Accumulation: commercials building, specs light
+            (
+                (commercial >= 70) & (mm <= 40),
+                MLRegimeType.ACCUMULATION,
+                60 + (commercial - mm) / 2,
+            ),
+            # Distribution: commercials selling, specs heavy
+            (
+                (commercial <= 30) & (mm >= 60),
+                MLRegimeType.DISTRIBUTION,
+                60 + (mm - commercial) / 2,
+            ),
+            # Trend following: aligned positioning with momentum
+            (
+                (mm >= 30) & (mm <= 70) & (np.abs(mm_flow) > 2),
+                MLRegimeType.TREND_FOLLOWING,
+                55 + np.abs(mm_flow) * 5,
+            ),
+            # Breakout setup: building concentration
+            (
+                (concentration > 50) & (gross > 70),
+                MLRegimeType.BREAKOUT_SETUP,
+                50 + concentration / 2,
+            ),
+        ]
 
-        mm_percentile = sum(1 for x in mm_nets if x <= mm_net) / len(mm_nets) * 100
-        commercial_percentile = (
-            sum(1 for x in commercial_nets if x <= commercial_net)
-            / len(commercial_nets)
-            * 100
+        conditions = [condition for condition, _, _ in rules]
+        regimes = np.select(
+            conditions,
+            [regime.value for _, regime, _ in rules],
+            default=MLRegimeType.CONSOLIDATION.value,
         )
-        nonrept_percentile = (
-            sum(1 for x in nonrept_nets if x <= nonrept_net) / len(nonrept_nets) * 100
+        confidences = np.select(
+            conditions, [confidence for _, _, confidence in rules], default=60.0
         )
+        return regimes, np.minimum(95, confidences)
 
-        # 4-week flows
-        mm_4wk_ago = data[min(4, len(data) - 1)].managed_money_net
-        commercial_4wk_ago = data[min(4, len(data) - 1)].producer_merchant_net
-        oi = current.get_int_value(current.Open_Interest_All)
-
-        mm_4wk_flow = (mm_net - mm_4wk_ago) / oi * 100 if oi > 0 else 0
-        commercial_4wk_flow = (
-            (commercial_net - commercial_4wk_ago) / oi * 100 if oi > 0 else 0
+    @staticmethod
+    def classify_ml_regime(
+        db: Session,
+        commodity: str,
+        weeks: int = 52,
+        context: Optional[COTContext] = None,
+    ) -> MLRegimeAnalysisResponse:
+        """
+        ML-based regime classification using rule-based heuristics.
+        Classifies market into actionable regimes based on positioning patterns.
+        """
+        data = COTAdvancedService.get_historical_data(
+            db, commodity, weeks, ML_REGIME_COLUMNS, context
         )
 
-        # Structure features
-        conc_long = current.Conc_Gross_LE_4_TDR_Long_All or 0
-        conc_short = current.Conc_Gross_LE_4_TDR_Short_All or 0
-        concentration_score = (conc_long + conc_short) / 2
+        if len(data) < 8:
+            raise ValueError(f"Insufficient data for commodity: {commodity}")
 
-        mm_spread = current.get_int_value(current.M_Money_Positions_Spread_All)
-        mm_total = (
-            current.get_int_value(current.M_Money_Positions_Long_All)
-            + current.get_int_value(current.M_Money_Positions_Short_All)
-            + mm_spread
-        )
-        spread_ratio = mm_spread / mm_total * 100 if mm_total > 0 else 0
-
-        # Herding score (simplified)
-        mm_long_traders = current.Traders_M_Money_Long_All or 0
-        mm_short_traders = current.Traders_M_Money_Short_All or 0
-        ls_ratio = mm_long_traders / mm_short_traders if mm_short_traders > 0 else 1
-        herding_score = min(100, abs(ls_ratio - 1) * 50)
-
-        # Curve features
-        front_oi = current.get_int_value(current.Open_Interest_Old)
-        back_oi = current.get_int_value(current.Open_Interest_Other)
-        front_back_ratio = front_oi / back_oi if back_oi > 0 else 1
-
-        # Gross positions percentile
-        gross = current.get_int_value(
-            current.M_Money_Positions_Long_All
-        ) + current.get_int_value(current.M_Money_Positions_Short_All)
-        gross_list = [
-            r.get_int_value(r.M_Money_Positions_Long_All)
-            + r.get_int_value(r.M_Money_Positions_Short_All)
-            for r in data
-        ]
-        gross_percentile = (
-            sum(1 for x in gross_list if x <= gross) / len(gross_list) * 100
-        )
+        # Feature vector of the latest week, ranked against the whole window
+        matrix = COTAdvancedService.ml_regime_features(data, len(data))
+        regimes, confidences = COTAdvancedService.classify_ml_regimes(matrix)
+        latest = {name: float(values[0]) for name, values in matrix.items()}
+
+        mm_percentiles = data.net_percentiles(MANAGED_MONEY)
+        commercial_percentiles = data.net_percentiles(PRODUCER_MERCHANT)
+
+        mm_percentile = latest["mm_net_percentile"]
+        commercial_percentile = latest["commercial_net_percentile"]
+        mm_4wk_flow = latest["mm_4wk_flow"]
+        concentration_score = latest["concentration_score"]
+        herding_score = latest["herding_score"]
 
         features = MLRegimeFeatures(
-            mm_net_percentile=round(mm_percentile, 1),
-            commercial_net_percentile=round(commercial_percentile, 1),
-            nonrept_net_percentile=round(nonrept_percentile, 1),
-            mm_4wk_flow=round(mm_4wk_flow, 2),
-            commercial_4wk_flow=round(commercial_4wk_flow, 2),
-            concentration_score=round(concentration_score, 1),
-            spread_ratio=round(spread_ratio, 1),
-            herding_score=round(herding_score, 1),
-            front_back_ratio=round(front_back_ratio, 2),
-            gross_positions_percentile=round(gross_percentile, 1),
+            **{
+                name: round(value, ML_FEATURE_DIGITS.get(name, 1))
+                for name, value in latest.items()
+            }
         )
 
         # Rule-based regime classification
-        primary_regime = MLRegimeType.CONSOLIDATION
-        confidence = 50.0
+        primary_regime = MLRegimeType(regimes[0])
+        confidence = float(confidences[0])
         secondary_regime = None
         secondary_confidence = None
 
-        # Mean reversion: extreme positioning
-        if mm_percentile >= 90 or mm_percentile <= 10:
-            primary_regime = MLRegimeType.MEAN_REVERSION
-            confidence = min(95, 50 + abs(mm_percentile - 50))
-            if commercial_4wk_flow * mm_4wk_flow < 0:  # Divergence
-                confidence += 10
-
-        # Capitulation: extreme + falling trader counts
-        elif mm_percentile >= 85 and mm_4wk_flow < -2:
-            primary_regime = MLRegimeType.CAPITULATION
-            confidence = 70 + abs(mm_4wk_flow) * 3
-
-        # Accumulation: commercials building, specs light
-        elif commercial_percentile >= 70 and mm_percentile <= 40:
-            primary_regime = MLRegimeType.ACCUMULATION
-            confidence = 60 + (commercial_percentile - mm_percentile) / 2
-
-        # Distribution: commercials selling, specs heavy
-        elif commercial_percentile <= 30 and mm_percentile >= 60:
-            primary_regime = MLRegimeType.DISTRIBUTION
-            confidence = 60 + (mm_percentile - commercial_percentile) / 2
-
-        # Trend following: aligned positioning with momentum
-        elif 30 <= mm_percentile <= 70 and abs(mm_4wk_flow) > 2:
-            primary_regime = MLRegimeType.TREND_FOLLOWING
-            confidence = 55 + abs(mm_4wk_flow) * 5
-
-        # Breakout setup: building concentration
-        elif concentration_score > 50 and gross_percentile > 70:
-            primary_regime = MLRegimeType.BREAKOUT_SETUP
-            confidence = 50 + concentration_score / 2
-
-        # Otherwise consolidation
-        else:
-            primary_regime = MLRegimeType.CONSOLIDATION
-            confidence = 60
-
-        confidence = min(95, confidence)
-
         # Regime descriptions
         regime_info = {
             MLRegimeType.TREND_FOLLOWING: {
@@ -1881,7 +1961,7 @@ class COTAdvancedService:
 
         current_classification = MLRegimeClassification(
             commodity=commodity,
-            report_date=str(current.Report_Date_as_YYYY_MM_DD or ""),
+            report_date=data.report_date(),
             primary_regime=primary_regime,
             primary_confidence=round(confidence, 1),
             secondary_regime=secondary_regime,
@@ -1900,15 +1980,9 @@ class COTAdvancedService:
         regime_counts = {}
         current_regime_duration = 0
 
-        for i, record in enumerate(data[:26]):
-            hist_mm_pct = (
-                sum(1 for x in mm_nets if x <= mm_nets[i]) / len(mm_nets) * 100
-            )
-            hist_comm_pct = (
-                sum(1 for x in commercial_nets if x <= commercial_nets[i])
-                / len(commercial_nets)
-                * 100
-            )
+        for i, report_date in enumerate(data.dates[:26].tolist()):
+            hist_mm_pct = float(mm_percentiles[i])
+            hist_comm_pct = float(commercial_percentiles[i])
 
             # Simplified classification for history
             if hist_mm_pct >= 85 or hist_mm_pct <= 15:
@@ -1922,7 +1996,7 @@ class COTAdvancedService:
 
             regime_history.append(
                 MLRegimeHistoryItem(
-                    report_date=str(record.Report_Date_as_YYYY_MM_DD or ""),
+                    report_date=report_date,
                     regime=hist_regime,
                     confidence=60.0,
                     mm_percentile=round(hist_mm_pct, 1),
@@ -1943,7 +2017,7 @@ class COTAdvancedService:
 
         return MLRegimeAnalysisResponse(
             commodity=commodity,
-            report_date=str(current.Report_Date_as_YYYY_MM_DD or ""),
+            report_date=data.report_date(),
             current_regime=current_classification,
             features=features,
             regime_history=regime_history,
@@ -0,0 +1,111 @@
+"""
+COT Result Cache Service
+
+COT reports are released once a week, so every /cot/disagg/* response is a
+pure function of (endpoint, parameters, latest report date). Responses are
+cached on the shared CacheBackend under keys that include the latest
+Report_Date_as_YYYY_MM_DD: when a new report is ingested the latest date
+moves on, every old key stops matching and simply expires.
+
+The latest report date itself is cached briefly, so between releases a
+cached endpoint does not touch Postgres at all. Ingestion calls
+mark_new_report() to switch to the new date immediately. The disaggregated
+table and the legacy FMP table are tracked as separate sources.
+"""
+
+from typing import Any, Optional
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+import json
+import logging
+
+from models.cot import COTReportDisaggFuturesOnly, COTReportLegacy
+from services.seasonal_cache_service import CacheBackend, get_cache
+
+logger = logging.getLogger(__name__)
+
+# Report date column of each cached data source
+DISAGG = "disagg"
+LEGACY = "legacy"
+REPORT_DATE_COLUMNS = {
+    DISAGG: COTReportDisaggFuturesOnly.Report_Date_as_YYYY_MM_DD,
+    LEGACY: COTReportLegacy.report_date,
+}
+
+# Commodities precomputed after each report (see warm-up in api/v1/endpoints/cot.py)
+POPULAR_COMMODITIES = ["GOLD", "SILVER", "CRUDE", "COPPER", "NATURAL GAS"]
+
+
+class COTCacheService:
+    """
+    Cache of COT endpoint responses keyed by the latest report date.
+
+    Usage:
+        cache = get_cot_cache()
+        report_date = cache.latest_report_date(db)
+        data = cache.get("disagg/analysis", report_date, commodity="GOLD", weeks=52)
+        if data is None:
+            data = compute()
+            cache.set("disagg/analysis", report_date, data, commodity="GOLD", weeks=52)
+    """
+
+    PREFIX = "cot"
+    LATEST_PREFIX = "cot:latest_report_date"
+
+    # Old report keys are never read again, keep them a little over a week
+    TTL_REPORT = 8 * 86400
+    # Bounds staleness when reports are loaded outside the ingestion job
+    TTL_LATEST = 3600
+
+    def __init__(self, backend: Optional[CacheBackend] = None):
+        self._cache = backend or get_cache().backend
+
+    def _make_key(self, endpoint: str, report_date: str, **params) -> str:
+        """Generate a cache key from endpoint, report date and parameters"""
+        if isinstance(params.get("commodity"), str):
+            params["commodity"] = params["commodity"].upper().strip()
+        values = ":".join(f"{k}={v}" for k, v in sorted(params.items()))
+        return f"{self.PREFIX}:{endpoint}:report={report_date}:{values}"
+
+    def latest_report_date(self, db: Session, source: str = DISAGG) -> str:
+        """Latest report date of a data source (cached for TTL_LATEST)"""
+        key = f"{self.LATEST_PREFIX}:{source}"
+        cached = self._cache.get(key)
+        if cached:
+            return cached
+
+        latest = db.query(func.max(REPORT_DATE_COLUMNS[source])).scalar()
+        report_date = str(latest) if latest else ""
+        if report_date:
+            self._cache.set(key, report_date, self.TTL_LATEST)
+        return report_date
+
+    def mark_new_report(self, report_date: str, source: str = DISAGG) -> None:
+        """Switch cache reads to a newly ingested report date"""
+        key = f"{self.LATEST_PREFIX}:{source}"
+        self._cache.set(key, str(report_date), self.TTL_LATEST)
+        logger.info(f"COT cache ({source}) now keyed on report date {report_date}")
+
+    def get(self, endpoint: str, report_date: str, **params) -> Optional[Any]:
+        """Cached JSON response, or None"""
+        data = self._cache.get(self._make_key(endpoint, report_date, **params))
+        return json.loads(data) if data else None
+
+    def set(self, endpoint: str, report_date: str, data: Any, **params) -> bool:
+        """Store a JSON-serializable response"""
+        if not report_date:
+            return False
+        key = self._make_key(endpoint, report_date, **params)
+        return self._cache.set(key, json.dumps(data, default=str), self.TTL_REPORT)
+
+
+# Global cache instance
+_cot_cache_instance: Optional[COTCacheService] = None
+
+
+def get_cot_cache() -> COTCacheService:
+    """Get the global COT cache instance"""
+    global _cot_cache_instance
+    if _cot_cache_instance is None:
+        _cot_cache_instance = COTCacheService()
+    return _cot_cache_instance
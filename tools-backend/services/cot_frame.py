@@ -0,0 +1,521 @@
+"""
+Columnar COT data access.
+
+Loads only the columns an analysis needs from cot_report_disagg_futures_only
+into a pandas frame keyed by report date (newest first), instead of
+hydrating full ~190 column ORM rows. Position columns are stored as
+comma-formatted text and are parsed once, vectorized, on load; nets, gross
+positions, spread ratios and per-trader averages are array operations.
+
+Usage:
+    frame = load_commodity_frame(db, "GOLD", columns=NET_COLUMNS, weeks=260)
+    mm_net = frame.net("M_Money")             # np.ndarray, newest first
+    pct = frame.percentile_rank(mm_net, mm_net[0])
+"""
+
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import desc, func, select
+from sqlalchemy.orm import Session
+
+from models.cot import COTReportDisaggFuturesOnly
+
+REPORT_DATE = "Report_Date_as_YYYY_MM_DD"
+
+# Trader category prefixes used in the CFTC column names
+PRODUCER_MERCHANT = "Prod_Merc"
+SWAP_DEALER = "Swap"
+MANAGED_MONEY = "M_Money"
+OTHER_REPORTABLES = "Other_Rept"
+NON_REPORTABLES = "NonRept"
+
+NET_CATEGORIES = (
+    PRODUCER_MERCHANT,
+    SWAP_DEALER,
+    MANAGED_MONEY,
+    OTHER_REPORTABLES,
+    NON_REPORTABLES,
+)
+SPREAD_CATEGORIES = (SWAP_DEALER, MANAGED_MONEY, OTHER_REPORTABLES)
+
+# Columns kept as text (everything else is parsed to numbers)
+TEXT_COLUMNS = frozenset(
+    {
+        REPORT_DATE,
+        "ID",
+        "Market_and_Exchange_Names",
+        "Commodity_Name",
+        "COMMODITY_NAME_UPPER",
+        "COMMODITY_GROUP_NAME",
+        "COMMODITY_SUBGROUP_NAME",
+        "market_key",
+    }
+)
+
+# Percentage columns stay float; counts and positions become int64
+FLOAT_PREFIXES = ("Conc_", "Pct_of_")
+
+
+def position_column(category: str, side: str, bucket: str = "All") -> str:
+    """Position column name, e.g. M_Money_Positions_Long_All"""
+    return f"{category}_Positions_{side}_{bucket}"
+
+
+def change_column(category: str, side: str) -> str:
+    """Weekly change column name, e.g. Change_in_M_Money_Long_All"""
+    return f"Change_in_{category}_{side}_All"
+
+
+def trader_column(category: str, side: str, bucket: str = "All") -> str:
+    """Trader count column name, e.g. Traders_M_Money_Long_All"""
+    return f"Traders_{category}_{side}_{bucket}"
+
+
+# Column groups, combined per analysis so each query projects only what it uses
+MARKET_COLUMNS = (
+    "Market_and_Exchange_Names",
+    "Commodity_Name",
+    "COMMODITY_GROUP_NAME",
+    "COMMODITY_SUBGROUP_NAME",
+)
+NET_COLUMNS = ("Open_Interest_All",) + tuple(
+    position_column(category, side)
+    for category in NET_CATEGORIES
+    for side in ("Long", "Short")
+)
+SPREAD_COLUMNS = tuple(
+    position_column(category, "Spread") for category in SPREAD_CATEGORIES
+)
+CHANGE_COLUMNS = tuple(
+    change_column(category, side)
+    for category in (PRODUCER_MERCHANT, SWAP_DEALER, MANAGED_MONEY, OTHER_REPORTABLES)
+    for side in ("Long", "Short")
+)
+TRADER_COLUMNS = tuple(
+    trader_column(category, side)
+    for category in (PRODUCER_MERCHANT, MANAGED_MONEY)
+    for side in ("Long", "Short")
+)
+CONCENTRATION_COLUMNS = tuple(
+    f"Conc_{kind}_LE_{n}_TDR_{side}_All"
+    for kind in ("Gross", "Net")
+    for n in (4, 8)
+    for side in ("Long", "Short")
+)
+CURVE_COLUMNS = (
+    ("Open_Interest_Old", "Open_Interest_Other", "Conc_Gross_LE_4_TDR_Long_Old")
+    + tuple(
+        position_column(category, side, bucket)
+        for category in (PRODUCER_MERCHANT, SWAP_DEALER, MANAGED_MONEY)
+        for bucket in ("Old", "Other")
+        for side in ("Long", "Short")
+    )
+    + tuple(
+        position_column(category, "Spread", bucket)
+        for category in (SWAP_DEALER, MANAGED_MONEY)
+        for bucket in ("Old", "Other")
+    )
+)
+
+
+def _parse_numeric(series: pd.Series, integer: bool) -> pd.Series:
+    """Parse a (possibly comma-formatted text) column, missing values as 0"""
+    # Text is object dtype before pandas 3 and str dtype from it
+    if not pd.api.types.is_numeric_dtype(series):
+        series = series.astype(str).str.replace(",", "", regex=False)
+    values = pd.to_numeric(series, errors="coerce").fillna(0)
+    return values.astype(np.int64) if integer else values.astype(np.float64)
+
+
+def _parse_columns(data: pd.DataFrame) -> pd.DataFrame:
+    """Parse every non-text column in place"""
+    for column in data.columns:
+        if column in TEXT_COLUMNS:
+            continue
+        data[column] = _parse_numeric(
+            data[column], integer=not column.startswith(FLOAT_PREFIXES)
+        )
+    data[REPORT_DATE] = data[REPORT_DATE].fillna("").astype(str)
+    return data
+
+
+class COTFrame:
+    """
+    Weekly COT history for one market, newest report first.
+
+    Index 0 is the latest report, matching the ordering of the ORM query it
+    replaces. Derived series are memoized, so repeated calls are free.
+    """
+
+    def __init__(self, data: pd.DataFrame):
+        self.data = data
+        self._cache: Dict[Tuple[Any, ...], np.ndarray] = {}
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Sequence[Any]], columns: Sequence[str]) -> "COTFrame":
+        """Build a frame from projected result rows, parsing numeric columns"""
+        data = pd.DataFrame.from_records(list(rows), columns=list(columns))
+        return cls(_parse_columns(data).set_index(REPORT_DATE))
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    @property
+    def dates(self) -> np.ndarray:
+        """Report dates (YYYY-MM-DD strings), newest first"""
+        return self.data.index.to_numpy()
+
+    def report_date(self, i: int = 0) -> str:
+        return str(self.data.index[i])
+
+    def head(self, weeks: int) -> "COTFrame":
+        """The latest `weeks` reports as a new frame"""
+        return COTFrame(self.data.iloc[:weeks])
+
+    def column(self, name: str) -> np.ndarray:
+        """Raw column values as an array"""
+        if name not in self.data.columns:
+            raise KeyError(f"COT column not loaded: {name}")
+        return self.data[name].to_numpy()
+
+    def value(self, name: str, i: int = 0) -> Any:
+        """Single value as a plain Python scalar (row 0 is the latest report)"""
+        value = self.column(name)[i]
+        return value.item() if isinstance(value, np.generic) else value
+
+    def _memo(self, key: Tuple[Any, ...], compute) -> np.ndarray:
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+
+    def long(self, category: str, bucket: str = "All") -> np.ndarray:
+        return self.column(position_column(category, "Long", bucket))
+
+    def short(self, category: str, bucket: str = "All") -> np.ndarray:
+        return self.column(position_column(category, "Short", bucket))
+
+    def spread(self, category: str, bucket: str = "All") -> np.ndarray:
+        return self.column(position_column(category, "Spread", bucket))
+
+    def net(self, category: str, bucket: str = "All") -> np.ndarray:
+        """Long minus short"""
+        return self._memo(
+            ("net", category, bucket),
+            lambda: self.long(category, bucket) - self.short(category, bucket),
+        )
+
+    def gross(self, category: str, bucket: str = "All") -> np.ndarray:
+        """Long plus short (outright positions, spreads excluded)"""
+        return self._memo(
+            ("gross", category, bucket),
+            lambda: self.long(category, bucket) + self.short(category, bucket),
+        )
+
+    def net_percentiles(self, category: str) -> np.ndarray:
+        """Percentile rank of every week's net position within this history"""
+        return self._memo(
+            ("net_percentiles", category),
+            lambda: self.percentile_ranks(self.net(category)),
+        )
+
+    def net_flow(self, category: str, weeks: int = 4) -> float:
+        """Net position change of the latest report versus `weeks` reports ago"""
+        return self._memo(
+            ("net_flow", category, weeks),
+            lambda: self.change_in(self.net(category), weeks),
+        )
+
+    def net_flows(self, category: str, weeks: int = 4) -> np.ndarray:
+        """net_flow of every report versus `weeks` reports before it, newest first"""
+
+        def compute() -> np.ndarray:
+            net = self.net(category)
+            earlier = np.minimum(np.arange(len(net)) + weeks, len(net) - 1)
+            return net - net[earlier]
+
+        return self._memo(("net_flows", category, weeks), compute)
+
+    def rolling_net_ranks(
+        self, category: str, window: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Rolling percentile rank and COT index of the net position, newest first.
+
+        Each week is ranked against the `window` reports up to and including it.
+        """
+        key = ("rolling_net_ranks", category, window)
+        if key not in self._cache:
+            percentile, cot_index = rolling_rank(self.net(category)[::-1], window)
+            self._cache[key] = (percentile[::-1], cot_index[::-1])
+        return self._cache[key]
+
+    @property
+    def open_interest(self) -> np.ndarray:
+        return self.column("Open_Interest_All")
+
+    def spread_ratio(self, categories: Iterable[str]) -> np.ndarray:
+        """Spread positions as % of gross + spread, summed over categories (0 if empty)"""
+        categories = tuple(categories)
+
+        def compute() -> np.ndarray:
+            spread = sum(self.spread(c) for c in categories)
+            total = sum(self.gross(c) for c in categories) + spread
+            return self.safe_divide(spread * 100.0, total)
+
+        return self._memo(("spread_ratio", categories), compute)
+
+    def traders(self, category: str, side: str, default: int = 0) -> np.ndarray:
+        """Trader counts, with missing/zero counts replaced by `default`"""
+        counts = self.column(trader_column(category, side))
+        if default:
+            counts = np.where(counts == 0, default, counts)
+        return counts
+
+    def avg_position(self, category: str, side: str) -> np.ndarray:
+        """Contracts per trader on one side (zero trader counts treated as 1)"""
+        return self._memo(
+            ("avg_position", category, side),
+            lambda: self.column(position_column(category, side))
+            / self.traders(category, side, default=1),
+        )
+
+    @staticmethod
+    def change_in(values: np.ndarray, weeks: int) -> float:
+        """Change of a series versus `weeks` reports ago (clamped to the oldest)"""
+        return values[0] - values[min(weeks, len(values) - 1)]
+
+    @staticmethod
+    def safe_divide(
+        numerator: np.ndarray, denominator: np.ndarray, default: float = 0.0
+    ) -> np.ndarray:
+        """Element-wise division returning `default` where the denominator is <= 0"""
+        numerator = np.asarray(numerator, dtype=np.float64)
+        denominator = np.asarray(denominator, dtype=np.float64)
+        out = np.full(np.broadcast(numerator, denominator).shape, default)
+        np.divide(numerator, denominator, out=out, where=denominator > 0)
+        return out
+
+    @staticmethod
+    def percentile_rank(values: np.ndarray, value: float) -> float:
+        """Share of values <= value, in percent (50 for an empty history)"""
+        if len(values) == 0:
+            return 50.0
+        return float(np.count_nonzero(values <= value) / len(values) * 100)
+
+    @staticmethod
+    def percentile_ranks(values: np.ndarray) -> np.ndarray:
+        """percentile_rank of every element against the whole series"""
+        if len(values) == 0:
+            return np.empty(0)
+        ordered = np.sort(values)
+        return np.searchsorted(ordered, values, side="right") / len(values) * 100
+
+
+def rolling_rank(values: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Rolling percentile rank and COT index of each value in its trailing window.
+
+    `values` are chronological (oldest first). Each point is ranked against
+    itself and up to `window - 1` preceding values, so the first points use
+    the shorter history available. The window is kept as a sorted list:
+    bisection finds positions in O(log W), but each insert and delete shifts
+    up to W elements, so the series costs O(N * W) moves in the worst case.
+    With COT windows of a few hundred weekly reports those shifts are short
+    memmoves and outrun a tree-based structure in pure Python.
+
+    Returns:
+        (percentile, cot_index): share of the window <= value in percent (as
+        COTFrame.percentile_rank), and (value - min) / (max - min) * 100,
+        50 for a flat window
+    """
+    series = np.asarray(values, dtype=np.float64).tolist()
+    percentile = np.empty(len(series))
+    cot_index = np.empty(len(series))
+
+    ordered: List[float] = []
+    for i, value in enumerate(series):
+        if i >= window:
+            del ordered[bisect_left(ordered, series[i - window])]
+        insort(ordered, value)
+
+        percentile[i] = bisect_right(ordered, value) / len(ordered) * 100
+        low, high = ordered[0], ordered[-1]
+        cot_index[i] = (value - low) / (high - low) * 100 if high > low else 50.0
+
+    return percentile, cot_index
+
+
+def load_cot_frame(
+    db: Session,
+    filters: List[Any],
+    columns: Iterable[str],
+    weeks: int,
+) -> COTFrame:
+    """
+    Select the latest `weeks` reports matching `filters`, projecting only `columns`.
+
+    Args:
+        db: Database session
+        filters: SQLAlchemy filter expressions on COTReportDisaggFuturesOnly
+        columns: Model attribute names to load (report date is always included)
+        weeks: Number of reports to load
+
+    Returns:
+        COTFrame ordered newest first
+    """
+    names = [REPORT_DATE] + list(dict.fromkeys(c for c in columns if c != REPORT_DATE))
+    model = COTReportDisaggFuturesOnly
+    stmt = (
+        select(*(getattr(model, name) for name in names))
+        .where(*filters)
+        .order_by(desc(model.Report_Date_as_YYYY_MM_DD))
+        .limit(weeks)
+    )
+    return COTFrame.from_rows(db.execute(stmt).all(), names)
+
+
+# User-facing commodity names mapped to market_key, the contract part of
+# Market_and_Exchange_Names. Keeps contract sizes apart (GOLD vs MICRO GOLD).
+COMMODITY_MARKET_KEYS = {
+    # Main contracts
+    "GOLD": "GOLD",
+    "SILVER": "SILVER",
+    "CRUDE": "CRUDE OIL, LIGHT SWEET",
+    "COPPER": "COPPER",
+    "PLATINUM": "PLATINUM",
+    "PALLADIUM": "PALLADIUM",
+    "NATURAL GAS": "NATURAL GAS",
+    # Micro contracts - separate markets (only include those with data)
+    "MICRO GOLD": "MICRO GOLD",
+}
+
+
+def market_key_for(commodity: str) -> str:
+    """Resolve a commodity name to its market_key (unmapped names are used as-is)"""
+    commodity_upper = commodity.upper().strip()
+    return COMMODITY_MARKET_KEYS.get(commodity_upper, commodity_upper)
+
+
+def load_commodity_frame(
+    db: Session, commodity: str, columns: Iterable[str], weeks: int
+) -> COTFrame:
+    """
+    Load a commodity's history through the (market_key, report date) index.
+
+    Falls back to a substring match on the commodity name when no market
+    has the resolved key.
+
+    Args:
+        db: Database session
+        commodity: Commodity name (e.g., GOLD, MICRO GOLD, SILVER)
+        columns: Model attribute names to load
+        weeks: Number of reports to load
+
+    Returns:
+        COTFrame ordered newest first
+    """
+    model = COTReportDisaggFuturesOnly
+    frame = load_cot_frame(
+        db, [model.market_key == market_key_for(commodity)], columns, weeks
+    )
+    if not len(frame):
+        frame = load_cot_frame(
+            db, [model.Commodity_Name.ilike(f"%{commodity.strip()}%")], columns, weeks
+        )
+    return frame
+
+
+class COTContext:
+    """
+    One commodity's COT history, loaded once per request and shared by analyses.
+
+    Analyses ask for the window of history they need; windows are memoized
+    COTFrames, so nets, percentiles and flows are computed once per window
+    however many analyses use them.
+
+    Usage:
+        context = COTContext.load(db, "GOLD", ANALYSIS_COLUMNS, weeks=52)
+        recent = context.window(12)
+        recent.net_percentiles("M_Money")
+    """
+
+    def __init__(self, commodity: str, frame: COTFrame):
+        self.commodity = commodity
+        self.frame = frame
+        self._windows: Dict[int, COTFrame] = {len(frame): frame}
+
+    @classmethod
+    def load(
+        cls, db: Session, commodity: str, columns: Iterable[str], weeks: int
+    ) -> "COTContext":
+        return cls(commodity, load_commodity_frame(db, commodity, columns, weeks))
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def window(self, weeks: int) -> COTFrame:
+        """The latest `weeks` reports (all loaded reports if fewer)"""
+        weeks = min(weeks, len(self.frame))
+        if weeks not in self._windows:
+            self._windows[weeks] = self.frame.head(weeks)
+        return self._windows[weeks]
+
+
+# Rank of a report within its market, 1 = latest
+WEEK_RANK = "week_rank"
+
+
+def load_cot_panel(
+    db: Session,
+    columns: Iterable[str],
+    weeks: int,
+    partition: str = "Commodity_Name",
+) -> pd.DataFrame:
+    """
+    Latest `weeks` reports of every market in one windowed query.
+
+    Uses ROW_NUMBER() OVER (PARTITION BY market ORDER BY report date DESC)
+    instead of one query per market.
+
+    Args:
+        db: Database session
+        columns: Model attribute names to load
+        weeks: Reports per market
+        partition: Model attribute identifying a market
+
+    Returns:
+        Parsed frame with `partition`, report date, `columns` and WEEK_RANK,
+        ordered by market and newest report first
+    """
+    model = COTReportDisaggFuturesOnly
+    names = [partition, REPORT_DATE] + list(
+        dict.fromkeys(c for c in columns if c not in (partition, REPORT_DATE))
+    )
+    market = getattr(model, partition)
+
+    ranked = (
+        select(
+            *(getattr(model, name).label(name) for name in names),
+            func.row_number()
+            .over(
+                partition_by=market,
+                order_by=desc(model.Report_Date_as_YYYY_MM_DD),
+            )
+            .label(WEEK_RANK),
+        )
+        .where(market.isnot(None))
+        .subquery()
+    )
+    stmt = (
+        select(*(ranked.c[name] for name in names), ranked.c[WEEK_RANK])
+        .where(ranked.c[WEEK_RANK] <= weeks)
+        .order_by(ranked.c[partition], ranked.c[WEEK_RANK])
+    )
+
+    data = pd.DataFrame.from_records(
+        list(db.execute(stmt).all()), columns=names + [WEEK_RANK]
+    )
+    return _parse_columns(data)
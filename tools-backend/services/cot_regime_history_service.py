@@ -0,0 +1,216 @@
+"""
+COT ML Regime History Service
+
+classify_ml_regime() classifies the latest week only. This service
+classifies every historical week at once: the feature matrix of a market
+(COTAdvancedService.ml_regime_features) is built as arrays and classified
+in one vectorized pass (classify_ml_regimes), then stored in
+cot_ml_regime_history for regime-transition charts and backtests.
+
+Each week's percentiles are ranked against the REGIME_WINDOW reports up to
+that week, so a stored week never changes when later reports arrive.
+"""
+
+from collections import Counter
+from datetime import date
+from typing import Any, Dict, List, Tuple
+import logging
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from models.cot import COTMLRegimeHistory
+from schemas.cot import (
+    MLRegimeFeatures,
+    MLRegimeHistoryPoint,
+    MLRegimeHistoryResponse,
+    MLRegimeTransition,
+)
+from services.bulk_writer import COT_ML_REGIME_HISTORY, bulk_upsert
+from services.cot_advanced_service import (
+    ML_FEATURE_DIGITS,
+    ML_REGIME_COLUMNS,
+    COTAdvancedService,
+)
+from services.cot_frame import (
+    COTFrame,
+    load_commodity_frame,
+    load_cot_panel,
+    market_key_for,
+    REPORT_DATE,
+)
+
+logger = logging.getLogger(__name__)
+
+# Percentile lookback of stored weeks (classify_ml_regime's default window)
+REGIME_WINDOW = 52
+
+# Reports needed before a market is classified (as classify_ml_regime)
+MIN_REPORTS = 8
+
+# Weeks recomputed after each new report
+REFRESH_WEEKS = 4
+
+FEATURE_NAMES = tuple(MLRegimeFeatures.model_fields)
+
+
+class COTRegimeHistoryService:
+    """Vectorized weekly ML regime classification and its stored history"""
+
+    @staticmethod
+    def history_rows(
+        market_key: str, frame: COTFrame, weeks: int, window: int = REGIME_WINDOW
+    ) -> List[Dict[str, Any]]:
+        """
+        Classify the latest `weeks` reports of a frame, newest first.
+
+        The frame should hold `weeks + window - 1` reports so the oldest
+        classified week still has a full percentile window.
+
+        Returns:
+            cot_ml_regime_history rows
+        """
+        matrix = COTAdvancedService.ml_regime_features(frame, window)
+        regimes, confidences = COTAdvancedService.classify_ml_regimes(matrix)
+
+        points = min(weeks, len(frame))
+        features = {
+            name: np.round(values[:points], ML_FEATURE_DIGITS.get(name, 1)).tolist()
+            for name, values in matrix.items()
+        }
+        regimes = regimes[:points].tolist()
+        confidences = np.round(confidences[:points], 1).tolist()
+
+        return [
+            {
+                "market_key": market_key,
+                "report_date": date.fromisoformat(report_date[:10]),
+                "window": window,
+                "regime": regimes[i],
+                "confidence": confidences[i],
+                **{name: features[name][i] for name in FEATURE_NAMES},
+            }
+            for i, report_date in enumerate(frame.dates[:points].tolist())
+        ]
+
+    @staticmethod
+    def backfill(
+        db: Session, weeks: int = 260, window: int = REGIME_WINDOW
+    ) -> int:
+        """
+        Classify the latest `weeks` reports of every market and store them.
+
+        History of all markets is loaded in one windowed query. Runs inside
+        the session's transaction; the caller commits.
+
+        Returns:
+            Number of weekly classifications written
+        """
+        panel = load_cot_panel(
+            db, ML_REGIME_COLUMNS, weeks + window - 1, partition="market_key"
+        )
+
+        rows = []
+        for market_key, history in panel.groupby("market_key", sort=False):
+            if len(history) < MIN_REPORTS:
+                continue
+            frame = COTFrame(history.set_index(REPORT_DATE))
+            rows.extend(
+                COTRegimeHistoryService.history_rows(market_key, frame, weeks, window)
+            )
+
+        written = bulk_upsert(db, COT_ML_REGIME_HISTORY, rows)
+        logger.info(f"COT ML regime history: {written} weekly classifications stored")
+        return written
+
+    @staticmethod
+    def stored_rows(
+        db: Session, market_key: str, weeks: int, window: int = REGIME_WINDOW
+    ) -> List[Dict[str, Any]]:
+        """Latest `weeks` stored classifications of a market, newest first"""
+        model = COTMLRegimeHistory
+        stored = (
+            db.query(model)
+            .filter(model.market_key == market_key, model.window == window)
+            .order_by(model.report_date.desc())
+            .limit(weeks)
+            .all()
+        )
+        columns = ("report_date", "regime", "confidence") + FEATURE_NAMES
+        return [{name: getattr(record, name) for name in columns} for record in stored]
+
+    @staticmethod
+    def load_history(
+        db: Session, commodity: str, weeks: int, window: int = REGIME_WINDOW
+    ) -> Tuple[List[Dict[str, Any]], str]:
+        """
+        Weekly classifications of a commodity, newest first.
+
+        Reads the stored history when it covers the requested weeks. The
+        /cron/cot-cache refresh only stores the latest REFRESH_WEEKS, so a
+        market that was never fully backfilled, or a request reaching past
+        the backfill, is computed on the fly from the reports instead.
+
+        Returns:
+            (rows, source) with source "stored" or "computed"
+        """
+        market_key = market_key_for(commodity)
+        stored = COTRegimeHistoryService.stored_rows(db, market_key, weeks, window)
+        if len(stored) >= weeks:
+            return stored, "stored"
+
+        frame = load_commodity_frame(
+            db, commodity, ML_REGIME_COLUMNS, weeks + window - 1
+        )
+        if len(frame) < MIN_REPORTS or len(frame) <= len(stored):
+            # No older reports than the stored weeks
+            if stored:
+                return stored, "stored"
+            raise ValueError(f"Insufficient data for commodity: {commodity}")
+        return (
+            COTRegimeHistoryService.history_rows(market_key, frame, weeks, window),
+            "computed",
+        )
+
+    @staticmethod
+    def get_history(
+        db: Session, commodity: str, weeks: int = 156, window: int = REGIME_WINDOW
+    ) -> MLRegimeHistoryResponse:
+        """Regime history with transitions and distribution, oldest week first"""
+        rows, source = COTRegimeHistoryService.load_history(
+            db, commodity, weeks, window
+        )
+        rows = rows[::-1]
+
+        history = [
+            MLRegimeHistoryPoint(
+                report_date=str(row["report_date"]),
+                regime=row["regime"],
+                confidence=row["confidence"],
+                features=MLRegimeFeatures(
+                    **{name: row[name] or 0.0 for name in FEATURE_NAMES}
+                ),
+            )
+            for row in rows
+        ]
+        transitions = [
+            MLRegimeTransition(
+                report_date=current.report_date,
+                from_regime=previous.regime,
+                to_regime=current.regime,
+            )
+            for previous, current in zip(history, history[1:])
+            if current.regime != previous.regime
+        ]
+
+        return MLRegimeHistoryResponse(
+            commodity=commodity,
+            report_date=history[-1].report_date,
+            window=window,
+            source=source,
+            history=history,
+            transitions=transitions,
+            regime_distribution=dict(
+                Counter(point.regime.value for point in history)
+            ),
+        )
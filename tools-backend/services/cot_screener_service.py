@@ -0,0 +1,261 @@
+"""
+COT Screener Service
+
+Screens every disaggregated market at once, e.g. "managed money above the
+90th percentile with negative 4-week flow". Features of each market's
+latest report are computed once per report by refresh_features() from a
+single windowed history load and stored in cot_screener_features; screen()
+then filters and sorts that table in SQL.
+
+Features come from the same COTAdvancedService analyses as the
+per-commodity /cot/disagg/* endpoints, so screener values match them.
+"""
+
+from datetime import date, datetime, timezone
+from typing import Dict, Optional, Tuple
+import logging
+
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Query, Session
+
+from models.cot import COTReportDisaggFuturesOnly, COTScreenerFeature
+from services.bulk_writer import COT_SCREENER_FEATURES, bulk_upsert
+from services.cot_advanced_service import COTAdvancedService
+from services.cot_frame import (
+    COTContext,
+    COTFrame,
+    load_cot_panel,
+    CONCENTRATION_COLUMNS,
+    NET_COLUMNS,
+    SPREAD_COLUMNS,
+    TRADER_COLUMNS,
+    PRODUCER_MERCHANT,
+    SWAP_DEALER,
+    MANAGED_MONEY,
+    OTHER_REPORTABLES,
+    NON_REPORTABLES,
+    REPORT_DATE,
+)
+
+logger = logging.getLogger(__name__)
+
+# History window of the precomputed features (the /disagg endpoints' default)
+SCREENER_WEEKS = 52
+
+# Columns needed by the concentration, squeeze and ML regime analyses
+SCREENER_COLUMNS = (
+    NET_COLUMNS
+    + SPREAD_COLUMNS
+    + TRADER_COLUMNS
+    + CONCENTRATION_COLUMNS
+    + ("Open_Interest_Old", "Open_Interest_Other")
+)
+MARKET_INFO_COLUMNS = (
+    "Commodity_Name",
+    "Market_and_Exchange_Names",
+    "COMMODITY_SUBGROUP_NAME",
+)
+
+# Numeric features accepting min/max filters
+RANGE_FIELDS = (
+    "open_interest",
+    "mm_net",
+    "mm_percentile",
+    "commercial_net",
+    "commercial_percentile",
+    "swap_percentile",
+    "other_percentile",
+    "nonrept_percentile",
+    "mm_flow_4w",
+    "mm_flow_4w_pct_oi",
+    "commercial_flow_4w",
+    "crowding_score",
+    "long_squeeze_score",
+    "short_squeeze_score",
+    "squeeze_risk_score",
+    "ml_regime_confidence",
+)
+SORT_FIELDS = RANGE_FIELDS + ("market_key", "commodity_name", "report_date")
+
+
+class COTScreenerService:
+    """Precomputed cross-market COT features and screens over them"""
+
+    @staticmethod
+    def market_features(context: COTContext) -> dict:
+        """
+        Latest features of one market as a cot_screener_features row.
+
+        The ML regime needs 8 reports; with less history it is left empty.
+        """
+        frame = context.frame
+        market = context.commodity
+        weeks = len(frame)
+
+        concentration = COTAdvancedService.analyze_concentration(
+            None, market, weeks, context
+        )
+        squeeze = COTAdvancedService.analyze_squeeze_risk(None, market, weeks, context)
+        try:
+            regime = COTAdvancedService.classify_ml_regime(
+                None, market, weeks, context
+            ).current_regime
+        except ValueError:
+            regime = None
+
+        def percentile(category: str) -> float:
+            return round(float(frame.net_percentiles(category)[0]), 1)
+
+        open_interest = frame.value("Open_Interest_All")
+        mm_flow = frame.net_flow(MANAGED_MONEY, 4)
+
+        return {
+            "market_key": market,
+            "commodity_name": frame.value("Commodity_Name"),
+            "market_name": frame.value("Market_and_Exchange_Names"),
+            "subgroup": frame.value("COMMODITY_SUBGROUP_NAME"),
+            "report_date": date.fromisoformat(frame.report_date()[:10]),
+            "weeks_analyzed": weeks,
+            "open_interest": open_interest,
+            "mm_net": int(frame.net(MANAGED_MONEY)[0]),
+            "mm_percentile": percentile(MANAGED_MONEY),
+            "commercial_net": int(frame.net(PRODUCER_MERCHANT)[0]),
+            "commercial_percentile": percentile(PRODUCER_MERCHANT),
+            "swap_percentile": percentile(SWAP_DEALER),
+            "other_percentile": percentile(OTHER_REPORTABLES),
+            "nonrept_percentile": percentile(NON_REPORTABLES),
+            "mm_flow_4w": int(mm_flow),
+            "mm_flow_4w_pct_oi": round(mm_flow / open_interest * 100, 2)
+            if open_interest > 0
+            else 0.0,
+            "commercial_flow_4w": int(frame.net_flow(PRODUCER_MERCHANT, 4)),
+            "crowding_score": concentration.crowding_score,
+            "crowding_level": concentration.crowding_level,
+            "long_squeeze_score": squeeze.long_squeeze_risk.risk_score,
+            "short_squeeze_score": squeeze.short_squeeze_risk.risk_score,
+            "squeeze_risk_score": max(
+                squeeze.long_squeeze_risk.risk_score,
+                squeeze.short_squeeze_risk.risk_score,
+            ),
+            "dominant_squeeze": squeeze.dominant_risk,
+            "ml_regime": regime.primary_regime.value if regime else None,
+            "ml_regime_confidence": regime.primary_confidence if regime else None,
+        }
+
+    @staticmethod
+    def refresh_features(db: Session, weeks: int = SCREENER_WEEKS) -> int:
+        """
+        Recompute the feature table from one windowed history load.
+
+        Markets that no longer appear in the report table are removed.
+        Runs inside the session's transaction; the caller commits.
+
+        Returns:
+            Number of markets written
+        """
+        panel = load_cot_panel(
+            db, SCREENER_COLUMNS + MARKET_INFO_COLUMNS, weeks, partition="market_key"
+        )
+        updated_at = datetime.now(timezone.utc)
+
+        rows = []
+        for market_key, history in panel.groupby("market_key", sort=False):
+            context = COTContext(market_key, COTFrame(history.set_index(REPORT_DATE)))
+            try:
+                features = COTScreenerService.market_features(context)
+            except Exception as e:
+                logger.warning(f"Skipping screener features for {market_key}: {e}")
+                continue
+            rows.append({**features, "updated_at": updated_at})
+
+        db.query(COTScreenerFeature).filter(
+            COTScreenerFeature.market_key.notin_([row["market_key"] for row in rows])
+        ).delete(synchronize_session=False)
+        written = bulk_upsert(db, COT_SCREENER_FEATURES, rows)
+
+        logger.info(f"COT screener: {written} markets refreshed")
+        return written
+
+    @staticmethod
+    def latest_report_date(db: Session) -> Optional[date]:
+        """Latest report date in the feature table"""
+        return db.query(func.max(COTScreenerFeature.report_date)).scalar()
+
+    @staticmethod
+    def is_stale(db: Session) -> bool:
+        """Whether the report table has a newer report than the features"""
+        latest_report = db.query(
+            func.max(COTReportDisaggFuturesOnly.Report_Date_as_YYYY_MM_DD)
+        ).scalar()
+        if not latest_report:
+            return False
+        latest_feature = COTScreenerService.latest_report_date(db)
+        return latest_feature is None or latest_feature.isoformat() < latest_report[:10]
+
+    @staticmethod
+    def screen(
+        db: Session,
+        ranges: Optional[Dict[str, Tuple[Optional[float], Optional[float]]]] = None,
+        crowding_level: Optional[str] = None,
+        ml_regime: Optional[str] = None,
+        dominant_squeeze: Optional[str] = None,
+        subgroup: Optional[str] = None,
+        search: Optional[str] = None,
+        current_only: bool = True,
+        sort_by: str = "mm_percentile",
+        descending: bool = True,
+    ) -> Query:
+        """
+        Filtered and sorted feature query (not yet paginated).
+
+        Args:
+            db: Database session
+            ranges: {field: (min, max)} inclusive bounds on RANGE_FIELDS;
+                either bound may be None
+            crowding_level / ml_regime / dominant_squeeze: Exact matches
+            subgroup: Commodity subgroup substring, e.g. "PRECIOUS"
+            search: Substring of the market key or market name
+            current_only: Only markets reported on the latest report date
+            sort_by: One of SORT_FIELDS
+            descending: Sort order (missing values always last)
+
+        Raises:
+            ValueError: Unknown range or sort field
+        """
+        model = COTScreenerFeature
+        query = db.query(model)
+
+        for field, (low, high) in (ranges or {}).items():
+            if field not in RANGE_FIELDS:
+                raise ValueError(f"Unknown screener field: {field}")
+            column = getattr(model, field)
+            if low is not None:
+                query = query.filter(column >= low)
+            if high is not None:
+                query = query.filter(column <= high)
+
+        if crowding_level:
+            query = query.filter(model.crowding_level == crowding_level)
+        if ml_regime:
+            query = query.filter(model.ml_regime == ml_regime)
+        if dominant_squeeze:
+            query = query.filter(model.dominant_squeeze == dominant_squeeze)
+        if subgroup:
+            query = query.filter(model.subgroup.ilike(f"%{subgroup}%"))
+        if search:
+            query = query.filter(
+                or_(
+                    model.market_key.ilike(f"%{search}%"),
+                    model.market_name.ilike(f"%{search}%"),
+                )
+            )
+        if current_only:
+            latest = db.query(func.max(model.report_date)).scalar_subquery()
+            query = query.filter(model.report_date == latest)
+
+        if sort_by not in SORT_FIELDS:
+            raise ValueError(f"Unknown sort field: {sort_by}")
+        column = getattr(model, sort_by)
+        order = column.desc() if descending else column.asc()
+        # Market key breaks ties so pages are stable
+        return query.order_by(order.nullslast(), model.market_key)
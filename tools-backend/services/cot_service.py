@@ -1,9 +1,30 @@
 """
 COT (Commitment of Traders) analysis service
 """
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 import statistics
 
+# FMP COT symbols for the commodities tracked by the legacy endpoints
+COT_SYMBOLS = {
+    "GOLD": "GC",
+    "SILVER": "SI",
+    "CRUDE": "CL",
+    "COPPER": "HG",
+    "PLATINUM": "PL",
+    "PALLADIUM": "PA",
+    "NATURALGAS": "NG",
+}
+
+
+def cot_symbol_for(commodity: str) -> Optional[str]:
+    """
+    FMP COT symbol of a commodity, None if untracked
+
+    Spaces are ignored, so the disaggregated spelling "NATURAL GAS" (see
+    POPULAR_COMMODITIES) maps to NG like "NATURALGAS".
+    """
+    return COT_SYMBOLS.get(commodity.upper().replace(" ", ""))
+
 
 class COTService:
     """Service for analyzing CFTC Commitment of Traders data"""
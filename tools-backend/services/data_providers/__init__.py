@@ -8,6 +8,7 @@ from .base import (
     OHLCData,
     HistoricalData,
     HistoricalDataPoint,
+    HistoricalFrame,
     ProviderError,
     RateLimitError,
     AuthenticationError,
@@ -19,6 +20,15 @@ from .factory import (
     get_data_provider_factory,
     configure_providers_from_settings,
 )
+from .rate_limiter import (
+    Priority,
+    RateLimitConfig,
+    RequestScheduler,
+    get_scheduler,
+    configure_scheduler,
+    configure_schedulers_from_settings,
+    get_scheduler_metrics,
+)
 from .metal_price_api import MetalPriceAPIProvider
 from .dhanhq_provider import DhanHQProvider
 from .yahoo_finance_provider import YahooFinanceProvider
@@ -32,6 +42,7 @@ __all__ = [
     "OHLCData",
     "HistoricalData",
     "HistoricalDataPoint",
+    "HistoricalFrame",
     # Errors
     "ProviderError",
     "RateLimitError",
@@ -42,6 +53,14 @@ __all__ = [
     "DataProviderFactory",
     "get_data_provider_factory",
     "configure_providers_from_settings",
+    # Rate limiting
+    "Priority",
+    "RateLimitConfig",
+    "RequestScheduler",
+    "get_scheduler",
+    "configure_scheduler",
+    "configure_schedulers_from_settings",
+    "get_scheduler_metrics",
     # Providers
     "MetalPriceAPIProvider",
     "DhanHQProvider",
@@ -13,6 +13,8 @@ from decimal import Decimal
 from enum import Enum
 from typing import Optional, List, Dict, Any
 
+import numpy as np
+
 
 class Exchange(Enum):
     """Supported exchanges"""
@@ -150,6 +152,122 @@ class HistoricalData:
     provider: str = ""
 
 
+@dataclass
+class HistoricalFrame:
+    """
+    Columnar historical data series: one NumPy array per field.
+
+    Cheaper than HistoricalData for long daily or intraday series since no
+    per-point objects or Decimal conversions are created. Timestamps are
+    naive datetime64[s] in the exchange's local time; missing volumes are NaN.
+    """
+
+    symbol: str
+    currency: str
+    exchange: Exchange
+    timestamps: np.ndarray  # datetime64[s]
+    open: np.ndarray  # float64
+    high: np.ndarray  # float64
+    low: np.ndarray  # float64
+    close: np.ndarray  # float64
+    volume: np.ndarray  # float64, NaN when not reported
+    start_date: date
+    end_date: date
+    interval: str  # "1d", "1h", "15m", etc.
+    provider: str = ""
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @property
+    def dates(self) -> np.ndarray:
+        """Calendar date of each bar as datetime64[D]"""
+        return self.timestamps.astype("datetime64[D]")
+
+    def to_dataframe(self):
+        """Convert to a pandas DataFrame indexed by timestamp"""
+        import pandas as pd
+
+        return pd.DataFrame(
+            {
+                "open": self.open,
+                "high": self.high,
+                "low": self.low,
+                "close": self.close,
+                "volume": self.volume,
+            },
+            index=pd.DatetimeIndex(self.timestamps, name="timestamp"),
+        )
+
+    def to_historical_data(self) -> HistoricalData:
+        """Convert to the row-based HistoricalData structure"""
+        dates = self.dates.tolist()
+        # NaN and zero volumes both map to None, as in the row-based parsers
+        volumes = np.nan_to_num(self.volume, nan=0.0).astype(np.int64).tolist()
+        data_points = [
+            HistoricalDataPoint(
+                date=dates[i],
+                open=Decimal(str(o)),
+                high=Decimal(str(h)),
+                low=Decimal(str(lo)),
+                close=Decimal(str(c)),
+                volume=volumes[i] or None,
+            )
+            for i, (o, h, lo, c) in enumerate(
+                zip(
+                    self.open.tolist(),
+                    self.high.tolist(),
+                    self.low.tolist(),
+                    self.close.tolist(),
+                )
+            )
+        ]
+        return HistoricalData(
+            symbol=self.symbol,
+            currency=self.currency,
+            exchange=self.exchange,
+            data_points=data_points,
+            start_date=self.start_date,
+            end_date=self.end_date,
+            interval=self.interval,
+            provider=self.provider,
+        )
+
+    @classmethod
+    def concat(cls, frames: List["HistoricalFrame"]) -> "HistoricalFrame":
+        """
+        Concatenate frames (e.g. fetched in chunks) into one series.
+
+        Bars are sorted by timestamp; when chunks overlap the later frame wins.
+        """
+        if not frames:
+            raise ValueError("No frames to concatenate")
+
+        first = frames[0]
+        timestamps = np.concatenate([f.timestamps for f in frames])
+        fields = {
+            name: np.concatenate([getattr(f, name) for f in frames])
+            for name in ("open", "high", "low", "close", "volume")
+        }
+
+        # Keep the last occurrence of each timestamp, in chronological order
+        reversed_ts = timestamps[::-1]
+        _, first_idx = np.unique(reversed_ts, return_index=True)
+        keep = len(timestamps) - 1 - first_idx
+
+        return cls(
+            symbol=first.symbol,
+            currency=first.currency,
+            exchange=first.exchange,
+            timestamps=timestamps[keep],
+            start_date=min(f.start_date for f in frames),
+            end_date=max(f.end_date for f in frames),
+            interval=first.interval,
+            provider=first.provider,
+            **{name: values[keep] for name, values in fields.items()},
+        )
+
+
 class BasePriceProvider(ABC):
     """
     Abstract base class for real-time price data providers.
@@ -20,25 +20,34 @@ from decimal import Decimal
 from typing import Optional, List, Dict, Any
 import logging
 import asyncio
-import time
 from functools import partial
 
+import numpy as np
+
 from .base import (
     BasePriceProvider,
     BaseHistoricalDataProvider,
     PriceData,
     OHLCData,
     HistoricalData,
-    HistoricalDataPoint,
+    HistoricalFrame,
     Exchange,
     ProviderError,
+    RateLimitError,
     AuthenticationError,
     SymbolNotFoundError,
     DataNotAvailableError,
 )
+from .rate_limiter import Priority, get_scheduler
 
 logger = logging.getLogger(__name__)
 
+# DhanHQ timestamps are Unix epochs; MCX bars are labelled in IST (UTC+5:30)
+IST_OFFSET = np.timedelta64(330, "m")
+
+# Parallel array fields in DhanHQ chart responses
+OHLC_FIELDS = ("open", "high", "low", "close")
+
 
 class DhanHQProvider(BasePriceProvider, BaseHistoricalDataProvider):
     """
@@ -87,11 +96,15 @@ class DhanHQProvider(BasePriceProvider, BaseHistoricalDataProvider):
     # Instrument types for MCX
     INSTRUMENT_TYPE = "FUTCOM"  # Futures Commodity
 
-    # Rate limiting: 1 request per second
-    RATE_LIMIT_SECONDS = 1.0
+    # Rate limiting (1 request per second) is shared by every instance in
+    # the process; see rate_limiter.DEFAULT_RATE_LIMITS["DhanHQ"]
 
     def __init__(
-        self, client_id: str, access_token: str, auto_fetch_instruments: bool = True
+        self,
+        client_id: str,
+        access_token: str,
+        auto_fetch_instruments: bool = True,
+        priority: Priority = Priority.INTERACTIVE,
     ):
         """
         Initialize DhanHQ provider.
@@ -100,14 +113,17 @@ class DhanHQProvider(BasePriceProvider, BaseHistoricalDataProvider):
             client_id: Your Dhan client ID
             access_token: Your Dhan access token (JWT)
             auto_fetch_instruments: Whether to fetch instrument list on init
+            priority: Scheduling lane for this instance's requests
+                (use Priority.BACKFILL for bulk historical jobs)
         """
         self.client_id = client_id
         self.access_token = access_token
+        self.priority = priority
         self._dhan = None
         self._dhan_context = None
         self._instruments_loaded = False
         self._security_map: Dict[str, str] = {}
-        self._last_request_time: float = 0.0
+        self._scheduler = get_scheduler(self.provider_name)
 
         # Initialize DhanHQ client
         self._init_client()
@@ -135,17 +151,38 @@ class DhanHQProvider(BasePriceProvider, BaseHistoricalDataProvider):
                 self.provider_name, f"Failed to initialize DhanHQ client: {str(e)}"
             )
 
-    async def _rate_limit(self):
+    def _raise_if_rate_limited(self, result: Any):
+        """Raise RateLimitError if a DhanHQ response reports throttling"""
+        if not isinstance(result, dict) or result.get("status") == "success":
+            return
+
+        candidates = [result.get("remarks"), result.get("errorCode")]
+        nested_data = result.get("data", {})
+        if isinstance(nested_data, dict):
+            nested_data = nested_data.get("data", nested_data)
+        if isinstance(nested_data, dict):
+            candidates.extend(nested_data.values())
+
+        for val in candidates:
+            text = str(val).lower() if val else ""
+            if "too many requests" in text or "dh-904" in text:
+                raise RateLimitError(self.provider_name, str(val))
+
+    async def _execute(self, func, *args, **kwargs) -> Any:
         """
-        Enforce rate limiting of 1 request per second.
-        Waits if necessary before allowing the next API call.
+        Run a blocking DhanHQ SDK call under the shared rate limiter.
+
+        Throttled responses are retried with jittered backoff by the
+        scheduler before the result is returned.
         """
-        current_time = time.time()
-        elapsed = current_time - self._last_request_time
-        if elapsed < self.RATE_LIMIT_SECONDS:
-            wait_time = self.RATE_LIMIT_SECONDS - elapsed
-            await asyncio.sleep(wait_time)
-        self._last_request_time = time.time()
+        loop = asyncio.get_running_loop()
+
+        async def call():
+            result = await loop.run_in_executor(None, partial(func, *args, **kwargs))
+            self._raise_if_rate_limited(result)
+            return result
+
+        return await self._scheduler.run(call, priority=self.priority)
 
     @property
     def provider_name(self) -> str:
@@ -199,16 +236,9 @@ class DhanHQProvider(BasePriceProvider, BaseHistoricalDataProvider):
         Returns:
             List of instrument dictionaries
         """
-        loop = asyncio.get_event_loop()
-
         try:
-            # Apply rate limiting
-            await self._rate_limit()
-
-            # Run synchronous DhanHQ call in executor
-            result = await loop.run_in_executor(
-                None, partial(self._dhan.fetch_security_list, "compact")
-            )
+            # Run synchronous DhanHQ call under the shared rate limiter
+            result = await self._execute(self._dhan.fetch_security_list, "compact")
 
             # Handle DataFrame response (newer dhanhq versions return DataFrame)
             instruments = []
@@ -250,18 +280,13 @@ class DhanHQProvider(BasePriceProvider, BaseHistoricalDataProvider):
             PriceData with current price
         """
         security_id = self._get_security_id(symbol)
-        loop = asyncio.get_event_loop()
 
         try:
-            # Apply rate limiting
-            await self._rate_limit()
-
             # Use quote_data for full market data
             securities = {self.MCX_SEGMENT: [security_id]}
 
-            result = await loop.run_in_executor(
-                None, partial(self._dhan.quote_data, securities=securities)
-            )
+            # Throttled responses are retried inside _execute
+            result = await self._execute(self._dhan.quote_data, securities=securities)
 
             if not result or result.get("status") != "success":
                 remarks = result.get("remarks", {})
@@ -270,15 +295,6 @@ class DhanHQProvider(BasePriceProvider, BaseHistoricalDataProvider):
                 else:
                     error_msg = str(remarks) if remarks else "Unknown error"
 
-                # Check for rate limiting in nested data
-                nested_data = result.get("data", {}).get("data", {})
-                if isinstance(nested_data, dict):
-                    for key, val in nested_data.items():
-                        if isinstance(val, str) and "too many requests" in val.lower():
-                            from .base import RateLimitError
-
-                            raise RateLimitError(self.provider_name, val)
-
                 raise DataNotAvailableError(
                     self.provider_name, f"No data returned for {symbol}: {error_msg}"
                 )
@@ -318,7 +334,7 @@ class DhanHQProvider(BasePriceProvider, BaseHistoricalDataProvider):
                 raw_data=quote,
             )
 
-        except (SymbolNotFoundError, DataNotAvailableError):
+        except (SymbolNotFoundError, DataNotAvailableError, RateLimitError):
             raise
         except Exception as e:
             raise ProviderError(self.provider_name, f"Failed to get price: {e}")
@@ -337,27 +353,12 @@ class DhanHQProvider(BasePriceProvider, BaseHistoricalDataProvider):
             List of PriceData objects
         """
         security_ids = [self._get_security_id(s) for s in symbols]
-        loop = asyncio.get_event_loop()
 
         try:
-            # Apply rate limiting
-            await self._rate_limit()
-
             securities = {self.MCX_SEGMENT: security_ids}
 
-            result = await loop.run_in_executor(
-                None, partial(self._dhan.quote_data, securities=securities)
-            )
-
-            # Check for rate limiting in response
-            if result.get("status") != "success":
-                nested_data = result.get("data", {}).get("data", {})
-                if isinstance(nested_data, dict):
-                    for key, val in nested_data.items():
-                        if isinstance(val, str) and "too many requests" in val.lower():
-                            from .base import RateLimitError
-
-                            raise RateLimitError(self.provider_name, val)
+            # Throttled responses are retried inside _execute
+            result = await self._execute(self._dhan.quote_data, securities=securities)
 
             results = []
             # Response structure: data.data.MCX_COMM.{security_id}
@@ -381,6 +382,8 @@ class DhanHQProvider(BasePriceProvider, BaseHistoricalDataProvider):
 
             return results
 
+        except RateLimitError:
+            raise
         except Exception as e:
             raise ProviderError(self.provider_name, f"Failed to get prices: {e}")
 
@@ -399,17 +402,10 @@ class DhanHQProvider(BasePriceProvider, BaseHistoricalDataProvider):
             OHLCData object
         """
         security_id = self._get_security_id(symbol)
-        loop = asyncio.get_event_loop()
-
         try:
-            # Apply rate limiting
-            await self._rate_limit()
-
             securities = {self.MCX_SEGMENT: [security_id]}
 
-            result = await loop.run_in_executor(
-                None, partial(self._dhan.ohlc_data, securities=securities)
-            )
+            result = await self._execute(self._dhan.ohlc_data, securities=securities)
 
             # Response structure: data.data.MCX_COMM.{security_id}
             data = (
@@ -435,34 +431,141 @@ class DhanHQProvider(BasePriceProvider, BaseHistoricalDataProvider):
         except Exception as e:
             raise ProviderError(self.provider_name, f"Failed to get OHLC: {e}")
 
-    async def get_historical_data(
+    @staticmethod
+    def _parse_ohlc_arrays(data: Dict[str, Any]) -> Dict[str, np.ndarray]:
+        """
+        Convert DhanHQ parallel arrays into NumPy columns.
+
+        Lengths are validated once up front instead of per element, epochs
+        are converted to IST datetime64[s] in a single vectorized step.
+
+        Args:
+            data: Dict with open[], high[], low[], close[], volume[], timestamp[]
+
+        Returns:
+            Dict of float64 columns plus "timestamps" (datetime64[s], IST)
+
+        Raises:
+            ValueError: If the arrays have mismatched lengths
+        """
+        timestamps = np.asarray(data.get("timestamp") or [], dtype=np.int64)
+        n = len(timestamps)
+
+        columns: Dict[str, np.ndarray] = {}
+        for field in OHLC_FIELDS:
+            values = np.asarray(data.get(field) or [], dtype=np.float64)
+            if len(values) != n:
+                raise ValueError(
+                    f"Mismatched array lengths: {field}={len(values)}, timestamp={n}"
+                )
+            columns[field] = values
+
+        volume = data.get("volume") or []
+        if len(volume) == n:
+            columns["volume"] = np.asarray(
+                [np.nan if v is None else v for v in volume], dtype=np.float64
+            )
+        else:
+            columns["volume"] = np.full(n, np.nan)
+
+        columns["timestamps"] = timestamps.astype("datetime64[s]") + IST_OFFSET
+        return columns
+
+    @staticmethod
+    def _candles_to_arrays(candles: List[Dict[str, Any]]) -> Dict[str, List[Any]]:
+        """Convert legacy list-of-candles responses to parallel arrays"""
+        arrays: Dict[str, List[Any]] = {
+            "timestamp": [],
+            **{field: [] for field in OHLC_FIELDS},
+            "volume": [],
+        }
+        for candle in candles:
+            ts = candle.get("start_Time", candle.get("timestamp", 0))
+            if isinstance(ts, str):
+                # Naive IST string - shift back to an epoch so parsing is uniform
+                ts = (
+                    np.datetime64(ts.replace(" ", "T"), "s") - IST_OFFSET
+                ).astype(np.int64)
+            arrays["timestamp"].append(int(ts))
+            for field in OHLC_FIELDS:
+                arrays[field].append(candle.get(field, 0))
+            arrays["volume"].append(candle.get("volume"))
+        return arrays
+
+    def _frame_from_response(
+        self,
+        result: Any,
+        symbol: str,
+        start_date: date,
+        end_date: date,
+        interval: str,
+    ) -> HistoricalFrame:
+        """Validate a DhanHQ chart response and build a HistoricalFrame"""
+        # Handle error responses
+        if result is None:
+            raise DataNotAvailableError(
+                self.provider_name, f"No data returned for {symbol}"
+            )
+
+        if isinstance(result, str):
+            raise AuthenticationError(self.provider_name, f"API error: {result}")
+
+        if not isinstance(result, dict):
+            raise ProviderError(
+                self.provider_name, f"Unexpected response type: {type(result)}"
+            )
+
+        # Check for API error status
+        if result.get("status") == "failure" or result.get("errorCode"):
+            error_msg = result.get(
+                "remarks", result.get("errorMessage", "Unknown error")
+            )
+            raise AuthenticationError(self.provider_name, f"API error: {error_msg}")
+
+        # DhanHQ returns data as parallel arrays: open[], high[], low[], close[], volume[], timestamp[]
+        data = result.get("data") or {}
+        if isinstance(data, list):
+            data = self._candles_to_arrays(data)
+
+        try:
+            columns = self._parse_ohlc_arrays(data)
+        except (TypeError, ValueError) as e:
+            raise DataNotAvailableError(
+                self.provider_name, f"Malformed chart data for {symbol}: {e}"
+            )
+
+        return HistoricalFrame(
+            symbol=symbol.upper(),
+            currency="INR",
+            exchange=Exchange.MCX,
+            start_date=start_date,
+            end_date=end_date,
+            interval=interval,
+            provider=self.provider_name,
+            **columns,
+        )
+
+    async def get_historical_frame(
         self,
         symbol: str,
         start_date: date,
         end_date: date,
         interval: str = "1d",
-        currency: str = "INR",
-    ) -> HistoricalData:
+    ) -> HistoricalFrame:
         """
-        Get historical daily data.
+        Get historical daily data as NumPy columns.
 
         Args:
             symbol: Commodity symbol
             start_date: Start date
             end_date: End date
             interval: Only "1d" for daily data
-            currency: Always INR for MCX
 
         Returns:
-            HistoricalData with daily data points
+            HistoricalFrame with daily bars
         """
         security_id = self._get_security_id(symbol)
-        loop = asyncio.get_event_loop()
-
         try:
-            # Apply rate limiting
-            await self._rate_limit()
-
             from_date = start_date.strftime("%Y-%m-%d")
             to_date = end_date.strftime("%Y-%m-%d")
 
@@ -471,163 +574,115 @@ class DhanHQProvider(BasePriceProvider, BaseHistoricalDataProvider):
                 f"Fetching historical data for {symbol} (security_id={security_id}) from {from_date} to {to_date}"
             )
 
-            result = await loop.run_in_executor(
-                None,
-                partial(
-                    self._dhan.historical_daily_data,
-                    security_id=str(security_id),  # Historical API expects string
-                    exchange_segment=self.MCX_SEGMENT,
-                    instrument_type=self.INSTRUMENT_TYPE,
-                    from_date=from_date,
-                    to_date=to_date,
-                ),
+            result = await self._execute(
+                self._dhan.historical_daily_data,
+                security_id=str(security_id),  # Historical API expects string
+                exchange_segment=self.MCX_SEGMENT,
+                instrument_type=self.INSTRUMENT_TYPE,
+                from_date=from_date,
+                to_date=to_date,
             )
 
             logger.debug(
                 f"Historical data response type: {type(result)}, content: {str(result)[:200] if result else 'None'}"
             )
 
-            # Handle error responses
-            if result is None:
-                raise DataNotAvailableError(
-                    self.provider_name, f"No data returned for {symbol}"
-                )
-
-            if isinstance(result, str):
-                raise AuthenticationError(self.provider_name, f"API error: {result}")
-
-            if not isinstance(result, dict):
-                raise ProviderError(
-                    self.provider_name, f"Unexpected response type: {type(result)}"
-                )
-
-            # Check for API error status
-            if result.get("status") == "failure" or result.get("errorCode"):
-                error_msg = result.get(
-                    "remarks", result.get("errorMessage", "Unknown error")
-                )
-                raise AuthenticationError(self.provider_name, f"API error: {error_msg}")
-
-            data_points = []
-            data = result.get("data", {})
-
-            # DhanHQ returns data as parallel arrays: open[], high[], low[], close[], volume[], timestamp[]
-            opens = data.get("open", [])
-            highs = data.get("high", [])
-            lows = data.get("low", [])
-            closes = data.get("close", [])
-            volumes = data.get("volume", [])
-            timestamps = data.get("timestamp", [])
-
-            for i in range(len(opens)):
-                # Convert timestamp (Unix epoch) to date
-                ts = timestamps[i] if i < len(timestamps) else 0
-                candle_date = datetime.fromtimestamp(ts).date() if ts else start_date
-
-                data_points.append(
-                    HistoricalDataPoint(
-                        date=candle_date,
-                        open=Decimal(str(opens[i])) if i < len(opens) else Decimal("0"),
-                        high=Decimal(str(highs[i])) if i < len(highs) else Decimal("0"),
-                        low=Decimal(str(lows[i])) if i < len(lows) else Decimal("0"),
-                        close=Decimal(str(closes[i]))
-                        if i < len(closes)
-                        else Decimal("0"),
-                        volume=int(volumes[i])
-                        if i < len(volumes) and volumes[i]
-                        else None,
-                    )
-                )
-
-            return HistoricalData(
-                symbol=symbol.upper(),
-                currency="INR",
-                exchange=Exchange.MCX,
-                data_points=data_points,
-                start_date=start_date,
-                end_date=end_date,
-                interval=interval,
-                provider=self.provider_name,
+            return self._frame_from_response(
+                result, symbol, start_date, end_date, interval
             )
 
+        except RateLimitError:
+            raise
         except Exception as e:
             raise ProviderError(
                 self.provider_name, f"Failed to get historical data: {e}"
             )
 
-    async def get_intraday_data(
-        self, symbol: str, date: date, interval: str = "1m"
+    async def get_historical_data(
+        self,
+        symbol: str,
+        start_date: date,
+        end_date: date,
+        interval: str = "1d",
+        currency: str = "INR",
     ) -> HistoricalData:
         """
-        Get intraday minute data.
+        Get historical daily data.
+
+        Prefer get_historical_frame for long ranges; this wraps it for
+        callers that need HistoricalDataPoint objects.
 
         Args:
             symbol: Commodity symbol
-            date: Date for intraday data
+            start_date: Start date
+            end_date: End date
+            interval: Only "1d" for daily data
+            currency: Always INR for MCX
+
+        Returns:
+            HistoricalData with daily data points
+        """
+        frame = await self.get_historical_frame(symbol, start_date, end_date, interval)
+        return frame.to_historical_data()
+
+    async def get_intraday_frame(
+        self,
+        symbol: str,
+        from_date: date,
+        to_date: Optional[date] = None,
+        interval: str = "1m",
+    ) -> HistoricalFrame:
+        """
+        Get intraday minute data as NumPy columns.
+
+        Args:
+            symbol: Commodity symbol
+            from_date: First trading date
+            to_date: Last trading date (defaults to from_date)
             interval: Time interval (1m, 5m, 15m, 25m, 60m)
 
         Returns:
-            HistoricalData with intraday data points
+            HistoricalFrame with intraday bars (IST timestamps)
         """
+        to_date = to_date or from_date
         security_id = self._get_security_id(symbol)
-        loop = asyncio.get_event_loop()
-
         try:
-            # Apply rate limiting
-            await self._rate_limit()
-
-            from_date = date.strftime("%Y-%m-%d")
-            to_date = date.strftime("%Y-%m-%d")
-
-            result = await loop.run_in_executor(
-                None,
-                partial(
-                    self._dhan.intraday_minute_data,
-                    security_id=security_id,
-                    exchange_segment=self.MCX_SEGMENT,
-                    instrument_type=self.INSTRUMENT_TYPE,
-                    from_date=from_date,
-                    to_date=to_date,
-                ),
+            result = await self._execute(
+                self._dhan.intraday_minute_data,
+                security_id=security_id,
+                exchange_segment=self.MCX_SEGMENT,
+                instrument_type=self.INSTRUMENT_TYPE,
+                from_date=from_date.strftime("%Y-%m-%d"),
+                to_date=to_date.strftime("%Y-%m-%d"),
+                interval=int(interval.rstrip("m") or 1),
             )
 
-            data_points = []
-            candles = result.get("data", [])
-
-            for candle in candles:
-                timestamp = candle.get("start_Time", 0)
-                if isinstance(timestamp, str):
-                    dt = datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S")
-                else:
-                    dt = datetime.fromtimestamp(timestamp)
-
-                data_points.append(
-                    HistoricalDataPoint(
-                        date=dt.date(),
-                        open=Decimal(str(candle.get("open", 0))),
-                        high=Decimal(str(candle.get("high", 0))),
-                        low=Decimal(str(candle.get("low", 0))),
-                        close=Decimal(str(candle.get("close", 0))),
-                        volume=int(candle.get("volume", 0))
-                        if candle.get("volume")
-                        else None,
-                    )
-                )
-
-            return HistoricalData(
-                symbol=symbol.upper(),
-                currency="INR",
-                exchange=Exchange.MCX,
-                data_points=data_points,
-                start_date=date,
-                end_date=date,
-                interval=interval,
-                provider=self.provider_name,
+            return self._frame_from_response(
+                result, symbol, from_date, to_date, interval
             )
 
+        except RateLimitError:
+            raise
         except Exception as e:
             raise ProviderError(self.provider_name, f"Failed to get intraday data: {e}")
 
+    async def get_intraday_data(
+        self, symbol: str, date: date, interval: str = "1m"
+    ) -> HistoricalData:
+        """
+        Get intraday minute data.
+
+        Args:
+            symbol: Commodity symbol
+            date: Date for intraday data
+            interval: Time interval (1m, 5m, 15m, 25m, 60m)
+
+        Returns:
+            HistoricalData with intraday data points
+        """
+        frame = await self.get_intraday_frame(symbol, date, date, interval)
+        return frame.to_historical_data()
+
     async def get_option_chain(
         self, underlying_symbol: str, expiry_date: str
     ) -> Dict[str, Any]:
@@ -642,17 +697,13 @@ class DhanHQProvider(BasePriceProvider, BaseHistoricalDataProvider):
             Option chain data
         """
         security_id = self._get_security_id(underlying_symbol)
-        loop = asyncio.get_event_loop()
 
         try:
-            result = await loop.run_in_executor(
-                None,
-                partial(
-                    self._dhan.option_chain,
-                    under_security_id=int(security_id),
-                    under_exchange_segment=self.MCX_SEGMENT,
-                    expiry=expiry_date,
-                ),
+            result = await self._execute(
+                self._dhan.option_chain,
+                under_security_id=int(security_id),
+                under_exchange_segment=self.MCX_SEGMENT,
+                expiry=expiry_date,
             )
 
             return result
@@ -33,6 +33,7 @@ from .base import (
 from .metal_price_api import MetalPriceAPIProvider
 from .dhanhq_provider import DhanHQProvider
 from .yahoo_finance_provider import YahooFinanceProvider
+from .rate_limiter import configure_schedulers_from_settings
 
 logger = logging.getLogger(__name__)
 
@@ -320,9 +321,13 @@ def configure_providers_from_settings(settings) -> DataProviderFactory:
         - metal_price_api_key: str
         - dhan_client_id: str
         - dhan_access_token: str
+        - *_rate_limit_per_second: float (optional upstream rate limits)
     """
     factory = get_data_provider_factory()
 
+    # Shared rate limits apply to every provider instance in the process
+    configure_schedulers_from_settings(settings)
+
     # Configure MetalPriceAPI if key is available
     if hasattr(settings, "metal_price_api_key") and settings.metal_price_api_key:
         factory.configure_metal_price_api(api_key=settings.metal_price_api_key)
@@ -24,6 +24,7 @@ from .base import (
     AuthenticationError,
     DataNotAvailableError,
 )
+from .rate_limiter import Priority, get_scheduler
 
 logger = logging.getLogger(__name__)
 
@@ -143,7 +144,11 @@ class FMPCOTProvider:
     V3_COT = "/api/v3/cot"
 
     def __init__(
-        self, api_key: str, timeout: float = 30.0, use_stable_api: bool = True
+        self,
+        api_key: str,
+        timeout: float = 30.0,
+        use_stable_api: bool = True,
+        priority: Priority = Priority.INTERACTIVE,
     ):
         """
         Initialize FMP COT provider.
@@ -152,11 +157,14 @@ class FMPCOTProvider:
             api_key: Your FMP API key
             timeout: Request timeout in seconds
             use_stable_api: Use stable API endpoints (recommended)
+            priority: Scheduling lane for this instance's requests
         """
         self.api_key = api_key
         self.timeout = timeout
         self.use_stable_api = use_stable_api
+        self.priority = priority
         self._client: Optional[httpx.AsyncClient] = None
+        self._scheduler = get_scheduler(self.provider_name)
 
     @property
     def provider_name(self) -> str:
@@ -179,6 +187,9 @@ class FMPCOTProvider:
         """
         Make authenticated request to FMP API.
 
+        Requests go through the process-wide rate limiter and are retried
+        with backoff on HTTP 429.
+
         Args:
             endpoint: API endpoint
             params: Query parameters
@@ -189,11 +200,18 @@ class FMPCOTProvider:
         Raises:
             ProviderError: On API errors
         """
+        return await self._scheduler.run(
+            self._send_request, endpoint, params, priority=self.priority
+        )
+
+    async def _send_request(
+        self, endpoint: str, params: Optional[Dict[str, Any]] = None
+    ) -> Any:
+        """Send a single request to the FMP API (no rate limiting)"""
         client = await self._get_client()
 
-        # Add API key to params
-        if params is None:
-            params = {}
+        # Add API key to params (copy so retries don't mutate the caller's dict)
+        params = dict(params or {})
         params["apikey"] = self.api_key
 
         url = f"{self.BASE_URL}{endpoint}"
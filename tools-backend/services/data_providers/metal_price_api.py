@@ -34,6 +34,7 @@ from .base import (
     SymbolNotFoundError,
     DataNotAvailableError,
 )
+from .rate_limiter import Priority, get_scheduler
 
 logger = logging.getLogger(__name__)
 
@@ -71,17 +72,25 @@ class MetalPriceAPIProvider(BasePriceProvider, BaseHistoricalDataProvider):
         "XCU": "XCU",
     }
 
-    def __init__(self, api_key: str, timeout: float = 30.0):
+    def __init__(
+        self,
+        api_key: str,
+        timeout: float = 30.0,
+        priority: Priority = Priority.INTERACTIVE,
+    ):
         """
         Initialize MetalPriceAPI provider.
 
         Args:
             api_key: Your MetalPriceAPI API key
             timeout: Request timeout in seconds
+            priority: Scheduling lane for this instance's requests
         """
         self.api_key = api_key
         self.timeout = timeout
+        self.priority = priority
         self._client: Optional[httpx.AsyncClient] = None
+        self._scheduler = get_scheduler(self.provider_name)
 
     @property
     def provider_name(self) -> str:
@@ -120,6 +129,9 @@ class MetalPriceAPIProvider(BasePriceProvider, BaseHistoricalDataProvider):
         """
         Make authenticated request to MetalPriceAPI.
 
+        Requests go through the process-wide rate limiter and are retried
+        with backoff when the API reports a rate limit error.
+
         Args:
             endpoint: API endpoint (e.g., "/latest", "/2024-01-01")
             params: Query parameters
@@ -130,11 +142,18 @@ class MetalPriceAPIProvider(BasePriceProvider, BaseHistoricalDataProvider):
         Raises:
             ProviderError: On API errors
         """
+        return await self._scheduler.run(
+            self._send_request, endpoint, params, priority=self.priority
+        )
+
+    async def _send_request(
+        self, endpoint: str, params: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Send a single request to MetalPriceAPI (no rate limiting)"""
         client = await self._get_client()
 
-        # Add API key to params
-        if params is None:
-            params = {}
+        # Add API key to params (copy so retries don't mutate the caller's dict)
+        params = dict(params or {})
         params["api_key"] = self.api_key
 
         url = f"{self.BASE_URL}{endpoint}"
@@ -372,6 +391,48 @@ class MetalPriceAPIProvider(BasePriceProvider, BaseHistoricalDataProvider):
             provider=self.provider_name,
         )
 
+    async def get_timeframe_rates(
+        self,
+        currencies: List[str],
+        start_date: date,
+        end_date: date,
+        base: str = "USD",
+    ) -> Dict[date, Dict[str, float]]:
+        """
+        Get raw daily rates for several symbols in a single timeframe request.
+
+        Used by bulk backfills to fetch all metals and USD/INR per chunk
+        instead of one request per symbol.
+
+        Args:
+            currencies: Metal/currency codes (e.g. ["XAU", "XAG", "INR"])
+            start_date: Start date
+            end_date: End date (max 365 days from start)
+            base: Base currency
+
+        Returns:
+            Dictionary of date -> {rate_key: rate}, as returned by the API
+            (e.g. "XAU" in ounces per base unit, "USDXAU" in base per ounce)
+        """
+        data = await self._make_request(
+            "/timeframe",
+            {
+                "base": base.upper(),
+                "currencies": ",".join(
+                    self._normalize_symbol(c) for c in currencies
+                ),
+                "start_date": start_date.strftime("%Y-%m-%d"),
+                "end_date": end_date.strftime("%Y-%m-%d"),
+            },
+        )
+
+        return {
+            datetime.strptime(date_str, "%Y-%m-%d").date(): {
+                key: float(value) for key, value in day_rates.items() if value
+            }
+            for date_str, day_rates in data.get("rates", {}).items()
+        }
+
     async def get_intraday_data(
         self, symbol: str, date: date, interval: str = "1m"
     ) -> HistoricalData:
@@ -0,0 +1,316 @@
+"""
+Shared rate limiting for upstream data providers.
+
+Every provider instance used to throttle itself, so each new instance (one per
+request in several endpoints) started with a fresh budget and the process as a
+whole could exceed the upstream limit. This module keeps one token-bucket
+scheduler per upstream for the entire process.
+
+Features:
+- Token bucket with configurable rate and burst per upstream
+- Priority lanes: interactive requests are served before backfills
+- Retry with jittered exponential backoff on RateLimitError
+- Metrics on queue depth and wait time
+
+Usage:
+    scheduler = get_scheduler("DhanHQ")
+    result = await scheduler.run(fetch_quote, symbol, priority=Priority.INTERACTIVE)
+
+    # Or just wait for a slot before making a call yourself
+    await scheduler.acquire(Priority.BACKFILL)
+"""
+
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Type
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+import time
+
+from .base import RateLimitError
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """Scheduling lanes - lower values are served first"""
+
+    INTERACTIVE = 0  # User-facing API requests
+    BACKGROUND = 1  # Cron jobs, cache warm-ups
+    BACKFILL = 2  # Bulk historical backfills
+
+
+@dataclass
+class RateLimitConfig:
+    """
+    Rate limit settings for a single upstream.
+
+    Attributes:
+        rate: Sustained requests per second
+        burst: Maximum tokens that can accumulate (bucket capacity)
+        max_retries: Retries on RateLimitError before giving up
+        base_delay: Initial backoff delay in seconds
+        max_delay: Upper bound on backoff delay in seconds
+    """
+
+    rate: float
+    burst: int = 1
+    max_retries: int = 3
+    base_delay: float = 1.0
+    max_delay: float = 30.0
+
+
+# Default limits per upstream (keyed by provider_name)
+DEFAULT_RATE_LIMITS: Dict[str, RateLimitConfig] = {
+    "DhanHQ": RateLimitConfig(rate=1.0, burst=1),
+    "MetalPriceAPI": RateLimitConfig(rate=2.0, burst=2),
+    "FinancialModelingPrep": RateLimitConfig(rate=5.0, burst=5),
+}
+
+
+class RequestScheduler:
+    """
+    Async token-bucket scheduler with priority lanes.
+
+    Waiters are kept in a heap ordered by (priority, arrival), so a backfill
+    queued first still yields to an interactive request that arrives later.
+    A single dispatcher task hands out tokens as they refill.
+    """
+
+    def __init__(self, name: str, config: RateLimitConfig):
+        self.name = name
+        self.config = config
+        self._tokens: float = float(config.burst)
+        self._last_refill: float = time.monotonic()
+        self._waiters: List[Tuple[int, int, float, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._dispatcher: Optional[asyncio.Task] = None
+
+        # Metrics
+        self._granted: Dict[str, int] = {p.name: 0 for p in Priority}
+        self._immediate: Dict[str, int] = {p.name: 0 for p in Priority}
+        self._total_wait: Dict[str, float] = {p.name: 0.0 for p in Priority}
+        self._max_wait: float = 0.0
+        self._retries: int = 0
+        self._failures: int = 0
+
+    def configure(self, config: RateLimitConfig):
+        """Replace the rate limit settings (keeps queued waiters)"""
+        self.config = config
+        self._tokens = min(self._tokens, float(config.burst))
+
+    def _refill(self):
+        """Add tokens accrued since the last refill"""
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self._tokens = min(
+            float(self.config.burst), self._tokens + elapsed * self.config.rate
+        )
+
+    def _record_grant(self, priority: Priority, waited: float):
+        """Count a granted slot and its wait, including zero-wait grants"""
+        lane = priority.name
+        self._granted[lane] += 1
+        self._total_wait[lane] += waited
+        self._max_wait = max(self._max_wait, waited)
+
+    def _ensure_dispatcher(self):
+        """Start the dispatcher task on the running loop if it isn't running"""
+        loop = asyncio.get_running_loop()
+        if (
+            self._dispatcher is None
+            or self._dispatcher.done()
+            or self._dispatcher.get_loop() is not loop
+        ):
+            self._dispatcher = loop.create_task(self._dispatch())
+
+    async def _dispatch(self):
+        """Grant tokens to waiters in priority order as they become available"""
+        while self._waiters:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.config.rate)
+                continue
+
+            priority, _, enqueued_at, future = heapq.heappop(self._waiters)
+            if future.done():
+                # Waiter was cancelled while queued
+                continue
+
+            self._tokens -= 1
+            self._record_grant(Priority(priority), time.monotonic() - enqueued_at)
+            future.set_result(None)
+
+    async def acquire(self, priority: Priority = Priority.INTERACTIVE):
+        """
+        Wait until a request slot is available.
+
+        Args:
+            priority: Scheduling lane for this request
+        """
+        self._refill()
+        if not self._waiters and self._tokens >= 1:
+            self._tokens -= 1
+            self._immediate[priority.name] += 1
+            self._record_grant(priority, 0.0)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(
+            self._waiters,
+            (int(priority), next(self._sequence), time.monotonic(), future),
+        )
+        self._ensure_dispatcher()
+        await future
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with random jitter"""
+        cap = min(self.config.max_delay, self.config.base_delay * (2**attempt))
+        return random.uniform(self.config.base_delay / 2, cap)
+
+    async def run(
+        self,
+        func: Callable[..., Awaitable[Any]],
+        *args,
+        priority: Priority = Priority.INTERACTIVE,
+        retry_on: Tuple[Type[BaseException], ...] = (RateLimitError,),
+        **kwargs,
+    ) -> Any:
+        """
+        Run an async call under the rate limit, retrying when throttled.
+
+        Args:
+            func: Async callable making the upstream request
+            priority: Scheduling lane for this request
+            retry_on: Exception types that trigger a backoff and retry
+
+        Returns:
+            Result of func
+
+        Raises:
+            The last exception once retries are exhausted
+        """
+        attempt = 0
+        while True:
+            await self.acquire(priority)
+            try:
+                return await func(*args, **kwargs)
+            except retry_on as e:
+                if attempt >= self.config.max_retries:
+                    self._failures += 1
+                    raise
+                delay = self._backoff_delay(attempt)
+                attempt += 1
+                self._retries += 1
+                logger.warning(
+                    f"{self.name} throttled ({e}); retry {attempt}/{self.config.max_retries} in {delay:.2f}s"
+                )
+                # Drain the bucket so other callers back off too
+                self._tokens = min(self._tokens, 0.0)
+                await asyncio.sleep(delay)
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of requests currently waiting for a slot"""
+        return sum(1 for waiter in self._waiters if not waiter[3].done())
+
+    def metrics(self) -> Dict[str, Any]:
+        """Snapshot of queue depth, wait times and retry counts"""
+        depth_by_lane = {p.name: 0 for p in Priority}
+        for priority, _, _, future in self._waiters:
+            if not future.done():
+                depth_by_lane[Priority(priority).name] += 1
+
+        return {
+            "upstream": self.name,
+            "rate_per_second": self.config.rate,
+            "burst": self.config.burst,
+            "available_tokens": round(self._tokens, 3),
+            "queue_depth": sum(depth_by_lane.values()),
+            "queue_depth_by_priority": depth_by_lane,
+            "requests_granted": dict(self._granted),
+            "requests_without_wait": dict(self._immediate),
+            "avg_wait_seconds": {
+                lane: round(self._total_wait[lane] / count, 4) if count else 0.0
+                for lane, count in self._granted.items()
+            },
+            "max_wait_seconds": round(self._max_wait, 4),
+            "retries": self._retries,
+            "failures": self._failures,
+        }
+
+
+# Process-wide registry (one scheduler per upstream)
+_schedulers: Dict[str, RequestScheduler] = {}
+
+
+def get_scheduler(name: str) -> RequestScheduler:
+    """
+    Get the shared scheduler for an upstream, creating it on first use.
+
+    Args:
+        name: Upstream name (provider_name of the provider)
+
+    Returns:
+        The process-wide RequestScheduler for that upstream
+    """
+    scheduler = _schedulers.get(name)
+    if scheduler is None:
+        config = DEFAULT_RATE_LIMITS.get(name, RateLimitConfig(rate=1.0))
+        scheduler = RequestScheduler(name, config)
+        _schedulers[name] = scheduler
+    return scheduler
+
+
+def configure_scheduler(name: str, **overrides) -> RequestScheduler:
+    """
+    Override rate limit settings for an upstream.
+
+    Args:
+        name: Upstream name
+        **overrides: RateLimitConfig fields to change (rate, burst, ...)
+
+    Returns:
+        The reconfigured scheduler
+    """
+    scheduler = get_scheduler(name)
+    current = scheduler.config
+    scheduler.configure(
+        RateLimitConfig(
+            rate=overrides.get("rate", current.rate),
+            burst=overrides.get("burst", current.burst),
+            max_retries=overrides.get("max_retries", current.max_retries),
+            base_delay=overrides.get("base_delay", current.base_delay),
+            max_delay=overrides.get("max_delay", current.max_delay),
+        )
+    )
+    return scheduler
+
+
+def get_scheduler_metrics() -> Dict[str, Dict[str, Any]]:
+    """Metrics for every upstream scheduler created so far"""
+    return {name: scheduler.metrics() for name, scheduler in _schedulers.items()}
+
+
+def configure_schedulers_from_settings(settings) -> None:
+    """
+    Apply upstream rate limits from application settings.
+
+    Expected settings attributes (all optional):
+        - dhan_rate_limit_per_second: float
+        - metal_price_api_rate_limit_per_second: float
+        - fmp_rate_limit_per_second: float
+    """
+    mapping = {
+        "DhanHQ": "dhan_rate_limit_per_second",
+        "MetalPriceAPI": "metal_price_api_rate_limit_per_second",
+        "FinancialModelingPrep": "fmp_rate_limit_per_second",
+    }
+    for name, attr in mapping.items():
+        rate = getattr(settings, attr, None)
+        if rate:
+            configure_scheduler(name, rate=float(rate))
@@ -0,0 +1,212 @@
+"""
+Chart series downsampling on float arrays.
+
+Every function returns the ascending indices of the points to keep, so
+callers select timestamps, rows and companion columns with one take:
+
+- lttb: Largest Triangle Three Buckets, keeps the visual shape of a line
+- minmax: first and last point plus each bucket's minimum and maximum,
+  keeps every spike
+- m4: each bucket's first, minimum, maximum and last point, renders a line
+  chart identically at one bucket per pixel column
+
+Values must be finite; series shorter than max_points are returned whole.
+
+OHLC candles are not thinned but merged per bucket (aggregate_candles), so
+no high or low is lost.
+
+Usage:
+    keep = downsample_indices(premiums, 500, LTTB, x=timestamps)
+    rows = [rows[i] for i in keep]
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+LTTB = "lttb"
+MINMAX = "minmax"
+M4 = "m4"
+METHODS = (LTTB, MINMAX, M4)
+
+
+def _all(n: int) -> np.ndarray:
+    return np.arange(n, dtype=np.int64)
+
+
+def lttb_indices(
+    y: np.ndarray, max_points: int, x: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Largest Triangle Three Buckets
+
+    The first and last points are kept; the inner points are split into
+    max_points - 2 buckets and each keeps the point forming the largest
+    triangle with the previously kept point and the next bucket's average.
+    Bucket averages come from prefix sums; only the per-bucket selection,
+    which depends on the previous pick, is a loop.
+
+    Args:
+        y: Values, in x order
+        max_points: Points to keep (at least 3)
+        x: Positions (e.g. epoch seconds); defaults to the point index
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n <= max_points or max_points < 3:
+        return _all(n)
+    x = np.arange(n, dtype=np.float64) if x is None else np.asarray(x, np.float64)
+
+    buckets = max_points - 2
+    # Bucket i holds the inner points edges[i] .. edges[i + 1] - 1
+    edges = (np.floor(np.arange(buckets + 1) * ((n - 2) / buckets)) + 1).astype(
+        np.int64
+    )
+    sum_x = np.concatenate(([0.0], np.cumsum(x)))
+    sum_y = np.concatenate(([0.0], np.cumsum(y)))
+    counts = np.diff(edges)
+    # Reference point of bucket i: average of bucket i + 1, last point at the end
+    ref_x = np.append(((sum_x[edges[1:]] - sum_x[edges[:-1]]) / counts)[1:], x[-1])
+    ref_y = np.append(((sum_y[edges[1:]] - sum_y[edges[:-1]]) / counts)[1:], y[-1])
+
+    keep = np.empty(max_points, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(buckets):
+        lo, hi = edges[i], edges[i + 1]
+        # Twice the triangle area; the factor does not change the argmax
+        area = np.abs(
+            (x[a] - ref_x[i]) * (y[lo:hi] - y[a])
+            - (x[a] - x[lo:hi]) * (ref_y[i] - y[a])
+        )
+        a = lo + int(np.argmax(area))
+        keep[i + 1] = a
+    return keep
+
+
+def _bucket_extremes(
+    y: np.ndarray, buckets: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """(first, last, argmin, argmax) of `buckets` equal-count buckets"""
+    n = len(y)
+    ids = np.arange(n, dtype=np.int64) * buckets // n
+    # Positions grouped by bucket, ascending value within each bucket
+    order = np.lexsort((y, ids))
+    first = np.searchsorted(ids, np.arange(buckets))
+    last = np.append(first[1:], n) - 1
+    return first, last, order[first], order[last]
+
+
+def minmax_indices(y: np.ndarray, max_points: int) -> np.ndarray:
+    """First and last point plus the minimum and maximum of each bucket"""
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n <= max_points or max_points < 4:
+        return _all(n)
+    _, _, lows, highs = _bucket_extremes(y, (max_points - 2) // 2)
+    return np.unique(np.concatenate(([0, n - 1], lows, highs)))
+
+
+def m4_indices(y: np.ndarray, max_points: int) -> np.ndarray:
+    """First, minimum, maximum and last point of each bucket"""
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n <= max_points or max_points < 4:
+        return _all(n)
+    return np.unique(np.concatenate(_bucket_extremes(y, max_points // 4)))
+
+
+def downsample_indices(
+    y: np.ndarray,
+    max_points: Optional[int],
+    method: str = LTTB,
+    x: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Indices of at most max_points points of a series
+
+    Args:
+        y: Values in chronological order
+        max_points: Point budget; None keeps every point
+        method: lttb, minmax or m4
+        x: Positions for lttb (defaults to the point index)
+
+    Raises:
+        ValueError: Unknown method
+    """
+    if method not in METHODS:
+        raise ValueError(
+            f"Unknown downsampling method: {method}. Use {', '.join(METHODS)}"
+        )
+    n = len(y)
+    if max_points is None or n <= max_points:
+        return _all(n)
+    if method == LTTB:
+        return lttb_indices(y, max_points, x)
+    if method == MINMAX:
+        return minmax_indices(y, max_points)
+    return m4_indices(y, max_points)
+
+
+def downsample_points(
+    points: List[Dict[str, Any]], field: str, max_points: Optional[int], method: str
+) -> List[Dict[str, Any]]:
+    """Chronological chart points reduced to max_points on one field"""
+    keep = downsample_indices(
+        np.array([p[field] for p in points], dtype=np.float64), max_points, method
+    )
+    if len(keep) == len(points):
+        return points
+    return [points[i] for i in keep]
+
+
+def aggregate_candles(
+    candles: List[Dict[str, Any]],
+    max_points: Optional[int],
+    anchors: Iterable[str] = (),
+) -> List[Dict[str, Any]]:
+    """
+    OHLCV candles merged into equal-count buckets
+
+    A bucket keeps its first date and open, highest high, lowest low, last
+    close and usdinr, and summed volume. Candles dated in `anchors` (e.g.
+    trade entries and exits) start a bucket so their dates stay in the
+    series, which allows up to one extra bucket per anchor.
+
+    Args:
+        candles: Chronological {"date", "open", "high", "low", "close",
+            "volume", "usdinr"} dicts
+        max_points: Bucket budget; None keeps every candle
+        anchors: Dates that must start a bucket
+    """
+    n = len(candles)
+    if max_points is None or n <= max_points:
+        return candles
+
+    size = -(-n // max_points)
+    anchor_dates = set(anchors)
+    anchored = [i for i, candle in enumerate(candles) if candle["date"] in anchor_dates]
+    starts = np.unique(
+        np.concatenate((np.arange(0, n, size), np.array(anchored, dtype=np.int64)))
+    )
+    ends = np.append(starts[1:], n) - 1
+
+    def column(name: str) -> np.ndarray:
+        return np.array([c.get(name) or 0.0 for c in candles], dtype=np.float64)
+
+    highs = np.maximum.reduceat(column("high"), starts)
+    lows = np.minimum.reduceat(column("low"), starts)
+    volumes = np.add.reduceat(column("volume"), starts)
+
+    return [
+        {
+            "date": candles[start]["date"],
+            "open": candles[start]["open"],
+            "high": float(highs[b]),
+            "low": float(lows[b]),
+            "close": candles[end]["close"],
+            "volume": float(volumes[b]),
+            "usdinr": candles[end].get("usdinr"),
+        }
+        for b, (start, end) in enumerate(zip(starts.tolist(), ends.tolist()))
+    ]
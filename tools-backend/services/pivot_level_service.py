@@ -0,0 +1,396 @@
+"""
+Pivot Level Service
+
+Daily, weekly and monthly pivots only change at session boundaries, yet
+/pivots/auto, /multi-timeframe and /nearest-level recomputed them from a
+live fetch on every call. This service computes the pivots of every
+configured symbol (settings.pivot_comex_symbols / pivot_mcx_symbols) right
+after the COMEX and MCX closes and stores them in pivot_levels.
+
+PivotLevelStore keeps the latest stored period of every symbol, exchange
+and timeframe in memory, with its levels as a sorted array so the nearest
+level to a price is a binary search. Symbols that have not been stored, or
+whose stored periods predate the last completed session (a failed or
+unscheduled cron), fall back to a live fetch, as does every symbol while
+the table cannot be read.
+
+Usage:
+    store = get_pivot_level_store()
+    store.ensure_loaded(db)
+    periods = store.periods("GOLD", "COMEX")
+"""
+
+from datetime import date, datetime, timedelta, timezone
+from contextlib import suppress
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import asyncio
+import logging
+import time
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from config import settings
+from models.pivot import PivotLevel
+from services.bulk_writer import PIVOT_LEVELS, bulk_upsert
+from services.data_providers import (
+    DataNotAvailableError,
+    DhanHQProvider,
+    ProviderError,
+    YahooFinanceProvider,
+)
+from services.pivot_service import (
+    ACCURACY_LEVELS,
+    NARROW_CPR_PERCENT,
+    TIMEFRAME_BARS,
+    WIDE_CPR_PERCENT,
+    PivotService,
+)
+
+logger = logging.getLogger(__name__)
+
+EXCHANGES = ("COMEX", "MCX")
+
+# Calendar days of daily bars fetched for the previous month's pivots
+HISTORY_FETCH_DAYS = 60
+
+# Seconds before the in-memory store rereads the table (other workers' writes)
+STORE_RELOAD_SECONDS = 600
+
+# Seconds before retrying a store load that failed (database unavailable)
+STORE_RETRY_SECONDS = 60
+
+# Symbol mappings
+YAHOO_SYMBOLS = {
+    "GOLD": "GC=F",
+    "SILVER": "SI=F",
+    "CRUDE": "CL=F",
+    "COPPER": "HG=F",
+    "NATURALGAS": "NG=F",
+}
+
+# pivot_levels column of each ACCURACY_LEVELS entry
+LEVEL_COLUMNS = {
+    "R3": "r3",
+    "R2": "r2",
+    "R1": "r1",
+    "CPR_TC": "tc",
+    "CPR_Pivot": "pivot",
+    "CPR_BC": "bc",
+    "S1": "s1",
+    "S2": "s2",
+    "S3": "s3",
+    "Fib_618": "fib_618",
+}
+
+# Levels searched by nearest-level lookups
+NEAREST_LEVELS = tuple(name for name in ACCURACY_LEVELS if name != "Fib_618")
+
+
+async def fetch_daily_bars(
+    symbol: str, exchange: str = "COMEX", days: int = HISTORY_FETCH_DAYS
+) -> Dict[str, Any]:
+    """
+    Fetch recent daily bars once for every timeframe's pivots
+
+    Returns:
+        {"dates", "high", "low", "close"}: dates as a list, prices as
+        float arrays, oldest bar first
+    """
+    # Get recent data (include today in case market is open)
+    end_date = date.today()
+    start_date = end_date - timedelta(days=days)
+
+    if exchange.upper() == "COMEX":
+        yahoo = YahooFinanceProvider()
+        yahoo_symbol = YAHOO_SYMBOLS.get(symbol.upper(), f"{symbol}=F")
+
+        try:
+            logger.info(
+                f"Fetching OHLC for {yahoo_symbol} from {start_date} to {end_date}"
+            )
+            history = await yahoo.get_historical_data(
+                yahoo_symbol, start_date, end_date, "1d", "USD"
+            )
+        except DataNotAvailableError as e:
+            logger.error(f"DataNotAvailableError for {symbol}: {e}")
+            raise ValueError(f"No data available for {symbol}: {e}")
+        except ProviderError as e:
+            logger.error(f"ProviderError fetching data for {symbol}: {e}")
+            raise ValueError(f"Could not fetch data for {symbol}: {e}")
+        except Exception as e:
+            logger.error(f"Unexpected error fetching data for {symbol}: {e}")
+            raise ValueError(f"Could not fetch data for {symbol}: {e}")
+
+        points = sorted(history.data_points, key=lambda dp: dp.date)
+        dates = [dp.date for dp in points]
+        ohlc = np.array(
+            [[dp.high, dp.low, dp.close] for dp in points], dtype=np.float64
+        ).reshape(-1, 3)
+
+    elif exchange.upper() == "MCX":
+        if not settings.dhan_client_id or not settings.dhan_access_token:
+            raise ValueError("MCX data provider not configured")
+
+        dhan = DhanHQProvider(settings.dhan_client_id, settings.dhan_access_token)
+
+        try:
+            frame = await dhan.get_historical_frame(
+                symbol.upper(), start_date, end_date, "1d"
+            )
+        except ProviderError as e:
+            raise ValueError(f"Could not fetch MCX data for {symbol}: {e}")
+
+        order = np.argsort(frame.timestamps, kind="stable")
+        dates = frame.dates[order].tolist()
+        ohlc = np.column_stack([frame.high, frame.low, frame.close])[order]
+
+    else:
+        raise ValueError(f"Unknown exchange: {exchange}")
+
+    if not len(dates):
+        logger.error(f"No data points returned for {symbol}")
+        raise ValueError(f"No data available for {symbol}")
+
+    return {
+        "dates": dates,
+        "high": ohlc[:, 0],
+        "low": ohlc[:, 1],
+        "close": ohlc[:, 2],
+    }
+
+
+def period_ohlc(bars: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Previous-period OHLC of every timeframe with its last bar's date"""
+    periods = PivotService.timeframe_ohlc(bars["high"], bars["low"], bars["close"])
+    for period in periods.values():
+        period["date"] = bars["dates"][period.pop("index")]
+    return periods
+
+
+def last_completed_session(today: Optional[date] = None) -> date:
+    """
+    Date of the last weekday session before today
+
+    Every timeframe's period is a trailing window ending at the latest
+    daily bar (PivotService.timeframe_ohlc), so stored periods of all
+    timeframes are current when dated on or after this session.
+    """
+    day = (today or date.today()) - timedelta(days=1)
+    while day.weekday() >= 5:
+        day -= timedelta(days=1)
+    return day
+
+
+def store_symbols(exchange: str) -> List[str]:
+    """Configured symbols of an exchange"""
+    spec = (
+        settings.pivot_mcx_symbols
+        if exchange.upper() == "MCX"
+        else settings.pivot_comex_symbols
+    )
+    symbols = (item.strip().upper() for item in spec.split(","))
+    return list(dict.fromkeys(symbol for symbol in symbols if symbol))
+
+
+class PivotLevelService:
+    """Session-close pivot precompute and its stored table"""
+
+    @staticmethod
+    def level_rows(
+        symbol: str, exchange: str, periods: Dict[str, Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        pivot_levels rows of every timeframe, levels computed as one matrix
+
+        Args:
+            symbol: Trading symbol
+            exchange: COMEX or MCX
+            periods: period_ohlc() output
+        """
+        timeframes = list(periods)
+        ohlc = np.array(
+            [
+                [periods[tf]["high"], periods[tf]["low"], periods[tf]["close"]]
+                for tf in timeframes
+            ],
+            dtype=np.float64,
+        )
+        levels, width_percent = PivotService.level_columns(
+            ohlc[:, 0], ohlc[:, 1], ohlc[:, 2]
+        )
+        classification = np.select(
+            [width_percent < NARROW_CPR_PERCENT, width_percent > WIDE_CPR_PERCENT],
+            ["narrow", "wide"],
+            default="normal",
+        )
+        updated_at = datetime.now(timezone.utc)
+
+        return [
+            {
+                "symbol": symbol.upper(),
+                "exchange": exchange.upper(),
+                "timeframe": timeframe,
+                "period_date": periods[timeframe]["date"],
+                "high": float(ohlc[t, 0]),
+                "low": float(ohlc[t, 1]),
+                "close": float(ohlc[t, 2]),
+                **{
+                    LEVEL_COLUMNS[name]: float(levels[t, j])
+                    for j, name in enumerate(ACCURACY_LEVELS)
+                },
+                "width_percent": round(float(width_percent[t]), 3),
+                "classification": str(classification[t]),
+                "updated_at": updated_at,
+            }
+            for t, timeframe in enumerate(timeframes)
+        ]
+
+    @staticmethod
+    async def refresh(
+        db: Session, exchanges: Sequence[str] = EXCHANGES
+    ) -> Tuple[int, Dict[str, str]]:
+        """
+        Fetch and store the pivots of every configured symbol.
+
+        Symbols are fetched concurrently; one that fails is reported and
+        the others are still written. Runs inside the session's
+        transaction; the caller commits.
+
+        Returns:
+            (rows written, {"EXCHANGE:SYMBOL": error})
+        """
+        jobs = [
+            (exchange.upper(), symbol)
+            for exchange in exchanges
+            for symbol in store_symbols(exchange)
+        ]
+        outcomes = await asyncio.gather(
+            *(fetch_daily_bars(symbol, exchange) for exchange, symbol in jobs),
+            return_exceptions=True,
+        )
+
+        rows, errors = [], {}
+        for (exchange, symbol), bars in zip(jobs, outcomes):
+            if isinstance(bars, Exception):
+                logger.error(f"Pivot levels: {exchange}:{symbol} failed: {bars}")
+                errors[f"{exchange}:{symbol}"] = str(bars)
+                continue
+            rows.extend(
+                PivotLevelService.level_rows(symbol, exchange, period_ohlc(bars))
+            )
+
+        written = bulk_upsert(db, PIVOT_LEVELS, rows)
+        logger.info(f"Pivot levels: {written} rows stored, {len(errors)} failed")
+        return written, errors
+
+
+class PivotLevelStore:
+    """Latest stored pivots of every symbol, exchange and timeframe, in memory"""
+
+    def __init__(self, reload_seconds: int = STORE_RELOAD_SECONDS):
+        self.reload_seconds = reload_seconds
+        # (symbol, exchange) -> timeframe -> period with sorted levels
+        self._periods: Dict[Tuple[str, str], Dict[str, Dict[str, Any]]] = {}
+        self._loaded_at: Optional[float] = None
+        self._failed_at: Optional[float] = None
+
+    def load(self, db: Session):
+        """Read the latest period of every symbol, exchange and timeframe"""
+        model = PivotLevel
+        records = (
+            db.query(model)
+            .distinct(model.symbol, model.exchange, model.timeframe)
+            .order_by(
+                model.symbol,
+                model.exchange,
+                model.timeframe,
+                model.period_date.desc(),
+            )
+            .all()
+        )
+
+        periods: Dict[Tuple[str, str], Dict[str, Dict[str, Any]]] = {}
+        for record in records:
+            levels = {
+                name: getattr(record, LEVEL_COLUMNS[name]) for name in NEAREST_LEVELS
+            }
+            names, values = PivotService.sorted_levels(levels)
+            periods.setdefault((record.symbol, record.exchange), {})[
+                record.timeframe
+            ] = {
+                "high": record.high,
+                "low": record.low,
+                "close": record.close,
+                "date": record.period_date,
+                "level_names": names,
+                "level_values": values,
+            }
+
+        self._periods = periods
+        self._loaded_at = time.monotonic()
+        logger.info(f"Pivot level store loaded: {len(records)} periods")
+
+    def ensure_loaded(self, db: Session) -> bool:
+        """
+        Reload the store when due
+
+        Returns:
+            False when the table cannot be read; callers then use the live
+            path so pivots stay available without the database
+        """
+        now = time.monotonic()
+        if self._loaded_at is not None and now - self._loaded_at <= self.reload_seconds:
+            return True
+        if self._failed_at is not None and now - self._failed_at <= STORE_RETRY_SECONDS:
+            return False
+        try:
+            self.load(db)
+        except Exception as e:
+            logger.warning(f"Pivot level store unavailable, using live pivots: {e}")
+            with suppress(Exception):
+                db.rollback()
+            self._failed_at = now
+            return False
+        self._failed_at = None
+        return True
+
+    def _current(self, symbol: str, exchange: str) -> Dict[str, Dict[str, Any]]:
+        """Stored periods of a symbol dated on or after the last session"""
+        cutoff = last_completed_session()
+        periods = self._periods.get((symbol.upper(), exchange.upper()), {})
+        return {
+            timeframe: period
+            for timeframe, period in periods.items()
+            if period["date"] >= cutoff
+        }
+
+    def periods(self, symbol: str, exchange: str) -> Optional[Dict[str, Dict]]:
+        """Stored periods of a symbol, or None unless every timeframe is current"""
+        periods = self._current(symbol, exchange)
+        if not set(TIMEFRAME_BARS) <= set(periods):
+            return None
+        return {timeframe: periods[timeframe] for timeframe in TIMEFRAME_BARS}
+
+    def nearest_level(
+        self, symbol: str, exchange: str, timeframe: str, current_price: float
+    ) -> Optional[Tuple[str, float, float]]:
+        """(level_name, level_value, distance) by binary search, None if unstored"""
+        period = self._current(symbol, exchange).get(timeframe)
+        if period is None:
+            return None
+        return PivotService.nearest_sorted_level(
+            period["level_names"], period["level_values"], current_price
+        )
+
+
+# Global store instance (one per process)
+_pivot_level_store: Optional[PivotLevelStore] = None
+
+
+def get_pivot_level_store() -> PivotLevelStore:
+    """Get the global pivot level store"""
+    global _pivot_level_store
+    if _pivot_level_store is None:
+        _pivot_level_store = PivotLevelStore()
+    return _pivot_level_store
@@ -2,7 +2,50 @@
 Pivot calculation service for CPR, Floor Pivots, and Fibonacci levels
 """
 
-from typing import Dict, Tuple, List, Any
+from typing import Dict, Tuple, List, Any, Sequence
+
+import numpy as np
+
+# Levels scored by the accuracy backtest, in reporting order
+ACCURACY_LEVELS = (
+    "R3",
+    "R2",
+    "R1",
+    "CPR_TC",
+    "CPR_Pivot",
+    "CPR_BC",
+    "S1",
+    "S2",
+    "S3",
+    "Fib_618",
+)
+
+# CPR width (percent of pivot) below which it is narrow and above which wide
+NARROW_CPR_PERCENT = 0.5
+WIDE_CPR_PERCENT = 1.0
+
+# Range expansion over the previous bar that marks a trending bar
+TRENDING_RANGE_RATIO = 1.2
+
+# Trading days aggregated into each timeframe's previous period
+TIMEFRAME_BARS = {"daily": 1, "weekly": 5, "monthly": 22}
+
+# Confluence zone type of each ACCURACY_LEVELS entry
+LEVEL_TYPES = {
+    "R3": "resistance",
+    "R2": "resistance",
+    "R1": "resistance",
+    "CPR_TC": "cpr",
+    "CPR_Pivot": "cpr",
+    "CPR_BC": "cpr",
+    "S1": "support",
+    "S2": "support",
+    "S3": "support",
+    "Fib_618": "fibonacci",
+}
+
+# Levels within this fraction of each other form a confluence zone
+CONFLUENCE_THRESHOLD = 0.003
 
 
 class PivotService:
@@ -29,9 +72,9 @@ class PivotService:
         width_percent = (width / pivot) * 100
 
         # Classification: narrow if width < 0.5% of pivot, wide if > 1%
-        if width_percent < 0.5:
+        if width_percent < NARROW_CPR_PERCENT:
             classification = "narrow"
-        elif width_percent > 1.0:
+        elif width_percent > WIDE_CPR_PERCENT:
             classification = "wide"
         else:
             classification = "normal"
@@ -150,18 +193,43 @@ class PivotService:
         Returns:
             Tuple of (level_name, level_value, distance)
         """
-        nearest_level = None
-        nearest_distance = float("inf")
-        nearest_value = None
+        names, values = PivotService.sorted_levels(levels)
+        return PivotService.nearest_sorted_level(names, values, current_price)
 
-        for level_name, level_value in levels.items():
-            distance = abs(current_price - level_value)
-            if distance < nearest_distance:
-                nearest_distance = distance
-                nearest_level = level_name
-                nearest_value = level_value
+    @staticmethod
+    def sorted_levels(levels: Dict[str, float]) -> Tuple[List[str], np.ndarray]:
+        """Level names and values in ascending value order"""
+        names = list(levels)
+        values = np.array([levels[name] for name in names], dtype=np.float64)
+        order = np.argsort(values, kind="stable")
+        return [names[i] for i in order], values[order]
+
+    @staticmethod
+    def nearest_sorted_level(
+        names: List[str], values: np.ndarray, current_price: float
+    ) -> Tuple[str, float, float]:
+        """
+        Nearest level by binary search over ascending values
 
-        return nearest_level, nearest_value, round(nearest_distance, 2)
+        Args:
+            names: Level names in ascending value order
+            values: Ascending level values (sorted_levels output)
+            current_price: Current market price
+
+        Returns:
+            Tuple of (level_name, level_value, distance)
+        """
+        if not len(values):
+            return None, None, float("inf")
+
+        i = int(np.searchsorted(values, current_price))
+        if i == len(values) or (
+            i > 0 and current_price - values[i - 1] <= values[i] - current_price
+        ):
+            i -= 1
+
+        value = float(values[i])
+        return names[i], value, round(abs(current_price - value), 2)
 
     @staticmethod
     def get_level_bias(current_price: float, cpr_levels: Dict[str, float]) -> str:
@@ -185,6 +253,170 @@ class PivotService:
         else:
             return "neutral"
 
+    @staticmethod
+    def level_columns(
+        high: np.ndarray, low: np.ndarray, close: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Backtested pivot levels of every bar at once
+
+        Args:
+            high, low, close: OHLC arrays of the bars the levels come from
+
+        Returns:
+            (levels, width_percent): levels has one column per ACCURACY_LEVELS
+            entry, rounded like the scalar calculators; width_percent is the
+            unrounded CPR width used for classification
+        """
+        high = np.asarray(high, dtype=np.float64)
+        low = np.asarray(low, dtype=np.float64)
+        close = np.asarray(close, dtype=np.float64)
+
+        pivot = (high + low + close) / 3
+        bc = (high + low) / 2
+        tc = (pivot - bc) + pivot
+        span = high - low
+
+        levels = np.column_stack(
+            [
+                high + 2 * (pivot - low),  # R3
+                pivot + span,  # R2
+                2 * pivot - low,  # R1
+                tc,
+                pivot,
+                bc,
+                2 * pivot - high,  # S1
+                pivot - span,  # S2
+                low - 2 * (high - pivot),  # S3
+                high - span * 0.618,  # Fibonacci 61.8% retracement
+            ]
+        )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            width_percent = (tc - bc) / pivot * 100
+        return np.round(levels, 2), width_percent
+
+    @staticmethod
+    def backtest_pivot_accuracy(
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray,
+        tolerances: Sequence[float] = (0.3,),
+    ) -> Dict[float, Dict[str, Any]]:
+        """
+        Pivot level accuracy of a bar series for several tolerances at once.
+
+        Levels of each bar come from the previous bar, so daily bars give
+        daily pivots and intraday bars give pivots of the bar size. All
+        levels of all bars are tested with one broadcast per tolerance
+        axis, so 20 years of daily bars or months of intraday bars take
+        a few array operations.
+
+        Args:
+            high, low, close: OHLC arrays sorted oldest first
+            tolerances: Percentage tolerances for level testing
+
+        Returns:
+            calculate_pivot_accuracy's result for each tolerance
+        """
+        high = np.asarray(high, dtype=np.float64)
+        low = np.asarray(low, dtype=np.float64)
+        close = np.asarray(close, dtype=np.float64)
+        if len(close) < 2:
+            return {
+                tolerance: {
+                    "error": "Need at least 2 days of data for accuracy calculation"
+                }
+                for tolerance in tolerances
+            }
+
+        levels, width_percent = PivotService.level_columns(
+            high[:-1], low[:-1], close[:-1]
+        )
+        curr_high = high[1:, None]
+        curr_low = low[1:, None]
+        curr_close = close[1:, None]
+
+        # CPR classification and its trending / range-bound hit rates
+        narrow = width_percent < NARROW_CPR_PERCENT
+        wide = width_percent > WIDE_CPR_PERCENT
+        is_trending = (high[1:] - low[1:]) > (
+            high[:-1] - low[:-1]
+        ) * TRENDING_RANGE_RATIO
+
+        def hit_rate(days: np.ndarray, hits: np.ndarray) -> float:
+            total = int(days.sum())
+            return round(int((days & hits).sum()) / total * 100, 1) if total else 0
+
+        cpr_statistics = {
+            "narrow_cpr_days": int(narrow.sum()),
+            "wide_cpr_days": int(wide.sum()),
+            "normal_cpr_days": int((~narrow & ~wide).sum()),
+            "narrow_cpr_trending_accuracy": hit_rate(narrow, is_trending),
+            "wide_cpr_range_accuracy": hit_rate(wide, ~is_trending),
+        }
+
+        # Axes: tolerance x bar x level
+        tolerance = (
+            np.asarray(tolerances, dtype=np.float64)[:, None, None] / 100 * levels
+        )
+        tested_from_below = (curr_high >= levels - tolerance) & (curr_low < levels)
+        tested_from_above = (curr_low <= levels + tolerance) & (curr_high > levels)
+        tested = tested_from_below | tested_from_above
+
+        # A resistance test is respected by a close below the level, a
+        # support test by a close above it
+        held_below = curr_close < levels
+        held_above = curr_close > levels
+        respected = np.where(
+            tested_from_below, held_below, tested_from_above & held_above
+        )
+        rejection = np.where(held_below, levels - curr_close, curr_close - levels)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rejection = rejection / levels * 100
+
+        times_tested = tested.sum(axis=1)
+        times_respected = respected.sum(axis=1)
+        rejection_total = np.where(respected, rejection, 0.0).sum(axis=1)
+
+        results = {}
+        for t, value in enumerate(tolerances):
+            level_accuracy = {}
+            for j, level_name in enumerate(ACCURACY_LEVELS):
+                tested_count = int(times_tested[t, j])
+                respected_count = int(times_respected[t, j])
+                level_accuracy[level_name] = {
+                    "times_tested": tested_count,
+                    "times_respected": respected_count,
+                    "accuracy_percent": round(
+                        respected_count / tested_count * 100 if tested_count else 0,
+                        1,
+                    ),
+                    "avg_rejection_distance": round(
+                        float(rejection_total[t, j]) / respected_count
+                        if respected_count
+                        else 0,
+                        2,
+                    ),
+                }
+
+            # Best performing levels
+            sorted_levels = sorted(
+                level_accuracy.items(),
+                key=lambda x: (x[1]["accuracy_percent"], x[1]["times_tested"]),
+                reverse=True,
+            )
+            results[value] = {
+                "level_accuracy": level_accuracy,
+                "cpr_statistics": dict(cpr_statistics),
+                "total_sessions_analyzed": len(close) - 1,
+                "best_performing_levels": [
+                    level[0]
+                    for level in sorted_levels[:3]
+                    if level[1]["times_tested"] > 0
+                ],
+            }
+        return results
+
     @staticmethod
     def calculate_pivot_accuracy(
         historical_data: List[Dict[str, Any]], tolerance_percent: float = 0.3
@@ -206,180 +438,130 @@ class PivotService:
         if len(historical_data) < 2:
             return {"error": "Need at least 2 days of data for accuracy calculation"}
 
-        # Initialize tracking for each level
-        level_stats = {
-            "R3": {"times_tested": 0, "times_respected": 0, "rejection_distances": []},
-            "R2": {"times_tested": 0, "times_respected": 0, "rejection_distances": []},
-            "R1": {"times_tested": 0, "times_respected": 0, "rejection_distances": []},
-            "CPR_TC": {
-                "times_tested": 0,
-                "times_respected": 0,
-                "rejection_distances": [],
-            },
-            "CPR_Pivot": {
-                "times_tested": 0,
-                "times_respected": 0,
-                "rejection_distances": [],
-            },
-            "CPR_BC": {
-                "times_tested": 0,
-                "times_respected": 0,
-                "rejection_distances": [],
-            },
-            "S1": {"times_tested": 0, "times_respected": 0, "rejection_distances": []},
-            "S2": {"times_tested": 0, "times_respected": 0, "rejection_distances": []},
-            "S3": {"times_tested": 0, "times_respected": 0, "rejection_distances": []},
-            "Fib_618": {
-                "times_tested": 0,
-                "times_respected": 0,
-                "rejection_distances": [],
-            },
-        }
+        ohlc = np.array(
+            [[row["high"], row["low"], row["close"]] for row in historical_data],
+            dtype=np.float64,
+        )
+        return PivotService.backtest_pivot_accuracy(
+            ohlc[:, 0], ohlc[:, 1], ohlc[:, 2], (tolerance_percent,)
+        )[tolerance_percent]
 
-        cpr_classifications = {"narrow": 0, "wide": 0, "normal": 0}
-        narrow_trending_correct = 0
-        narrow_trending_total = 0
-        wide_range_correct = 0
-        wide_range_total = 0
-
-        # Iterate through data (except last day since we need next day's data)
-        for i in range(len(historical_data) - 1):
-            prev_day = historical_data[i]
-            curr_day = historical_data[i + 1]
-
-            prev_high = float(prev_day["high"])
-            prev_low = float(prev_day["low"])
-            prev_close = float(prev_day["close"])
-
-            curr_high = float(curr_day["high"])
-            curr_low = float(curr_day["low"])
-            curr_close = float(curr_day["close"])
-
-            # Calculate pivots for current day using previous day's OHLC
-            cpr = PivotService.calculate_cpr(prev_high, prev_low, prev_close)
-            floor = PivotService.calculate_floor_pivots(prev_high, prev_low, prev_close)
-            fib = PivotService.calculate_fibonacci(prev_high, prev_low, "up")
-
-            # Track CPR classification
-            cpr_classifications[cpr["classification"]] += 1
-
-            # Check if day was trending (range expansion) or range-bound
-            day_range = curr_high - curr_low
-            prev_range = prev_high - prev_low
-            is_trending = day_range > prev_range * 1.2  # 20% more range = trending
-
-            # Track narrow CPR trending accuracy
-            if cpr["classification"] == "narrow":
-                narrow_trending_total += 1
-                if is_trending:
-                    narrow_trending_correct += 1
-
-            # Track wide CPR range-bound accuracy
-            if cpr["classification"] == "wide":
-                wide_range_total += 1
-                if not is_trending:
-                    wide_range_correct += 1
-
-            # Build levels dict for testing
-            levels_to_test = {
-                "R3": floor["r3"],
-                "R2": floor["r2"],
-                "R1": floor["r1"],
-                "CPR_TC": cpr["tc"],
-                "CPR_Pivot": cpr["pivot"],
-                "CPR_BC": cpr["bc"],
-                "S1": floor["s1"],
-                "S2": floor["s2"],
-                "S3": floor["s3"],
-                "Fib_618": fib["level_618"],
-            }
+    @staticmethod
+    def timeframe_ohlc(
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray,
+        timeframes: Dict[str, int] = TIMEFRAME_BARS,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Previous-period OHLC of every timeframe from one daily series
 
-            # Test each level
-            for level_name, level_value in levels_to_test.items():
-                tolerance = level_value * (tolerance_percent / 100)
+        Args:
+            high, low, close: Daily OHLC arrays sorted oldest first
+            timeframes: Trading days aggregated per timeframe
 
-                # Check if price tested this level (high or low came within tolerance)
-                tested_from_below = (
-                    curr_high >= (level_value - tolerance) and curr_low < level_value
-                )
-                tested_from_above = (
-                    curr_low <= (level_value + tolerance) and curr_high > level_value
-                )
+        Returns:
+            {timeframe: {"high", "low", "close", "index"}} where index is the
+            position of the period's last bar
+        """
+        high = np.asarray(high, dtype=np.float64)
+        low = np.asarray(low, dtype=np.float64)
+        close = np.asarray(close, dtype=np.float64)
+        if not len(close):
+            raise ValueError("No bars to aggregate")
 
-                if tested_from_below or tested_from_above:
-                    level_stats[level_name]["times_tested"] += 1
-
-                    # Check if level was respected (price reversed after testing)
-                    if tested_from_below:
-                        # Resistance test - respected if close is below level
-                        if curr_close < level_value:
-                            level_stats[level_name]["times_respected"] += 1
-                            rejection_dist = (
-                                (level_value - curr_close) / level_value * 100
-                            )
-                            level_stats[level_name]["rejection_distances"].append(
-                                rejection_dist
-                            )
-                    elif tested_from_above:
-                        # Support test - respected if close is above level
-                        if curr_close > level_value:
-                            level_stats[level_name]["times_respected"] += 1
-                            rejection_dist = (
-                                (curr_close - level_value) / level_value * 100
-                            )
-                            level_stats[level_name]["rejection_distances"].append(
-                                rejection_dist
-                            )
-
-        # Calculate final statistics
-        result = {
-            "level_accuracy": {},
-            "cpr_statistics": {
-                "narrow_cpr_days": cpr_classifications["narrow"],
-                "wide_cpr_days": cpr_classifications["wide"],
-                "normal_cpr_days": cpr_classifications["normal"],
-                "narrow_cpr_trending_accuracy": round(
-                    (narrow_trending_correct / narrow_trending_total * 100)
-                    if narrow_trending_total > 0
-                    else 0,
-                    1,
-                ),
-                "wide_cpr_range_accuracy": round(
-                    (wide_range_correct / wide_range_total * 100)
-                    if wide_range_total > 0
-                    else 0,
-                    1,
-                ),
-            },
-            "total_sessions_analyzed": len(historical_data) - 1,
+        return {
+            timeframe: {
+                "high": float(high[-bars:].max()),
+                "low": float(low[-bars:].min()),
+                "close": float(close[-1]),
+                "index": len(close) - 1,
+            }
+            for timeframe, bars in timeframes.items()
         }
 
-        # Calculate accuracy for each level
-        for level_name, stats in level_stats.items():
-            tested = stats["times_tested"]
-            respected = stats["times_respected"]
-            accuracy = (respected / tested * 100) if tested > 0 else 0
-            avg_rejection = (
-                sum(stats["rejection_distances"]) / len(stats["rejection_distances"])
-                if stats["rejection_distances"]
-                else 0
-            )
+    @staticmethod
+    def timeframe_levels(
+        periods: Dict[str, Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Confluence candidates of every timeframe, computed as one level matrix
 
-            result["level_accuracy"][level_name] = {
-                "times_tested": tested,
-                "times_respected": respected,
-                "accuracy_percent": round(accuracy, 1),
-                "avg_rejection_distance": round(avg_rejection, 2),
-            }
+        Args:
+            periods: timeframe_ohlc() output
 
-        # Determine best performing levels
-        sorted_levels = sorted(
-            result["level_accuracy"].items(),
-            key=lambda x: (x[1]["accuracy_percent"], x[1]["times_tested"]),
-            reverse=True,
+        Returns:
+            Level dicts with name, value, timeframe and type
+        """
+        timeframes = list(periods)
+        ohlc = np.array(
+            [
+                [periods[tf]["high"], periods[tf]["low"], periods[tf]["close"]]
+                for tf in timeframes
+            ],
+            dtype=np.float64,
         )
-        result["best_performing_levels"] = [
-            level[0] for level in sorted_levels[:3] if level[1]["times_tested"] > 0
+        levels, _ = PivotService.level_columns(ohlc[:, 0], ohlc[:, 1], ohlc[:, 2])
+
+        return [
+            {
+                "name": f"{timeframe[0].upper()}_{level_name}",
+                "value": float(levels[t, j]),
+                "timeframe": timeframe,
+                "type": LEVEL_TYPES[level_name],
+            }
+            for t, timeframe in enumerate(timeframes)
+            for j, level_name in enumerate(ACCURACY_LEVELS)
         ]
 
-        return result
+    @staticmethod
+    def find_confluence_zones(
+        levels: List[Dict[str, Any]], threshold: float = CONFLUENCE_THRESHOLD
+    ) -> List[Dict[str, Any]]:
+        """
+        Group levels of different timeframes that lie close together.
+
+        Levels are sorted once and swept from the lowest up: each zone is
+        anchored at its lowest level and takes every level up to
+        `threshold` above it (a binary search). A window is a zone if it
+        holds more than one timeframe; the sweep then continues after it,
+        otherwise at the next level. O(L log L) for L levels.
+
+        Args:
+            levels: Level dicts with at least name, value and timeframe
+            threshold: Maximum relative distance from the zone's lowest level
+
+        Returns:
+            Zones with value, strength, levels and description, strongest
+            first (lowest value first within equal strength)
+        """
+        if not levels:
+            return []
+
+        values = np.array([level["value"] for level in levels], dtype=np.float64)
+        order = np.argsort(values, kind="stable")
+        ordered = values[order]
+        ends = np.searchsorted(ordered, ordered * (1 + threshold), side="right")
+
+        zones = []
+        start = 0
+        while start < len(order):
+            end = int(ends[start])
+            members = [levels[i] for i in order[start:end]]
+            if len({level["timeframe"] for level in members}) > 1:
+                zones.append(
+                    {
+                        "value": round(float(ordered[start:end].mean()), 2),
+                        "levels": members,
+                        "strength": len(members),
+                        "description": " + ".join(
+                            level["name"] for level in members
+                        ),
+                    }
+                )
+                start = end
+            else:
+                start += 1
+
+        zones.sort(key=lambda zone: zone["strength"], reverse=True)
+        return zones
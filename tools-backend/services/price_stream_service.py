@@ -0,0 +1,306 @@
+"""
+Live price stream hub for arbitrage/price widgets.
+
+Instead of every client polling REST endpoints that each fetch upstream
+quotes, one background poller task per upstream feed (COMEX via Yahoo,
+MCX via DhanHQ, USD/INR) publishes into an in-process fan-out hub.
+Each update recomputes fair value and premium once with ArbitrageService
+and broadcasts the resulting tick to every subscriber.
+
+Feeds are started when the first subscriber for a symbol arrives and
+cancelled when the last one leaves.
+
+Usage:
+    hub = get_price_stream_hub()
+    queue = await hub.subscribe(["GOLD"])
+    try:
+        while True:
+            tick = await queue.get()
+            ...
+    finally:
+        hub.unsubscribe(queue, ["GOLD"])
+"""
+
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set
+import asyncio
+import logging
+
+from config import settings
+from services.arbitrage_service import (
+    COMEX_SYMBOLS,
+    MCX_CONTRACT_SIZES,
+    ArbitrageService,
+)
+from services.data_providers import (
+    DhanHQProvider,
+    Priority,
+    ProviderError,
+    YahooFinanceProvider,
+)
+
+logger = logging.getLogger(__name__)
+
+# Feed keys
+USDINR_FEED = "forex:USDINR"
+
+
+class PriceStreamHub:
+    """
+    In-process fan-out hub backed by one upstream poller per feed.
+
+    Feeds:
+        - comex:{SYMBOL}: COMEX futures price (Yahoo Finance)
+        - mcx:{SYMBOL}: MCX futures price (DhanHQ, if configured)
+        - forex:USDINR: USD/INR rate (Yahoo Finance)
+    """
+
+    SUPPORTED_SYMBOLS = list(COMEX_SYMBOLS.keys())
+
+    # Per-subscriber buffer; slow consumers drop their oldest ticks
+    QUEUE_SIZE = 100
+
+    def __init__(self, poll_interval: float = 5.0):
+        self.poll_interval = poll_interval
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+        self._pollers: Dict[str, asyncio.Task] = {}
+        self._quotes: Dict[str, Dict[str, Any]] = {}
+        self._latest: Dict[str, Dict[str, Any]] = {}
+        self._yahoo: Optional[YahooFinanceProvider] = None
+        self._dhan: Optional[DhanHQProvider] = None
+
+    @staticmethod
+    def _feeds_for_symbol(symbol: str) -> List[str]:
+        """Upstream feeds needed to price a symbol"""
+        return [f"comex:{symbol}", f"mcx:{symbol}", USDINR_FEED]
+
+    def _get_yahoo(self) -> YahooFinanceProvider:
+        if self._yahoo is None:
+            self._yahoo = YahooFinanceProvider()
+        return self._yahoo
+
+    def _get_dhan(self) -> Optional[DhanHQProvider]:
+        if self._dhan is None and settings.dhan_client_id and settings.dhan_access_token:
+            # Background lane so interactive REST requests are served first
+            self._dhan = DhanHQProvider(
+                client_id=settings.dhan_client_id,
+                access_token=settings.dhan_access_token,
+                priority=Priority.BACKGROUND,
+            )
+        return self._dhan
+
+    # ------------------------------------------------------------------
+    # Subscription management
+    # ------------------------------------------------------------------
+
+    async def subscribe(self, symbols: List[str]) -> asyncio.Queue:
+        """
+        Register a subscriber for the given symbols.
+
+        The latest known tick for each symbol is queued immediately so new
+        clients don't wait for the next poll.
+
+        Args:
+            symbols: Symbols to subscribe to (GOLD, SILVER)
+
+        Returns:
+            Queue receiving tick dictionaries
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.QUEUE_SIZE)
+
+        for symbol in symbols:
+            self._subscribers[symbol].add(queue)
+            for feed in self._feeds_for_symbol(symbol):
+                self._start_feed(feed)
+            if symbol in self._latest:
+                self._offer(queue, self._latest[symbol])
+
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue, symbols: List[str]):
+        """Remove a subscriber and stop feeds nobody needs anymore"""
+        for symbol in symbols:
+            self._subscribers[symbol].discard(queue)
+
+        needed = {
+            feed
+            for symbol, queues in self._subscribers.items()
+            if queues
+            for feed in self._feeds_for_symbol(symbol)
+        }
+        for feed in list(self._pollers):
+            if feed not in needed:
+                self._pollers.pop(feed).cancel()
+                logger.info(f"Price stream feed stopped: {feed}")
+
+    @property
+    def subscriber_count(self) -> int:
+        return len({q for queues in self._subscribers.values() for q in queues})
+
+    def status(self) -> Dict[str, Any]:
+        """Active feeds, subscriber counts and last quotes"""
+        return {
+            "poll_interval_seconds": self.poll_interval,
+            "subscribers": self.subscriber_count,
+            "subscribers_by_symbol": {
+                symbol: len(queues) for symbol, queues in self._subscribers.items()
+            },
+            "active_feeds": sorted(self._pollers.keys()),
+            "quotes": self._quotes,
+        }
+
+    async def shutdown(self):
+        """Cancel all poller tasks (called on application shutdown)"""
+        tasks = list(self._pollers.values())
+        self._pollers.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    # ------------------------------------------------------------------
+    # Polling
+    # ------------------------------------------------------------------
+
+    def _start_feed(self, feed: str):
+        task = self._pollers.get(feed)
+        if task is not None and not task.done():
+            return
+        self._pollers[feed] = asyncio.get_running_loop().create_task(
+            self._poll_feed(feed)
+        )
+        logger.info(f"Price stream feed started: {feed}")
+
+    async def _fetch_quote(self, feed: str) -> Optional[float]:
+        """Fetch one quote for a feed from its upstream provider"""
+        kind, symbol = feed.split(":", 1)
+
+        if kind == "comex":
+            price = await self._get_yahoo().get_price(COMEX_SYMBOLS[symbol], "USD")
+            return float(price.price)
+
+        if kind == "forex":
+            return float(await self._get_yahoo().get_forex_rate("USD", "INR"))
+
+        if kind == "mcx":
+            dhan = self._get_dhan()
+            if dhan is None:
+                return None
+            price = await dhan.get_price(symbol, "INR")
+            return float(price.price)
+
+        return None
+
+    async def _poll_feed(self, feed: str):
+        """Poll a single upstream feed and publish ticks on change"""
+        while True:
+            try:
+                price = await self._fetch_quote(feed)
+                if price is not None:
+                    previous = self._quotes.get(feed, {}).get("price")
+                    self._quotes[feed] = {
+                        "price": price,
+                        "timestamp": datetime.now().isoformat(),
+                    }
+                    if price != previous:
+                        self._publish_for_feed(feed)
+                elif feed.startswith("mcx:"):
+                    # MCX not configured - stop polling, ticks use estimates
+                    self._publish_for_feed(feed)
+                    return
+            except asyncio.CancelledError:
+                raise
+            except ProviderError as e:
+                logger.warning(f"Price stream feed {feed} failed: {e}")
+            except Exception as e:
+                logger.error(f"Unexpected error in price stream feed {feed}: {e}")
+
+            await asyncio.sleep(self.poll_interval)
+
+    # ------------------------------------------------------------------
+    # Tick computation and fan-out
+    # ------------------------------------------------------------------
+
+    def _publish_for_feed(self, feed: str):
+        """Recompute and broadcast ticks for every symbol using a feed"""
+        if feed == USDINR_FEED:
+            symbols = [s for s, queues in self._subscribers.items() if queues]
+        else:
+            symbols = [feed.split(":", 1)[1]]
+
+        for symbol in symbols:
+            tick = self._compute_tick(symbol)
+            if tick is None:
+                continue
+            self._latest[symbol] = tick
+            for queue in list(self._subscribers.get(symbol, ())):
+                self._offer(queue, tick)
+
+    def _compute_tick(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Compute fair value and premium once for all subscribers"""
+        comex = self._quotes.get(f"comex:{symbol}")
+        usdinr = self._quotes.get(USDINR_FEED)
+        if not comex or not usdinr:
+            return None
+
+        contract_size = MCX_CONTRACT_SIZES.get(symbol, 10)
+        fair_value = ArbitrageService.calculate_fair_value(
+            comex_price_usd_per_oz=comex["price"],
+            usdinr_rate=usdinr["price"],
+            import_duty_percent=ArbitrageService.DEFAULT_IMPORT_DUTY_PERCENT,
+            contract_size_grams=contract_size,
+        )
+
+        mcx = self._quotes.get(f"mcx:{symbol}")
+        if mcx:
+            mcx_price = mcx["price"]
+            mcx_source = "DhanHQ"
+        else:
+            # Same estimate as /arbitrage/realtime when DhanHQ is unavailable
+            mcx_price = fair_value * 1.005
+            mcx_source = "estimated"
+
+        metrics = ArbitrageService.calculate_arbitrage_metrics(
+            mcx_price=mcx_price, fair_value=fair_value
+        )
+
+        return {
+            "type": "tick",
+            "symbol": symbol,
+            "timestamp": datetime.now().isoformat(),
+            "comex_price_usd": comex["price"],
+            "mcx_price_inr": round(mcx_price, 2),
+            "usdinr_rate": usdinr["price"],
+            "fair_value_inr": fair_value,
+            "contract_size_grams": contract_size,
+            **metrics,
+            "data_sources": {
+                "comex": f"Yahoo Finance ({COMEX_SYMBOLS[symbol]})",
+                "mcx": mcx_source,
+                "usdinr": "Yahoo Finance",
+            },
+        }
+
+    @staticmethod
+    def _offer(queue: asyncio.Queue, tick: Dict[str, Any]):
+        """Enqueue a tick, dropping the oldest one if the subscriber lags"""
+        try:
+            queue.put_nowait(tick)
+        except asyncio.QueueFull:
+            try:
+                queue.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+            queue.put_nowait(tick)
+
+
+# Global hub instance (one per process)
+_hub_instance: Optional[PriceStreamHub] = None
+
+
+def get_price_stream_hub() -> PriceStreamHub:
+    """Get the global price stream hub"""
+    global _hub_instance
+    if _hub_instance is None:
+        _hub_instance = PriceStreamHub(poll_interval=settings.price_stream_poll_seconds)
+    return _hub_instance
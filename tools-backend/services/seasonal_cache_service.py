@@ -44,7 +44,8 @@ class CacheBackend(ABC):
 class InMemoryCache(CacheBackend):
     """Simple in-memory cache for development"""
 
-    _cache: Dict[str, Dict] = {}
+    def __init__(self):
+        self._cache: Dict[str, Dict] = {}
 
     def get(self, key: str) -> Optional[str]:
         if key in self._cache:
@@ -162,6 +163,11 @@ class SeasonalCacheService:
             # Default to in-memory cache
             self._cache = InMemoryCache()
 
+    @property
+    def backend(self) -> CacheBackend:
+        """Underlying cache backend, shared with other cached services"""
+        return self._cache
+
     def _make_key(self, prefix: str, **kwargs) -> str:
         """Generate a cache key from prefix and parameters"""
         params = ":".join(f"{k}={v}" for k, v in sorted(kwargs.items()))
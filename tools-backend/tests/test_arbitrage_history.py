@@ -0,0 +1,146 @@
+"""
+Unit tests for the SQL-side arbitrage history queries.
+
+These tests compile statements for PostgreSQL and run without a database.
+Run with: pytest tests/test_arbitrage_history.py -v
+"""
+
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+import os
+import sys
+
+import numpy as np
+import pytest
+from sqlalchemy.dialects import postgresql
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.arbitrage import ArbitrageHistory
+from services.arbitrage_history import (
+    AUTO_BUCKET,
+    choose_bucket,
+    history_filters,
+    kept_times,
+    load_premium_series,
+    points_query,
+    statistics_query,
+)
+
+
+# Schema-qualified as configured by settings.database_schema
+TABLE = ArbitrageHistory.__table__.fullname
+
+
+def compiled(stmt):
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def span_stats(count, days):
+    first = datetime(2020, 1, 1)
+    return {"count": count, "first_at": first, "last_at": first + timedelta(days)}
+
+
+class TestStatisticsQuery:
+    """Tests for the single aggregate statistics query"""
+
+    def test_aggregates_in_one_statement(self):
+        sql = compiled(statistics_query(history_filters("gold", 365, True)))
+
+        assert sql.count("SELECT") == 3
+        assert f"stddev_samp({TABLE}.premium_percent)" in sql
+        assert sql.count("percentile_cont(") == 5
+        assert f"WITHIN GROUP (ORDER BY {TABLE}.premium_percent)" in sql
+        assert "json_object_agg" in sql
+        assert f"GROUP BY {TABLE}.signal" in sql
+
+    def test_filters(self):
+        assert len(history_filters("GOLD", 0, False)) == 1
+        assert len(history_filters("GOLD", 30, True)) == 3
+
+
+class TestPointsQuery:
+    """Tests for raw and bucketed point queries"""
+
+    def test_raw_points_oldest_first(self):
+        sql = compiled(points_query(history_filters("GOLD", 0, False)))
+
+        assert "GROUP BY" not in sql
+        assert sql.endswith(f"ORDER BY {TABLE}.recorded_at")
+
+    def test_bucketed_points(self):
+        sql = compiled(points_query(history_filters("GOLD", 0, False), "week"))
+
+        assert f"GROUP BY date_trunc('week', {TABLE}.recorded_at)" in sql
+        assert f"mode() WITHIN GROUP (ORDER BY {TABLE}.signal)" in sql
+        assert f"avg({TABLE}.premium_percent)" in sql
+
+    def test_kept_points_only(self):
+        at = [datetime(2025, 1, 6, tzinfo=timezone.utc)]
+        raw = compiled(points_query([], None, at=at))
+        weekly = compiled(points_query([], "week", ("recorded_at",), at=at))
+
+        assert f"{TABLE}.recorded_at IN" in raw
+        assert f"date_trunc('week', {TABLE}.recorded_at) IN" in weekly
+        assert "premium_percent" not in weekly
+
+    def test_unknown_bucket(self):
+        with pytest.raises(ValueError):
+            points_query([], "minute; DROP TABLE arbitrage_history")
+
+
+class TestChooseBucket:
+    """Tests for resolving the requested bucket"""
+
+    def test_explicit_and_none_pass_through(self):
+        assert choose_bucket(None, span_stats(10000, 3650), 500) is None
+        assert choose_bucket("day", span_stats(10, 3650), 500) == "day"
+
+    def test_auto(self):
+        assert choose_bucket(AUTO_BUCKET, span_stats(400, 3650), 500) is None
+        assert choose_bucket(AUTO_BUCKET, span_stats(9000, 15), 500) == "hour"
+        assert choose_bucket(AUTO_BUCKET, span_stats(9000, 365), 500) == "day"
+        assert choose_bucket(AUTO_BUCKET, span_stats(9000, 3000), 500) == "week"
+        assert choose_bucket(AUTO_BUCKET, span_stats(9000, 20000), 500) == "month"
+
+
+class FakeResult:
+    def __init__(self, rows, batch):
+        self.rows, self.batch = rows, batch
+
+    def partitions(self):
+        for i in range(0, len(self.rows), self.batch):
+            yield self.rows[i : i + self.batch]
+
+
+class FakeSession:
+    def __init__(self, rows, batch=3):
+        self.result = FakeResult(rows, batch)
+
+    def execute(self, stmt):
+        return self.result
+
+
+class TestPremiumSeries:
+    """Tests for streaming the premium series and selecting kept points"""
+
+    def test_batches_fill_arrays_and_times_round_trip(self):
+        start = datetime(2025, 1, 1, 9, 30, 0, 123456, tzinfo=timezone.utc)
+        rows = [
+            (start + timedelta(hours=i), Decimal(f"{i}.25")) for i in range(10)
+        ]
+
+        micros, premiums = load_premium_series(FakeSession(rows), [])
+
+        assert premiums.tolist() == [i + 0.25 for i in range(10)]
+        assert kept_times(micros, np.array([0, 4, 9])) == [
+            rows[0][0],
+            rows[4][0],
+            rows[9][0],
+        ]
+        assert kept_times(micros, np.arange(10)) is None
+
+    def test_no_rows(self):
+        micros, premiums = load_premium_series(FakeSession([]), [])
+        assert len(micros) == 0 and len(premiums) == 0
@@ -0,0 +1,160 @@
+"""
+Unit tests for backfill chunking, resume and failure handling.
+
+Jobs and sessions are in-memory fakes, so these tests run without a
+database or network access.
+Run with: pytest tests/test_backfill.py -v
+"""
+
+from datetime import date, timedelta
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.backfill_service import (
+    BackfillEngine,
+    BackfillJob,
+    DateChunk,
+    split_date_range,
+)
+
+TODAY = date(2025, 12, 10)
+
+
+class FakeSession:
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class FakeJob(BackfillJob):
+    """One row per day; chunks starting on `failing` dates raise"""
+
+    chunk_days = 10
+
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.fetched = []
+        self.written = []
+
+    @property
+    def name(self):
+        return "fake"
+
+    async def fetch_chunk(self, chunk, db):
+        self.fetched.append(chunk)
+        if chunk.start in self.failing:
+            raise RuntimeError("upstream down")
+        days = (chunk.end - chunk.start).days + 1
+        return [{"date": chunk.start + timedelta(days=i)} for i in range(days)]
+
+    def upsert(self, db, rows):
+        self.written.extend(rows)
+        return len(rows)
+
+
+@pytest.fixture
+def checkpoints(monkeypatch):
+    """Checkpoint store replacing the backfill_checkpoints table"""
+    store = {}
+
+    def checkpoint(db, job_name, chunk, status, rows_written=0, error=None):
+        store[(job_name, chunk.start, chunk.end)] = status
+
+    def completed_ranges(self, job_name):
+        return [
+            (start, end)
+            for (name, start, end), status in store.items()
+            if name == job_name and status == "done"
+        ]
+
+    monkeypatch.setattr(BackfillEngine, "_checkpoint", staticmethod(checkpoint))
+    monkeypatch.setattr(BackfillEngine, "_completed_ranges", completed_ranges)
+    return store
+
+
+def engine(**kwargs):
+    return BackfillEngine(session_factory=FakeSession, clock=lambda: TODAY, **kwargs)
+
+
+class TestSplitDateRange:
+    """Tests for chunk boundaries"""
+
+    def test_chunks_are_consecutive_and_inclusive(self):
+        chunks = split_date_range(date(2025, 1, 1), date(2025, 1, 25), 10)
+
+        assert chunks == [
+            DateChunk(date(2025, 1, 1), date(2025, 1, 10)),
+            DateChunk(date(2025, 1, 11), date(2025, 1, 20)),
+            DateChunk(date(2025, 1, 21), date(2025, 1, 25)),
+        ]
+
+    def test_single_day_and_empty_ranges(self):
+        day = date(2025, 1, 1)
+        assert split_date_range(day, day, 10) == [DateChunk(day, day)]
+        assert split_date_range(day, day - timedelta(days=1), 10) == []
+
+    def test_exact_multiple(self):
+        chunks = split_date_range(date(2025, 1, 1), date(2025, 1, 20), 10)
+        assert [c.end for c in chunks] == [date(2025, 1, 10), date(2025, 1, 20)]
+
+    def test_invalid_chunk_size(self):
+        with pytest.raises(ValueError):
+            split_date_range(date(2025, 1, 1), date(2025, 1, 2), 0)
+
+
+class TestBackfillEngine:
+    """Tests for checkpointing, resume and failures"""
+
+    @pytest.mark.asyncio
+    async def test_resume_skips_done_chunks_and_retries_failed(self, checkpoints):
+        start, end = date(2025, 1, 1), date(2025, 1, 30)
+        first = FakeJob(failing={date(2025, 1, 11)})
+
+        result = await engine().run(first, start, end)
+
+        assert (result.chunks_completed, result.chunks_failed) == (2, 1)
+        assert result.rows_written == 20
+        assert checkpoints[("fake", date(2025, 1, 11), date(2025, 1, 20))] == "failed"
+
+        second = FakeJob()
+        result = await engine().run(second, start, end)
+
+        assert result.chunks_skipped == 2
+        assert second.fetched == [DateChunk(date(2025, 1, 11), date(2025, 1, 20))]
+        assert result.rows_written == 10
+
+    @pytest.mark.asyncio
+    async def test_chunk_ending_today_is_not_checkpointed(self, checkpoints):
+        start = TODAY - timedelta(days=14)
+
+        result = await engine().run(FakeJob(), start, TODAY)
+
+        assert result.rows_written == 15
+        assert ("fake", start, start + timedelta(days=9)) in checkpoints
+        assert all(end < TODAY for _, _, end in checkpoints)
+
+        # The next run fetches the open chunk again
+        again = FakeJob()
+        await engine().run(again, start, TODAY)
+        assert again.fetched == [DateChunk(start + timedelta(days=10), TODAY)]
+
+    @pytest.mark.asyncio
+    async def test_dry_run_writes_nothing(self, checkpoints):
+        job = FakeJob()
+
+        result = await engine(dry_run=True).run(
+            job, date(2025, 1, 1), date(2025, 1, 20)
+        )
+
+        assert result.rows_fetched == 20 and result.rows_written == 0
+        assert job.written == [] and checkpoints == {}
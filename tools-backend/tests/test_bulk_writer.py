@@ -0,0 +1,76 @@
+"""
+Unit tests for the bulk upsert writer's staging and merge SQL.
+
+These tests run without a database.
+Run with: pytest tests/test_bulk_writer.py -v
+"""
+
+from datetime import date, datetime
+from decimal import Decimal
+import csv
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.bulk_writer import (
+    ARBITRAGE_HISTORY,
+    COPY_NULL,
+    COT_ML_REGIME_HISTORY,
+    METALS_PRICES_SPOT,
+    _copy_buffer,
+    _dedupe,
+    _merge_sql,
+)
+
+
+class TestBulkWriter:
+    """Tests for COPY staging and INSERT ... SELECT ... ON CONFLICT merge"""
+
+    def test_copy_buffer_formats_values(self):
+        rows = [
+            {
+                "date": date(2024, 1, 2),
+                "usd_inr_rate": Decimal("83.12"),
+                "gold_usd": None,
+                "gold_inr": float("nan"),
+            }
+        ]
+        buffer = _copy_buffer(rows, ("date", "usd_inr_rate", "gold_usd", "gold_inr"))
+
+        assert next(csv.reader(buffer)) == ["2024-01-02", "83.12", COPY_NULL, COPY_NULL]
+
+    def test_dedupe_keeps_last_row_per_key(self):
+        recorded_at = datetime(2024, 1, 2)
+        rows = [
+            {"symbol": "GOLD", "recorded_at": recorded_at, "premium": 1},
+            {"symbol": "SILVER", "recorded_at": recorded_at, "premium": 2},
+            {"symbol": "GOLD", "recorded_at": recorded_at, "premium": 3},
+        ]
+        deduped = _dedupe(rows, ARBITRAGE_HISTORY.conflict_columns)
+
+        assert sorted(r["premium"] for r in deduped) == [2, 3]
+
+    def test_merge_sql_upserts_on_conflict_key(self):
+        sql = _merge_sql(ARBITRAGE_HISTORY, '"staging"')
+
+        assert 'ON CONFLICT ("symbol", "recorded_at") DO UPDATE SET' in sql
+        assert '"premium" = EXCLUDED."premium"' in sql
+        assert '"id"' not in sql
+
+    def test_regime_windows_are_kept_apart(self):
+        report_date = date(2024, 12, 17)
+        rows = [
+            {"market_key": "GOLD", "window": 52, "report_date": report_date},
+            {"market_key": "GOLD", "window": 156, "report_date": report_date},
+        ]
+
+        assert len(_dedupe(rows, COT_ML_REGIME_HISTORY.conflict_columns)) == 2
+        sql = _merge_sql(COT_ML_REGIME_HISTORY, '"staging"')
+        assert 'ON CONFLICT ("market_key", "window", "report_date")' in sql
+
+    def test_merge_sql_keeps_existing_values_on_null(self):
+        sql = _merge_sql(METALS_PRICES_SPOT, '"staging"')
+
+        assert 'COALESCE(EXCLUDED."gold_usd"' in sql
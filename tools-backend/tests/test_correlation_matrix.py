@@ -0,0 +1,242 @@
+"""
+Unit tests for the vectorized correlation kernels.
+
+These tests run without network access.
+Run with: pytest tests/test_correlation_matrix.py -v
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.correlation_service import (
+    ALIGN_FFILL,
+    CorrelationService,
+    RollingCorrelation,
+)
+
+
+class TestCorrelationMatrix:
+    """Tests for the one-pass matrix, p-values and intervals"""
+
+    def setup_method(self):
+        rng = np.random.default_rng(11)
+        base = rng.normal(size=250)
+        self.returns = np.column_stack(
+            [base, base + rng.normal(size=250), rng.normal(size=250)]
+        )
+
+    def test_matches_corrcoef_and_pairwise(self):
+        result = CorrelationService.correlation_matrix(self.returns)
+        assert np.allclose(result["correlation"], np.corrcoef(self.returns.T))
+        assert result["sample_size"] == 250
+
+        pair = CorrelationService.calculate_correlation(
+            self.returns[:, 0].tolist(), self.returns[:, 1].tolist()
+        )
+        assert np.isclose(result["correlation"][0, 1], pair)
+
+    def test_intervals_match_pairwise_method(self):
+        result = CorrelationService.correlation_matrix(self.returns)
+        r = result["correlation"][0, 1]
+        # Unrounded Fisher-z bounds with the exact normal quantile
+        margin = 1.959964 / np.sqrt(250 - 3)
+        assert np.isclose(result["ci_lower"][0, 1], np.tanh(np.arctanh(r) - margin))
+        assert np.isclose(result["ci_upper"][0, 1], np.tanh(np.arctanh(r) + margin))
+
+        # The pairwise method rounds its bounds to 3 decimals
+        lower, upper = CorrelationService.calculate_confidence_interval(r, 250)
+        assert np.isclose(result["ci_lower"][0, 1], lower, atol=1e-3)
+        assert np.isclose(result["ci_upper"][0, 1], upper, atol=1e-3)
+        assert result["p_value"][0, 1] < 1e-6
+
+    def test_constant_asset_has_zero_correlation(self):
+        returns = np.column_stack([self.returns[:, 0], np.zeros(250)])
+        correlation = CorrelationService.correlation_matrix(returns)["correlation"]
+        assert correlation[0, 1] == 0.0
+        assert correlation[1, 1] == 1.0
+
+    def test_exact_p_value(self):
+        # t = 0.5 * sqrt(10 / 0.75) = 1.826 with 10 df -> p ~ 0.098
+        p_value = CorrelationService.calculate_p_value(0.5, 12)
+        assert np.isclose(p_value, 0.0979, atol=1e-3)
+        assert CorrelationService.calculate_p_value(1.0, 12) == 0.0
+
+
+class TestAlignReturns:
+    """Tests for joining assets with different trading calendars"""
+
+    def setup_method(self):
+        dates = pd.to_datetime(["2024-07-01", "2024-07-02", "2024-07-03", "2024-07-05"])
+        self.closes = {
+            "GOLD": pd.Series([100.0, 101.0, 102.0, 103.0], index=dates),
+            # No close on the 3rd (holiday on this exchange)
+            "NIFTY": pd.Series([50.0, 51.0, 52.0], index=dates[[0, 1, 3]]),
+        }
+
+    def test_inner_keeps_common_dates(self):
+        returns = CorrelationService.align_returns(self.closes)
+        assert returns.index.strftime("%m-%d").tolist() == ["07-02", "07-05"]
+        assert np.isclose(returns.loc["2024-07-05", "GOLD"], 103 / 101 - 1)
+
+    def test_ffill_carries_last_close(self):
+        returns = CorrelationService.align_returns(self.closes, ALIGN_FFILL)
+        assert len(returns) == 3
+        assert returns.loc["2024-07-03", "NIFTY"] == 0.0
+
+
+class TestDivergenceSeries:
+    """Tests for the cumulative-sum rolling divergence"""
+
+    def setup_method(self):
+        rng = np.random.default_rng(3)
+        self.returns2 = rng.normal(0, 0.01, size=120)
+        self.returns1 = 0.8 * self.returns2 + rng.normal(0, 0.005, size=120)
+
+    def test_matches_brute_force_windows(self):
+        lookback, beta = 20, 0.8
+        series = CorrelationService.divergence_series(
+            self.returns1, self.returns2, beta, lookback
+        )
+        expected = [
+            np.sum(self.returns1[i - lookback : i])
+            - beta * np.sum(self.returns2[i - lookback : i])
+            for i in range(lookback, 121)
+        ]
+        assert np.allclose(series["divergence"], expected)
+
+        previous = np.array(expected[:50])
+        z_score = (expected[50] - previous.mean()) / previous.std(ddof=1)
+        assert np.isclose(series["z_score"][50], z_score)
+        assert np.isnan(series["z_score"][:2]).all()
+
+    def test_latest_point_matches_detect_divergence(self):
+        result = CorrelationService.detect_divergence(
+            self.returns1.tolist(), self.returns2.tolist(), 0.8, 20
+        )
+        latest = result["history"]["z_score"][-1]
+        assert np.isclose(latest, result["z_score"], atol=1e-3)
+
+    def test_short_history_is_empty(self):
+        series = CorrelationService.divergence_series([0.01] * 5, [0.01] * 5, 1.0, 10)
+        assert len(series["z_score"]) == 0
+
+
+class TestCrossCorrelation:
+    """Tests for the FFT lead-lag kernel"""
+
+    def setup_method(self):
+        rng = np.random.default_rng(5)
+        self.leader = rng.normal(size=600)
+        # Follows the leader 7 periods later
+        self.follower = np.roll(self.leader, 7) + rng.normal(0, 0.5, size=600)
+
+    def test_matches_per_lag_corrcoef(self):
+        lags, correlations = CorrelationService.cross_correlation(
+            self.leader, self.follower, 150
+        )
+        for lag, correlation in zip(lags, correlations):
+            if lag > 0:
+                r1, r2 = self.leader[:-lag], self.follower[lag:]
+            elif lag < 0:
+                r1, r2 = self.leader[-lag:], self.follower[:lag]
+            else:
+                r1, r2 = self.leader, self.follower
+            assert np.isclose(correlation, np.corrcoef(r1, r2)[0, 1])
+
+    def test_max_lag_keeps_minimum_overlap(self):
+        lags, _ = CorrelationService.cross_correlation(
+            self.leader[:30], self.follower[:30], 100
+        )
+        assert lags[-1] == 20
+
+    def test_basket_matrix_finds_leader(self):
+        returns = pd.DataFrame(
+            {"GOLD": self.leader, "SILVER": self.follower, "NOISE": np.zeros(600)}
+        )
+        result = CorrelationService.lead_lag_matrix(returns, max_lag=30)
+        pair = result["pairs"][0]
+        assert (pair["asset1"], pair["asset2"]) == ("GOLD", "SILVER")
+        assert pair["leading_asset"] == "GOLD"
+        assert pair["lag_direction"] == 7
+        assert result["lag_matrix"]["SILVER"]["GOLD"] == -7
+        assert result["correlation_matrix"]["GOLD"]["NOISE"] == 0.0
+        assert result["lag_matrix"]["GOLD"]["NOISE"] == 0
+
+
+class TestRollingCorrelation:
+    """Tests for the O(1) sliding-window estimator"""
+
+    def setup_method(self):
+        rng = np.random.default_rng(9)
+        self.y = rng.normal(0, 0.01, size=300)
+        self.x = 1.5 * self.y + rng.normal(0, 0.01, size=300)
+
+    def test_matches_full_recomputation(self):
+        state = RollingCorrelation(40)
+        for i, (x, y) in enumerate(zip(self.x, self.y)):
+            state.update(x, y)
+            if i < 2:
+                continue
+            wx, wy = self.x[max(0, i - 39) : i + 1], self.y[max(0, i - 39) : i + 1]
+            stats = state.stats()
+            assert stats["observations"] == len(wx)
+            assert np.isclose(stats["correlation"], np.corrcoef(wx, wy)[0, 1])
+            assert np.isclose(stats["covariance"], np.cov(wx, wy)[0, 1])
+            assert np.isclose(
+                stats["beta"], CorrelationService.calculate_beta(wx, wy)[0]
+            )
+
+    def test_pending_bar_does_not_change_state(self):
+        state = RollingCorrelation(40)
+        for x, y in zip(self.x[:40], self.y[:40]):
+            state.update(x, y)
+        committed = state.stats()
+        preview = state.stats(pending=(self.x[40], self.y[40]))
+
+        state.update(self.x[40], self.y[40])
+        assert state.stats() == preview
+        assert committed["observations"] == 40
+
+    def test_snapshot_restore(self):
+        state = RollingCorrelation(40)
+        for x, y in zip(self.x, self.y):
+            state.update(x, y)
+        restored = RollingCorrelation.restore(state.snapshot())
+        assert len(restored) == 40
+        for name, value in state.stats().items():
+            assert np.isclose(restored.stats()[name], value)
+
+
+class TestRollingPairCorrelations:
+    """Tests for the multi-window cumulative-sum kernel"""
+
+    def test_matches_pandas_rolling(self):
+        rng = np.random.default_rng(13)
+        returns = pd.DataFrame(rng.normal(size=(400, 3)), columns=["A", "B", "C"])
+        returns.iloc[50:60, 2] = np.nan
+
+        result = CorrelationService.rolling_pair_correlations(
+            returns.to_numpy(), [(0, 1), (0, 2)], (20, 60), min_fill=1.0
+        )
+        for window in (20, 60):
+            correlation, observations = result[window]
+            expected = returns["A"].rolling(window).corr(returns["B"]).to_numpy()
+            assert np.allclose(correlation[:, 0], expected, equal_nan=True)
+            assert observations[-1, 0] == window
+
+            # Windows overlapping the gap lack observations
+            assert np.isnan(correlation[60 + window - 2, 1])
+            pair = returns[["A", "C"]].iloc[-window:]
+            assert np.isclose(correlation[-1, 1], pair["A"].corr(pair["C"]))
+
+    def test_window_longer_than_history(self):
+        result = CorrelationService.rolling_pair_correlations(
+            np.ones((10, 2)), [(0, 1)], (20,)
+        )
+        assert np.isnan(result[20][0]).all()
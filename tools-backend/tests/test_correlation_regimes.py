@@ -0,0 +1,99 @@
+"""
+Unit tests for precomputed correlation regimes and structural breaks.
+
+These tests build return frames in memory and run without a database.
+Run with: pytest tests/test_correlation_regimes.py -v
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.correlation_regime_service import (
+    BREAK_WINDOW,
+    CorrelationRegimeService,
+    correlation_regimes,
+    locate_break,
+)
+
+
+def make_returns(days: int = 600, switch: int = 300) -> pd.DataFrame:
+    """GOLD and SILVER move together until `switch`, then independently"""
+    rng = np.random.default_rng(21)
+    gold = rng.normal(0, 0.01, size=days)
+    silver = np.where(
+        np.arange(days) < switch,
+        gold + rng.normal(0, 0.002, size=days),
+        rng.normal(0, 0.01, size=days),
+    )
+    index = pd.bdate_range("2015-01-01", periods=days)
+    return pd.DataFrame({"GOLD": gold, "SILVER": silver}, index=index)
+
+
+class TestRegimeRows:
+    """Tests for the vectorized regime and break computation"""
+
+    def setup_method(self):
+        self.returns = make_returns()
+        self.rows = CorrelationRegimeService.regime_rows(
+            self.returns, [("GOLD", "SILVER")]
+        )
+
+    def test_rows_start_with_first_window(self):
+        assert self.rows[0]["date"] == self.returns.index[19].date()
+        assert self.rows[0]["corr_250"] is None
+        assert self.rows[-1]["date"] == self.returns.index[-1].date()
+
+    def test_regimes_follow_the_switch(self):
+        by_date = {row["date"]: row for row in self.rows}
+        assert by_date[self.returns.index[280].date()]["regime"] == "strong_positive"
+        latest = by_date[self.returns.index[-1].date()]
+        assert latest["corr_120"] < 0.5
+        assert latest["regime"] != "strong_positive"
+
+    def test_strongest_break_at_the_switch(self):
+        breaks = [row for row in self.rows if row["is_break"]]
+        strongest = max(breaks, key=lambda row: abs(row["shift_stat"]))
+        break_day = self.returns.index.get_loc(pd.Timestamp(strongest["date"]))
+        assert abs(break_day - 299) <= 5
+        assert strongest["corr_60"] > 0.9
+
+    def test_recent_days_are_not_tested(self):
+        assert all(row["shift_stat"] is None for row in self.rows[-BREAK_WINDOW:])
+
+
+class TestLocateBreak:
+    """Tests for placing a detected break on the best split"""
+
+    def test_finds_last_correlated_day(self):
+        returns = make_returns(days=200, switch=120)
+        gold, silver = returns["GOLD"].to_numpy(), returns["SILVER"].to_numpy()
+        assert abs(locate_break(gold, silver, 60, 180) - 119) <= 2
+
+    def test_missing_returns_and_search_bounds(self):
+        returns = make_returns(days=200, switch=120)
+        gold, silver = returns["GOLD"].to_numpy(), returns["SILVER"].to_numpy()
+        silver[100:110] = np.nan
+        assert abs(locate_break(gold, silver, 60, 180) - 119) <= 2
+        # The split never leaves the candidate days
+        assert locate_break(gold, silver, 60, 90) == 90
+
+
+class TestCorrelationRegimes:
+    """Tests for regime labels"""
+
+    def test_bands(self):
+        labels = correlation_regimes(np.array([0.9, 0.3, 0.0, -0.3, -0.9, np.nan]))
+        assert labels.tolist() == [
+            "strong_positive",
+            "positive",
+            "uncorrelated",
+            "negative",
+            "strong_negative",
+            None,
+        ]
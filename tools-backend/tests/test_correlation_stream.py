@@ -0,0 +1,58 @@
+"""
+Unit tests for live rolling correlation bar handling.
+
+These tests restore in-memory states and run without a database.
+Run with: pytest tests/test_correlation_stream.py -v
+"""
+
+from datetime import date, datetime
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.correlation_stream_service import LiveCorrelationService
+
+PAIR = ("GOLD", "USDINR")
+
+
+def make_service(bar_date: date) -> LiveCorrelationService:
+    service = LiveCorrelationService([PAIR], window=5)
+    service.restore(
+        {
+            "bar_date": bar_date.isoformat(),
+            "closes": {"GOLD": 2000.0, "USDINR": 83.0},
+            "quotes": {"GOLD": 2010.0, "USDINR": 83.1},
+            "states": {},
+        }
+    )
+    return service
+
+
+def tick(gold: float, usdinr: float) -> dict:
+    return {"symbol": "GOLD", "comex_price_usd": gold, "usdinr_rate": usdinr}
+
+
+class TestBarRollover:
+    """Tests for committing or dropping the unfinished daily bar"""
+
+    def test_next_session_commits_the_bar(self):
+        # Friday's bar committed by Monday's first tick
+        service = make_service(date(2025, 12, 5))
+
+        service.on_tick(tick(2020.0, 83.2), now=datetime(2025, 12, 8, 10))
+
+        assert service.status()["pairs"][0]["committed"]["observations"] == 1
+        assert service.status()["closes"] == {"GOLD": 2010.0, "USDINR": 83.1}
+        assert not service.needs_rebuild(date(2025, 12, 8))
+
+    def test_bar_spanning_missed_sessions_is_dropped(self):
+        service = make_service(date(2025, 12, 1))
+        assert service.needs_rebuild(date(2025, 12, 8))
+
+        service.on_tick(tick(2100.0, 84.0), now=datetime(2025, 12, 8, 10))
+
+        assert service.status()["pairs"][0]["committed"]["observations"] == 0
+        assert service.status()["bar_date"] == "2025-12-08"
+        assert service.needs_rebuild(date(2025, 12, 8))
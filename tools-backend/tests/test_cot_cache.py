@@ -0,0 +1,40 @@
+"""
+Unit tests for the COT result cache.
+
+These tests use the in-memory backend and run without a database.
+Run with: pytest tests/test_cot_cache.py -v
+"""
+
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.cot_cache_service import COTCacheService
+from services.seasonal_cache_service import InMemoryCache
+
+
+class TestCOTCacheService:
+    """Tests for report-date keyed caching"""
+
+    def setup_method(self):
+        backend = InMemoryCache()
+        backend.clear()
+        self.cache = COTCacheService(backend)
+
+    def test_round_trip_normalizes_commodity(self):
+        self.cache.set("analysis", "2024-01-16", {"net": 1}, commodity="gold", weeks=52)
+        assert self.cache.get("analysis", "2024-01-16", commodity=" GOLD", weeks=52) == {
+            "net": 1
+        }
+        assert self.cache.get("analysis", "2024-01-16", commodity="GOLD", weeks=26) is None
+
+    def test_new_report_date_misses_old_entries(self):
+        self.cache.set("analysis", "2024-01-16", [1, 2], commodity="GOLD")
+        self.cache.mark_new_report("2024-01-23")
+        assert self.cache.latest_report_date(db=None) == "2024-01-23"
+        assert self.cache.get("analysis", "2024-01-23", commodity="GOLD") is None
+
+    def test_nothing_cached_without_report_date(self):
+        assert self.cache.set("analysis", "", {"net": 1}, commodity="GOLD") is False
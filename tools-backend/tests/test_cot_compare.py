@@ -0,0 +1,127 @@
+"""
+Unit tests for /cot/compare partial failures and per-commodity caching.
+
+The legacy report loader is stubbed and the COT cache uses the in-memory
+backend, so these tests run without a database.
+Run with: pytest tests/test_cot_compare.py -v
+"""
+
+from datetime import date, timedelta
+import os
+import sys
+
+import pytest
+from fastapi import HTTPException
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.v1.endpoints import cot as cot_endpoints
+from schemas.cot import COTComparisonRequest, COTPositionData
+from services.cot_cache_service import LEGACY, COTCacheService
+from services.seasonal_cache_service import InMemoryCache
+
+
+def reports(commercial_nets):
+    """Legacy reports, oldest first, with the given commercial nets"""
+    start = date(2025, 1, 7)
+    return [
+        COTPositionData(
+            report_date=start + timedelta(weeks=i),
+            commercial_long=50000 + net,
+            commercial_short=50000,
+            commercial_net=net,
+            non_commercial_long=40000,
+            non_commercial_short=40000 + net,
+            non_commercial_net=-net,
+            non_reportable_long=1000,
+            non_reportable_short=1000,
+            non_reportable_net=0,
+            open_interest=200000,
+        )
+        for i, net in enumerate(commercial_nets)
+    ]
+
+
+STORED = {
+    "GOLD": reports([-5000, -3000, 2000, 9000]),
+    "SILVER": reports([4000, 1000, -2000, -8000]),
+    "COPPER": reports([100, 200, 300, 200]),
+    # No reports to compare: _comparison_item fails
+    "BROKEN": [],
+}
+
+
+@pytest.fixture
+def loads(monkeypatch):
+    """Stub the batch loader and record which commodities it was asked for"""
+    cache = COTCacheService(InMemoryCache())
+    cache.mark_new_report("2025-12-02", LEGACY)
+    monkeypatch.setattr(cot_endpoints, "cot_cache", cache)
+
+    calls = []
+
+    def fetch_cot_data_batch(db, commodities, weeks):
+        calls.append(list(commodities))
+        return {c: STORED[c] for c in commodities if c in STORED}
+
+    monkeypatch.setattr(cot_endpoints, "fetch_cot_data_batch", fetch_cot_data_batch)
+    return calls
+
+
+async def compare(*commodities, weeks=52):
+    request = COTComparisonRequest(commodities=list(commodities), weeks=weeks)
+    return await cot_endpoints.compare_commodities(request, db=None)
+
+
+class TestPartialFailures:
+    """Tests for reporting failed commodities without failing the comparison"""
+
+    @pytest.mark.asyncio
+    async def test_missing_and_broken_commodities_are_reported(self, loads):
+        response = await compare("gold", "SILVER", "UNKNOWN", "BROKEN")
+
+        assert response.commodities == ["GOLD", "SILVER"]
+        assert set(response.errors) == {"UNKNOWN", "BROKEN"}
+        assert response.errors["UNKNOWN"] == "No COT data found for UNKNOWN"
+        assert {response.most_bullish, response.most_bearish} <= {"GOLD", "SILVER"}
+
+    @pytest.mark.asyncio
+    async def test_nothing_comparable_is_404(self, loads):
+        with pytest.raises(HTTPException) as error:
+            await compare("UNKNOWN", "BROKEN")
+        assert error.value.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_errors_default_to_empty(self, loads):
+        response = await compare("GOLD", "SILVER")
+        assert response.errors == {}
+
+
+class TestCompareItemCache:
+    """Tests for the per-commodity compare_item cache"""
+
+    @pytest.mark.asyncio
+    async def test_cached_items_are_not_reloaded(self, loads):
+        first = await compare("GOLD", "SILVER")
+        second = await compare("SILVER", "GOLD")
+
+        assert loads == [["GOLD", "SILVER"]]
+        assert {item.commodity: item for item in second.comparison_data} == {
+            item.commodity: item for item in first.comparison_data
+        }
+
+    @pytest.mark.asyncio
+    async def test_only_misses_are_loaded(self, loads):
+        await compare("GOLD", "SILVER")
+        await compare("GOLD", "COPPER")
+
+        assert loads == [["GOLD", "SILVER"], ["COPPER"]]
+
+    @pytest.mark.asyncio
+    async def test_failures_and_other_weeks_are_not_cached(self, loads):
+        await compare("GOLD", "UNKNOWN")
+        await compare("GOLD", "UNKNOWN")
+        await compare("GOLD", "SILVER", weeks=26)
+
+        assert loads == [["GOLD", "UNKNOWN"], ["UNKNOWN"], ["GOLD", "SILVER"]]
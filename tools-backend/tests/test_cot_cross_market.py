@@ -0,0 +1,79 @@
+"""
+Unit tests for cross-market speculative pressure.
+
+The windowed panel query is stubbed with an in-memory frame, so these tests
+run without a database.
+Run with: pytest tests/test_cot_cross_market.py -v
+"""
+
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import cot_advanced_service
+from services.cot_advanced_service import COTAdvancedService
+from services.cot_frame import NET_COLUMNS, REPORT_DATE, WEEK_RANK
+
+DATES = ["2024-12-17", "2024-12-10", "2024-12-03"]
+
+
+def market_rows(market_key, managed_money_longs):
+    """Weekly rows of one market, newest first"""
+    rows = []
+    for rank, (report_date, longs) in enumerate(zip(DATES, managed_money_longs), 1):
+        values = {column: 1000 for column in NET_COLUMNS}
+        values["Open_Interest_All"] = 100000
+        values["M_Money_Positions_Long_All"] = longs
+        rows.append(
+            {
+                "market_key": market_key,
+                REPORT_DATE: report_date,
+                **values,
+                "COMMODITY_SUBGROUP_NAME": "PRECIOUS METALS",
+                WEEK_RANK: rank,
+            }
+        )
+    return rows
+
+
+@pytest.fixture
+def panel(monkeypatch):
+    """GOLD and MICRO GOLD share Commodity_Name GOLD but are separate markets"""
+    frame = pd.DataFrame(
+        market_rows("GOLD", [30000, 20000, 10000])
+        + market_rows("MICRO GOLD", [1000, 2000, 3000])
+    )
+    partitions = []
+
+    def load_cot_panel(db, columns, weeks, partition="Commodity_Name"):
+        partitions.append(partition)
+        return frame
+
+    monkeypatch.setattr(cot_advanced_service, "load_cot_panel", load_cot_panel)
+    return partitions
+
+
+class TestCrossMarketPressure:
+    """Tests for ranking markets by speculative pressure"""
+
+    def test_markets_are_keyed_by_market_key(self, panel):
+        result = COTAdvancedService.analyze_cross_market_pressure(None, weeks=3)
+
+        assert panel == ["market_key"]
+        assert result.commodities_analyzed == 2
+        items = {item.commodity: item for item in result.most_crowded_long}
+        assert set(items) == {"GOLD", "MICRO GOLD"}
+
+    def test_percentiles_stay_within_each_market(self, panel):
+        result = COTAdvancedService.analyze_cross_market_pressure(None, weeks=3)
+
+        items = {item.commodity: item for item in result.most_crowded_long}
+        assert items["GOLD"].mm_percentile == 100.0
+        assert items["MICRO GOLD"].mm_percentile == pytest.approx(33.3)
+        assert result.rotation_into == ["GOLD"]
+        assert result.rotation_out_of == []
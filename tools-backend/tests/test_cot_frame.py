@@ -0,0 +1,162 @@
+"""
+Unit tests for the columnar COT frame.
+
+These tests run without a database.
+Run with: pytest tests/test_cot_frame.py -v
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.cot_frame import (
+    MANAGED_MONEY,
+    SWAP_DEALER,
+    COTContext,
+    COTFrame,
+    market_key_for,
+    rolling_rank,
+)
+
+COLUMNS = (
+    "Report_Date_as_YYYY_MM_DD",
+    "M_Money_Positions_Long_All",
+    "M_Money_Positions_Short_All",
+    "M_Money_Positions_Spread_All",
+    "Swap_Positions_Long_All",
+    "Swap_Positions_Short_All",
+    "Swap_Positions_Spread_All",
+    "Traders_M_Money_Long_All",
+    "Conc_Gross_LE_4_TDR_Long_All",
+)
+
+# Newest first, as returned by the query
+ROWS = [
+    ("2024-01-16", "120,000", "20,000", "10,000", "5,000", "5,000", "0", 0, 31.5),
+    ("2024-01-09", "100,000", "40,000", "5,000", None, "", "0", 50, None),
+    ("2024-01-02", "80,000", "60,000", "0", "1,000", "1,000", "bad", 40, 20.0),
+]
+
+
+class TestCOTFrame:
+    """Tests for parsing and derived series"""
+
+    def setup_method(self):
+        self.frame = COTFrame.from_rows(ROWS, COLUMNS)
+
+    def test_parses_comma_text_and_missing_values(self):
+        assert self.frame.dates.tolist() == ["2024-01-16", "2024-01-09", "2024-01-02"]
+        assert self.frame.long(MANAGED_MONEY).tolist() == [120000, 100000, 80000]
+        assert self.frame.long(SWAP_DEALER).tolist() == [5000, 0, 1000]
+        assert self.frame.spread(SWAP_DEALER).tolist() == [0, 0, 0]
+        assert self.frame.value("Conc_Gross_LE_4_TDR_Long_All", 1) == 0.0
+        assert isinstance(self.frame.value("M_Money_Positions_Long_All"), int)
+
+    def test_parses_string_dtype_text(self):
+        """pandas 3 infers the str dtype for text columns"""
+        with pd.option_context("future.infer_string", True):
+            frame = COTFrame.from_rows(ROWS, COLUMNS)
+        assert frame.long(MANAGED_MONEY).tolist() == [120000, 100000, 80000]
+        assert frame.long(SWAP_DEALER).tolist() == [5000, 0, 1000]
+
+    def test_net_and_gross(self):
+        assert self.frame.net(MANAGED_MONEY).tolist() == [100000, 60000, 20000]
+        assert self.frame.gross(MANAGED_MONEY).tolist() == [140000, 140000, 140000]
+
+    def test_spread_ratio(self):
+        ratios = self.frame.spread_ratio((MANAGED_MONEY, SWAP_DEALER))
+        assert np.isclose(ratios[0], 10000 / 160000 * 100)
+        assert ratios[2] == 0
+
+    def test_avg_position_treats_zero_traders_as_one(self):
+        assert self.frame.avg_position(MANAGED_MONEY, "Long").tolist() == [
+            120000.0,
+            2000.0,
+            2000.0,
+        ]
+
+    def test_percentiles(self):
+        nets = self.frame.net(MANAGED_MONEY)
+        assert COTFrame.percentile_rank(nets, nets[0]) == 100.0
+        assert COTFrame.percentile_rank(np.array([]), 1) == 50.0
+        assert COTFrame.percentile_ranks(nets).tolist() == [
+            COTFrame.percentile_rank(nets, x) for x in nets
+        ]
+
+    def test_change_in_clamps_to_oldest(self):
+        nets = self.frame.net(MANAGED_MONEY)
+        assert COTFrame.change_in(nets, 1) == 40000
+        assert COTFrame.change_in(nets, 4) == 80000
+
+    def test_memoized_net_percentiles_and_flow(self):
+        assert np.allclose(
+            self.frame.net_percentiles(MANAGED_MONEY), [100.0, 200 / 3, 100 / 3]
+        )
+        assert self.frame.net_percentiles(MANAGED_MONEY) is self.frame.net_percentiles(
+            MANAGED_MONEY
+        )
+        assert self.frame.net_flow(MANAGED_MONEY, 4) == 80000
+
+    def test_net_flows_of_every_week(self):
+        assert self.frame.net_flows(MANAGED_MONEY, 1).tolist() == [40000, 40000, 0]
+        assert self.frame.net_flows(MANAGED_MONEY, 4)[0] == self.frame.net_flow(
+            MANAGED_MONEY, 4
+        )
+
+
+class TestCOTContext:
+    """Tests for shared per-request history windows"""
+
+    def setup_method(self):
+        self.context = COTContext("GOLD", COTFrame.from_rows(ROWS, COLUMNS))
+
+    def test_window_is_latest_reports_and_memoized(self):
+        window = self.context.window(2)
+        assert window.dates.tolist() == ["2024-01-16", "2024-01-09"]
+        assert self.context.window(2) is window
+        assert window.net_percentiles(MANAGED_MONEY).tolist() == [100.0, 50.0]
+
+    def test_window_larger_than_history_is_whole_frame(self):
+        assert self.context.window(52) is self.context.frame
+
+
+class TestRollingRank:
+    """Tests for the rolling percentile / COT index kernel"""
+
+    def test_matches_brute_force_window(self):
+        rng = np.random.default_rng(7)
+        values = rng.integers(-50, 50, size=200)
+        window = 26
+
+        percentile, cot_index = rolling_rank(values, window)
+
+        for i in range(len(values)):
+            past = values[max(0, i - window + 1) : i + 1]
+            assert np.isclose(percentile[i], COTFrame.percentile_rank(past, values[i]))
+            low, high = past.min(), past.max()
+            expected = (values[i] - low) / (high - low) * 100 if high > low else 50.0
+            assert np.isclose(cot_index[i], expected)
+
+    def test_frame_series_is_newest_first(self):
+        frame = COTFrame.from_rows(ROWS, COLUMNS)
+        percentile, cot_index = frame.rolling_net_ranks(MANAGED_MONEY, 2)
+        # Net 20000 -> 60000 -> 100000 chronologically, always a new high
+        assert percentile.tolist() == [100.0, 100.0, 100.0]
+        assert cot_index.tolist() == [100.0, 100.0, 50.0]
+
+
+class TestMarketKey:
+    """Tests for commodity to market_key resolution"""
+
+    def test_mapped_names_keep_contract_sizes_apart(self):
+        assert market_key_for("gold") == "GOLD"
+        assert market_key_for(" Micro Gold ") == "MICRO GOLD"
+        assert market_key_for("crude") == "CRUDE OIL, LIGHT SWEET"
+
+    def test_unmapped_names_are_normalized(self):
+        assert market_key_for("  lean hogs") == "LEAN HOGS"
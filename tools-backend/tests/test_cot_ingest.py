@@ -0,0 +1,212 @@
+"""
+Unit tests for the incremental legacy COT ingester and symbol mapping.
+
+The FMP provider and the database session are in-memory fakes, so these
+tests run without a database or network access.
+Run with: pytest tests/test_cot_ingest.py -v
+"""
+
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+import importlib.util
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path for imports
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from services.cot_cache_service import POPULAR_COMMODITIES
+from services.cot_service import cot_symbol_for
+from services.data_providers import DataNotAvailableError
+
+# scripts/cron is not a package; load the script as a module
+spec = importlib.util.spec_from_file_location(
+    "cot_ingest_cron",
+    os.path.join(BACKEND_DIR, "scripts", "cron", "cot_ingest_cron.py"),
+)
+cot_ingest_cron = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(cot_ingest_cron)
+COTIngestion = cot_ingest_cron.COTIngestion
+
+
+def report(day, open_interest=1000):
+    return SimpleNamespace(
+        date=day,
+        name="GOLD (COMEX)",
+        sector="METALS",
+        exchange="COMEX",
+        open_interest=open_interest,
+        change_open_interest=10,
+        commercial_long=100,
+        commercial_short=200,
+        non_commercial_long=300,
+        non_commercial_short=150,
+        non_reportable_long=50,
+        non_reportable_short=60,
+    )
+
+
+class FakeProvider:
+    """FMP provider serving `reports` per symbol; missing symbols have no data"""
+
+    def __init__(self, reports):
+        self.reports = reports
+        self.calls = []
+        self.closed = False
+
+    async def get_cot_report(self, symbol, from_date, to_date):
+        self.calls.append((symbol, from_date, to_date))
+        if symbol == "ERR":
+            raise RuntimeError("upstream down")
+        if symbol not in self.reports:
+            raise DataNotAvailableError("FMP", f"No COT data for {symbol}")
+        return self.reports[symbol]
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeSession:
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def make_ingestion(reports, latest=None, dry_run=False):
+    """COTIngestion wired to fakes instead of settings and a database"""
+    ingestion = COTIngestion.__new__(COTIngestion)
+    ingestion.dry_run = dry_run
+    ingestion.rows_written = 0
+    ingestion.latest_report_date = None
+    ingestion.provider = FakeProvider(reports)
+    ingestion.Session = FakeSession
+    ingestion.get_latest_stored_dates = lambda symbols: dict(latest or {})
+    return ingestion
+
+
+class TestSymbolMapping:
+    """Tests for mapping commodity names to FMP symbols"""
+
+    def test_popular_commodities_all_map(self):
+        assert {c: cot_symbol_for(c) for c in POPULAR_COMMODITIES} == {
+            "GOLD": "GC",
+            "SILVER": "SI",
+            "CRUDE": "CL",
+            "COPPER": "HG",
+            "NATURAL GAS": "NG",
+        }
+
+    def test_spelling_variants(self):
+        assert cot_symbol_for("naturalgas") == "NG"
+        assert cot_symbol_for("MICRO GOLD") is None
+
+
+class TestFetchNewReports:
+    """Tests for parsing FMP reports into cot_report_legacy rows"""
+
+    @pytest.mark.asyncio
+    async def test_only_reports_after_latest_stored(self):
+        since = date(2025, 11, 25)
+        ingestion = make_ingestion(
+            {
+                "GC": [
+                    report(datetime(2025, 11, 25, 0, 0)),
+                    report(datetime(2025, 12, 2, 0, 0), open_interest=1234),
+                ]
+            }
+        )
+
+        rows = await ingestion.fetch_new_reports("GC", since)
+
+        assert ingestion.provider.calls[0][1] == since + timedelta(days=1)
+        assert rows == [
+            {
+                "symbol": "GC",
+                "report_date": date(2025, 12, 2),
+                "name": "GOLD (COMEX)",
+                "sector": "METALS",
+                "exchange": "COMEX",
+                "open_interest": 1234,
+                "change_open_interest": 10,
+                "commercial_long": 100,
+                "commercial_short": 200,
+                "non_commercial_long": 300,
+                "non_commercial_short": 150,
+                "non_reportable_long": 50,
+                "non_reportable_short": 60,
+            }
+        ]
+
+    @pytest.mark.asyncio
+    async def test_new_symbol_loads_initial_history(self):
+        ingestion = make_ingestion({"GC": [report(date(2025, 12, 2))]})
+
+        rows = await ingestion.fetch_new_reports("GC", None)
+
+        _, from_date, to_date = ingestion.provider.calls[0]
+        assert to_date - from_date == timedelta(
+            weeks=cot_ingest_cron.INITIAL_HISTORY_WEEKS
+        )
+        assert rows[0]["report_date"] == date(2025, 12, 2)
+
+    @pytest.mark.asyncio
+    async def test_up_to_date_and_unavailable(self):
+        ingestion = make_ingestion({})
+
+        assert await ingestion.fetch_new_reports("GC", date.today()) == []
+        assert ingestion.provider.calls == []
+        assert await ingestion.fetch_new_reports("GC", date(2025, 1, 1)) == []
+
+
+class TestRun:
+    """Tests for the concurrent fetch and single bulk upsert"""
+
+    @pytest.mark.asyncio
+    async def test_upserts_every_symbol_and_reports_failures(self, monkeypatch):
+        upserts = []
+
+        def bulk_upsert(session, target, rows):
+            upserts.append(rows)
+            return len(rows)
+
+        monkeypatch.setattr(cot_ingest_cron, "bulk_upsert", bulk_upsert)
+        ingestion = make_ingestion(
+            {
+                "GC": [report(date(2025, 12, 2))],
+                "SI": [report(date(2025, 11, 25)), report(date(2025, 12, 2))],
+            },
+            latest={"GC": date(2025, 11, 25)},
+        )
+
+        success = await ingestion.run(["GC", "SI", "ERR"])
+
+        assert success is False
+        assert len(upserts) == 1
+        assert sorted((r["symbol"], r["report_date"]) for r in upserts[0]) == [
+            ("GC", date(2025, 12, 2)),
+            ("SI", date(2025, 11, 25)),
+            ("SI", date(2025, 12, 2)),
+        ]
+        assert ingestion.rows_written == 3
+        assert ingestion.latest_report_date == date(2025, 12, 2)
+        assert ingestion.provider.closed
+
+    @pytest.mark.asyncio
+    async def test_dry_run_writes_nothing(self, monkeypatch):
+        monkeypatch.setattr(
+            cot_ingest_cron,
+            "bulk_upsert",
+            lambda *args: pytest.fail("dry run must not write"),
+        )
+        ingestion = make_ingestion({"GC": [report(date(2025, 12, 2))]}, dry_run=True)
+
+        assert await ingestion.run(["GC"]) is True
+        assert ingestion.rows_written == 0
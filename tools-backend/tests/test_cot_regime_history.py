@@ -0,0 +1,149 @@
+"""
+Unit tests for vectorized COT ML regime classification.
+
+These tests build frames in memory and run without a database.
+Run with: pytest tests/test_cot_regime_history.py -v
+"""
+
+import os
+import sys
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.cot_advanced_service import ML_REGIME_COLUMNS, COTAdvancedService
+from services.cot_frame import COTContext, COTFrame, REPORT_DATE
+from services import cot_regime_history_service as history_service
+from services.cot_regime_history_service import REFRESH_WEEKS, COTRegimeHistoryService
+
+COLUMNS = (REPORT_DATE,) + ML_REGIME_COLUMNS
+
+
+def make_frame(weeks: int) -> COTFrame:
+    """Managed money net swinging through long and short extremes"""
+    rng = np.random.default_rng(3)
+    rows = []
+    for i in range(weeks):
+        values = {column: int(rng.integers(1, 1000)) for column in ML_REGIME_COLUMNS}
+        values["Open_Interest_All"] = 100000
+        values["M_Money_Positions_Long_All"] = int(30000 + 20000 * np.sin(i / 5))
+        values["M_Money_Positions_Short_All"] = 30000
+        values["Conc_Gross_LE_4_TDR_Long_All"] = 20.0 + i % 50
+        values["Conc_Gross_LE_4_TDR_Short_All"] = 30.0
+        report_date = np.datetime64("2024-12-31") - np.timedelta64(7 * i, "D")
+        rows.append(
+            (str(report_date),) + tuple(values[column] for column in ML_REGIME_COLUMNS)
+        )
+    return COTFrame.from_rows(rows, COLUMNS)
+
+
+def features(**overrides) -> dict:
+    """Single-week feature matrix, neutral unless overridden"""
+    base = {
+        "mm_net_percentile": 50.0,
+        "commercial_net_percentile": 50.0,
+        "mm_4wk_flow": 0.0,
+        "commercial_4wk_flow": 0.0,
+        "concentration_score": 20.0,
+        "gross_positions_percentile": 50.0,
+    }
+    base.update(overrides)
+    return {name: np.array([value]) for name, value in base.items()}
+
+
+class TestClassifyMLRegimes:
+    """Tests for the vectorized rule cascade"""
+
+    def classify(self, **overrides):
+        regimes, confidences = COTAdvancedService.classify_ml_regimes(
+            features(**overrides)
+        )
+        return regimes[0], confidences[0]
+
+    def test_rules_in_order(self):
+        assert self.classify(mm_net_percentile=95.0)[0] == "mean_reversion"
+        assert self.classify(mm_net_percentile=87.0, mm_4wk_flow=-3.0)[0] == (
+            "capitulation"
+        )
+        assert self.classify(
+            commercial_net_percentile=80.0, mm_net_percentile=20.0
+        )[0] == "accumulation"
+        assert self.classify(
+            commercial_net_percentile=20.0, mm_net_percentile=65.0
+        )[0] == "distribution"
+        assert self.classify(mm_4wk_flow=3.0)[0] == "trend_following"
+        assert self.classify(
+            concentration_score=60.0, gross_positions_percentile=80.0
+        )[0] == "breakout_setup"
+        assert self.classify() == ("consolidation", 60.0)
+
+    def test_divergence_bonus_is_capped(self):
+        regime, confidence = self.classify(
+            mm_net_percentile=100.0, mm_4wk_flow=1.0, commercial_4wk_flow=-1.0
+        )
+        assert regime == "mean_reversion"
+        assert confidence == 95
+
+
+class TestRegimeHistory:
+    """Tests for weekly history rows"""
+
+    def test_latest_week_matches_single_week_classifier(self):
+        frame = make_frame(40)
+        rows = COTRegimeHistoryService.history_rows("GOLD", frame, 40, window=40)
+        current = COTAdvancedService.classify_ml_regime(
+            None, "GOLD", 40, COTContext("GOLD", frame)
+        )
+
+        assert len(rows) == 40
+        assert str(rows[0]["report_date"]) == frame.report_date()
+        assert rows[0]["regime"] == current.current_regime.primary_regime.value
+        assert rows[0]["confidence"] == round(
+            current.current_regime.primary_confidence, 1
+        )
+        assert rows[0]["mm_net_percentile"] == current.features.mm_net_percentile
+
+    def test_weeks_only_use_earlier_reports(self):
+        frame = make_frame(60)
+        full = COTRegimeHistoryService.history_rows("GOLD", frame, 30, window=20)
+        # Dropping the 10 newest reports leaves older weeks unchanged
+        older = COTRegimeHistoryService.history_rows(
+            "GOLD", COTFrame(frame.data.iloc[10:]), 20, window=20
+        )
+        assert full[10:30] == older
+
+
+class TestLoadHistory:
+    """Tests for choosing stored or computed history"""
+
+    def patch(self, monkeypatch, stored_weeks, reports):
+        frame = make_frame(reports)
+        stored = COTRegimeHistoryService.history_rows("GOLD", frame, stored_weeks)
+        monkeypatch.setattr(
+            COTRegimeHistoryService,
+            "stored_rows",
+            staticmethod(lambda db, market_key, weeks, window: stored[:weeks]),
+        )
+        monkeypatch.setattr(
+            history_service,
+            "load_commodity_frame",
+            lambda db, commodity, columns, weeks: COTFrame(frame.data.iloc[:weeks]),
+        )
+
+    def test_full_stored_history_is_served(self, monkeypatch):
+        self.patch(monkeypatch, stored_weeks=60, reports=120)
+        rows, source = COTRegimeHistoryService.load_history(None, "GOLD", 30)
+        assert source == "stored" and len(rows) == 30
+
+    def test_refresh_only_history_is_computed(self, monkeypatch):
+        # /cron/cot-cache stores only the latest REFRESH_WEEKS
+        self.patch(monkeypatch, stored_weeks=REFRESH_WEEKS, reports=120)
+        rows, source = COTRegimeHistoryService.load_history(None, "GOLD", 30)
+        assert source == "computed" and len(rows) == 30
+
+    def test_stored_history_covering_every_report_is_served(self, monkeypatch):
+        self.patch(monkeypatch, stored_weeks=20, reports=20)
+        rows, source = COTRegimeHistoryService.load_history(None, "GOLD", 30)
+        assert source == "stored" and len(rows) == 20
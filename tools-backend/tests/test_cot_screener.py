@@ -0,0 +1,59 @@
+"""
+Unit tests for COT screener feature extraction.
+
+These tests build frames in memory and run without a database.
+Run with: pytest tests/test_cot_screener.py -v
+"""
+
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.cot_frame import MANAGED_MONEY, COTContext, COTFrame, REPORT_DATE
+from services.cot_screener_service import (
+    MARKET_INFO_COLUMNS,
+    SCREENER_COLUMNS,
+    COTScreenerService,
+)
+
+COLUMNS = (REPORT_DATE,) + MARKET_INFO_COLUMNS + SCREENER_COLUMNS
+
+
+def make_context(weeks: int) -> COTContext:
+    """Market whose managed money longs grow by 1,000 contracts a week"""
+    rows = []
+    for i in range(weeks):
+        values = {column: 100 for column in SCREENER_COLUMNS}
+        values["Open_Interest_All"] = 100000
+        values["M_Money_Positions_Long_All"] = 50000 - i * 1000
+        values["M_Money_Positions_Short_All"] = 10000
+        report_date = f"2024-{12 - i // 4:02d}-{28 - (i % 4) * 7:02d}"
+        rows.append(
+            (report_date, "GOLD", "GOLD - CMX", "PM")
+            + tuple(values[column] for column in SCREENER_COLUMNS)
+        )
+    return COTContext("GOLD", COTFrame.from_rows(rows, COLUMNS))
+
+
+class TestMarketFeatures:
+    """Tests for one market's screener row"""
+
+    def test_latest_positioning_and_flow(self):
+        context = make_context(12)
+        features = COTScreenerService.market_features(context)
+
+        assert features["market_key"] == "GOLD"
+        assert features["weeks_analyzed"] == 12
+        assert features["mm_net"] == 40000
+        assert features["mm_percentile"] == 100.0
+        assert features["mm_flow_4w"] == context.frame.net_flow(MANAGED_MONEY, 4)
+        assert features["mm_flow_4w_pct_oi"] == 4.0
+        assert features["ml_regime"] == "mean_reversion"
+
+    def test_short_history_has_no_regime(self):
+        features = COTScreenerService.market_features(make_context(4))
+        assert features["ml_regime"] is None
+        assert features["ml_regime_confidence"] is None
+        assert features["squeeze_risk_score"] >= 0
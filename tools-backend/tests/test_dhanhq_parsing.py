@@ -0,0 +1,124 @@
+"""
+Unit tests for vectorized DhanHQ chart parsing.
+
+These tests run without network access or API keys.
+Run with: pytest tests/test_dhanhq_parsing.py -v
+"""
+
+from datetime import date
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.data_providers import DataNotAvailableError, HistoricalFrame
+from services.data_providers.dhanhq_provider import DhanHQProvider
+
+
+# 2024-01-01 09:00 IST and 2024-01-02 09:00 IST as Unix epochs
+EPOCHS = [1704079800, 1704166200]
+
+
+@pytest.fixture
+def provider():
+    # Parsing needs no SDK client or credentials
+    return DhanHQProvider.__new__(DhanHQProvider)
+
+
+def chart_response(**overrides):
+    data = {
+        "open": [62000.0, 62100.0],
+        "high": [62500.0, 62600.0],
+        "low": [61900.0, 62000.0],
+        "close": [62400.0, 62550.0],
+        "volume": [1200, 0],
+        "timestamp": EPOCHS,
+    }
+    data.update(overrides)
+    return {"status": "success", "data": data}
+
+
+class TestDhanHQFrameParsing:
+    """Tests for the array -> HistoricalFrame fast path"""
+
+    def test_arrays_become_ist_columns(self, provider):
+        frame = provider._frame_from_response(
+            chart_response(), "goldm", date(2024, 1, 1), date(2024, 1, 2), "1d"
+        )
+
+        assert isinstance(frame, HistoricalFrame)
+        assert len(frame) == 2
+        assert frame.symbol == "GOLDM"
+        assert frame.timestamps[0] == np.datetime64("2024-01-01T09:00:00")
+        assert frame.close.dtype == np.float64
+        assert frame.close.tolist() == [62400.0, 62550.0]
+
+    def test_mismatched_lengths_rejected(self, provider):
+        with pytest.raises(DataNotAvailableError):
+            provider._frame_from_response(
+                chart_response(close=[62400.0]),
+                "GOLDM",
+                date(2024, 1, 1),
+                date(2024, 1, 2),
+                "1d",
+            )
+
+    def test_legacy_candle_list(self, provider):
+        result = {
+            "data": [
+                {
+                    "start_Time": "2024-01-01 09:00:00",
+                    "open": 1,
+                    "high": 2,
+                    "low": 0.5,
+                    "close": 1.5,
+                    "volume": 10,
+                }
+            ]
+        }
+        frame = provider._frame_from_response(
+            result, "GOLDM", date(2024, 1, 1), date(2024, 1, 1), "1m"
+        )
+
+        assert frame.timestamps[0] == np.datetime64("2024-01-01T09:00:00")
+        assert frame.volume.tolist() == [10.0]
+
+    def test_to_historical_data_matches_row_format(self, provider):
+        frame = provider._frame_from_response(
+            chart_response(), "GOLDM", date(2024, 1, 1), date(2024, 1, 2), "1d"
+        )
+        history = frame.to_historical_data()
+
+        assert [p.date for p in history.data_points] == [
+            date(2024, 1, 1),
+            date(2024, 1, 2),
+        ]
+        assert history.data_points[0].volume == 1200
+        assert history.data_points[1].volume is None
+
+    def test_concat_dedupes_overlapping_chunks(self, provider):
+        first = provider._frame_from_response(
+            chart_response(), "GOLDM", date(2024, 1, 1), date(2024, 1, 2), "1d"
+        )
+        second = provider._frame_from_response(
+            chart_response(
+                open=[1.0],
+                high=[1.0],
+                low=[1.0],
+                close=[99.0],
+                volume=[5],
+                timestamp=EPOCHS[1:],
+            ),
+            "GOLDM",
+            date(2024, 1, 2),
+            date(2024, 1, 2),
+            "1d",
+        )
+
+        merged = HistoricalFrame.concat([first, second])
+        assert len(merged) == 2
+        assert merged.close.tolist() == [62400.0, 99.0]
@@ -0,0 +1,174 @@
+"""
+Unit tests for chart series downsampling.
+
+These tests run without a database.
+Run with: pytest tests/test_downsampling.py -v
+"""
+
+import math
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.downsampling import (
+    M4,
+    MINMAX,
+    aggregate_candles,
+    downsample_indices,
+    lttb_indices,
+    m4_indices,
+    minmax_indices,
+)
+
+
+def loop_lttb(y, threshold):
+    """Reference LTTB over Python lists"""
+    n = len(y)
+    every = (n - 2) / (threshold - 2)
+    sampled = [0]
+    a = 0
+    for i in range(threshold - 2):
+        avg_start = int(math.floor((i + 1) * every)) + 1
+        avg_end = min(int(math.floor((i + 2) * every)) + 1, n)
+        if i == threshold - 3:
+            avg_x, avg_y = n - 1, y[-1]
+        else:
+            count = avg_end - avg_start
+            avg_x = sum(range(avg_start, avg_end)) / count
+            avg_y = sum(y[avg_start:avg_end]) / count
+
+        start = int(math.floor(i * every)) + 1
+        end = int(math.floor((i + 1) * every)) + 1
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((a - avg_x) * (y[j] - y[a]) - (a - j) * (avg_y - y[a]))
+            if area > best_area:
+                best, best_area = j, area
+        sampled.append(best)
+        a = best
+    sampled.append(n - 1)
+    return sampled
+
+
+def random_walk(n, seed=1):
+    return np.cumsum(np.random.default_rng(seed).normal(0, 1, n))
+
+
+class TestLTTB:
+    """Tests for Largest Triangle Three Buckets"""
+
+    def test_matches_reference_loop(self):
+        y = random_walk(1000)
+        assert lttb_indices(y, 97).tolist() == loop_lttb(y.tolist(), 97)
+
+    def test_keeps_endpoints_and_order(self):
+        y = random_walk(5000, seed=2)
+        keep = lttb_indices(y, 500)
+        assert len(keep) == 500
+        assert keep[0] == 0 and keep[-1] == 4999
+        assert np.all(np.diff(keep) > 0)
+
+    def test_uses_positions_when_given(self):
+        y = random_walk(300, seed=3)
+        x = np.cumsum(np.random.default_rng(4).uniform(1, 100, 300))
+        keep = lttb_indices(y, 50, x)
+        assert len(keep) == 50
+        assert np.all(np.diff(keep) > 0)
+
+
+class TestMinMaxAndM4:
+    """Tests for the extreme-preserving variants"""
+
+    def test_minmax_keeps_spikes(self):
+        y = random_walk(10000, seed=5)
+        y[1234] = 1e6
+        y[8765] = -1e6
+        keep = minmax_indices(y, 200)
+        assert len(keep) <= 200
+        assert {0, 1234, 8765, 9999} <= set(keep.tolist())
+
+    def test_m4_keeps_bucket_extremes(self):
+        y = random_walk(4000, seed=6)
+        keep = m4_indices(y, 400)
+        assert len(keep) <= 400
+        assert np.all(np.diff(keep) > 0)
+        # Every 40-point bucket keeps its first, last, min and max
+        bucket = y[:40]
+        assert {0, 39, int(bucket.argmin()), int(bucket.argmax())} <= set(
+            keep.tolist()
+        )
+
+
+class TestDownsampleIndices:
+    """Tests for method dispatch"""
+
+    def test_short_series_and_no_budget_are_whole(self):
+        y = random_walk(100)
+        assert downsample_indices(y, 500).tolist() == list(range(100))
+        assert downsample_indices(y, None, M4).tolist() == list(range(100))
+
+    def test_dispatch(self):
+        y = random_walk(2000)
+        assert downsample_indices(y, 100, MINMAX).tolist() == minmax_indices(
+            y, 100
+        ).tolist()
+
+    def test_unknown_method(self):
+        with pytest.raises(ValueError):
+            downsample_indices(random_walk(10), 5, "nth")
+
+
+def make_candles(n, seed=7):
+    close = 100 + random_walk(n, seed)
+    return [
+        {
+            "date": f"day-{i:05d}",
+            "open": float(close[i - 1] if i else close[0]),
+            "high": float(close[i] + 1),
+            "low": float(close[i] - 1),
+            "close": float(close[i]),
+            "volume": 10.0,
+            "usdinr": 83.0,
+        }
+        for i in range(n)
+    ]
+
+
+class TestAggregateCandles:
+    """Tests for merging OHLC candles per bucket"""
+
+    def test_buckets_keep_wicks_and_volume(self):
+        candles = make_candles(1000)
+        candles[123]["high"] = 1e6
+        candles[877]["low"] = -1e6
+
+        merged = aggregate_candles(candles, 100)
+
+        assert len(merged) == 100
+        assert max(c["high"] for c in merged) == 1e6
+        assert min(c["low"] for c in merged) == -1e6
+        assert sum(c["volume"] for c in merged) == 10.0 * 1000
+        assert merged[0]["open"] == candles[0]["open"]
+        assert merged[0]["close"] == candles[9]["close"]
+        assert merged[-1]["close"] == candles[-1]["close"]
+
+    def test_anchor_dates_start_buckets(self):
+        candles = make_candles(1000)
+        anchors = ["day-00123", "day-00555"]
+
+        merged = aggregate_candles(candles, 100, anchors)
+
+        dates = [c["date"] for c in merged]
+        assert set(anchors) <= set(dates)
+        assert dates == sorted(dates)
+        assert len(merged) <= 102
+
+    def test_short_series_and_no_budget_are_whole(self):
+        candles = make_candles(50)
+        assert aggregate_candles(candles, 100) is candles
+        assert aggregate_candles(candles, None) is candles
@@ -0,0 +1,143 @@
+"""
+Unit tests for the vectorized pivot accuracy backtest.
+
+These tests run without a database.
+Run with: pytest tests/test_pivot_accuracy.py -v
+"""
+
+import os
+import sys
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.pivot_service import ACCURACY_LEVELS, PivotService
+
+
+def random_bars(n: int, seed: int = 3):
+    rng = np.random.default_rng(seed)
+    close = 2000 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    high = close * (1 + rng.uniform(0, 0.012, n))
+    low = close * (1 - rng.uniform(0, 0.012, n))
+    return np.round(high, 2), np.round(low, 2), np.round(close, 2)
+
+
+def loop_accuracy(high, low, close, tolerance_percent):
+    """Per-day reference using the scalar calculators"""
+    tested = dict.fromkeys(ACCURACY_LEVELS, 0)
+    respected = dict.fromkeys(ACCURACY_LEVELS, 0)
+    rejections = {name: [] for name in ACCURACY_LEVELS}
+    classifications = {"narrow": 0, "wide": 0, "normal": 0}
+
+    for i in range(len(close) - 1):
+        h, lo, c = high[i], low[i], close[i]
+        cpr = PivotService.calculate_cpr(h, lo, c)
+        floor = PivotService.calculate_floor_pivots(h, lo, c)
+        fib = PivotService.calculate_fibonacci(h, lo, "up")
+        classifications[cpr["classification"]] += 1
+        levels = {
+            "R3": floor["r3"],
+            "R2": floor["r2"],
+            "R1": floor["r1"],
+            "CPR_TC": cpr["tc"],
+            "CPR_Pivot": cpr["pivot"],
+            "CPR_BC": cpr["bc"],
+            "S1": floor["s1"],
+            "S2": floor["s2"],
+            "S3": floor["s3"],
+            "Fib_618": fib["level_618"],
+        }
+        ch, cl, cc = high[i + 1], low[i + 1], close[i + 1]
+        for name, level in levels.items():
+            tolerance = level * (tolerance_percent / 100)
+            below = ch >= level - tolerance and cl < level
+            above = cl <= level + tolerance and ch > level
+            if not (below or above):
+                continue
+            tested[name] += 1
+            if below and cc < level:
+                respected[name] += 1
+                rejections[name].append((level - cc) / level * 100)
+            elif not below and cc > level:
+                respected[name] += 1
+                rejections[name].append((cc - level) / level * 100)
+
+    return tested, respected, rejections, classifications
+
+
+class TestLevelColumns:
+    """Tests for the per-bar level matrix"""
+
+    def test_matches_scalar_calculators(self):
+        high, low, close = random_bars(50)
+        levels, width_percent = PivotService.level_columns(high, low, close)
+
+        cpr = PivotService.calculate_cpr(high[7], low[7], close[7])
+        floor = PivotService.calculate_floor_pivots(high[7], low[7], close[7])
+        fib = PivotService.calculate_fibonacci(high[7], low[7], "up")
+        row = dict(zip(ACCURACY_LEVELS, levels[7]))
+
+        assert np.isclose(row["R3"], floor["r3"])
+        assert np.isclose(row["S2"], floor["s2"])
+        assert np.isclose(row["CPR_TC"], cpr["tc"])
+        assert np.isclose(row["Fib_618"], fib["level_618"])
+        assert np.isclose(round(width_percent[7], 3), cpr["width_percent"])
+
+
+class TestBacktestPivotAccuracy:
+    """Tests for the broadcast accuracy backtest"""
+
+    def test_matches_per_day_loop_for_every_tolerance(self):
+        high, low, close = random_bars(600)
+        tolerances = (0.1, 0.3, 0.5)
+
+        results = PivotService.backtest_pivot_accuracy(high, low, close, tolerances)
+
+        for tolerance in tolerances:
+            tested, respected, rejections, classes = loop_accuracy(
+                high.tolist(), low.tolist(), close.tolist(), tolerance
+            )
+            result = results[tolerance]
+            assert result["total_sessions_analyzed"] == 599
+            assert result["cpr_statistics"]["narrow_cpr_days"] == classes["narrow"]
+            assert result["cpr_statistics"]["wide_cpr_days"] == classes["wide"]
+            for name in ACCURACY_LEVELS:
+                stats = result["level_accuracy"][name]
+                assert stats["times_tested"] == tested[name]
+                assert stats["times_respected"] == respected[name]
+                expected = (
+                    sum(rejections[name]) / len(rejections[name])
+                    if rejections[name]
+                    else 0
+                )
+                assert np.isclose(
+                    stats["avg_rejection_distance"], round(expected, 2)
+                )
+
+    def test_wider_tolerance_tests_more_often(self):
+        high, low, close = random_bars(300, seed=11)
+        results = PivotService.backtest_pivot_accuracy(
+            high, low, close, (0.1, 1.0)
+        )
+        narrow = sum(
+            s["times_tested"] for s in results[0.1]["level_accuracy"].values()
+        )
+        wide = sum(s["times_tested"] for s in results[1.0]["level_accuracy"].values())
+        assert wide >= narrow
+
+    def test_dict_wrapper_and_short_history(self):
+        high, low, close = random_bars(40)
+        rows = [
+            {"date": i, "high": h, "low": lo, "close": c}
+            for i, (h, lo, c) in enumerate(zip(high, low, close))
+        ]
+
+        result = PivotService.calculate_pivot_accuracy(rows, 0.3)
+
+        assert result == PivotService.backtest_pivot_accuracy(
+            high, low, close, (0.3,)
+        )[0.3]
+        assert set(result["best_performing_levels"]) <= set(ACCURACY_LEVELS)
+        assert "error" in PivotService.calculate_pivot_accuracy(rows[:1])
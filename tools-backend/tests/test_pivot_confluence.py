@@ -0,0 +1,110 @@
+"""
+Unit tests for multi-timeframe pivot levels and confluence zones.
+
+These tests run without a database.
+Run with: pytest tests/test_pivot_confluence.py -v
+"""
+
+import os
+import sys
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.pivot_service import (
+    ACCURACY_LEVELS,
+    CONFLUENCE_THRESHOLD,
+    PivotService,
+)
+
+
+def level(name, value, timeframe):
+    return {"name": name, "value": value, "timeframe": timeframe, "type": "cpr"}
+
+
+class TestTimeframeOHLC:
+    """Tests for aggregating one daily series into every timeframe"""
+
+    def test_aggregates_trailing_bars(self):
+        high = np.arange(1.0, 31.0) + 10
+        low = np.arange(1.0, 31.0)
+        close = np.arange(1.0, 31.0) + 5
+
+        periods = PivotService.timeframe_ohlc(high, low, close)
+
+        assert periods["daily"] == {
+            "high": 40.0,
+            "low": 30.0,
+            "close": 35.0,
+            "index": 29,
+        }
+        assert periods["weekly"]["high"] == 40.0
+        assert periods["weekly"]["low"] == 26.0
+        assert periods["monthly"]["low"] == 9.0
+        assert periods["monthly"]["close"] == 35.0
+
+    def test_levels_match_scalar_calculators(self):
+        periods = {
+            "daily": {"high": 2050.0, "low": 2010.0, "close": 2040.0},
+            "weekly": {"high": 2080.0, "low": 1990.0, "close": 2040.0},
+        }
+
+        levels = {
+            item["name"]: item for item in PivotService.timeframe_levels(periods)
+        }
+
+        assert len(levels) == 2 * len(ACCURACY_LEVELS)
+        floor = PivotService.calculate_floor_pivots(2080.0, 1990.0, 2040.0)
+        cpr = PivotService.calculate_cpr(2050.0, 2010.0, 2040.0)
+        assert np.isclose(levels["W_R1"]["value"], floor["r1"])
+        assert np.isclose(levels["D_CPR_TC"]["value"], cpr["tc"])
+        assert levels["W_S3"]["type"] == "support"
+        assert levels["D_Fib_618"]["timeframe"] == "daily"
+
+
+class TestConfluenceZones:
+    """Tests for the sorted sweep confluence finder"""
+
+    def test_groups_close_levels_of_different_timeframes(self):
+        levels = [
+            level("D_R1", 2000.0, "daily"),
+            level("W_R2", 2003.0, "weekly"),
+            level("M_S1", 2004.0, "monthly"),
+            level("D_S1", 1900.0, "daily"),
+            level("D_S2", 1901.0, "daily"),
+            level("W_S3", 1800.0, "weekly"),
+        ]
+
+        zones = PivotService.find_confluence_zones(levels)
+
+        # Same-timeframe neighbours alone are no confluence
+        assert len(zones) == 1
+        assert zones[0]["strength"] == 3
+        assert zones[0]["description"] == "D_R1 + W_R2 + M_S1"
+        assert zones[0]["value"] == round((2000 + 2003 + 2004) / 3, 2)
+
+    def test_zones_are_disjoint_and_within_threshold(self):
+        rng = np.random.default_rng(5)
+        timeframes = ("daily", "weekly", "monthly")
+        levels = [
+            level(f"L{i}", float(value), timeframes[i % 3])
+            for i, value in enumerate(rng.uniform(1900, 2100, 300))
+        ]
+
+        zones = PivotService.find_confluence_zones(levels)
+
+        seen = set()
+        for zone in zones:
+            values = [item["value"] for item in zone["levels"]]
+            assert max(values) <= min(values) * (1 + CONFLUENCE_THRESHOLD)
+            assert len({item["timeframe"] for item in zone["levels"]}) > 1
+            names = {item["name"] for item in zone["levels"]}
+            assert not names & seen
+            seen |= names
+        strengths = [zone["strength"] for zone in zones]
+        assert strengths == sorted(strengths, reverse=True)
+
+    def test_no_levels(self):
+        assert PivotService.find_confluence_zones([]) == []
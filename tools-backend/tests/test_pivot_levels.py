@@ -0,0 +1,150 @@
+"""
+Unit tests for stored pivot level rows and the sorted nearest-level search.
+
+These tests run without a database.
+Run with: pytest tests/test_pivot_levels.py -v
+"""
+
+from datetime import date, timedelta
+from types import SimpleNamespace
+import os
+import sys
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.pivot_level_service import (
+    PivotLevelService,
+    PivotLevelStore,
+    last_completed_session,
+)
+from services.pivot_service import PivotService
+
+CLOSE_DATE = date(2025, 12, 5)
+
+PERIODS = {
+    "daily": {"high": 2050.0, "low": 2010.0, "close": 2040.0, "date": CLOSE_DATE},
+    "weekly": {"high": 2080.0, "low": 1990.0, "close": 2040.0, "date": CLOSE_DATE},
+    "monthly": {"high": 2100.0, "low": 1900.0, "close": 2040.0, "date": CLOSE_DATE},
+}
+
+
+class TestLevelRows:
+    """Tests for pivot_levels rows"""
+
+    def test_rows_match_scalar_calculators(self):
+        rows = PivotLevelService.level_rows("gold", "comex", PERIODS)
+
+        assert [row["timeframe"] for row in rows] == ["daily", "weekly", "monthly"]
+        for row in rows:
+            period = PERIODS[row["timeframe"]]
+            cpr = PivotService.calculate_cpr(
+                period["high"], period["low"], period["close"]
+            )
+            floor = PivotService.calculate_floor_pivots(
+                period["high"], period["low"], period["close"]
+            )
+            assert row["symbol"] == "GOLD" and row["exchange"] == "COMEX"
+            assert row["period_date"] == CLOSE_DATE
+            assert np.isclose(row["tc"], cpr["tc"])
+            assert np.isclose(row["s3"], floor["s3"])
+            assert row["width_percent"] == cpr["width_percent"]
+            assert row["classification"] == cpr["classification"]
+
+
+class TestNearestSortedLevel:
+    """Tests for the binary search nearest-level lookup"""
+
+    def test_matches_linear_scan(self):
+        rng = np.random.default_rng(9)
+        levels = {f"L{i}": float(v) for i, v in enumerate(rng.uniform(90, 110, 12))}
+        names, values = PivotService.sorted_levels(levels)
+
+        for price in rng.uniform(85, 115, 200):
+            name, value, distance = PivotService.nearest_sorted_level(
+                names, values, price
+            )
+            expected = min(abs(price - v) for v in levels.values())
+            assert levels[name] == value
+            assert np.isclose(distance, round(expected, 2))
+
+    def test_outside_range_and_empty(self):
+        names, values = PivotService.sorted_levels({"S1": 95.0, "R1": 105.0})
+
+        assert PivotService.nearest_sorted_level(names, values, 50.0)[0] == "S1"
+        assert PivotService.nearest_sorted_level(names, values, 500.0)[0] == "R1"
+        assert PivotService.find_nearest_level(104.0, {"S1": 95.0, "R1": 105.0}) == (
+            "R1",
+            105.0,
+            1.0,
+        )
+        assert PivotService.nearest_sorted_level([], np.array([]), 1.0)[0] is None
+
+
+class FakeSession:
+    """Session whose pivot_levels query returns `records` or raises"""
+
+    def __init__(self, records=None, error=None):
+        self.records, self.error = records, error
+        self.rolled_back = False
+
+    def query(self, model):
+        if self.error:
+            raise self.error
+        return self
+
+    def distinct(self, *columns):
+        return self
+
+    def order_by(self, *columns):
+        return self
+
+    def all(self):
+        return self.records
+
+    def rollback(self):
+        self.rolled_back = True
+
+
+def stored_records(period_date):
+    periods = {tf: dict(PERIODS[tf], date=period_date) for tf in PERIODS}
+    return [
+        SimpleNamespace(**row)
+        for row in PivotLevelService.level_rows("GOLD", "COMEX", periods)
+    ]
+
+
+class TestPivotLevelStore:
+    """Tests for serving, expiring and failing over stored periods"""
+
+    def test_last_completed_session_skips_weekends(self):
+        assert last_completed_session(date(2025, 12, 9)) == date(2025, 12, 8)
+        assert last_completed_session(date(2025, 12, 8)) == date(2025, 12, 5)
+        assert last_completed_session(date(2025, 12, 7)) == date(2025, 12, 5)
+
+    def test_current_periods_are_served(self):
+        store = PivotLevelStore()
+        assert store.ensure_loaded(FakeSession(stored_records(date.today())))
+
+        periods = store.periods("gold", "comex")
+        assert list(periods) == ["daily", "weekly", "monthly"]
+        assert store.nearest_level("GOLD", "COMEX", "daily", 2041.0) is not None
+
+    def test_stale_periods_fall_back(self):
+        store = PivotLevelStore()
+        stale = last_completed_session() - timedelta(days=1)
+        store.ensure_loaded(FakeSession(stored_records(stale)))
+
+        assert store.periods("GOLD", "COMEX") is None
+        assert store.nearest_level("GOLD", "COMEX", "daily", 2041.0) is None
+
+    def test_load_failure_uses_live_path_and_retries_later(self):
+        store = PivotLevelStore()
+        db = FakeSession(error=RuntimeError("relation does not exist"))
+
+        assert store.ensure_loaded(db) is False
+        assert db.rolled_back
+        # Within the retry interval the database is not queried again
+        assert store.ensure_loaded(FakeSession(stored_records(date.today()))) is False
@@ -0,0 +1,129 @@
+"""
+Unit tests for the live price stream hub.
+
+Upstream quotes are served from a dictionary, so these tests run without
+network access or API keys.
+Run with: pytest tests/test_price_stream.py -v
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.price_stream_service import USDINR_FEED, PriceStreamHub
+
+QUOTES = {
+    "comex:GOLD": 2000.0,
+    "comex:SILVER": 25.0,
+    USDINR_FEED: 83.0,
+}
+
+
+class FakeHub(PriceStreamHub):
+    """Hub whose feeds read QUOTES; MCX is unconfigured and uses estimates"""
+
+    def __init__(self):
+        super().__init__(poll_interval=0.01)
+        self.quotes = dict(QUOTES)
+
+    async def _fetch_quote(self, feed):
+        return self.quotes.get(feed)
+
+
+async def next_tick(queue, symbol):
+    """Next tick for a symbol, skipping ticks published before every feed"""
+    while True:
+        tick = await asyncio.wait_for(queue.get(), timeout=1.0)
+        if tick["symbol"] == symbol:
+            return tick
+
+
+class TestSubscriptions:
+    """Tests for feed lifecycle on subscribe and unsubscribe"""
+
+    @pytest.mark.asyncio
+    async def test_feeds_start_and_stop_with_subscribers(self):
+        hub = FakeHub()
+        first = await hub.subscribe(["GOLD"])
+        second = await hub.subscribe(["GOLD"])
+
+        assert set(hub.status()["active_feeds"]) == {
+            "comex:GOLD",
+            "mcx:GOLD",
+            USDINR_FEED,
+        }
+        assert hub.subscriber_count == 2
+
+        hub.unsubscribe(first, ["GOLD"])
+        assert "comex:GOLD" in hub.status()["active_feeds"]
+
+        hub.unsubscribe(second, ["GOLD"])
+        assert hub.status()["active_feeds"] == []
+        assert hub.subscriber_count == 0
+        await hub.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_shared_feed_survives_other_symbol_leaving(self):
+        hub = FakeHub()
+        gold = await hub.subscribe(["GOLD"])
+        silver = await hub.subscribe(["SILVER"])
+
+        hub.unsubscribe(silver, ["SILVER"])
+
+        assert set(hub.status()["active_feeds"]) == {
+            "comex:GOLD",
+            "mcx:GOLD",
+            USDINR_FEED,
+        }
+        hub.unsubscribe(gold, ["GOLD"])
+        await hub.shutdown()
+
+
+class TestFanOut:
+    """Tests for tick computation and broadcast"""
+
+    @pytest.mark.asyncio
+    async def test_ticks_reach_every_subscriber_of_the_symbol(self):
+        hub = FakeHub()
+        first = await hub.subscribe(["GOLD"])
+        second = await hub.subscribe(["GOLD", "SILVER"])
+        silver_only = await hub.subscribe(["SILVER"])
+
+        gold_ticks = [await next_tick(q, "GOLD") for q in (first, second)]
+        silver = await next_tick(silver_only, "SILVER")
+
+        assert gold_ticks[0]["fair_value_inr"] == gold_ticks[1]["fair_value_inr"]
+        assert gold_ticks[0]["data_sources"]["mcx"] == "estimated"
+        assert gold_ticks[0]["contract_size_grams"] == 10
+        assert silver["contract_size_grams"] == 1000
+        while not first.empty():
+            assert first.get_nowait()["symbol"] == "GOLD"
+        await hub.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_price_change_publishes_and_late_subscriber_gets_latest(self):
+        hub = FakeHub()
+        queue = await hub.subscribe(["GOLD"])
+        before = await next_tick(queue, "GOLD")
+
+        hub.quotes["comex:GOLD"] = 2100.0
+        while (await next_tick(queue, "GOLD"))["comex_price_usd"] != 2100.0:
+            pass
+
+        late = await hub.subscribe(["GOLD"])
+        latest = late.get_nowait()
+        assert latest["comex_price_usd"] == 2100.0
+        assert latest["fair_value_inr"] > before["fair_value_inr"]
+        await hub.shutdown()
+
+    def test_slow_subscriber_drops_oldest_tick(self):
+        queue = asyncio.Queue(maxsize=2)
+        for n in range(3):
+            PriceStreamHub._offer(queue, {"n": n})
+
+        assert [queue.get_nowait()["n"] for _ in range(2)] == [1, 2]
@@ -0,0 +1,118 @@
+"""
+Unit tests for the shared upstream rate limiter.
+
+These tests run without network access or API keys.
+Run with: pytest tests/test_rate_limiter.py -v
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.data_providers.base import RateLimitError
+from services.data_providers.rate_limiter import (
+    Priority,
+    RateLimitConfig,
+    RequestScheduler,
+    get_scheduler,
+)
+
+
+class TestRequestScheduler:
+    """Tests for the token-bucket RequestScheduler"""
+
+    @pytest.mark.asyncio
+    async def test_burst_is_granted_immediately(self):
+        """Requests within the burst size do not queue"""
+        scheduler = RequestScheduler("test", RateLimitConfig(rate=1.0, burst=3))
+
+        for _ in range(3):
+            await scheduler.acquire()
+
+        metrics = scheduler.metrics()
+        assert metrics["requests_granted"]["INTERACTIVE"] == 3
+        assert metrics["requests_without_wait"]["INTERACTIVE"] == 3
+        assert metrics["avg_wait_seconds"]["INTERACTIVE"] == 0.0
+        assert metrics["queue_depth"] == 0
+
+    @pytest.mark.asyncio
+    async def test_queued_waits_are_recorded(self):
+        """Queued grants count their wait; immediate grants count zero"""
+        scheduler = RequestScheduler("test", RateLimitConfig(rate=20.0, burst=1))
+
+        await scheduler.acquire()
+        await scheduler.acquire()
+
+        metrics = scheduler.metrics()
+        assert metrics["requests_granted"]["INTERACTIVE"] == 2
+        assert metrics["requests_without_wait"]["INTERACTIVE"] == 1
+        assert metrics["max_wait_seconds"] > 0
+        average = metrics["avg_wait_seconds"]["INTERACTIVE"]
+        assert 0 < average < metrics["max_wait_seconds"]
+
+    @pytest.mark.asyncio
+    async def test_interactive_served_before_backfill(self):
+        """A later interactive request overtakes queued backfills"""
+        scheduler = RequestScheduler("test", RateLimitConfig(rate=50.0, burst=1))
+        await scheduler.acquire()  # Drain the bucket
+
+        order = []
+
+        async def request(name, priority):
+            await scheduler.acquire(priority)
+            order.append(name)
+
+        backfills = [
+            asyncio.create_task(request(f"backfill-{i}", Priority.BACKFILL))
+            for i in range(3)
+        ]
+        await asyncio.sleep(0)
+        interactive = asyncio.create_task(request("interactive", Priority.INTERACTIVE))
+
+        await asyncio.gather(*backfills, interactive)
+        assert order[0] == "interactive"
+
+    @pytest.mark.asyncio
+    async def test_retries_on_rate_limit_error(self):
+        """RateLimitError is retried until the call succeeds"""
+        scheduler = RequestScheduler(
+            "test", RateLimitConfig(rate=100.0, burst=5, base_delay=0.01, max_delay=0.02)
+        )
+        calls = {"count": 0}
+
+        async def flaky():
+            calls["count"] += 1
+            if calls["count"] < 3:
+                raise RateLimitError("test", "Too many requests")
+            return "ok"
+
+        assert await scheduler.run(flaky) == "ok"
+        assert calls["count"] == 3
+        assert scheduler.metrics()["retries"] == 2
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_retries(self):
+        """The last RateLimitError is raised once retries are exhausted"""
+        scheduler = RequestScheduler(
+            "test",
+            RateLimitConfig(
+                rate=100.0, burst=5, max_retries=1, base_delay=0.01, max_delay=0.02
+            ),
+        )
+
+        async def always_throttled():
+            raise RateLimitError("test", "Too many requests")
+
+        with pytest.raises(RateLimitError):
+            await scheduler.run(always_throttled)
+        assert scheduler.metrics()["failures"] == 1
+
+    def test_scheduler_is_shared_per_upstream(self):
+        """Every caller gets the same scheduler for an upstream"""
+        assert get_scheduler("DhanHQ") is get_scheduler("DhanHQ")
+        assert get_scheduler("DhanHQ") is not get_scheduler("MetalPriceAPI")